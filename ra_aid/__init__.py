@@ -1,15 +1,4 @@
 from .__version__ import __version__
-from .agent_utils import run_agent_with_retry
-from .console.formatting import (
-    print_error,
-    print_interrupt,
-    print_stage_header,
-    print_task_header,
-)
-from .console.output import print_agent_output
-from .text.processing import truncate_output
-from .scripts.last_session_usage import get_latest_session_usage
-from .scripts.all_sessions_usage import get_all_sessions_usage
 
 __all__ = [
     "print_stage_header",
@@ -23,3 +12,32 @@ __all__ = [
     "get_latest_session_usage",
     "get_all_sessions_usage",
 ]
+
+# The package is imported by every `ra-aid` invocation, including --help and
+# --version, so its exports are imported on first use rather than up front.
+_LAZY_EXPORTS = {
+    "run_agent_with_retry": ".agent_utils",
+    "print_error": ".console.formatting",
+    "print_interrupt": ".console.formatting",
+    "print_stage_header": ".console.formatting",
+    "print_task_header": ".console.formatting",
+    "print_agent_output": ".console.output",
+    "truncate_output": ".text.processing",
+    "get_latest_session_usage": ".scripts.last_session_usage",
+    "get_all_sessions_usage": ".scripts.all_sessions_usage",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
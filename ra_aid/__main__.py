@@ -5,23 +5,7 @@ import sys
 import uuid
 from datetime import datetime
 
-import litellm
-import uvicorn
-
-from langgraph.checkpoint.memory import MemorySaver
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.prompt import Confirm
-
-from ra_aid import print_error, print_stage_header
 from ra_aid.__version__ import __version__
-from ra_aid.version_check import check_for_newer_version
-from ra_aid.agent_utils import (
-    create_agent,
-    run_agent_with_retry,
-)
-from ra_aid.agents.research_agent import run_research_agent
 from ra_aid.config import (
     DEFAULT_MAX_TEST_CMD_RETRIES,
     DEFAULT_MODEL,
@@ -32,87 +16,49 @@ from ra_aid.config import (
     DEFAULT_PROVIDER,
     DEFAULT_RECURSION_LIMIT,
     DEFAULT_TEST_CMD_TIMEOUT,
+    DEFAULT_FALLBACK_HEDGE_COUNT,
     VALID_PROVIDERS,
     DEFAULT_EXPERT_ANTHROPIC_MODEL,
     DEFAULT_EXPERT_GEMINI_MODEL,
     DEFAULT_EXPERT_OPENAI_MODEL,
     DEFAULT_EXPERT_DEEPSEEK_MODEL
 )
-from ra_aid.database.repositories.key_fact_repository import (
-    KeyFactRepositoryManager,
-    get_key_fact_repository,
-)
-from ra_aid.database.repositories.key_snippet_repository import (
-    KeySnippetRepositoryManager,
-    get_key_snippet_repository,
-)
-from ra_aid.database.repositories.human_input_repository import (
-    HumanInputRepositoryManager,
-    get_human_input_repository,
-)
-from ra_aid.database.repositories.research_note_repository import (
-    ResearchNoteRepositoryManager,
-    get_research_note_repository,
-)
-from ra_aid.database.repositories.trajectory_repository import (
-    TrajectoryRepositoryManager,
-    get_trajectory_repository,
-)
-from ra_aid.database.repositories.session_repository import SessionRepositoryManager
-from ra_aid.database.repositories.related_files_repository import (
-    RelatedFilesRepositoryManager,
-)
 
+# Everything else pulls in litellm, langchain, the web server or the database
+# layer, which together take seconds to import. Argument parsing only needs the
+# imports above, so `ra-aid --help` and `ra-aid --version` return without them;
+# main(), launch_server() and build_status() import the rest where they use it.
 
-from ra_aid.database.repositories.work_log_repository import WorkLogRepositoryManager
-from ra_aid.database.repositories.config_repository import (
-    ConfigRepositoryManager,
-    get_config_repository,
-)
-from ra_aid.env_inv import EnvDiscovery
-from ra_aid.env_inv_context import EnvInvManager, get_env_inv
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.console.formatting import cpm
-from ra_aid.database import (
-    DatabaseManager,
-    ensure_migrations_applied,
-)
-from ra_aid.dependencies import check_dependencies
-from ra_aid.env import validate_environment
-from ra_aid.exceptions import AgentInterrupt
-from ra_aid.fallback_handler import FallbackHandler
-from ra_aid.llm import initialize_llm, get_model_default_temperature
-from ra_aid.logging_config import get_logger, setup_logging
-from ra_aid.models_params import models_params
-from ra_aid.project_info import format_project_info, get_project_info
-from ra_aid.prompts.chat_prompts import CHAT_PROMPT
-from ra_aid.prompts.web_research_prompts import WEB_RESEARCH_PROMPT_SECTION_CHAT
-from ra_aid.prompts.custom_tools_prompts import DEFAULT_CUSTOM_TOOLS_PROMPT
-from ra_aid.server.server import app as fastapi_app
-from ra_aid.tool_configs import get_chat_tools, set_modification_tools, get_custom_tools
-from ra_aid.tools.human import ask_human
-
-logger = get_logger(__name__)
-
-# Configure litellm to suppress debug logs
-os.environ["LITELLM_LOG"] = "ERROR"
-litellm.suppress_debug_info = True
-litellm.set_verbose = False
-
-# Explicitly configure LiteLLM's loggers
-for logger_name in ["litellm", "LiteLLM"]:
-    litellm_logger = logging.getLogger(logger_name)
-    litellm_logger.setLevel(logging.WARNING)
-    litellm_logger.propagate = True
-
-# Use litellm's internal method to disable debugging
-if hasattr(litellm, "_logging") and hasattr(litellm._logging, "_disable_debugging"):
-    litellm._logging._disable_debugging()
+# The logger ra_aid.logging_config.get_logger(__name__) returns, without
+# importing logging_config and rich up front
+logger = logging.getLogger(f"ra_aid.{__name__}")
+
+
+def _configure_litellm():
+    """Import litellm with its debug output suppressed."""
+    # Must be set before litellm is first imported
+    os.environ["LITELLM_LOG"] = "ERROR"
+    import litellm
+
+    litellm.suppress_debug_info = True
+    litellm.set_verbose = False
+
+    # Explicitly configure LiteLLM's loggers
+    for logger_name in ["litellm", "LiteLLM"]:
+        litellm_logger = logging.getLogger(logger_name)
+        litellm_logger.setLevel(logging.WARNING)
+        litellm_logger.propagate = True
+
+    # Use litellm's internal method to disable debugging
+    if hasattr(litellm, "_logging") and hasattr(litellm._logging, "_disable_debugging"):
+        litellm._logging._disable_debugging()
 
 
 def launch_server(host: str, port: int, args):
     """Launch the RA.Aid web interface."""
+    import uvicorn
+
+    from ra_aid.console.formatting import cpm
     from ra_aid.database.connection import DatabaseManager
     from ra_aid.database.repositories.session_repository import SessionRepositoryManager
     from ra_aid.database.repositories.key_fact_repository import (
@@ -137,8 +83,13 @@ def launch_server(host: str, port: int, args):
         WorkLogRepositoryManager,
     )
     from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
+    from ra_aid.dependencies import check_dependencies
+    from ra_aid.env import validate_environment
     from ra_aid.env_inv_context import EnvInvManager
     from ra_aid.env_inv import EnvDiscovery
+    from ra_aid.llm import get_model_default_temperature
+    from ra_aid.models_params import models_params
+    from ra_aid.server.server import app as fastapi_app
 
     # Set the console handler level to INFO for server mode
     # Get the root logger and modify the console handler
@@ -246,6 +197,7 @@ def launch_server(host: str, port: int, args):
                 "expert_num_ctx": args.expert_num_ctx,
                 "temperature": args.temperature,
                 "experimental_fallback_handler": args.experimental_fallback_handler,
+                "fallback_hedge_count": args.fallback_hedge_count,
                 "expert_enabled": expert_enabled,
                 "web_research_enabled": web_research_enabled,
                 "show_thoughts": args.show_thoughts,
@@ -253,6 +205,8 @@ def launch_server(host: str, port: int, args):
                 "force_reasoning_assistance": args.reasoning_assistance,
                 "disable_reasoning_assistance": args.no_reasoning_assistance,
                 "cowboy_mode": args.cowboy_mode,
+                # Nobody watches the server's terminal; only capture command output
+                "shell_echo": False,
             }
         )
 
@@ -320,6 +274,16 @@ Examples:
         default=262144,
         help="Context window size for Ollama models",
     )
+    parser.add_argument(
+        "--rate-limit-rpm",
+        type=float,
+        help="Maximum requests per minute to send to the provider, shared by all agents (default: no limit)",
+    )
+    parser.add_argument(
+        "--rate-limit-tpm",
+        type=float,
+        help="Maximum tokens per minute to use with the provider, shared by all agents (default: no limit)",
+    )
     parser.add_argument(
         "--research-provider",
         type=str,
@@ -405,6 +369,13 @@ Examples:
         action="store_true",
         help="Enable experimental fallback handler.",
     )
+    parser.add_argument(
+        "--fallback-hedge-count",
+        type=int,
+        default=DEFAULT_FALLBACK_HEDGE_COUNT,
+        help="Number of fallback models to query concurrently when the fallback handler "
+        "is triggered; the first successful tool call wins (default: 1, one at a time)",
+    )
     parser.add_argument(
         "--recursion-limit",
         type=int,
@@ -536,6 +507,15 @@ Examples:
     # Validate provider
     if parsed_args.provider not in VALID_PROVIDERS:
         parser.error(f"Invalid provider: {parsed_args.provider}")
+
+    for flag, value in (
+        ("--rate-limit-rpm", parsed_args.rate_limit_rpm),
+        ("--rate-limit-tpm", parsed_args.rate_limit_tpm),
+        ("--fallback-hedge-count", parsed_args.fallback_hedge_count),
+    ):
+        if value is not None and value <= 0:
+            parser.error(f"{flag} must be positive")
+
     # Handle model defaults and requirements
 
     if parsed_args.provider == "openai":
@@ -610,17 +590,10 @@ Examples:
     return parsed_args
 
 
-# Create console instance
-console = Console()
-
-# Create individual memory objects for each agent
-research_memory = MemorySaver()
-planning_memory = MemorySaver()
-implementation_memory = MemorySaver()
-
-
 def is_informational_query() -> bool:
     """Determine if the current query is informational based on config settings."""
+    from ra_aid.database.repositories.config_repository import get_config_repository
+
     return get_config_repository().get("research_only", False)
 
 
@@ -655,6 +628,10 @@ def wipe_project_memory(custom_dir=None):
 
     try:
         os.remove(db_path)
+        # Drop cached memory that still describes the deleted database
+        from ra_aid.database.memory_cache import clear_memory_caches
+
+        clear_memory_caches()
         return "Project memory wiped successfully."
     except PermissionError:
         return "Error: Could not wipe project memory due to permission issues."
@@ -667,6 +644,16 @@ def build_status():
 
     Includes memory statistics at the bottom with counts of key facts, snippets, and research notes.
     """
+    from rich.text import Text
+
+    from ra_aid.database.repositories.config_repository import get_config_repository
+    from ra_aid.database.repositories.key_fact_repository import get_key_fact_repository
+    from ra_aid.database.repositories.key_snippet_repository import get_key_snippet_repository
+    from ra_aid.database.repositories.research_note_repository import (
+        get_research_note_repository,
+    )
+    from ra_aid.version_check import check_for_newer_version
+
     status = Text()
 
     # Get the config repository to get model/provider information
@@ -720,6 +707,8 @@ def build_status():
 
     # Fallback handler status
     if experimental_fallback_handler:
+        from ra_aid.fallback_handler import FallbackHandler
+
         fb_handler = FallbackHandler({}, [])
         status.append("\n🔧 FallbackHandler Enabled: ")
         msg = ", ".join(
@@ -735,17 +724,17 @@ def build_status():
     note_count = 0
 
     try:
-        fact_count = len(get_key_fact_repository().get_all())
+        fact_count = get_key_fact_repository().count()
     except RuntimeError as e:
         logger.debug(f"Failed to get key facts count: {e}")
 
     try:
-        snippet_count = len(get_key_snippet_repository().get_all())
+        snippet_count = get_key_snippet_repository().count()
     except RuntimeError as e:
         logger.debug(f"Failed to get key snippets count: {e}")
 
     try:
-        note_count = len(get_research_note_repository().get_all())
+        note_count = get_research_note_repository().count()
     except RuntimeError as e:
         logger.debug(f"Failed to get research notes count: {e}")
 
@@ -768,6 +757,61 @@ def build_status():
 def main():
     """Main entry point for the ra-aid command line tool."""
     args = parse_arguments()
+
+    _configure_litellm()
+    from langgraph.checkpoint.memory import MemorySaver
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+
+    from ra_aid.agent_utils import create_agent, run_agent_with_retry
+    from ra_aid.agents.research_agent import run_research_agent
+    from ra_aid.console.formatting import cpm, print_error, print_stage_header
+    from ra_aid.database import DatabaseManager, ensure_migrations_applied
+    from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
+    from ra_aid.database.repositories.human_input_repository import (
+        HumanInputRepositoryManager,
+        get_human_input_repository,
+    )
+    from ra_aid.database.repositories.key_fact_repository import (
+        KeyFactRepositoryManager,
+        get_key_fact_repository,
+    )
+    from ra_aid.database.repositories.key_snippet_repository import (
+        KeySnippetRepositoryManager,
+        get_key_snippet_repository,
+    )
+    from ra_aid.database.repositories.related_files_repository import (
+        RelatedFilesRepositoryManager,
+    )
+    from ra_aid.database.repositories.research_note_repository import (
+        ResearchNoteRepositoryManager,
+    )
+    from ra_aid.database.repositories.session_repository import SessionRepositoryManager
+    from ra_aid.database.repositories.trajectory_repository import (
+        TrajectoryRepositoryManager,
+        get_trajectory_repository,
+    )
+    from ra_aid.database.repositories.work_log_repository import WorkLogRepositoryManager
+    from ra_aid.dependencies import check_dependencies
+    from ra_aid.env import validate_environment
+    from ra_aid.env_inv import EnvDiscovery
+    from ra_aid.env_inv_context import EnvInvManager, get_env_inv
+    from ra_aid.exceptions import AgentInterrupt
+    from ra_aid.llm import get_model_default_temperature, initialize_llm
+    from ra_aid.logging_config import setup_logging
+    from ra_aid.model_formatters import format_key_facts_dict
+    from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
+    from ra_aid.models_params import models_params
+    from ra_aid.project_info import format_project_info, get_project_info
+    from ra_aid.prompts.chat_prompts import CHAT_PROMPT
+    from ra_aid.prompts.custom_tools_prompts import DEFAULT_CUSTOM_TOOLS_PROMPT
+    from ra_aid.prompts.web_research_prompts import WEB_RESEARCH_PROMPT_SECTION_CHAT
+    from ra_aid.rate_limiter import configure_rate_limit
+    from ra_aid.tool_configs import get_chat_tools, get_custom_tools, set_modification_tools
+    from ra_aid.tools.human import ask_human
+    from ra_aid.utils.gc_scheduler import run_pending_gc
+
     setup_logging(
         args.log_mode,
         args.pretty_logger,
@@ -804,6 +848,10 @@ def main():
         logger.info(result)
         print(f"📋 {result}")
 
+    # Limits are process-wide, so server sessions share them too
+    if args.rate_limit_rpm or args.rate_limit_tpm:
+        configure_rate_limit(args.provider, args.rate_limit_rpm, args.rate_limit_tpm)
+
     # Launch web interface if requested
     if args.server:
         if args.cowboy_mode:
@@ -918,6 +966,7 @@ def main():
                 config_repo.set(
                     "experimental_fallback_handler", args.experimental_fallback_handler
                 )
+                config_repo.set("fallback_hedge_count", args.fallback_hedge_count)
                 config_repo.set("web_research_enabled", web_research_enabled)
                 config_repo.set("show_thoughts", args.show_thoughts)
                 config_repo.set("show_cost", args.show_cost)
@@ -939,7 +988,7 @@ def main():
                 # Build status panel with memory statistics
                 status = build_status()
 
-                console.print(
+                Console().print(
                     Panel(
                         status,
                         title=f"RA.Aid v{__version__}",
@@ -1100,6 +1149,8 @@ def main():
                         ),
                         config,
                     )
+                    # Finish queued memory GC while the repositories are open
+                    run_pending_gc()
                     return
 
                 # Validate message is provided
@@ -1182,6 +1233,7 @@ def main():
                     "test_cmd": args.test_cmd,
                     "max_test_cmd_retries": args.max_test_cmd_retries,
                     "experimental_fallback_handler": args.experimental_fallback_handler,
+                    "fallback_hedge_count": args.fallback_hedge_count,
                     "test_cmd_timeout": args.test_cmd_timeout,
                 }
 
@@ -1252,8 +1304,10 @@ def main():
                     expert_enabled=expert_enabled,
                     research_only=args.research_only,
                     hil=args.hil,
-                    memory=research_memory,
+                    memory=MemorySaver(),
                 )
+                # Finish queued memory GC while the repositories are open
+                run_pending_gc()
 
                 # for how long have we had a second planning agent triggered here?
 
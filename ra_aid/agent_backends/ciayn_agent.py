@@ -1,9 +1,11 @@
 import re
 import ast
+import contextvars
 import string
 import random
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Generator, List, Optional, Union
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
@@ -13,7 +15,8 @@ from requests import session
 from ra_aid.callbacks.default_callback_handler import (
     initialize_callback_handler,
 )
-from ra_aid.config import DEFAULT_MAX_TOOL_FAILURES
+from ra_aid.config import DEFAULT_MAX_PARALLEL_TOOL_CALLS, DEFAULT_MAX_TOOL_FAILURES
+from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.exceptions import ToolExecutionError
 from ra_aid.fallback_handler import FallbackHandler
 from ra_aid.logging_config import get_logger
@@ -23,11 +26,12 @@ from ra_aid.models_params import (
     models_params,
     DEFAULT_TOKEN_LIMIT,
 )  # Need DEFAULT_TOKEN_LIMIT too
+from ra_aid.prompt_cache import add_cache_control, supports_cache_control
 from ra_aid.prompts.ciayn_prompts import (
     CIAYN_AGENT_SYSTEM_PROMPT,
 )
 from ra_aid.tools.reflection import get_function_info
-from ra_aid.tool_configs import CUSTOM_TOOLS
+from ra_aid.tool_configs import CUSTOM_TOOLS, SIDE_EFFECT_FREE_TOOLS
 import ra_aid.console.formatting
 from ra_aid.agent_context import should_exit
 from ra_aid.text.processing import process_thinking_content
@@ -35,6 +39,9 @@ from ra_aid.text import fix_triple_quote_contents
 
 logger = get_logger(__name__)
 
+# Stands in for the result of a bundled call skipped because the agent should exit
+_INTERRUPTED = object()
+
 
 @dataclass
 class ChunkMessage:
@@ -138,6 +145,9 @@ class CiaynAgent:
         "plan_implementation_completed",
         "request_research_and_implementation",
         "run_shell_command",
+        "ripgrep_search",
+        "fuzzy_find_project_files",
+        "list_directory_tree",
     ]
 
     # List of tools that should not be called repeatedly with the same parameters
@@ -164,6 +174,7 @@ class CiaynAgent:
         max_tokens: Optional[int] = DEFAULT_TOKEN_LIMIT,
         config: Optional[dict] = None,
         session_id: Optional[int] = None,
+        agent_type: str = "default",
     ):
         """Initialize the agent with a model and list of tools.
 
@@ -174,6 +185,7 @@ class CiaynAgent:
             max_tokens: Maximum number of tokens allowed in message history (None for no limit)
             config: Optional configuration dictionary
             session_id: Optional session ID for tracking
+            agent_type: Kind of agent, attached to model calls for latency metrics
         """
         if config is None:
             config = {}
@@ -186,6 +198,9 @@ class CiaynAgent:
         self.max_history_messages = max_history_messages
         self.max_tokens = max_tokens
         self.chat_history = []
+        # id(message) -> (message content, estimated tokens); the content guards
+        # against a recycled id being mistaken for an already counted message
+        self._token_cache: Dict[int, Tuple[Any, int]] = {}
         self.available_functions = []
         for t in tools:
             self.available_functions.append(get_function_info(t.func))
@@ -196,6 +211,7 @@ class CiaynAgent:
             model=self.model,
             track_cost=self.config.get("track_cost", True),
         )
+        self.stream_config["metadata"] = {"agent_type": agent_type}
 
         # Include the functions list in the system prompt
         functions_list = "\\n\\n".join(self.available_functions)
@@ -203,6 +219,7 @@ class CiaynAgent:
         self.sys_message = HumanMessage(
             CIAYN_AGENT_SYSTEM_PROMPT.format(functions_list=functions_list)
         )
+        self.cache_prompts = supports_cache_control(model)
 
         self.error_message_template = "Your tool call caused an error: {e}\\n\\nPlease correct your tool call and try again."
         self.fallback_fixed_msg = HumanMessage(
@@ -216,7 +233,11 @@ class CiaynAgent:
         self.last_tool_params = None
 
     def _build_prompt(self, last_result: Optional[str] = None) -> str:
-        """Build the prompt for the agent including available tools and context."""
+        """Build the prompt for the agent including available tools and context.
+
+        Only the last result is added per step, as a new message after the
+        system message and task, so the prompt prefix stays cacheable.
+        """
         # Add last result section if provided
         last_result_section = ""
         if last_result is not None:
@@ -336,6 +357,56 @@ class CiaynAgent:
             # If we can't parse the code with AST, just return the original
             return [code]
 
+    def _can_run_in_parallel(self, calls: List[str]) -> bool:
+        """Whether bundled calls may run concurrently: several calls, all to side-effect-free tools."""
+        if len(calls) < 2 or self._max_parallel_tool_calls() < 2:
+            return False
+        return all(self.extract_tool_name(call) in SIDE_EFFECT_FREE_TOOLS for call in calls)
+
+    def _max_parallel_tool_calls(self) -> int:
+        workers = self.config.get("max_parallel_tool_calls")
+        if workers is None:
+            try:
+                workers = get_config_repository().get(
+                    "max_parallel_tool_calls", DEFAULT_MAX_PARALLEL_TOOL_CALLS
+                )
+            except RuntimeError:
+                workers = DEFAULT_MAX_PARALLEL_TOOL_CALLS
+        return workers or 1
+
+    def _execute_calls_in_sequence(self, calls: List[str], globals_dict: Dict[str, Any]) -> List[Any]:
+        """Run bundled calls one after another, stopping if the agent should exit."""
+        results = []
+        for call in calls:
+            if should_exit(self.session_id):
+                logger.debug("Agent should exit flag detected during bundled tool execution")
+                results.append(_INTERRUPTED)
+                break
+            results.append(eval(call.strip(), globals_dict))
+        return results
+
+    def _execute_calls_in_parallel(self, calls: List[str], globals_dict: Dict[str, Any]) -> List[Any]:
+        """
+        Run bundled side-effect-free calls on a thread pool.
+
+        Results come back in call order. Each call runs in a copy of the
+        current context so tools still see the session's repositories. If a
+        call raises, the first exception in call order is re-raised once all
+        calls have finished, as it would have been when running in sequence.
+        """
+        if should_exit(self.session_id):
+            logger.debug("Agent should exit flag detected before parallel bundled tool execution")
+            return [_INTERRUPTED]
+
+        workers = min(len(calls), self._max_parallel_tool_calls())
+        logger.debug(f"Running {len(calls)} bundled read-only tool calls on {workers} threads.")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ciayn-tool") as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, eval, call.strip(), globals_dict)
+                for call in calls
+            ]
+        return [future.result() for future in futures]
+
     def _execute_tool(self, msg: BaseMessage) -> str:
         """Execute a tool call and return its result."""
 
@@ -380,8 +451,9 @@ class CiaynAgent:
                         "Bundled tool execution aborted - agent should exit flag is set"
                     )
 
-                results = []
-                result_strings = []
+                # Validate every call first, then run the ones that passed.
+                # Each slot holds (call to run, None) or (None, result string).
+                slots: List[Tuple[Optional[str], Optional[str]]] = []
 
                 for call in tool_calls:
                     # Check if agent should exit
@@ -423,11 +495,12 @@ class CiaynAgent:
                             )
                             warning_message = f"Invalid bundled tool call format detected:\\n```\\n{call}\\n```\\nLLM extraction is disabled. Skipping this call."
                             # Add an error message to results instead of raising, to allow other bundled calls to proceed
-                            error_msg = f"Invalid tool call format and LLM extraction is disabled. Call: {call}"
-                            results.append(f"Error: {error_msg}")
                             result_id = self._generate_random_id()
-                            result_strings.append(
-                                f"<result-{result_id}>\\nError: tool call was not structured correctly. Re-read the instructions, carefully consider what went wrong, and try again with a *CORRECT AND COMPLETE* tool call.\\n</result-{result_id}>"
+                            slots.append(
+                                (
+                                    None,
+                                    f"<result-{result_id}>\\nError: tool call was not structured correctly. Re-read the instructions, carefully consider what went wrong, and try again with a *CORRECT AND COMPLETE* tool call.\\n</result-{result_id}>",
+                                )
                             )
                             continue  # Skip executing this invalid call
 
@@ -510,12 +583,11 @@ class CiaynAgent:
                                         f"Detected repeat call of {tool_name} with the same parameters."
                                     )
                                     result = f"Repeat calls of {tool_name} with the same parameters are not allowed. You must try something different!"
-                                    results.append(result)
 
                                     # Generate a random ID for this result
                                     result_id = self._generate_random_id()
-                                    result_strings.append(
-                                        f"<result-{result_id}>\n{result}\n</result-{result_id}>"
+                                    slots.append(
+                                        (None, f"<result-{result_id}>\n{result}\n</result-{result_id}>")
                                     )
                                     continue
 
@@ -529,17 +601,26 @@ class CiaynAgent:
                             )
                             pass
 
-                    # Execute the call and collect the result
-                    result = eval(call.strip(), globals_dict)
-                    results.append(result)
+                    slots.append((call, None))
 
-                    # Generate a random ID for this result
-                    result_id = self._generate_random_id()
-                    result_strings.append(
-                        f"<result-{result_id}>\n{result}\n</result-{result_id}>"
-                    )
+                calls = [call for call, _ in slots if call is not None]
+                if self._can_run_in_parallel(calls):
+                    outputs = iter(self._execute_calls_in_parallel(calls, globals_dict))
+                else:
+                    outputs = iter(self._execute_calls_in_sequence(calls, globals_dict))
 
-                # Return all results as one big string with tagged sections
+                result_strings = []
+                for call, result_string in slots:
+                    if call is not None:
+                        result = next(outputs)
+                        if result is _INTERRUPTED:
+                            return "Tool execution interrupted: agent_should_exit flag is set."
+                        # Generate a random ID for this result
+                        result_id = self._generate_random_id()
+                        result_string = f"<result-{result_id}>\n{result}\n</result-{result_id}>"
+                    result_strings.append(result_string)
+
+                # Return all results as one big string with tagged sections, in call order
                 return "\n\n".join(result_strings)
 
             # Regular single tool call case
@@ -892,20 +973,42 @@ class CiaynAgent:
         if self.max_tokens is None:
             return initial_messages + chat_history
 
-        # Calculate initial messages token count
-        initial_tokens = sum(self._estimate_tokens(msg) for msg in initial_messages)
+        # Calculate token counts once; messages seen on earlier turns are cached
+        initial_tokens = sum(self._message_tokens(msg) for msg in initial_messages)
+        token_counts = [self._message_tokens(msg) for msg in chat_history]
+        total_tokens = initial_tokens + sum(token_counts)
 
         # Remove messages from start of chat_history until under token limit
-        while chat_history:
-            total_tokens = initial_tokens + sum(
-                self._estimate_tokens(msg) for msg in chat_history
-            )
-            if total_tokens <= self.max_tokens:
-                break
-            chat_history.pop(0)
-
+        drop = 0
+        while drop < len(chat_history) and total_tokens > self.max_tokens:
+            total_tokens -= token_counts[drop]
+            drop += 1
+        if drop:
+            del chat_history[:drop]
+
+        self._prune_token_cache(initial_messages, chat_history)
         return initial_messages + chat_history
 
+    def _message_tokens(self, msg: Optional[Union[str, BaseMessage]]) -> int:
+        """Estimate token count for a message, reusing the estimate from earlier turns."""
+        content = msg.content if isinstance(msg, BaseMessage) else msg
+        cached = self._token_cache.get(id(msg))
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        tokens = self._estimate_tokens(msg)
+        self._token_cache[id(msg)] = (content, tokens)
+        return tokens
+
+    def _prune_token_cache(self, *message_lists: List[Any]) -> None:
+        """Drop cached counts for messages no longer in the history once the cache grows."""
+        live = sum(len(messages) for messages in message_lists)
+        if len(self._token_cache) <= 2 * live + 64:
+            return
+        live_ids = {id(msg) for messages in message_lists for msg in messages}
+        self._token_cache = {
+            key: value for key, value in self._token_cache.items() if key in live_ids
+        }
+
     @staticmethod
     def _estimate_tokens(content: Optional[Union[str, BaseMessage]]) -> int:
         """Estimate token count for a message or string."""
@@ -953,9 +1056,11 @@ class CiaynAgent:
                 logger.debug("Agent should exit flag detected before model invocation")
                 break
 
-            response = self.model.invoke(
-                [self.sys_message] + full_history, self.stream_config
-            )
+            messages = [self.sys_message] + full_history
+            if self.cache_prompts:
+                # The system message and task are the same at every step
+                messages = add_cache_control(messages, prefix_messages=2)
+            response = self.model.invoke(messages, self.stream_config)
             # print(f"response={response}")
 
             if isinstance(response.content, list):
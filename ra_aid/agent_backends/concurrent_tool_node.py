@@ -0,0 +1,160 @@
+"""
+Tool node for the create_react_agent backend that only parallelizes read-only tools.
+
+langgraph's ToolNode runs every tool call of an AIMessage at once on the
+graph's thread pool, whatever the tools do. That lets two file writes or shell
+commands from one message race each other, and leaves the number of threads
+up to the runnable config rather than ra.aid's settings.
+
+ConcurrentToolNode splits the calls of a message into runs:
+
+- consecutive calls to side-effect-free tools (SIDE_EFFECT_FREE_TOOLS) run
+  concurrently, on at most "max_parallel_tool_calls" threads;
+- every other call runs on its own, after the calls before it have finished.
+
+Each run is handed to ToolNode's public invoke() as a copy of the AI message
+holding only that run's calls, and the tool messages of the runs are returned
+in the order of the calls, so the model sees the same results as with
+sequential execution.
+"""
+
+import copy
+from typing import Any, Callable, Collection, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.messages import AIMessage, ToolCall
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import patch_config
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import ToolNode
+
+from ra_aid.config import DEFAULT_MAX_PARALLEL_TOOL_CALLS
+from ra_aid.logging_config import get_logger
+from ra_aid.tool_configs import SIDE_EFFECT_FREE_TOOLS
+
+logger = get_logger(__name__)
+
+
+def get_max_parallel_tool_calls() -> int:
+    """Return the configured number of threads for concurrent read-only tool calls."""
+    try:
+        from ra_aid.database.repositories.config_repository import get_config_repository
+
+        workers = get_config_repository().get("max_parallel_tool_calls", DEFAULT_MAX_PARALLEL_TOOL_CALLS)
+    except RuntimeError:
+        workers = DEFAULT_MAX_PARALLEL_TOOL_CALLS
+    return max(1, workers or 1)
+
+
+class ConcurrentToolNode(ToolNode):
+    """ToolNode that runs read-only tool calls concurrently and all others in order."""
+
+    def __init__(
+        self,
+        tools: Sequence[Union[BaseTool, Callable]],
+        *,
+        max_workers: Optional[int] = None,
+        read_only_tools: Collection[str] = SIDE_EFFECT_FREE_TOOLS,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the tool node.
+
+        Args:
+            tools: Tools the node can call
+            max_workers: Threads for concurrent read-only calls; the
+                "max_parallel_tool_calls" setting is used when None
+            read_only_tools: Names of the tools that may run concurrently
+            **kwargs: Passed on to ToolNode
+        """
+        super().__init__(tools, **kwargs)
+        self.max_workers = max(1, max_workers) if max_workers is not None else get_max_parallel_tool_calls()
+        self.read_only_tools = frozenset(read_only_tools)
+
+    def _batches(self, tool_calls: List[ToolCall]) -> List[List[ToolCall]]:
+        """Group calls into runs that may execute together, in call order."""
+        batches: List[List[ToolCall]] = []
+        previous_parallel = False
+        for call in tool_calls:
+            parallel = self.max_workers > 1 and call["name"] in self.read_only_tools
+            if parallel and previous_parallel:
+                batches[-1].append(call)
+            else:
+                batches.append([call])
+            previous_parallel = parallel
+        return batches
+
+    def _split_input(self, input: Any) -> Optional[Tuple[List[ToolCall], Callable[[List[ToolCall]], Any]]]:
+        """
+        Return the calls of the input's last AI message and a function that
+        builds the same input with only some of those calls.
+
+        Returns None for input that is not a message history, such as tool
+        calls sent directly to the node.
+        """
+        if isinstance(input, list):
+            if input and isinstance(input[-1], dict) and input[-1].get("type") == "tool_call":
+                return None
+            messages = input
+        elif isinstance(input, dict):
+            messages = input.get(self.messages_key)
+        else:
+            messages = getattr(input, self.messages_key, None)
+        if not messages or not isinstance(messages[-1], AIMessage):
+            return None
+
+        def with_calls(calls: List[ToolCall]) -> Any:
+            batch_messages = [*messages[:-1], messages[-1].model_copy(update={"tool_calls": calls})]
+            if isinstance(input, list):
+                return batch_messages
+            if isinstance(input, dict):
+                return {**input, self.messages_key: batch_messages}
+            state = copy.copy(input)
+            setattr(state, self.messages_key, batch_messages)
+            return state
+
+        return messages[-1].tool_calls, with_calls
+
+    def _merge_outputs(self, outputs: List[Any], input: Any) -> Any:
+        """Combine the ToolNode outputs of each run into one output, in call order."""
+        parts: List[Any] = []
+        for output in outputs:
+            parts.extend(output if isinstance(output, list) else [output])
+        if isinstance(input, list) or not all(isinstance(part, dict) for part in parts):
+            # Tool messages, or updates mixed with the Commands some tools return
+            return parts
+        return {self.messages_key: [message for part in parts for message in part[self.messages_key]]}
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        split = self._split_input(input)
+        if split is None:
+            return super().invoke(input, config, **kwargs)
+
+        tool_calls, with_calls = split
+        outputs = []
+        for batch in self._batches(tool_calls):
+            workers = min(len(batch), self.max_workers)
+            if workers > 1:
+                logger.debug(f"Running {len(batch)} read-only tool calls on {workers} threads.")
+            # ToolNode runs the calls of one invocation on a ContextThreadPoolExecutor
+            # sized by max_concurrency, so the repositories held in contextvars are
+            # visible to the tools
+            batch_config = patch_config(config, max_concurrency=workers)
+            outputs.append(super().invoke(with_calls(batch), batch_config, **kwargs))
+
+        return self._merge_outputs(outputs, input)
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        split = self._split_input(input)
+        if split is None:
+            return await super().ainvoke(input, config, **kwargs)
+
+        tool_calls, with_calls = split
+        outputs = []
+        for batch in self._batches(tool_calls):
+            # The async ToolNode gathers every call it is given, so bound the
+            # concurrency by handing it at most max_workers calls at a time
+            for start in range(0, len(batch), self.max_workers):
+                chunk = batch[start : start + self.max_workers]
+                outputs.append(await super().ainvoke(with_calls(chunk), config, **kwargs))
+
+        return self._merge_outputs(outputs, input)
@@ -6,7 +6,7 @@ from contextlib import contextmanager
 from typing import Optional
 from ra_aid.logging_config import get_logger
 from ra_aid.utils import agent_thread_manager
-from ra_aid.utils.agent_thread_manager import agent_thread_registry
+from ra_aid.utils.agent_thread_manager import CancellationToken, agent_thread_registry
 
 # Create contextvar to hold the agent context
 agent_context_var = contextvars.ContextVar("agent_context", default=None)
@@ -16,15 +16,22 @@ logger = get_logger(__name__)
 class AgentContext:
     """Context manager for agent state tracking."""
 
-    def __init__(self, parent_context=None):
+    def __init__(self, parent_context=None, cancellation_token: Optional[CancellationToken] = None):
         """Initialize a new agent context.
 
         Args:
             parent_context: Optional parent context to inherit state from
+            cancellation_token: Session stop signal; inherited from the parent if not given
         """
         # Store reference to parent context
         self.parent = parent_context
 
+        # Unlike the completion flags, the session's stop signal applies to
+        # every nested agent
+        if cancellation_token is None and parent_context is not None:
+            cancellation_token = parent_context.cancellation_token
+        self.cancellation_token = cancellation_token
+
         # Initialize completion flags
         self.task_completed = False
         self.plan_completed = False
@@ -142,7 +149,7 @@ def get_depth() -> int:
 
 
 @contextmanager
-def agent_context(parent_context=None):
+def agent_context(parent_context=None, cancellation_token: Optional[CancellationToken] = None):
     """Context manager for agent execution.
 
     Creates a new agent context and makes it the current context for the duration
@@ -150,6 +157,7 @@ def agent_context(parent_context=None):
 
     Args:
         parent_context: Optional parent context to inherit state from
+        cancellation_token: Optional session stop signal; inherited from the parent if None
 
     Yields:
         The newly created AgentContext
@@ -160,9 +168,9 @@ def agent_context(parent_context=None):
     # Create a new context, inheriting from parent if provided
     # If parent_context is None but previous_context exists, use previous_context as parent
     if parent_context is None and previous_context is not None:
-        context = AgentContext(previous_context)
+        context = AgentContext(previous_context, cancellation_token)
     else:
-        context = AgentContext(parent_context)
+        context = AgentContext(parent_context, cancellation_token)
 
     # Set as current context and get token for resetting later
     token = agent_context_var.set(context)
@@ -226,21 +234,31 @@ def get_completion_message() -> str:
 def should_exit(session_id: Optional[int] = None) -> bool:
     """Check if the agent should exit execution.
 
+    Called on every agent step and tool call, so it only reads flags: the
+    current context's exit flag, its cancellation token, and the session's
+    token from the agent thread registry. It takes no locks and does not log.
+
+    Args:
+        session_id: Optional session whose stop signal should also be checked
+
     Returns:
         True if the agent should exit, False otherwise
     """
+    context = agent_context_var.get()
+    if context is not None:
+        if context.agent_should_exit:
+            return True
+        token = context.cancellation_token
+        if token is not None and token.cancelled:
+            return True
 
     # Check if the agent has received a stop signal from the client
-    logger.info("SHOULD_EXIT: Checking if agent should exit for session_id: %s", session_id)
+    if session_id is not None:
+        token = agent_thread_manager.get_cancellation_token(session_id)
+        if token is not None and token.cancelled:
+            return True
 
-    if session_id is not None and agent_thread_manager.has_received_stop_signal(session_id):
-        logger.info("SHOULD_EXIT: Received stop signal from client, exiting agent for session_id: %s", session_id)
-        return True
-    else:
-        logger.info("SHOULD_EXIT: No stop signal received from client, continuing agent for session_id: %s", session_id)
-
-    context = get_current_context()
-    return context.agent_should_exit if context else False
+    return False
 
 
 def mark_should_exit(propagation_depth: Optional[int] = 0) -> None:
@@ -1,9 +1,9 @@
 """Utility functions for working with agents."""
 
+import random
 import signal
 import sys
 import threading
-import time
 from typing import Any, Dict, List, Literal, Optional
 import uuid
 
@@ -41,6 +41,7 @@ from ra_aid.agent_context import (
     should_exit,
 )
 from ra_aid.agent_backends.ciayn_agent import CiaynAgent
+from ra_aid.agent_backends.concurrent_tool_node import ConcurrentToolNode
 from ra_aid.agents_alias import RAgents
 from ra_aid.config import DEFAULT_MAX_TEST_CMD_RETRIES, DEFAULT_MODEL
 
@@ -54,10 +55,17 @@ from ra_aid.exceptions import (
 )
 from ra_aid.fallback_handler import FallbackHandler
 from ra_aid.logging_config import get_logger
+from ra_aid.prompt_cache import add_cache_control, supports_cache_control
+from ra_aid.rate_limiter import get_rate_limiter, retry_after_seconds, wait_interruptibly
 from ra_aid.models_params import (
     DEFAULT_TOKEN_LIMIT,
 )
-from ra_aid.utils.agent_thread_manager import agent_thread_registry, has_received_stop_signal
+from ra_aid.utils.agent_thread_manager import (
+    agent_thread_registry,
+    get_cancellation_token,
+    has_received_stop_signal,
+)
+from ra_aid.utils.gc_scheduler import run_pending_gc
 from ra_aid.tools.handle_user_defined_test_cmd_execution import execute_test_command
 from ra_aid.database.repositories.human_input_repository import (
     get_human_input_repository,
@@ -75,6 +83,9 @@ from ra_aid.anthropic_token_limiter import (
 
 logger = get_logger(__name__)
 
+# Upper bound of the exponential backoff between retries without a Retry-After hint
+MAX_RETRY_BACKOFF_SECONDS = 60
+
 
 def build_agent_kwargs(
     checkpointer: Optional[Any] = None,
@@ -100,10 +111,14 @@ def build_agent_kwargs(
 
     limit_tokens = get_config_repository().get("limit_tokens", True)
     model_name = get_model_name_from_chat_model(model)
+    cache_prompts = supports_cache_control(model)
 
-    if limit_tokens and model is not None:
+    if (limit_tokens or cache_prompts) and model is not None:
+
+        def trim_state(state: AgentState) -> list[BaseMessage]:
+            if not limit_tokens:
+                return list(state["messages"])
 
-        def wrapped_state_modifier(state: AgentState) -> list[BaseMessage]:
             model_name = get_model_name_from_chat_model(model)
 
             if any(
@@ -114,6 +129,13 @@ def build_agent_kwargs(
 
             return base_state_modifier(state, max_input_tokens=max_input_tokens)
 
+        def wrapped_state_modifier(state: AgentState) -> list[BaseMessage]:
+            messages = trim_state(state)
+            if cache_prompts:
+                # Trimming always keeps the first message, the agent's prompt
+                messages = add_cache_control(messages)
+            return messages
+
         agent_kwargs["state_modifier"] = wrapped_state_modifier
 
     # Important for anthropic callback handler to determine the correct model name given the agent
@@ -122,6 +144,24 @@ def build_agent_kwargs(
     return agent_kwargs
 
 
+def build_tool_node(
+    tools: List[Any], max_workers: Optional[int] = None
+) -> ConcurrentToolNode:
+    """Build the tool node for a create_react_agent agent.
+
+    Calls to read-only tools in one model message run concurrently; all other
+    calls run one at a time, in order.
+
+    Args:
+        tools: Tools available to the agent
+        max_workers: Optional thread limit; defaults to the max_parallel_tool_calls setting
+
+    Returns:
+        Tool node to pass to create_react_agent in place of the tool list
+    """
+    return ConcurrentToolNode(tools, max_workers=max_workers)
+
+
 def create_agent(
     model: BaseChatModel,
     tools: List[Any],
@@ -183,13 +223,23 @@ def create_agent(
             )
             cpm("Using ReAct Agent")
             agent_kwargs = build_agent_kwargs(checkpointer, model, max_input_tokens)
-            return create_react_agent(
-                model, tools, interrupt_after=["tools"], **agent_kwargs
+            return _with_agent_type(
+                create_react_agent(
+                    model, build_tool_node(tools), interrupt_after=["tools"], **agent_kwargs
+                ),
+                agent_type,
             )
         else:
             cpm("Using CIAYN Agent")
             logger.debug("Using CiaynAgent agent instance based on model capabilities.")
-            return CiaynAgent(model, tools, max_tokens=max_input_tokens, config=config, session_id=session_id)
+            return CiaynAgent(
+                model,
+                tools,
+                max_tokens=max_input_tokens,
+                config=config,
+                session_id=session_id,
+                agent_type=agent_type,
+            )
 
     except Exception as e:
         # Default to REACT agent if provider/model detection fails
@@ -206,11 +256,21 @@ def create_agent(
 
         max_input_tokens = get_model_token_limit(config, agent_type, model)
         agent_kwargs = build_agent_kwargs(checkpointer, model, max_input_tokens)
-        return create_react_agent(
-            model, tools, interrupt_after=["tools"], **agent_kwargs
+        return _with_agent_type(
+            create_react_agent(
+                model, build_tool_node(tools), interrupt_after=["tools"], **agent_kwargs
+            ),
+            agent_type,
         )
 
 
+def _with_agent_type(agent: Any, agent_type: str) -> Any:
+    """Tag a react agent's model calls with its agent type for latency metrics."""
+    if isinstance(agent, CompiledGraph):
+        return agent.with_config(metadata={"agent_type": agent_type})
+    return agent
+
+
 _CONTEXT_STACK = []
 _INTERRUPT_CONTEXT = None
 _FEEDBACK_MODE = False
@@ -328,8 +388,11 @@ def _handle_api_error(e, attempt, max_retries, base_delay):
 
     # Change log level to info
     logger.info("API error (attempt %d/%d): %s", attempt + 1, max_retries, str(e))
-    delay = base_delay * (2**attempt)
-    error_message = f"Encountered {e.__class__.__name__}: {e}. Retrying in {delay}s... (Attempt {attempt+1}/{max_retries})"
+    delay = _retry_delay(e, attempt, base_delay)
+    if is_rate_limit_error:
+        # Hold every thread calling this provider, not just this one
+        _penalize_provider(delay)
+    error_message = f"Encountered {e.__class__.__name__}: {e}. Retrying in {delay:.1f}s... (Attempt {attempt+1}/{max_retries})"
 
     trajectory_repo = get_trajectory_repository()
     human_input_id = get_human_input_repository().get_most_recent_id()
@@ -354,10 +417,26 @@ def _handle_api_error(e, attempt, max_retries, base_delay):
     else:
         print_error(error_message)
 
-    start = time.monotonic()
-    while time.monotonic() - start < delay:
-        check_interrupt()
-        time.sleep(0.1)
+    wait_interruptibly(delay, check=check_interrupt)
+
+
+def _retry_delay(e: Exception, attempt: int, base_delay: float) -> float:
+    """Return the wait before retrying: the provider's Retry-After hint, or capped, jittered backoff."""
+    hint = retry_after_seconds(e)
+    if hint is not None:
+        return hint
+    backoff = min(base_delay * (2**attempt), MAX_RETRY_BACKOFF_SECONDS)
+    # Jitter spreads out the retries of sessions that hit the limit together
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+def _penalize_provider(delay: float) -> None:
+    try:
+        provider = get_config_repository().get("provider", None)
+    except RuntimeError:
+        provider = None
+    if provider:
+        get_rate_limiter(provider).penalize(delay)
 
 
 def get_agent_type(agent: RAgents) -> Literal["CiaynAgent", "React"]:
@@ -385,12 +464,14 @@ def init_fallback_handler(agent: RAgents, tools: List[Any]):
             "fallback_tool_model_limit", None
         )
         retry_fallback_count = get_config_repository().get("retry_fallback_count", None)
+        fallback_hedge_count = get_config_repository().get("fallback_hedge_count", None)
         provider = get_config_repository().get("provider", "anthropic")
         model = get_config_repository().get("model", "")
 
         config_for_fallback = {
             "fallback_tool_model_limit": fallback_tool_model_limit,
             "retry_fallback_count": retry_fallback_count,
+            "fallback_hedge_count": fallback_hedge_count,
             "provider": provider,
             "model": model,
         }
@@ -523,6 +604,9 @@ def _run_agent_stream(agent: RAgents, msg_list: list[BaseMessage], session_id: O
                 reset_completion_flags()
                 return True
 
+            # Step boundary: run memory GC queued by this step's tool calls
+            run_pending_gc()
+
         logger.debug("Stream iteration ended; checking agent state for continuation.")
 
         # If the agent is CiaynAgent we handle differently
@@ -585,7 +669,9 @@ def run_agent_with_retry(
     }
 
     # Create a new agent context for this run
-    with InterruptibleSection(), agent_context() as ctx:
+    with InterruptibleSection(), agent_context(
+        cancellation_token=get_cancellation_token(session_id)
+    ) as ctx:
         try:
             for attempt in range(max_retries):
                 logger.debug("Attempt %d/%d", attempt + 1, max_retries)
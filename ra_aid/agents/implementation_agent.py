@@ -107,7 +107,9 @@ def run_task_implementation_agent(
 
     # Make sure key_facts is defined before using it
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = format_key_facts_dict(
+            get_key_fact_repository().get_relevant_facts_dict(task)
+        )
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
@@ -115,7 +117,7 @@ def run_task_implementation_agent(
     # Get formatted research notes using repository
     try:
         repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
+        notes_dict = repository.get_relevant_notes_dict(task)
         formatted_research_notes = format_research_notes_dict(notes_dict)
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
@@ -197,7 +199,7 @@ def run_task_implementation_agent(
                 task=task,
                 key_facts=key_facts,
                 key_snippets=format_key_snippets_dict(
-                    get_key_snippet_repository().get_snippets_dict()
+                    get_key_snippet_repository().get_relevant_snippets_dict(task)
                 ),
                 research_notes=formatted_research_notes,
                 related_files="\n".join(related_files),
@@ -273,7 +275,7 @@ def run_task_implementation_agent(
         related_files=related_files,
         key_facts=key_facts,
         key_snippets=format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
+            get_key_snippet_repository().get_relevant_snippets_dict(task)
         ),
         research_notes=formatted_research_notes,
         work_log=get_work_log_repository().format_work_log(),
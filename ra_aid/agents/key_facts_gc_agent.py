@@ -240,8 +240,7 @@ def run_key_facts_gc_agent() -> None:
             
             # Get updated count
             try:
-                updated_facts = get_key_fact_repository().get_all()
-                updated_count = len(updated_facts)
+                updated_count = get_key_fact_repository().count()
             except RuntimeError as e:
                 logger.error(f"Failed to access key fact repository for update count: {str(e)}")
                 updated_count = "unknown"
@@ -226,8 +226,7 @@ def run_key_snippets_gc_agent() -> None:
             agent_utils.run_agent_with_retry(agent, prompt, agent_config)
             
             # Get updated count
-            updated_snippets = get_key_snippet_repository().get_all()
-            updated_count = len(updated_snippets)
+            updated_count = get_key_snippet_repository().count()
             
             # Show info panel with updated count and protected snippets count
             protected_count = len(protected_snippets)
@@ -128,7 +128,9 @@ def run_planning_agent(
 
     # Make sure key_facts is defined before using it
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = format_key_facts_dict(
+            get_key_fact_repository().get_relevant_facts_dict(base_task)
+        )
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
@@ -136,7 +138,7 @@ def run_planning_agent(
     # Make sure key_snippets is defined before using it
     try:
         key_snippets = format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
+            get_key_snippet_repository().get_relevant_snippets_dict(base_task)
         )
     except RuntimeError as e:
         logger.error(f"Failed to access key snippet repository: {str(e)}")
@@ -145,7 +147,7 @@ def run_planning_agent(
     # Get formatted research notes using repository
     try:
         repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
+        notes_dict = repository.get_relevant_notes_dict(base_task)
         formatted_research_notes = format_research_notes_dict(notes_dict)
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
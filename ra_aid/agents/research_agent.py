@@ -133,7 +133,9 @@ def run_research_agent(
         # Continue without appending last human input
 
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = format_key_facts_dict(
+            get_key_fact_repository().get_relevant_facts_dict(base_task_or_query)
+        )
         logger.debug(f"[{thread_id}] Retrieved {len(key_facts)} chars of key facts.")
     except RuntimeError as e:
         logger.error(f"[{thread_id}] Failed to access key fact repository: {str(e)}")
@@ -141,7 +143,7 @@ def run_research_agent(
 
     try:
         key_snippets = format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
+            get_key_snippet_repository().get_relevant_snippets_dict(base_task_or_query)
         )
         logger.debug(
             f"[{thread_id}] Retrieved {len(key_snippets)} chars of key snippets."
@@ -208,7 +210,7 @@ def run_research_agent(
     # Get research note information for reasoning assistance
     try:
         research_notes = format_research_notes_dict(
-            get_research_note_repository().get_notes_dict()
+            get_research_note_repository().get_relevant_notes_dict(base_task_or_query)
         )
         logger.debug(
             f"[{thread_id}] Retrieved {len(research_notes)} chars of research notes."
@@ -523,13 +525,15 @@ def run_web_research_agent(
     human_section = HUMAN_PROMPT_SECTION_RESEARCH if hil else ""
 
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = format_key_facts_dict(
+            get_key_fact_repository().get_relevant_facts_dict(query)
+        )
     except RuntimeError as e:
         logger.error(f"[{thread_id}] Failed to access key fact repository: {str(e)}")
         key_facts = ""
     try:
         key_snippets = format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
+            get_key_snippet_repository().get_relevant_snippets_dict(query)
         )
     except RuntimeError as e:
         logger.error(f"[{thread_id}] Failed to access key snippet repository: {str(e)}")
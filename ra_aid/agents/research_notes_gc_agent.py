@@ -291,8 +291,7 @@ Remember: Your goal is to maintain a concise, high-value collection of research
             
             # Get updated count
             try:
-                updated_notes = get_research_note_repository().get_all()
-                updated_count = len(updated_notes)
+                updated_count = get_research_note_repository().count()
             except RuntimeError as e:
                 logger.error(f"Failed to access research note repository for update count: {str(e)}")
                 updated_count = "unknown"
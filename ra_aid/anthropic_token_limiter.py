@@ -1,7 +1,9 @@
 """Utilities for handling token limits with Anthropic models."""
 
+import threading
+from collections import OrderedDict
 from functools import partial
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Hashable, List, Optional, Sequence
 
 from langchain.chat_models.base import BaseChatModel
 from typing import Tuple
@@ -60,15 +62,139 @@ def convert_message_to_litellm_format(message: BaseMessage) -> Dict:
     }
 
 
-def create_token_counter_wrapper(model: str):
+class CachedTokenCounter:
+    """Token counter for a model that memoizes litellm counts per message.
+
+    litellm counts a list of messages as a fixed overhead plus a count per
+    message, so each message only needs to be tokenized once. Later calls,
+    including the repeated calls trimming makes over growing message lists,
+    only tokenize messages not seen before.
+    """
+
+    def __init__(self, model: str, max_entries: int = 10_000):
+        """Initialize the counter.
+
+        Args:
+            model: The model name to use for token counting
+            max_entries: Maximum number of per-message counts to keep
+        """
+        self.model = model
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._base: Optional[int] = None
+        # key -> (message, content, tokens); holding the message keeps id() keys unique
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, messages: List[Dict]) -> int:
+        return token_counter(messages=messages, model=self.model)
+
+    def _base_tokens(self) -> int:
+        if self._base is None:
+            self._base = self._count([])
+        return self._base
+
+    def count_message(self, message: BaseMessage) -> int:
+        """Return the tokens a message adds to a request, tokenizing it at most once.
+
+        Args:
+            message: The message to count
+
+        Returns:
+            Token count of the message, excluding the fixed per-request overhead
+        """
+        key = ("id", message.id) if getattr(message, "id", None) else id(message)
+        content = message.content
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and (entry[1] is content or entry[1] == content):
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        tokens = self._count([convert_message_to_litellm_format(message)]) - self._base_tokens()
+
+        with self._lock:
+            self._cache[key] = (message, content, tokens)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def __call__(self, messages: List[BaseMessage]) -> int:
+        """Count tokens in a list of messages.
+
+        Args:
+            messages: List of BaseMessage objects
+
+        Returns:
+            Token count for the messages
+        """
+        if not messages:
+            return 0
+        return self._base_tokens() + sum(self.count_message(msg) for msg in messages)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics for this counter."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model": self.model,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._cache),
+            }
+
+
+_token_counters: Dict[str, CachedTokenCounter] = {}
+_token_counters_lock = threading.Lock()
+
+
+def get_cached_token_counter(model: str) -> CachedTokenCounter:
+    """Get the shared memoizing token counter for a model.
+
+    Args:
+        model: The model name to use for token counting
+
+    Returns:
+        CachedTokenCounter: Counter shared by all callers counting for this model
+    """
+    with _token_counters_lock:
+        counter = _token_counters.get(model)
+        if counter is None:
+            counter = _token_counters[model] = CachedTokenCounter(model)
+        return counter
+
+
+def get_token_counter_stats() -> List[Dict[str, Any]]:
+    """Return hit/miss statistics for every model's cached token counter."""
+    with _token_counters_lock:
+        counters = list(_token_counters.values())
+    return [counter.stats() for counter in counters]
+
+
+def clear_token_counter_cache() -> None:
+    """Drop all cached token counters and their per-message counts."""
+    with _token_counters_lock:
+        _token_counters.clear()
+
+
+def create_token_counter_wrapper(model: str, cached: bool = True):
     """Create a wrapper for token counter that handles BaseMessage conversion.
 
     Args:
         model: The model name to use for token counting
+        cached: Whether to return the shared memoizing counter for the model
+            instead of one that tokenizes every message on every call
 
     Returns:
         A function that accepts BaseMessage objects and returns token count
     """
+    if cached:
+        return get_cached_token_counter(model)
 
     # Create a partial function that already has the model parameter set
     base_token_counter = partial(token_counter, model=model)
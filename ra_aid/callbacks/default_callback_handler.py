@@ -5,11 +5,13 @@ import litellm
 from contextlib import contextmanager
 from contextvars import ContextVar
 from typing import Dict, Optional, Union, Any, List
+from uuid import UUID
 from decimal import Decimal, getcontext
 
 from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.outputs import LLMResult
 
+from ra_aid.callbacks.latency_metrics import get_latency_metrics
 from ra_aid.model_detection import (
     get_model_name_from_chat_model,
     get_provider_from_chat_model,
@@ -81,10 +83,51 @@ MODEL_COSTS = {
 }
 
 
+def _cache_token_usage(usage: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Prompt cache tokens from a provider's usage report.
+
+    Providers name them differently: Anthropic reports cache reads and writes,
+    OpenAI the cached part of the prompt, DeepSeek its cache hits, and
+    LangChain's usage metadata normalizes them to cache_read/cache_creation.
+    """
+    cache_usage: Dict[str, int] = {}
+    prompt_details = usage.get("prompt_tokens_details")
+    if not isinstance(prompt_details, dict):
+        prompt_details = {}
+    for key, source in (
+        ("cache_read_tokens", usage.get("cache_read_input_tokens")),
+        ("cache_read_tokens", usage.get("cache_read")),
+        ("cache_read_tokens", prompt_details.get("cached_tokens")),
+        ("cache_read_tokens", usage.get("prompt_cache_hit_tokens")),
+        ("cache_creation_tokens", usage.get("cache_creation_input_tokens")),
+        ("cache_creation_tokens", usage.get("cache_creation")),
+    ):
+        if source is not None and key not in cache_usage:
+            cache_usage[key] = int(source)
+    return cache_usage
+
+
 class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
+    """
+    Process-wide handler tracking token usage, cost and latency of LLM calls.
+
+    Concurrent calls (for example from several server sessions) are timed
+    separately by run id: start, first streamed token, and end, along with the
+    model and agent type each call was made for. Each finished
+    call is recorded in the latency metrics and stored as a model_usage
+    trajectory row with the p50/p95 of its model and agent type.
+
+    Prompt tokens read from or written to the provider's prompt cache are
+    counted per call and per session, and priced at litellm's cache rates
+    when it has them.
+    """
+
     def __init__(self, model_name: str, provider: Optional[str] = None):
         super().__init__()
         self._lock = threading.Lock()
+        # run_id -> {"start", "first_token", "agent_type"} for calls in flight
+        self._runs: Dict[UUID, Dict[str, Any]] = {}
         self._initialize(model_name, provider)
 
     def _initialize(self, model_name: str, provider: Optional[str] = None):
@@ -102,18 +145,25 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
     cumulative_total_tokens: int = 0
     cumulative_prompt_tokens: int = 0
     cumulative_completion_tokens: int = 0
+    cumulative_cache_read_tokens: int = 0
+    cumulative_cache_creation_tokens: int = 0
 
     trajectory_repo = None
     session_repo = None
 
     input_cost_per_token: Decimal = Decimal("0.0")
     output_cost_per_token: Decimal = Decimal("0.0")
+    # None when the provider does not price cached input differently
+    cache_read_cost_per_token: Optional[Decimal] = None
+    cache_creation_cost_per_token: Optional[Decimal] = None
 
     session_totals = {
         "cost": Decimal("0.0"),
         "tokens": 0,
         "input_tokens": 0,
         "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
         "session_id": None,
         "duration": 0.0,
     }
@@ -136,11 +186,19 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
             logger.error(f"Failed to initialize callback handler: {e}", exc_info=True)
 
     def _initialize_model_costs(self) -> None:
+        self.cache_read_cost_per_token = None
+        self.cache_creation_cost_per_token = None
         try:
             model_info = litellm.get_model_info(
                 model=self.model_name, custom_llm_provider=self.provider
             )
             if model_info:
+                cache_read_cost = model_info.get("cache_read_input_token_cost")
+                cache_creation_cost = model_info.get("cache_creation_input_token_cost")
+                if cache_read_cost is not None:
+                    self.cache_read_cost_per_token = Decimal(str(cache_read_cost))
+                if cache_creation_cost is not None:
+                    self.cache_creation_cost_per_token = Decimal(str(cache_creation_cost))
                 input_cost = model_info.get("input_cost_per_token", 0.0)
                 output_cost = model_info.get("output_cost_per_token", 0.0)
                 self.input_cost_per_token = Decimal(str(input_cost))
@@ -183,12 +241,44 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
         self, serialized: Dict[str, Any], prompts: List[str], **kwargs
     ) -> None:
         try:
-            self._last_request_time = time.time()
+            now = time.time()
+            self._last_request_time = now
+            run_id = kwargs.get("run_id")
+            if run_id is not None:
+                metadata = kwargs.get("metadata") or {}
+                with self._lock:
+                    self._runs[run_id] = {
+                        "start": now,
+                        "first_token": None,
+                        "agent_type": metadata.get("agent_type", "default"),
+                        "model": self._run_model_name(kwargs),
+                    }
             if "name" in serialized:
                 self.model_name = serialized["name"]
         except Exception as e:
             logger.error(f"Error in on_llm_start: {e}", exc_info=True)
 
+    def _run_model_name(self, kwargs: Dict[str, Any]) -> str:
+        """Model of one call; self.model_name is shared by every session's calls."""
+        metadata = kwargs.get("metadata") or {}
+        params = kwargs.get("invocation_params") or {}
+        return (
+            metadata.get("model_name")
+            or metadata.get("ls_model_name")
+            or params.get("model")
+            or params.get("model_name")
+            or self.model_name
+        )
+
+    def on_llm_new_token(self, token: str, **kwargs) -> None:
+        run = self._runs.get(kwargs.get("run_id"))
+        if run is not None and run["first_token"] is None:
+            run["first_token"] = time.time()
+
+    def on_llm_error(self, error: BaseException, **kwargs) -> None:
+        with self._lock:
+            self._runs.pop(kwargs.get("run_id"), None)
+
     def _extract_token_usage(self, response: LLMResult) -> dict:
         """Extract token usage information from various response formats."""
         token_usage = {}
@@ -197,13 +287,19 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
         if hasattr(response, "llm_output") and response.llm_output:
             llm_output = response.llm_output
             if "token_usage" in llm_output:
-                token_usage = llm_output["token_usage"]
+                token_usage = dict(llm_output["token_usage"])
+                token_usage.update(_cache_token_usage(token_usage))
             elif "usage" in llm_output:
                 usage = llm_output["usage"]
                 if "input_tokens" in usage:
                     token_usage["prompt_tokens"] = usage["input_tokens"]
                 if "output_tokens" in usage:
                     token_usage["completion_tokens"] = usage["output_tokens"]
+                cache_usage = _cache_token_usage(usage)
+                if cache_usage and "prompt_tokens" in token_usage:
+                    # Anthropic's input_tokens excludes the cached part of the prompt
+                    token_usage["prompt_tokens"] += sum(cache_usage.values())
+                token_usage.update(cache_usage)
             if "model_name" in llm_output:
                 self.model_name = llm_output["model_name"]
 
@@ -247,6 +343,9 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
                             token_usage["completion_tokens"] = usage_metadata[
                                 "output_tokens"
                             ]
+                        token_usage.update(
+                            _cache_token_usage(usage_metadata.get("input_token_details") or {})
+                        )
                         if (
                             "total_tokens" in usage_metadata
                             and not token_usage.get("prompt_tokens")
@@ -258,11 +357,15 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
 
         return token_usage
 
-    def _update_token_counts(self, token_usage: dict, duration: float) -> None:
+    def _update_token_counts(
+        self, token_usage: dict, duration: float, timing: Optional[dict] = None
+    ) -> None:
         """Update token counts and costs with thread safety."""
         with self._lock:
             prompt_tokens = token_usage.get("prompt_tokens", 0)
             completion_tokens = token_usage.get("completion_tokens", 0)
+            cache_read_tokens = token_usage.get("cache_read_tokens", 0)
+            cache_creation_tokens = token_usage.get("cache_creation_tokens", 0)
             total_tokens = token_usage.get(
                 "total_tokens", prompt_tokens + completion_tokens
             )
@@ -276,15 +379,18 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
             self.cumulative_prompt_tokens += prompt_tokens
             self.cumulative_completion_tokens += completion_tokens
             self.cumulative_total_tokens += total_tokens
+            self.cumulative_cache_read_tokens += cache_read_tokens
+            self.cumulative_cache_creation_tokens += cache_creation_tokens
 
             self.prompt_tokens = prompt_tokens
             self.completion_tokens = completion_tokens
             self.total_tokens = total_tokens
 
-            # Calculate costs using Decimal arithmetic
-            input_cost = Decimal(prompt_tokens) * self.input_cost_per_token
-            output_cost = Decimal(completion_tokens) * self.output_cost_per_token
-            cost = input_cost + output_cost
+            cache_usage = {
+                "cache_read_tokens": cache_read_tokens,
+                "cache_creation_tokens": cache_creation_tokens,
+            }
+            cost = self._call_cost(prompt_tokens, completion_tokens, cache_usage)
             self.total_cost += cost
 
             self.successful_requests += 1
@@ -294,24 +400,95 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
             self.session_totals["tokens"] += total_tokens
             self.session_totals["input_tokens"] += prompt_tokens
             self.session_totals["output_tokens"] += completion_tokens
+            self.session_totals["cache_read_tokens"] += cache_read_tokens
+            self.session_totals["cache_creation_tokens"] += cache_creation_tokens
             self.session_totals["duration"] += duration
 
+            model_name = timing["model"] if timing is not None else self.model_name
+            call_timing = None
+            if timing is not None:
+                time_to_first_token = timing["time_to_first_token"]
+                # Output throughput, excluding the wait for the first token when streamed
+                generation_time = duration - (time_to_first_token or 0)
+                tokens_per_second = (
+                    completion_tokens / generation_time
+                    if completion_tokens and generation_time > 0
+                    else None
+                )
+                call_timing = {
+                    "agent_type": timing["agent_type"],
+                    "time_to_first_token": time_to_first_token,
+                    "tokens_per_second": tokens_per_second,
+                    "latency": get_latency_metrics().record(
+                        model_name,
+                        timing["agent_type"],
+                        duration,
+                        time_to_first_token=time_to_first_token,
+                        tokens_per_second=tokens_per_second,
+                    ),
+                }
+
             self._handle_callback_update(
-                total_tokens, prompt_tokens, completion_tokens, duration
+                total_tokens,
+                prompt_tokens,
+                completion_tokens,
+                duration,
+                call_timing,
+                cache_usage,
+                model_name,
             )
 
+    def _call_cost(
+        self,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cache_usage: Optional[Dict[str, int]] = None,
+    ) -> Decimal:
+        """Cost of one call, pricing cached prompt tokens at their own rates when known."""
+        cache_usage = cache_usage or {}
+        cache_read_tokens = cache_usage.get("cache_read_tokens", 0)
+        cache_creation_tokens = cache_usage.get("cache_creation_tokens", 0)
+        read_rate = self.cache_read_cost_per_token
+        creation_rate = self.cache_creation_cost_per_token
+
+        uncached_tokens = prompt_tokens
+        input_cost = Decimal("0")
+        if read_rate is not None:
+            uncached_tokens -= cache_read_tokens
+            input_cost += Decimal(cache_read_tokens) * read_rate
+        if creation_rate is not None:
+            uncached_tokens -= cache_creation_tokens
+            input_cost += Decimal(cache_creation_tokens) * creation_rate
+        input_cost += Decimal(max(uncached_tokens, 0)) * self.input_cost_per_token
+        output_cost = Decimal(completion_tokens) * self.output_cost_per_token
+        return input_cost + output_cost
+
     def on_llm_end(self, response: LLMResult, **kwargs) -> None:
         try:
-            if self._last_request_time is None:
+            now = time.time()
+            with self._lock:
+                run = self._runs.pop(kwargs.get("run_id"), None)
+
+            timing = None
+            if run is not None:
+                duration = now - run["start"]
+                timing = {
+                    "model": run["model"],
+                    "agent_type": run["agent_type"],
+                    "time_to_first_token": (
+                        run["first_token"] - run["start"] if run["first_token"] else None
+                    ),
+                }
+            elif self._last_request_time is None:
                 logger.debug("No request start time found, using default duration")
                 duration = 0.1  # Default duration in seconds
             else:
-                duration = time.time() - self._last_request_time
+                duration = now - self._last_request_time
                 self._last_request_time = None
 
             token_usage = self._extract_token_usage(response)
 
-            self._update_token_counts(token_usage, duration)
+            self._update_token_counts(token_usage, duration, timing)
 
         except Exception as e:
             logger.error(f"Error in on_llm_end: {e}", exc_info=True)
@@ -322,6 +499,9 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
         prompt_tokens: int,
         completion_tokens: int,
         duration: float,
+        call_timing: Optional[Dict[str, Any]] = None,
+        cache_usage: Optional[Dict[str, int]] = None,
+        model_name: Optional[str] = None,
     ) -> None:
         try:
             if not self.trajectory_repo:
@@ -331,23 +511,29 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
                 logger.warning("session_id not initialized")
                 return
 
-            input_cost = Decimal(prompt_tokens) * self.input_cost_per_token
-            output_cost = Decimal(completion_tokens) * self.output_cost_per_token
-            cost = input_cost + output_cost
+            cost = self._call_cost(prompt_tokens, completion_tokens, cache_usage)
 
             # Must Convert Decimal to float compatible JSON serialization in repository
             cost_float = float(cost)
 
+            step_data = {
+                "duration": duration,
+                "model": model_name or self.model_name,
+            }
+            if cache_usage:
+                # Prompt tokens served from, and written to, the provider's prompt cache
+                step_data.update(cache_usage)
+            if call_timing:
+                # Per-call timing plus p50/p95 for the model and agent type
+                step_data.update(call_timing)
+
             trajectory_record = self.trajectory_repo.create(
                 record_type="model_usage",
                 current_cost=cost_float,
                 input_tokens=self.prompt_tokens,
                 output_tokens=self.completion_tokens,
                 session_id=self.session_totals["session_id"],
-                step_data={
-                    "duration": duration,
-                    "model": self.model_name,
-                },
+                step_data=step_data,
             )
         except Exception as e:
             logger.error(f"Failed to store token usage data: {e}", exc_info=True)
@@ -360,6 +546,8 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
                 "tokens": 0,
                 "input_tokens": 0,
                 "output_tokens": 0,
+                "cache_read_tokens": 0,
+                "cache_creation_tokens": 0,
                 "session_id": current_session_id,
                 "duration": 0.0,
             }
@@ -374,12 +562,15 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
             self.successful_requests = 0
             self.total_cost = Decimal("0.0")
             self._last_request_time = None
+            self._runs.clear()
 
             self.session_totals = {
                 "cost": Decimal("0.0"),
                 "tokens": 0,
                 "input_tokens": 0,
                 "output_tokens": 0,
+                "cache_read_tokens": 0,
+                "cache_creation_tokens": 0,
                 "session_id": None,
                 "duration": 0.0,
             }
@@ -387,6 +578,8 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
             self.cumulative_total_tokens = 0
             self.cumulative_prompt_tokens = 0
             self.cumulative_completion_tokens = 0
+            self.cumulative_cache_read_tokens = 0
+            self.cumulative_cache_creation_tokens = 0
 
             self._initialize_model_costs()
             if self.session_repo:
@@ -408,6 +601,8 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
                     "total": self.cumulative_total_tokens,
                     "prompt": self.cumulative_prompt_tokens,
                     "completion": self.cumulative_completion_tokens,
+                    "cache_read": self.cumulative_cache_read_tokens,
+                    "cache_creation": self.cumulative_cache_creation_tokens,
                 },
             }
         except Exception as e:
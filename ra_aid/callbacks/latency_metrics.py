@@ -0,0 +1,117 @@
+"""
+Latency telemetry for LLM calls.
+
+DefaultCallbackHandler records a sample for every finished call: its total
+duration, its time to first token (only known for streamed calls), and its
+output tokens per second. Samples are grouped by model and agent type. Each
+group keeps a window of its most recent calls, summarized as p50/p95 for the
+model_usage trajectory rows and the /v1/metrics endpoint.
+
+The metrics are process-wide, so in server mode they cover every session.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+# Recent calls kept per (model, agent type) for percentiles
+LATENCY_WINDOW = 500
+
+_FIELDS = ("duration", "time_to_first_token", "tokens_per_second")
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Return the pct-th percentile of values, interpolating between ranks."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class _Group:
+    def __init__(self, window: int):
+        self.calls = 0
+        self.samples: Dict[str, Deque[float]] = {field: deque(maxlen=window) for field in _FIELDS}
+
+
+class LatencyMetrics:
+    """Thread-safe windows of recent LLM call timings, by model and agent type."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._groups: Dict[Tuple[str, str], _Group] = {}
+
+    def record(
+        self,
+        model: str,
+        agent_type: str,
+        duration: float,
+        time_to_first_token: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Record one finished call.
+
+        Returns:
+            The updated summary for the call's model and agent type
+        """
+        values = {
+            "duration": duration,
+            "time_to_first_token": time_to_first_token,
+            "tokens_per_second": tokens_per_second,
+        }
+        with self._lock:
+            group = self._groups.setdefault((model, agent_type), _Group(self.window))
+            group.calls += 1
+            for field, value in values.items():
+                if value is not None:
+                    group.samples[field].append(value)
+            return self._summarize(model, agent_type, group)
+
+    def summary(self, model: str, agent_type: str) -> Optional[Dict[str, Any]]:
+        """Return the p50/p95 summary for a model and agent type, if any calls were recorded."""
+        with self._lock:
+            group = self._groups.get((model, agent_type))
+            return self._summarize(model, agent_type, group) if group else None
+
+    def snapshot(
+        self, model: Optional[str] = None, agent_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return summaries of every group, optionally only for one model or agent type."""
+        with self._lock:
+            return [
+                self._summarize(group_model, group_agent_type, group)
+                for (group_model, group_agent_type), group in sorted(self._groups.items())
+                if (model is None or group_model == model)
+                and (agent_type is None or group_agent_type == agent_type)
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._groups.clear()
+
+    @staticmethod
+    def _summarize(model: str, agent_type: str, group: _Group) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "model": model,
+            "agent_type": agent_type,
+            "calls": group.calls,
+        }
+        for field in _FIELDS:
+            samples = list(group.samples[field])
+            for pct in (50, 95):
+                value = percentile(samples, pct)
+                summary[f"{field}_p{pct}"] = round(value, 4) if value is not None else None
+        return summary
+
+
+_latency_metrics = LatencyMetrics()
+
+
+def get_latency_metrics() -> LatencyMetrics:
+    """Return the process-wide LLM latency metrics."""
+    return _latency_metrics
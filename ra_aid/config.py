@@ -10,7 +10,19 @@ DEFAULT_MAX_TEST_CMD_RETRIES = 3
 DEFAULT_MAX_TOOL_FAILURES = 3
 FALLBACK_TOOL_MODEL_LIMIT = 5
 RETRY_FALLBACK_COUNT = 3
+DEFAULT_FALLBACK_HEDGE_COUNT = 1  # Fallback models queried at once
 DEFAULT_TEST_CMD_TIMEOUT = 60 * 5  # 5 minutes in seconds
+DEFAULT_RIPGREP_MAX_MATCHES = 500
+DEFAULT_RIPGREP_MAX_OUTPUT_BYTES = 64 * 1024
+DEFAULT_KEY_FACTS_GC_THRESHOLD = 50
+DEFAULT_KEY_SNIPPETS_GC_THRESHOLD = 35
+DEFAULT_RESEARCH_NOTES_GC_THRESHOLD = 30
+DEFAULT_MEMORY_RELEVANCE_TOP_K = 20
+DEFAULT_MAX_PARALLEL_TOOL_CALLS = 4
+DEFAULT_TOOL_RESULT_CACHE_MAX_ENTRIES = 256
+DEFAULT_LLM_CLIENT_POOL_MAX_ENTRIES = 32
+DEFAULT_ENV_INV_CACHE_TTL = 60 * 60 * 24  # 1 day in seconds
+DEFAULT_ENV_DISCOVERY_WORKERS = 16
 
 # Function to get the configuration file path
 def get_config_file_path(project_state_dir: Optional[str] = None) -> Path:
@@ -0,0 +1,249 @@
+"""
+Versioned cache of the agent memory stores.
+
+Every agent start renders the key facts, key snippets and research notes into
+its prompt, and sub-agents in a deep research tree do so over and over. The
+MemoryStoreCache keeps a snapshot of one memory table in memory so those reads
+do not re-query and re-validate every row:
+
+- The snapshot is loaded from the database on first use.
+- Repository writes apply their change to the snapshot (upsert or remove) and
+  bump its version, so it never has to be reloaded as a whole.
+- The row count is the size of the snapshot, so counting needs no query once
+  the snapshot is loaded.
+- A BM25 index over the snapshot is built on the first relevance query and
+  then updated by the same writes (see ra_aid.database.relevance_index).
+
+Repositories on the same database file share one cache per table, so a write
+through one thread's repository is seen by every other thread's. In-memory
+databases exist per connection, so their repositories each keep a private cache.
+
+Writes that bypass the repositories, such as another ra-aid process on the same
+project database, are caught through SQLite's PRAGMA data_version: before a
+read is served from the snapshot, the reading connection's data_version is
+compared with the value it had at its previous read, and the snapshot is
+reloaded when another connection has committed in between. Commits from other
+threads of this process count too, which costs a reload but never a stale read.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ra_aid.database.relevance_index import BM25Index
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_caches: Dict[Tuple[str, str], "MemoryStoreCache"] = {}
+_caches_lock = threading.Lock()
+
+
+class MemoryStoreCache:
+    """Snapshot of one memory table, kept current by repository writes."""
+
+    def __init__(self, name: str):
+        """
+        Initialize an empty, unloaded cache.
+
+        Args:
+            name: Name of the cached table, used in log messages
+        """
+        self.name = name
+        self.version = 0
+        self._entries: Optional[Dict[int, Any]] = None
+        self._index: Optional[BM25Index] = None
+        self._index_text: Optional[Callable[[Any], str]] = None
+        # Thread ID -> (connection, data_version at that thread's last read)
+        self._data_versions: Dict[int, Tuple[Any, int]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._entries is not None
+
+    def check_data_version(self, db: Any) -> None:
+        """
+        Drop the snapshot if another connection has committed to the database
+        since the calling thread's previous read.
+
+        Args:
+            db: Database the reading repository uses, or None to skip the check
+        """
+        if db is None:
+            return
+        try:
+            connection = db.connection()
+            data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        except Exception as e:
+            logger.debug(f"Could not read data_version for {self.name}: {e}")
+            return
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            previous = self._data_versions.get(thread_id)
+            if len(self._data_versions) > 64:
+                live = {thread.ident for thread in threading.enumerate()}
+                self._data_versions = {
+                    ident: seen for ident, seen in self._data_versions.items() if ident in live
+                }
+            self._data_versions[thread_id] = (connection, data_version)
+            if self._entries is None:
+                return
+            if previous is None or previous[0] is not connection or previous[1] != data_version:
+                # Another connection wrote, or this one has not been seen since the load
+                logger.debug(f"{self.name} changed outside the memory cache; reloading")
+                self.invalidate()
+
+    def entries(self, load: Callable[[], Dict[int, Any]], db: Any = None) -> Dict[int, Any]:
+        """
+        Return the cached entries, loading them on first use.
+
+        Callers get the cache's own dictionary and must not modify it; writes
+        replace it rather than changing it, so it is safe to iterate.
+
+        Args:
+            load: Reads all entries from the database, keyed by ID
+            db: Database to check for outside writes, see check_data_version()
+
+        Returns:
+            Dict[int, Any]: Entries keyed by ID, in ascending ID order
+        """
+        self.check_data_version(db)
+        with self._lock:
+            if self._entries is not None:
+                return self._entries
+            version = self.version
+        entries = dict(sorted(load().items()))
+        with self._lock:
+            if self._entries is None and self.version == version:
+                self._entries = entries
+                logger.debug(f"Loaded {len(entries)} {self.name} into the memory cache")
+            elif self._entries is not None:
+                # Another thread finished loading first
+                return self._entries
+        # A write raced the load; serve the result without caching it
+        return entries
+
+    def count(self, load_count: Callable[[], int], db: Any = None) -> int:
+        """
+        Return the number of entries, without a query once the cache is loaded.
+
+        Args:
+            load_count: Counts the entries in the database
+            db: Database to check for outside writes, see check_data_version()
+
+        Returns:
+            int: Number of entries
+        """
+        self.check_data_version(db)
+        with self._lock:
+            if self._entries is not None:
+                return len(self._entries)
+        return load_count()
+
+    def relevant(
+        self,
+        load: Callable[[], Dict[int, Any]],
+        text_of: Callable[[Any], str],
+        query: str,
+        top_k: int,
+        db: Any = None,
+    ) -> Dict[int, Any]:
+        """
+        Return the top_k entries most relevant to a query, in ascending ID order.
+
+        All entries are returned when there are no more than top_k of them or
+        top_k is 0. Like entries(), the values are the cache's own.
+
+        Args:
+            load: Reads all entries from the database, keyed by ID
+            text_of: Returns the searchable text of an entry
+            query: Free text describing the task at hand
+            top_k: Maximum number of entries to return, or 0 for all
+            db: Database to check for outside writes, see check_data_version()
+
+        Returns:
+            Dict[int, Any]: The selected entries keyed by ID
+        """
+        entries = self.entries(load, db)
+        if not top_k or len(entries) <= top_k:
+            return entries
+        with self._lock:
+            if self._entries is not entries:
+                # The load raced a write and was not cached; rank it on its own
+                index = BM25Index()
+                for entry_id, value in entries.items():
+                    index.add(entry_id, text_of(value))
+            else:
+                if self._index is None:
+                    self._index = BM25Index()
+                    self._index_text = text_of
+                    for entry_id, value in entries.items():
+                        self._index.add(entry_id, text_of(value))
+                index = self._index
+            selected = sorted(index.top_k(query, top_k))
+        logger.debug(f"Selected {len(selected)} of {len(entries)} {self.name} by relevance")
+        return {entry_id: entries[entry_id] for entry_id in selected}
+
+    def upsert(self, entry_id: int, value: Any) -> None:
+        """Record a created or updated entry."""
+        with self._lock:
+            self.version += 1
+            if self._entries is None:
+                return
+            # Copy on write: dictionaries handed out by entries() never change
+            entries = dict(self._entries)
+            in_order = entry_id in entries or not entries or entry_id > next(reversed(entries))
+            entries[entry_id] = value
+            self._entries = entries if in_order else dict(sorted(entries.items()))
+            if self._index is not None:
+                self._index.add(entry_id, self._index_text(value))
+
+    def remove(self, entry_id: int) -> None:
+        """Record a deleted entry."""
+        with self._lock:
+            self.version += 1
+            if self._entries is not None and entry_id in self._entries:
+                entries = dict(self._entries)
+                del entries[entry_id]
+                self._entries = entries
+            if self._index is not None:
+                self._index.remove(entry_id)
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read reloads it from the database."""
+        with self._lock:
+            self.version += 1
+            self._entries = None
+            self._index = None
+
+
+def get_memory_cache(db: Any, name: str) -> MemoryStoreCache:
+    """
+    Return the cache for a table, shared by all repositories on the same database file.
+
+    Args:
+        db: Database connection the repository uses
+        name: Name of the table
+
+    Returns:
+        MemoryStoreCache: The shared cache, or a new private one for in-memory databases
+    """
+    path = getattr(db, "database", None)
+    if getattr(db, "_is_in_memory", False) or not isinstance(path, str) or path in ("", ":memory:"):
+        return MemoryStoreCache(name)
+    key = (os.path.abspath(path), name)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = MemoryStoreCache(name)
+        return cache
+
+
+def clear_memory_caches() -> None:
+    """Invalidate every shared memory cache, e.g. after writing to the tables directly."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalidate()
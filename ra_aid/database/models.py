@@ -56,6 +56,10 @@ def initialize_database():
             safe=True,
         )
         logger.debug("Ensured database tables exist")
+
+        from ra_aid.database.search_index import create_search_index
+
+        create_search_index(db)
     except Exception as e:
         logger.error(f"Error creating tables: {str(e)}")
 
@@ -256,3 +260,9 @@ class Trajectory(BaseModel):
 
     class Meta:
         table_name = "trajectory"
+        # Session history is read in created_at order and usage totals filter
+        # on record_type; both queries start from the session
+        indexes = (
+            (("session", "created_at"), False),
+            (("session", "record_type"), False),
+        )
@@ -380,3 +380,34 @@ class TrajectoryModel(BaseModel):
             return None
 
         return json.dumps(step_data)
+
+
+class SearchResultModel(BaseModel):
+    """
+    Pydantic model representing one full-text search match.
+
+    Matches come from either the trajectory or the human input search index
+    and share this shape so they can be listed together.
+
+    Attributes:
+        kind: Source of the match, 'trajectory' or 'human_input'
+        id: ID of the matching trajectory or human input
+        created_at: When the matching record was created
+        session_id: Optional reference to the session the record belongs to
+        human_input_id: Optional reference to the human input of a trajectory
+        tool_name: Tool name of a matching trajectory
+        record_type: Record type of a matching trajectory
+        snippet: Excerpt of the matching text with matched terms in [brackets]
+        rank: BM25 rank of the match; lower ranks are better matches. Ranks are
+            only comparable within one record kind, and are None for matches
+            found without the full-text index
+    """
+    kind: str
+    id: int
+    created_at: Optional[datetime.datetime] = None
+    session_id: Optional[int] = None
+    human_input_id: Optional[int] = None
+    tool_name: Optional[str] = None
+    record_type: Optional[str] = None
+    snippet: str = ""
+    rank: Optional[float] = None
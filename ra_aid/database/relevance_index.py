@@ -0,0 +1,166 @@
+"""
+Lexical relevance ranking for the agent memory stores.
+
+Agent prompts used to include every key fact, key snippet and research note,
+so prompts grew with memory. With a relevance budget (the
+"memory_relevance_top_k" setting), each agent includes only the entries that
+best match its task, ranked by Okapi BM25 over an inverted index kept with the
+memory cache:
+
+- Text is split into lowercase word tokens; identifiers are also split at
+  underscores and camelCase boundaries, so "get_user_id" and "getUserId"
+  both match "user id".
+- Stores holding no more entries than the budget are included in full.
+- Entries that match no query term rank by recency, so the budget is filled
+  with the newest memories rather than left unused.
+
+No embeddings or external services are involved; ranking runs in-process and
+the index is updated entry by entry as the repositories write.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+from ra_aid.config import DEFAULT_MEMORY_RELEVANCE_TOP_K
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+STOPWORDS = frozenset(
+    """a an and are as at be by for from has have in is it its of on or that the
+    this to was were will with""".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List[str]: Terms in order of occurrence, including identifier parts
+    """
+    terms = []
+    for word in _WORD_RE.findall(text or ""):
+        lower = word.lower()
+        if lower not in STOPWORDS:
+            terms.append(lower)
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            terms.extend(part.lower() for part in parts if part.lower() not in STOPWORDS)
+    return terms
+
+
+class BM25Index:
+    """Inverted index scoring documents against a query with Okapi BM25."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._terms: Dict[int, Counter] = {}
+        self._lengths: Dict[int, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._terms
+
+    def add(self, doc_id: int, text: str) -> None:
+        """Index a document, replacing any previous version of it."""
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self._terms[doc_id] = terms
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_length += self._lengths[doc_id]
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document from the index if it is present."""
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """
+        Score the documents matching at least one query term.
+
+        Args:
+            query: Free text to match
+
+        Returns:
+            Dict[int, float]: BM25 score by document ID; unmatched documents are omitted
+        """
+        count = len(self._terms)
+        if not count:
+            return {}
+        average_length = self._total_length / count or 1.0
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def top_k(self, query: str, k: int) -> List[int]:
+        """
+        Return the IDs of the k best matching documents, best first.
+
+        Ties, including documents matching no term, go to the newest (highest) ID.
+
+        Args:
+            query: Free text to match
+            k: Number of documents to return
+
+        Returns:
+            List[int]: Document IDs
+        """
+        scores = self.scores(query)
+        ranked = sorted(self._terms, key=lambda doc_id: (scores.get(doc_id, 0.0), doc_id), reverse=True)
+        return ranked[:k]
+
+
+def resolve_top_k(top_k: Optional[int] = None) -> int:
+    """
+    Return the relevance budget to use, reading the configured one if none is given.
+
+    Args:
+        top_k: Explicit budget, or None for the "memory_relevance_top_k" setting
+
+    Returns:
+        int: Number of entries to include per store; 0 means no limit
+    """
+    if top_k is not None:
+        return max(0, top_k)
+    try:
+        from ra_aid.database.repositories.config_repository import get_config_repository
+
+        return max(0, get_config_repository().get("memory_relevance_top_k", DEFAULT_MEMORY_RELEVANCE_TOP_K) or 0)
+    except RuntimeError:
+        return DEFAULT_MEMORY_RELEVANCE_TOP_K
+
+
+def snippet_text(info: Dict[str, object]) -> str:
+    """Return the searchable text of a key snippet's information."""
+    return " ".join(
+        str(info.get(field) or "") for field in ("filepath", "description", "snippet")
+    )
+
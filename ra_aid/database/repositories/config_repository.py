@@ -27,7 +27,16 @@ class ConfigRepository:
             DEFAULT_MAX_TOOL_FAILURES,
             FALLBACK_TOOL_MODEL_LIMIT,
             RETRY_FALLBACK_COUNT,
+            DEFAULT_FALLBACK_HEDGE_COUNT,
             DEFAULT_TEST_CMD_TIMEOUT,
+            DEFAULT_RIPGREP_MAX_MATCHES,
+            DEFAULT_RIPGREP_MAX_OUTPUT_BYTES,
+            DEFAULT_KEY_FACTS_GC_THRESHOLD,
+            DEFAULT_KEY_SNIPPETS_GC_THRESHOLD,
+            DEFAULT_RESEARCH_NOTES_GC_THRESHOLD,
+            DEFAULT_MEMORY_RELEVANCE_TOP_K,
+            DEFAULT_MAX_PARALLEL_TOOL_CALLS,
+            DEFAULT_TOOL_RESULT_CACHE_MAX_ENTRIES,
             DEFAULT_SHOW_COST,
             VALID_PROVIDERS,
         )
@@ -38,7 +47,22 @@ class ConfigRepository:
             "max_tool_failures": DEFAULT_MAX_TOOL_FAILURES,
             "fallback_tool_model_limit": FALLBACK_TOOL_MODEL_LIMIT,
             "retry_fallback_count": RETRY_FALLBACK_COUNT,
+            "fallback_hedge_count": DEFAULT_FALLBACK_HEDGE_COUNT,
             "test_cmd_timeout": DEFAULT_TEST_CMD_TIMEOUT,
+            "ripgrep_streaming": True,
+            "ripgrep_max_matches": DEFAULT_RIPGREP_MAX_MATCHES,
+            "ripgrep_max_output_bytes": DEFAULT_RIPGREP_MAX_OUTPUT_BYTES,
+            "memory_gc_async": True,
+            "key_facts_gc_threshold": DEFAULT_KEY_FACTS_GC_THRESHOLD,
+            "key_snippets_gc_threshold": DEFAULT_KEY_SNIPPETS_GC_THRESHOLD,
+            "research_notes_gc_threshold": DEFAULT_RESEARCH_NOTES_GC_THRESHOLD,
+            "memory_relevance_top_k": DEFAULT_MEMORY_RELEVANCE_TOP_K,
+            "max_parallel_tool_calls": DEFAULT_MAX_PARALLEL_TOOL_CALLS,
+            "tool_result_cache": True,
+            "tool_result_cache_max_entries": DEFAULT_TOOL_RESULT_CACHE_MAX_ENTRIES,
+            "llm_client_pool": True,
+            "prompt_caching": True,
+            "shell_echo": True,
             "show_cost": DEFAULT_SHOW_COST,
             "track_cost": True,
             "valid_providers": VALID_PROVIDERS,
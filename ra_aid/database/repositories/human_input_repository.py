@@ -5,13 +5,22 @@ This module provides a repository implementation for the HumanInput model,
 following the repository pattern for data access abstraction.
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 import contextvars
 
 import peewee
 
 from ra_aid.database.models import HumanInput, Session
-from ra_aid.database.pydantic_models import HumanInputModel
+from ra_aid.database.pydantic_models import HumanInputModel, SearchResultModel
+from ra_aid.database.search_index import (
+    HUMAN_INPUT_FTS,
+    ORDER_RECENT,
+    build_match_query,
+    excerpt,
+    order_clause,
+    search_index_available,
+    search_terms,
+)
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -326,6 +335,78 @@ class HumanInputRepository:
             logger.error(f"Failed to fetch human inputs by source {source}: {str(e)}")
             raise
     
+    def search(
+        self,
+        query: str,
+        session_id: Optional[int] = None,
+        limit: int = 20,
+        order: str = ORDER_RECENT,
+    ) -> List[SearchResultModel]:
+        """
+        Full-text search over the content of human inputs.
+
+        Uses the human_input_fts index and returns the newest or the
+        best ranked matches first. On databases without the index, falls back
+        to substring matching and returns the newest matches first.
+
+        Args:
+            query: Search words; all must match, and a trailing * matches a prefix
+            session_id: Only search human inputs of this session
+            limit: Maximum number of matches to return
+            order: "recent" for newest first, or "rank" for best BM25 rank first;
+                ranking scores every match, so it is slower for common words
+
+        Returns:
+            List[SearchResultModel]: Matches with an excerpt of the matching text
+
+        Raises:
+            ValueError: If the query contains no searchable words or the order is unknown
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        match = build_match_query(query)
+        order_by = order_clause(HUMAN_INPUT_FTS, order)
+        db = HumanInput._meta.database
+        try:
+            if not search_index_available(db, HUMAN_INPUT_FTS):
+                terms = search_terms(query)
+                select = HumanInput.select()
+                for term in terms:
+                    select = select.where(HumanInput.content.contains(term))
+                if session_id is not None:
+                    select = select.where(HumanInput.session == session_id)
+                return [
+                    SearchResultModel(
+                        kind="human_input",
+                        id=human_input.id,
+                        created_at=human_input.created_at,
+                        session_id=human_input.session_id,
+                        snippet=excerpt(human_input.content, terms),
+                    )
+                    for human_input in select.order_by(HumanInput.id.desc()).limit(limit)
+                ]
+
+            sql = (
+                "SELECT h.id, h.created_at, h.session_id, "
+                f"snippet({HUMAN_INPUT_FTS}, -1, '[', ']', '...', 24), {HUMAN_INPUT_FTS}.rank "
+                f"FROM {HUMAN_INPUT_FTS} JOIN human_input AS h ON h.id = {HUMAN_INPUT_FTS}.rowid "
+                f"WHERE {HUMAN_INPUT_FTS} MATCH ?"
+            )
+            params: List[Any] = [match]
+            if session_id is not None:
+                sql += " AND h.session_id = ?"
+                params.append(session_id)
+            sql += f" ORDER BY {order_by} LIMIT ?"
+            params.append(limit)
+
+            fields = ("id", "created_at", "session_id", "snippet", "rank")
+            return [
+                SearchResultModel(kind="human_input", **dict(zip(fields, row)))
+                for row in db.execute_sql(sql, params).fetchall()
+            ]
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to search human inputs for {query!r}: {str(e)}")
+            raise
+
     def garbage_collect(self) -> int:
         """
         Remove old human input records when the count exceeds 100.
@@ -11,8 +11,10 @@ from contextlib import contextmanager
 
 import peewee
 
-from ra_aid.database.models import KeyFact
+from ra_aid.database.memory_cache import get_memory_cache
+from ra_aid.database.models import HumanInput, KeyFact
 from ra_aid.database.pydantic_models import KeyFactModel
+from ra_aid.database.relevance_index import resolve_top_k
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -120,6 +122,13 @@ class KeyFactRepository:
         if db is None:
             raise ValueError("Database connection is required for KeyFactRepository")
         self.db = db
+        # ID -> content snapshot, kept current by this repository's writes
+        self._cache = get_memory_cache(db, "key_facts")
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever a key fact is created, updated or deleted."""
+        return self._cache.version
     
     def _to_model(self, fact: Optional[KeyFact]) -> Optional[KeyFactModel]:
         """
@@ -152,6 +161,7 @@ class KeyFactRepository:
         """
         try:
             fact = KeyFact.create(content=content, human_input_id=human_input_id)
+            self._cache.upsert(fact.id, fact.content)
             logger.debug(f"Created key fact ID {fact.id}: {content}")
             return self._to_model(fact)
         except peewee.DatabaseError as e:
@@ -202,6 +212,7 @@ class KeyFactRepository:
             # Update the fact
             fact.content = content
             fact.save()
+            self._cache.upsert(fact_id, content)
             logger.debug(f"Updated key fact ID {fact_id}: {content}")
             return self._to_model(fact)
         except peewee.DatabaseError as e:
@@ -230,6 +241,7 @@ class KeyFactRepository:
             
             # Delete the fact
             fact.delete_instance()
+            self._cache.remove(fact_id)
             logger.debug(f"Deleted key fact ID {fact_id}")
             return True
         except peewee.DatabaseError as e:
@@ -253,11 +265,58 @@ class KeyFactRepository:
             logger.error(f"Failed to fetch all key facts: {str(e)}")
             raise
     
+    def count(self) -> int:
+        """
+        Count the key facts in the database.
+
+        Served from the memory cache once it is loaded, otherwise with a COUNT query.
+
+        Returns:
+            int: Number of key facts
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return self._cache.count(lambda: KeyFact.select().count(), self.db)
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count key facts: {str(e)}")
+            raise
+
+    def count_by_session(self, session_id: int) -> int:
+        """
+        Count the key facts recorded in a session.
+
+        Key facts belong to a session either directly or through the
+        human input they were recorded under.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            int: Number of key facts in the session
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return (
+                KeyFact.select()
+                .join(HumanInput, peewee.JOIN.LEFT_OUTER)
+                .where((KeyFact.session == session_id) | (HumanInput.session == session_id))
+                .count()
+            )
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count key facts for session {session_id}: {str(e)}")
+            raise
+
     def get_facts_dict(self) -> Dict[int, str]:
         """
         Retrieve all key facts as a dictionary mapping IDs to content.
         
         This method is useful for compatibility with the existing memory format.
+        Facts are read from the database once and then served from the memory
+        cache, which this repository's writes keep current.
         
         Returns:
             Dict[int, str]: Dictionary with fact IDs as keys and content as values
@@ -266,8 +325,38 @@ class KeyFactRepository:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            facts = self.get_all()
-            return {fact.id: fact.content for fact in facts}
+            return dict(self._cache.entries(self._load_facts_dict, self.db))
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch key facts as dictionary: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def get_relevant_facts_dict(self, query: str, top_k: Optional[int] = None) -> Dict[int, str]:
+        """
+        Retrieve the key facts most relevant to a task, for inclusion in a prompt.
+
+        Facts are ranked against the query with BM25; all facts are returned when
+        there are no more than top_k of them.
+
+        Args:
+            query: Text describing the task, such as the agent's base task
+            top_k: Maximum number of facts, or None for the "memory_relevance_top_k" setting
+
+        Returns:
+            Dict[int, str]: Dictionary with fact IDs as keys and content as values, in ID order
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return dict(
+                self._cache.relevant(
+                    self._load_facts_dict, str, query, resolve_top_k(top_k), self.db
+                )
+            )
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to fetch relevant key facts: {str(e)}")
+            raise
+
+    def _load_facts_dict(self) -> Dict[int, str]:
+        query = KeyFact.select(KeyFact.id, KeyFact.content).order_by(KeyFact.id).tuples()
+        return {fact_id: content for fact_id, content in query}
@@ -10,8 +10,10 @@ import contextvars
 
 import peewee
 
-from ra_aid.database.models import KeySnippet
+from ra_aid.database.memory_cache import get_memory_cache
+from ra_aid.database.models import HumanInput, KeySnippet
 from ra_aid.database.pydantic_models import KeySnippetModel
+from ra_aid.database.relevance_index import resolve_top_k, snippet_text
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -129,6 +131,22 @@ class KeySnippetRepository:
         if db is None:
             raise ValueError("Database connection is required for KeySnippetRepository")
         self.db = db
+        # ID -> snippet information snapshot, kept current by this repository's writes
+        self._cache = get_memory_cache(db, "key_snippets")
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever a key snippet is created, updated or deleted."""
+        return self._cache.version
+
+    @staticmethod
+    def _snippet_info(key_snippet: KeySnippet) -> Dict[str, Any]:
+        return {
+            "filepath": key_snippet.filepath,
+            "line_number": key_snippet.line_number,
+            "snippet": key_snippet.snippet,
+            "description": key_snippet.description,
+        }
     
     def _to_model(self, snippet: Optional[KeySnippet]) -> Optional[KeySnippetModel]:
         """
@@ -173,6 +191,7 @@ class KeySnippetRepository:
                 description=description,
                 human_input_id=human_input_id
             )
+            self._cache.upsert(key_snippet.id, self._snippet_info(key_snippet))
             logger.debug(f"Created key snippet ID {key_snippet.id}: {filepath}:{line_number}")
             return self._to_model(key_snippet)
         except peewee.DatabaseError as e:
@@ -236,6 +255,7 @@ class KeySnippetRepository:
             key_snippet.snippet = snippet
             key_snippet.description = description
             key_snippet.save()
+            self._cache.upsert(snippet_id, self._snippet_info(key_snippet))
             logger.debug(f"Updated key snippet ID {snippet_id}: {filepath}:{line_number}")
             return self._to_model(key_snippet)
         except peewee.DatabaseError as e:
@@ -264,6 +284,7 @@ class KeySnippetRepository:
             
             # Delete the snippet
             key_snippet.delete_instance()
+            self._cache.remove(snippet_id)
             logger.debug(f"Deleted key snippet ID {snippet_id}")
             return True
         except peewee.DatabaseError as e:
@@ -287,11 +308,58 @@ class KeySnippetRepository:
             logger.error(f"Failed to fetch all key snippets: {str(e)}")
             raise
     
+    def count(self) -> int:
+        """
+        Count the key snippets in the database.
+
+        Served from the memory cache once it is loaded, otherwise with a COUNT query.
+
+        Returns:
+            int: Number of key snippets
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return self._cache.count(lambda: KeySnippet.select().count(), self.db)
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count key snippets: {str(e)}")
+            raise
+
+    def count_by_session(self, session_id: int) -> int:
+        """
+        Count the key snippets recorded in a session.
+
+        Key snippets belong to a session either directly or through the
+        human input they were recorded under.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            int: Number of key snippets in the session
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return (
+                KeySnippet.select()
+                .join(HumanInput, peewee.JOIN.LEFT_OUTER)
+                .where((KeySnippet.session == session_id) | (HumanInput.session == session_id))
+                .count()
+            )
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count key snippets for session {session_id}: {str(e)}")
+            raise
+
     def get_snippets_dict(self) -> Dict[int, Dict[str, Any]]:
         """
         Retrieve all key snippets as a dictionary mapping IDs to snippet information.
         
         This method is useful for compatibility with the existing memory format.
+        Snippets are read from the database once and then served from the memory
+        cache, which this repository's writes keep current.
         
         Returns:
             Dict[int, Dict[str, Any]]: Dictionary with snippet IDs as keys and 
@@ -301,16 +369,43 @@ class KeySnippetRepository:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            snippets = self.get_all()
-            return {
-                snippet.id: {
-                    "filepath": snippet.filepath,
-                    "line_number": snippet.line_number,
-                    "snippet": snippet.snippet,
-                    "description": snippet.description
-                } 
-                for snippet in snippets
-            }
+            entries = self._cache.entries(self._load_snippets_dict, self.db)
+            # Copy the inner dictionaries so callers cannot change the cache
+            return {snippet_id: dict(info) for snippet_id, info in entries.items()}
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch key snippets as dictionary: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def get_relevant_snippets_dict(
+        self, query: str, top_k: Optional[int] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Retrieve the key snippets most relevant to a task, for inclusion in a prompt.
+
+        Snippets are ranked against the query with BM25 over their file path,
+        description and code; all snippets are returned when there are no more
+        than top_k of them.
+
+        Args:
+            query: Text describing the task, such as the agent's base task
+            top_k: Maximum number of snippets, or None for the "memory_relevance_top_k" setting
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Dictionary with snippet IDs as keys and
+                                       snippet information as values, in ID order
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            entries = self._cache.relevant(
+                self._load_snippets_dict, snippet_text, query, resolve_top_k(top_k), self.db
+            )
+            return {snippet_id: dict(info) for snippet_id, info in entries.items()}
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to fetch relevant key snippets: {str(e)}")
+            raise
+
+    def _load_snippets_dict(self) -> Dict[int, Dict[str, Any]]:
+        query = KeySnippet.select().order_by(KeySnippet.id)
+        return {key_snippet.id: self._snippet_info(key_snippet) for key_snippet in query}
@@ -11,8 +11,10 @@ from contextlib import contextmanager
 
 import peewee
 
-from ra_aid.database.models import ResearchNote
+from ra_aid.database.memory_cache import get_memory_cache
+from ra_aid.database.models import HumanInput, ResearchNote
 from ra_aid.database.pydantic_models import ResearchNoteModel
+from ra_aid.database.relevance_index import resolve_top_k
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -120,6 +122,13 @@ class ResearchNoteRepository:
         if db is None:
             raise ValueError("Database connection is required for ResearchNoteRepository")
         self.db = db
+        # ID -> content snapshot, kept current by this repository's writes
+        self._cache = get_memory_cache(db, "research_notes")
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever a research note is created, updated or deleted."""
+        return self._cache.version
     
     def _to_model(self, note: Optional[ResearchNote]) -> Optional[ResearchNoteModel]:
         """
@@ -152,6 +161,7 @@ class ResearchNoteRepository:
         """
         try:
             note = ResearchNote.create(content=content, human_input_id=human_input_id)
+            self._cache.upsert(note.id, note.content)
             logger.debug(f"Created research note ID {note.id}: {content[:50]}...")
             return self._to_model(note)
         except peewee.DatabaseError as e:
@@ -202,6 +212,7 @@ class ResearchNoteRepository:
             # Update the note
             note.content = content
             note.save()
+            self._cache.upsert(note_id, content)
             logger.debug(f"Updated research note ID {note_id}: {content[:50]}...")
             return self._to_model(note)
         except peewee.DatabaseError as e:
@@ -230,6 +241,7 @@ class ResearchNoteRepository:
             
             # Delete the note
             note.delete_instance()
+            self._cache.remove(note_id)
             logger.debug(f"Deleted research note ID {note_id}")
             return True
         except peewee.DatabaseError as e:
@@ -253,11 +265,58 @@ class ResearchNoteRepository:
             logger.error(f"Failed to fetch all research notes: {str(e)}")
             raise
     
+    def count(self) -> int:
+        """
+        Count the research notes in the database.
+
+        Served from the memory cache once it is loaded, otherwise with a COUNT query.
+
+        Returns:
+            int: Number of research notes
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return self._cache.count(lambda: ResearchNote.select().count(), self.db)
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count research notes: {str(e)}")
+            raise
+
+    def count_by_session(self, session_id: int) -> int:
+        """
+        Count the research notes recorded in a session.
+
+        Research notes belong to a session either directly or through the
+        human input they were recorded under.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            int: Number of research notes in the session
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return (
+                ResearchNote.select()
+                .join(HumanInput, peewee.JOIN.LEFT_OUTER)
+                .where((ResearchNote.session == session_id) | (HumanInput.session == session_id))
+                .count()
+            )
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count research notes for session {session_id}: {str(e)}")
+            raise
+
     def get_notes_dict(self) -> Dict[int, str]:
         """
         Retrieve all research notes as a dictionary mapping IDs to content.
         
         This method is useful for compatibility with the existing memory format.
+        Notes are read from the database once and then served from the memory
+        cache, which this repository's writes keep current.
         
         Returns:
             Dict[int, str]: Dictionary with note IDs as keys and content as values
@@ -266,8 +325,38 @@ class ResearchNoteRepository:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            notes = self.get_all()
-            return {note.id: note.content for note in notes}
+            return dict(self._cache.entries(self._load_notes_dict, self.db))
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch research notes as dictionary: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def get_relevant_notes_dict(self, query: str, top_k: Optional[int] = None) -> Dict[int, str]:
+        """
+        Retrieve the research notes most relevant to a task, for inclusion in a prompt.
+
+        Notes are ranked against the query with BM25; all notes are returned when
+        there are no more than top_k of them.
+
+        Args:
+            query: Text describing the task, such as the agent's base task
+            top_k: Maximum number of notes, or None for the "memory_relevance_top_k" setting
+
+        Returns:
+            Dict[int, str]: Dictionary with note IDs as keys and content as values, in ID order
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return dict(
+                self._cache.relevant(
+                    self._load_notes_dict, str, query, resolve_top_k(top_k), self.db
+                )
+            )
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to fetch relevant research notes: {str(e)}")
+            raise
+
+    def _load_notes_dict(self) -> Dict[int, str]:
+        query = ResearchNote.select(ResearchNote.id, ResearchNote.content).order_by(ResearchNote.id).tuples()
+        return {note_id: content for note_id, content in query}
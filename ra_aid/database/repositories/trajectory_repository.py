@@ -6,8 +6,9 @@ following the repository pattern for data access abstraction. It handles
 operations for storing and retrieving agent action trajectories.
 """
 
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union, Callable
 import contextvars
+import datetime
 import json
 import logging
 import sys
@@ -15,12 +16,25 @@ import sys
 import peewee
 
 from ra_aid.database.models import Trajectory, HumanInput
-from ra_aid.database.pydantic_models import TrajectoryModel
+from ra_aid.database.pydantic_models import SearchResultModel, TrajectoryModel
+from ra_aid.database.search_index import (
+    TRAJECTORY_FTS,
+    ORDER_RECENT,
+    build_match_query,
+    excerpt,
+    order_clause,
+    search_index_available,
+    search_terms,
+)
 from ra_aid.database.repositories.session_repository import get_session_repository
+from ra_aid.database.trajectory_writer import TrajectoryWriter, flush_all_writers
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Position of a trajectory in session history order: (created_at, id)
+TrajectoryCursor = Tuple[datetime.datetime, int]
+
 # Create contextvar to hold the TrajectoryRepository instance
 trajectory_repo_var = contextvars.ContextVar("trajectory_repo", default=None)
 
@@ -43,14 +57,17 @@ class TrajectoryRepositoryManager:
                 all_trajectories = repo.get_all()
     """
 
-    def __init__(self, db):
+    def __init__(self, db, async_writes: Optional[bool] = None):
         """
         Initialize the TrajectoryRepositoryManager.
 
         Args:
             db: Database connection to use (required)
+            async_writes: Whether to write records from a background thread
+                (see TrajectoryRepository); None picks based on the database
         """
         self.db = db
+        self.async_writes = async_writes
 
     def __enter__(self) -> "TrajectoryRepository":
         """
@@ -59,7 +76,8 @@ class TrajectoryRepositoryManager:
         Returns:
             TrajectoryRepository: The initialized repository
         """
-        repo = TrajectoryRepository(self.db)
+        repo = TrajectoryRepository(self.db, async_writes=self.async_writes)
+        self.repo = repo
         trajectory_repo_var.set(repo)
         return repo
 
@@ -77,6 +95,9 @@ class TrajectoryRepositoryManager:
             exc_val: The exception value if an exception was raised
             exc_tb: The traceback if an exception was raised
         """
+        # Write out everything queued before the database goes away
+        self.repo.close()
+
         # Reset the contextvar to None
         trajectory_repo_var.set(None)
 
@@ -115,6 +136,12 @@ class TrajectoryRepository:
     It also supports registering hooks that are executed after a new trajectory record
     is successfully created.
 
+    With asynchronous writes enabled, create() queues the record for a background
+    TrajectoryWriter that inserts records in batched transactions and runs the hooks
+    once they are stored, so callers do not wait for SQLite commits. Reads flush
+    pending records first, and the records are flushed synchronously when the
+    repository is closed.
+
     Example:
         with DatabaseManager() as db:
             with TrajectoryRepositoryManager(db) as repo:
@@ -127,17 +154,50 @@ class TrajectoryRepository:
 
     # _create_hooks: List[Callable[[TrajectoryModel], None]] = [] # Removed class variable
 
-    def __init__(self, db):
+    def __init__(self, db, async_writes: Optional[bool] = None):
         """
         Initialize the repository with a database connection.
 
         Args:
             db: Database connection to use (required)
+            async_writes: Whether create() hands records to a background writer.
+                Defaults to True for file databases; in-memory databases are
+                per-connection and always written synchronously.
         """
         if db is None:
             raise ValueError("Database connection is required for TrajectoryRepository")
         self.db = db
         self._create_hooks: List[Callable[[TrajectoryModel], None]] = [] # Initialized instance variable
+        in_memory = getattr(db, "_is_in_memory", False) or getattr(db, "database", None) == ":memory:"
+        if async_writes is None:
+            async_writes = not in_memory
+        self._writer: Optional[TrajectoryWriter] = (
+            TrajectoryWriter(hooks=self._create_hooks) if async_writes and not in_memory else None
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued trajectory records have been written.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if everything was written, False on timeout
+        """
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Write out all queued records and stop the background writer."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _flush_pending(self) -> None:
+        # Queued records may belong to any open repository (e.g. agent threads)
+        flush_all_writers()
 
     def register_create_hook(self, hook: Callable[[TrajectoryModel], None]) -> None: # Changed cls to self
         """
@@ -192,6 +252,9 @@ class TrajectoryRepository:
         """
         Create a new trajectory record in the database and execute registered hooks.
 
+        With asynchronous writes the record is queued and the returned model has no
+        id yet; hooks run with the stored record once it has been written.
+
         Args:
             tool_name: Optional name of the tool that was executed
             tool_parameters: Optional parameters passed to the tool (will be JSON encoded)
@@ -224,6 +287,52 @@ class TrajectoryRepository:
             )
             step_data_json = json.dumps(step_data) if step_data is not None else None
 
+            new_session_id = session_id
+            if not session_id:
+                session_repo = get_session_repository()
+                session_record = session_repo.get_current_session_record()
+                new_session_id = session_record.get_id()
+
+            if self._writer is not None:
+                now = datetime.datetime.now()
+                record = dict(
+                    created_at=now,
+                    updated_at=now,
+                    human_input=human_input_id,
+                    session=new_session_id,
+                    tool_name=tool_name or "",
+                    tool_parameters=tool_parameters_json,
+                    tool_result=tool_result_json,
+                    step_data=step_data_json,
+                    record_type=record_type,
+                    current_cost=current_cost,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    is_error=is_error,
+                    error_message=error_message,
+                    error_type=error_type,
+                    error_details=error_details,
+                )
+                self._writer.submit(record)
+                return TrajectoryModel(
+                    created_at=now,
+                    updated_at=now,
+                    human_input_id=human_input_id,
+                    session_id=new_session_id,
+                    tool_name=tool_name or "",
+                    tool_parameters=tool_parameters,
+                    tool_result=tool_result,
+                    step_data=step_data,
+                    record_type=record_type,
+                    current_cost=current_cost,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    is_error=is_error,
+                    error_message=error_message,
+                    error_type=error_type,
+                    error_details=error_details,
+                )
+
             # Create human input reference if provided
             human_input = None
             if human_input_id is not None:
@@ -232,13 +341,6 @@ class TrajectoryRepository:
                 except peewee.DoesNotExist:
                     logger.warning(f"Human input with ID {human_input_id} not found")
 
-            new_session_id = session_id
-            if not session_id:
-                session_repo = get_session_repository()
-                session_record = session_repo.get_current_session_record()
-                new_session_id = session_record.get_id()
-                
-
             trajectory = Trajectory.create(
                 human_input=human_input,
                 session=new_session_id,
@@ -298,6 +400,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self._flush_pending()
         try:
             trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
             return self._to_model(trajectory)
@@ -341,6 +444,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error updating the record
         """
+        self._flush_pending()
         try:
             # First check if the trajectory exists
             peewee_trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
@@ -406,6 +510,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error deleting the record
         """
+        self._flush_pending()
         try:
             # First check if the trajectory exists
             trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
@@ -433,6 +538,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self._flush_pending()
         try:
             trajectories = Trajectory.select().order_by(Trajectory.id)
             return {                trajectory.id: self._to_model(trajectory) for trajectory in trajectories            }
@@ -455,6 +561,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self._flush_pending()
         try:
             trajectories = list(
                 Trajectory.select()
@@ -468,6 +575,106 @@ class TrajectoryRepository:
             )
             raise
 
+    def search(
+        self,
+        query: str,
+        session_id: Optional[int] = None,
+        record_type: Optional[str] = None,
+        limit: int = 20,
+        order: str = ORDER_RECENT,
+    ) -> List[SearchResultModel]:
+        """
+        Full-text search over trajectory tool names, parameters, results and errors.
+
+        Uses the trajectory_fts index and returns the newest or the
+        best ranked matches first. On databases without the index, falls back
+        to substring matching and returns the newest matches first.
+
+        Args:
+            query: Search words; all must match, and a trailing * matches a prefix
+            session_id: Only search trajectories of this session
+            record_type: Only search trajectories of this record type
+            limit: Maximum number of matches to return
+            order: "recent" for newest first, or "rank" for best BM25 rank first;
+                ranking scores every match, so it is slower for common words
+
+        Returns:
+            List[SearchResultModel]: Matches with an excerpt of the matching text
+
+        Raises:
+            ValueError: If the query contains no searchable words or the order is unknown
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        match = build_match_query(query)
+        order_by = order_clause(TRAJECTORY_FTS, order)
+        self._flush_pending()
+        db = Trajectory._meta.database
+        try:
+            if not search_index_available(db, TRAJECTORY_FTS):
+                return self._search_without_index(query, session_id, record_type, limit)
+
+            sql = (
+                "SELECT t.id, t.created_at, t.session_id, t.human_input_id, t.tool_name, t.record_type, "
+                f"snippet({TRAJECTORY_FTS}, -1, '[', ']', '...', 24), {TRAJECTORY_FTS}.rank "
+                f"FROM {TRAJECTORY_FTS} JOIN trajectory AS t ON t.id = {TRAJECTORY_FTS}.rowid "
+                f"WHERE {TRAJECTORY_FTS} MATCH ?"
+            )
+            params: List[Any] = [match]
+            if session_id is not None:
+                sql += " AND t.session_id = ?"
+                params.append(session_id)
+            if record_type is not None:
+                sql += " AND t.record_type = ?"
+                params.append(record_type)
+            sql += f" ORDER BY {order_by} LIMIT ?"
+            params.append(limit)
+
+            fields = ("id", "created_at", "session_id", "human_input_id", "tool_name", "record_type", "snippet", "rank")
+            return [
+                SearchResultModel(kind="trajectory", **dict(zip(fields, row)))
+                for row in db.execute_sql(sql, params).fetchall()
+            ]
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to search trajectories for {query!r}: {str(e)}")
+            raise
+
+    def _search_without_index(
+        self,
+        query: str,
+        session_id: Optional[int],
+        record_type: Optional[str],
+        limit: int,
+    ) -> List[SearchResultModel]:
+        terms = search_terms(query)
+        columns = (Trajectory.tool_name, Trajectory.tool_parameters, Trajectory.tool_result, Trajectory.error_message)
+        select = Trajectory.select()
+        for term in terms:
+            condition = columns[0].contains(term)
+            for column in columns[1:]:
+                condition |= column.contains(term)
+            select = select.where(condition)
+        if session_id is not None:
+            select = select.where(Trajectory.session == session_id)
+        if record_type is not None:
+            select = select.where(Trajectory.record_type == record_type)
+
+        results = []
+        for trajectory in select.order_by(Trajectory.id.desc()).limit(limit):
+            text = " ".join(getattr(trajectory, column.name) or "" for column in columns)
+            results.append(
+                SearchResultModel(
+                    kind="trajectory",
+                    id=trajectory.id,
+                    created_at=trajectory.created_at,
+                    session_id=trajectory.session_id,
+                    human_input_id=trajectory.human_input_id,
+                    tool_name=trajectory.tool_name,
+                    record_type=trajectory.record_type,
+                    snippet=excerpt(text, terms),
+                )
+            )
+        return results
+
     def get_parsed_trajectory(self, trajectory_id: int) -> Optional[TrajectoryModel]:
         """
         Get a trajectory record with JSON fields parsed into dictionaries.
@@ -493,6 +700,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self._flush_pending()
         try:
             # Use SQL aggregation instead of Python computation
             query = (
@@ -548,11 +756,12 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self._flush_pending()
         try:
             trajectories = list(
                 Trajectory.select()
                 .where(Trajectory.session == session_id)
-                .order_by(Trajectory.created_at)
+                .order_by(Trajectory.created_at, Trajectory.id)
             )
             return [self._to_model(trajectory) for trajectory in trajectories]
         except peewee.DatabaseError as e:
@@ -560,3 +769,86 @@ class TrajectoryRepository:
                 f"Failed to fetch trajectories for session {session_id}: {str(e)}"
             )
             raise
+
+    def get_trajectories_by_session_page(
+        self,
+        session_id: int,
+        limit: int = 100,
+        after: Optional[TrajectoryCursor] = None,
+    ) -> Tuple[List[TrajectoryModel], Optional[TrajectoryCursor]]:
+        """
+        Retrieve one page of a session's trajectory records using keyset pagination.
+
+        Records are ordered by (created_at, id), the same order as
+        get_trajectories_by_session. Each page starts right after the cursor
+        instead of skipping rows with OFFSET, so fetching a late page costs the
+        same as fetching the first one.
+
+        Args:
+            session_id: The ID of the session to get trajectories for
+            limit: Maximum number of records to return
+            after: Cursor returned with the previous page, or None for the first page
+
+        Returns:
+            Tuple[List[TrajectoryModel], Optional[TrajectoryCursor]]: The records and
+                the cursor for the next page, which is None when this is the last page
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        self._flush_pending()
+        try:
+            query = Trajectory.select().where(Trajectory.session == session_id)
+            if after is not None:
+                created_at, last_id = after
+                # The >= bound lets the (session_id, created_at) index seek to the cursor
+                query = query.where(
+                    (Trajectory.created_at >= created_at)
+                    & (
+                        (Trajectory.created_at > created_at)
+                        | (Trajectory.id > last_id)
+                    )
+                )
+            # Fetch one extra row to learn whether another page follows
+            trajectories = list(
+                query.order_by(Trajectory.created_at, Trajectory.id).limit(limit + 1)
+            )
+            next_cursor = None
+            if len(trajectories) > limit:
+                trajectories = trajectories[:limit]
+                last = trajectories[-1]
+                next_cursor = (last.created_at, last.id)
+            return [self._to_model(trajectory) for trajectory in trajectories], next_cursor
+        except peewee.DatabaseError as e:
+            logger.error(
+                f"Failed to fetch trajectory page for session {session_id}: {str(e)}"
+            )
+            raise
+
+    def iter_trajectories_by_session(
+        self, session_id: int, batch_size: int = 500
+    ) -> Iterator[TrajectoryModel]:
+        """
+        Stream a session's trajectory records without loading them all at once.
+
+        Records are read in keyset-paginated batches, so memory use is bounded
+        by batch_size no matter how long the session history is.
+
+        Args:
+            session_id: The ID of the session to get trajectories for
+            batch_size: Number of records read from the database per query
+
+        Yields:
+            TrajectoryModel: The session's records in created_at order
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        cursor: Optional[TrajectoryCursor] = None
+        while True:
+            page, cursor = self.get_trajectories_by_session_page(
+                session_id, limit=batch_size, after=cursor
+            )
+            yield from page
+            if cursor is None:
+                return
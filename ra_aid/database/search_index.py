@@ -0,0 +1,168 @@
+"""
+Full-text search index over trajectories and human inputs.
+
+Two SQLite FTS5 tables index past sessions without copying their text:
+
+- trajectory_fts covers each trajectory's tool name, tool parameters, tool
+  result and error message.
+- human_input_fts covers the content of each human input.
+
+Both are external-content tables (content="trajectory" / "human_input"), so
+the text stays in the source tables and the index only holds tokens. Triggers
+keep them in step with every insert, update and delete, including the batched
+inserts of the trajectory writer.
+
+Migration 017 creates the index on existing databases and indexes their rows.
+create_search_index also runs when the database is initialized, so new and
+in-memory databases get it too. SQLite builds without FTS5 simply have no
+index, and the repositories fall back to substring matching.
+"""
+
+import re
+from typing import Any, List
+
+import peewee
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TRAJECTORY_FTS = "trajectory_fts"
+HUMAN_INPUT_FTS = "human_input_fts"
+
+# Result orders: newest first, which stops after the first `limit` matches,
+# or best BM25 rank first, which has to score every match
+ORDER_RECENT = "recent"
+ORDER_RANK = "rank"
+SEARCH_ORDERS = (ORDER_RECENT, ORDER_RANK)
+
+# Indexed columns of the source tables
+TRAJECTORY_FTS_COLUMNS = ("tool_name", "tool_parameters", "tool_result", "error_message")
+HUMAN_INPUT_FTS_COLUMNS = ("content",)
+
+
+def _fts_sql(fts: str, table: str, columns: tuple) -> List[str]:
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+SEARCH_INDEX_SQL = _fts_sql(TRAJECTORY_FTS, "trajectory", TRAJECTORY_FTS_COLUMNS) + _fts_sql(
+    HUMAN_INPUT_FTS, "human_input", HUMAN_INPUT_FTS_COLUMNS
+)
+
+
+def create_search_index(db: Any, rebuild: bool = False) -> bool:
+    """
+    Create the search tables and triggers if they do not exist.
+
+    Args:
+        db: Database connection
+        rebuild: Whether to re-index all existing rows afterwards
+
+    Returns:
+        bool: True if the index exists, False if this SQLite build lacks FTS5
+    """
+    try:
+        with db.atomic():
+            for statement in SEARCH_INDEX_SQL:
+                db.execute_sql(statement)
+            if rebuild:
+                for fts in (TRAJECTORY_FTS, HUMAN_INPUT_FTS):
+                    db.execute_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        return True
+    except peewee.OperationalError as e:
+        logger.debug(f"Full-text search index unavailable: {str(e)}")
+        return False
+
+
+def search_index_available(db: Any, fts: str) -> bool:
+    """Return whether the given FTS table exists in the database."""
+    cursor = db.execute_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    )
+    return cursor.fetchone() is not None
+
+
+_TERM_RE = re.compile(r'[^\s"]+')
+
+
+def build_match_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word must match; a trailing * makes a word a prefix search. Words are
+    quoted, so FTS5 operators and punctuation in the input are searched for
+    literally instead of being parsed.
+
+    Args:
+        text: Search text as typed by the user
+
+    Returns:
+        str: MATCH expression
+
+    Raises:
+        ValueError: If the text contains no searchable words
+    """
+    phrases = []
+    for term in _TERM_RE.findall(text or ""):
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            phrases.append(f'"{term}"' + ("*" if prefix else ""))
+    if not phrases:
+        raise ValueError("Search query must contain at least one word")
+    return " ".join(phrases)
+
+
+def order_clause(fts: str, order: str) -> str:
+    """
+    Return the ORDER BY expression for a search order.
+
+    Raises:
+        ValueError: If the order is not one of SEARCH_ORDERS
+    """
+    if order == ORDER_RECENT:
+        return f"{fts}.rowid DESC"
+    if order == ORDER_RANK:
+        return f"{fts}.rank"
+    raise ValueError(f"Unknown search order {order!r}; expected one of {', '.join(SEARCH_ORDERS)}")
+
+
+def search_terms(text: str) -> List[str]:
+    """Split free text into the words matched by the substring fallback."""
+    return [term.rstrip("*") for term in _TERM_RE.findall(text or "") if term.rstrip("*")]
+
+
+def excerpt(text: str, terms: List[str], width: int = 160) -> str:
+    """
+    Cut an excerpt of text around the first of the terms it contains.
+
+    Used for substring-fallback matches, which have no FTS5 snippet().
+
+    Args:
+        text: Matching text
+        terms: Search words
+        width: Maximum excerpt length in characters
+
+    Returns:
+        str: The excerpt, with ellipses where the text was cut
+    """
+    lower = text.lower()
+    positions = [lower.find(term.lower()) for term in terms]
+    position = min((p for p in positions if p >= 0), default=0)
+    start = max(0, position - width // 4)
+    end = start + width
+    return ("..." if start else "") + text[start:end] + ("..." if end < len(text) else "")
@@ -0,0 +1,255 @@
+"""
+Background writer for trajectory records.
+
+Tools record a trajectory for nearly every call. Writing each record in its own
+SQLite transaction makes every tool call wait for a commit, so the
+TrajectoryWriter queues records and inserts them from a background thread in
+batched transactions, then runs the repository's create hooks for the stored
+records.
+
+Durability guarantees:
+- flush() blocks until every record queued before the call is committed; the
+  repository calls it before reads and when its context manager exits.
+- The queue is bounded: once max_pending records are waiting, callers block
+  until the writer catches up instead of records being dropped.
+- A batch that fails to commit is retried one record at a time, so a single bad
+  record cannot take the rest of its batch with it.
+- Writers still open at interpreter exit are flushed by an atexit handler.
+"""
+
+import atexit
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import peewee
+
+from ra_aid.database.models import HumanInput, Trajectory
+from ra_aid.database.pydantic_models import TrajectoryModel
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Maximum number of records inserted per transaction.
+DEFAULT_BATCH_SIZE = 200
+# Seconds a record may wait before the writer commits a partial batch.
+DEFAULT_FLUSH_INTERVAL = 0.1
+# Callers block once this many records are waiting to be written.
+DEFAULT_MAX_PENDING = 10_000
+
+_writers: "weakref.WeakSet[TrajectoryWriter]" = weakref.WeakSet()
+_writers_lock = threading.Lock()
+
+
+class TrajectoryWriter:
+    """Queue trajectory records and insert them in batches from a background thread."""
+
+    def __init__(
+        self,
+        hooks: Optional[List[Callable[[TrajectoryModel], None]]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        """
+        Initialize the writer and start its thread.
+
+        Args:
+            hooks: Callables run with each stored record, in registration order.
+                The list is shared with the caller, so hooks registered later apply.
+            batch_size: Maximum number of records inserted per transaction
+            flush_interval: Seconds a record may wait before a partial batch is committed
+            max_pending: Number of queued records at which callers start to block
+        """
+        self.hooks = hooks if hooks is not None else []
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="trajectory-writer", daemon=True
+        )
+        self._thread.start()
+        with _writers_lock:
+            _writers.add(self)
+
+    @property
+    def pending(self) -> int:
+        """Number of records queued or being written."""
+        with self._cond:
+            return len(self._queue) + self._in_flight
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        """
+        Queue a record for insertion.
+
+        Args:
+            record: Field values for Trajectory.create, with human_input holding
+                the human input ID (checked for existence before insertion)
+        """
+        with self._cond:
+            if self._closed or not self._thread.is_alive():
+                write_now = True
+            else:
+                write_now = False
+                while len(self._queue) >= self.max_pending and self._thread.is_alive():
+                    self._flush_requested = True
+                    self._cond.notify_all()
+                    self._cond.wait(0.1)
+                self._queue.append(record)
+                if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                    self._cond.notify_all()
+        if write_now:
+            # No writer thread to hand off to; keep the record by writing it here
+            self._write_batch([record])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every record queued so far has been committed.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if all records were written, False on timeout
+        """
+        if threading.current_thread() is self._thread:
+            # Called from a create hook; the writer cannot wait on itself
+            return not self._queue
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._in_flight:
+                if not self._thread.is_alive():
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._flush_requested = True
+                self._cond.notify_all()
+                self._cond.wait(remaining if remaining is not None else 1.0)
+            leftover = list(self._queue)
+            self._queue.clear()
+        if leftover:
+            # The thread died; write what it left behind synchronously
+            self._write_batch(leftover)
+        return True
+
+    def close(self) -> None:
+        """Flush all queued records and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        with _writers_lock:
+            _writers.discard(self)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    if not self._queue and not self._closed:
+                        self._cond.wait()
+                    if not self._queue and self._closed:
+                        return
+                    # Give a partial batch a moment to fill up unless asked to flush
+                    if len(self._queue) < self.batch_size and not (
+                        self._flush_requested or self._closed
+                    ):
+                        self._cond.wait(self.flush_interval)
+                    batch = []
+                    while self._queue and len(batch) < self.batch_size:
+                        batch.append(self._queue.popleft())
+                    self._in_flight = len(batch)
+                    if not self._queue:
+                        self._flush_requested = False
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    logger.error(f"Trajectory writer failed to store {len(batch)} records: {e}", exc_info=True)
+                finally:
+                    with self._cond:
+                        self._in_flight = 0
+                        self._cond.notify_all()
+        finally:
+            database = Trajectory._meta.database
+            try:
+                if not database.is_closed():
+                    database.close()
+            except Exception:
+                pass
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        database = Trajectory._meta.database
+        human_input_ids = {r["human_input"] for r in records if r.get("human_input") is not None}
+        if human_input_ids:
+            existing = {
+                row.id
+                for row in HumanInput.select(HumanInput.id).where(HumanInput.id.in_(list(human_input_ids)))
+            }
+            for record in records:
+                if record.get("human_input") is not None and record["human_input"] not in existing:
+                    logger.warning(f"Human input with ID {record['human_input']} not found")
+                    record["human_input"] = None
+
+        try:
+            with database.atomic():
+                stored = [Trajectory.create(**record) for record in records]
+        except peewee.DatabaseError as e:
+            logger.warning(f"Batched trajectory insert failed ({e}); retrying records individually")
+            stored = []
+            for record in records:
+                try:
+                    with database.atomic():
+                        stored.append(Trajectory.create(**record))
+                except peewee.DatabaseError as record_exc:
+                    logger.error(f"Failed to create trajectory record: {record_exc}")
+
+        logger.debug(f"Stored batch of {len(stored)} trajectory records")
+        for trajectory in stored:
+            model = TrajectoryModel.model_validate(trajectory, from_attributes=True)
+            for hook in list(self.hooks):
+                try:
+                    hook(model)
+                except Exception as hook_exc:
+                    logger.error(
+                        f"Error executing trajectory create hook {getattr(hook, '__name__', hook)}: {hook_exc}",
+                        exc_info=True,
+                    )
+
+
+def flush_all_writers(timeout: Optional[float] = None) -> None:
+    """
+    Flush every open trajectory writer.
+
+    Args:
+        timeout: Maximum seconds to wait for each writer, or None to wait indefinitely
+    """
+    with _writers_lock:
+        writers = list(_writers)
+    for writer in writers:
+        writer.flush(timeout)
+
+
+def _close_all_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers)
+    for writer in writers:
+        try:
+            writer.close()
+        except Exception as e:
+            logger.error(f"Failed to flush trajectory writer at exit: {e}")
+
+
+atexit.register(_close_all_writers)
@@ -10,6 +10,7 @@ from typing import List, Type
 import peewee
 
 from ra_aid.database.connection import get_db
+from ra_aid.database.memory_cache import clear_memory_caches
 from ra_aid.database.models import BaseModel, initialize_database
 from ra_aid.logging_config import get_logger
 
@@ -92,6 +93,8 @@ def truncate_table(model_class: Type[BaseModel]) -> None:
     try:
         with db.atomic():
             model_class.delete().execute()
+        # The rows were deleted without going through the repositories
+        clear_memory_caches()
         logger.info(f"Successfully truncated table for {model_class.__name__}")
     except peewee.DatabaseError as e:
         logger.error(f"Database Error: Failed to truncate table: {str(e)}")
@@ -1,11 +1,77 @@
+import glob
+import hashlib
+import json
 import os
 import platform
 import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from ra_aid.config import DEFAULT_ENV_DISCOVERY_WORKERS, DEFAULT_ENV_INV_CACHE_TTL
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the shape of the discovery results changes
+ENV_INV_CACHE_VERSION = 1
+
+# Directories pkg-config searches besides PKG_CONFIG_PATH
+_PKG_CONFIG_DIRS = [
+    "/usr/lib/pkgconfig",
+    "/usr/lib/*/pkgconfig",
+    "/usr/lib64/pkgconfig",
+    "/usr/share/pkgconfig",
+    "/usr/local/lib/pkgconfig",
+    "/usr/local/share/pkgconfig",
+    "/opt/homebrew/lib/pkgconfig",
+]
+
+# This process's discoveries by cache key, as (timestamp, JSON-encoded results)
+# so that every hit decodes its own copy
+_memory_cache = {}
+_memory_cache_lock = threading.Lock()
+
+
+def default_cache_path():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "ra-aid" / "env_inv.json"
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 class EnvDiscovery:
-    def __init__(self):
+    """Inventory of the developer tools, interpreters and libraries on this machine.
+
+    Each discovery runs dozens of probes (`--version` calls, pkg-config queries),
+    so probes run concurrently, and results are cached in memory and on disk for
+    cache_ttl seconds. The cache key covers PATH, the platform, and the mtimes
+    of every PATH, include and pkg-config directory, so installing or removing a
+    tool or library invalidates it before the TTL runs out.
+    """
+
+    def __init__(
+        self,
+        use_cache=True,
+        cache_ttl=DEFAULT_ENV_INV_CACHE_TTL,
+        cache_path=None,
+        max_workers=None,
+    ):
+        self.use_cache = use_cache
+        self.cache_ttl = cache_ttl
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path()
+        # Probes are mostly short-lived processes, so a few per core keep it busy
+        self.max_workers = max_workers or min(
+            DEFAULT_ENV_DISCOVERY_WORKERS, 4 * (os.cpu_count() or 1)
+        )
+        self._executor = None
         # Structured results dictionary.
         self.results = {
             "os": {},
@@ -221,16 +287,98 @@ class EnvDiscovery:
             pass
         return distro
 
-    def discover(self):
-        self._detect_os()
-        self._detect_cli_tools()
-        self._detect_python()
-        self._detect_python_env_tools()
-        self._detect_package_managers()
-        self._detect_libraries()
-        self._detect_node()
+    def discover(self, refresh=False):
+        cache_key = self.cache_key() if self.use_cache else None
+        if cache_key and not refresh:
+            cached = self._load_cached(cache_key)
+            if cached is not None:
+                self.results = cached
+                return self.results
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._executor = executor
+            try:
+                self._detect_os()
+                self._detect_cli_tools()
+                self._detect_python()
+                self._detect_python_env_tools()
+                self._detect_package_managers()
+                self._detect_libraries()
+                self._detect_node()
+            finally:
+                self._executor = None
+
+        if cache_key:
+            self._store_cached(cache_key)
         return self.results
 
+    def cache_key(self):
+        path_dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        pkg_config_dirs = [
+            d for d in os.environ.get("PKG_CONFIG_PATH", "").split(os.pathsep) if d
+        ]
+        for pattern in _PKG_CONFIG_DIRS:
+            pkg_config_dirs.extend(sorted(glob.glob(pattern)))
+        watched = path_dirs + [str(p) for p in self._include_paths] + pkg_config_dirs
+        fingerprint = {
+            "version": ENV_INV_CACHE_VERSION,
+            "platform": platform.platform(),
+            "path": os.environ.get("PATH", ""),
+            "nvm_dir": os.environ.get("NVM_DIR"),
+            "mtimes": [[d, _mtime_ns(d)] for d in watched],
+        }
+        encoded = json.dumps(fingerprint, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _load_cached(self, cache_key):
+        now = time.time()
+        with _memory_cache_lock:
+            entry = _memory_cache.get(cache_key)
+        if entry is not None and now - entry[0] < self.cache_ttl:
+            return json.loads(entry[1])
+
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(data, dict)
+            or data.get("key") != cache_key
+            or now - data.get("created", 0) >= self.cache_ttl
+        ):
+            return None
+        logger.debug(f"Using cached environment inventory from {self.cache_path}")
+        with _memory_cache_lock:
+            _memory_cache[cache_key] = (data["created"], json.dumps(data["results"]))
+        return data["results"]
+
+    def _store_cached(self, cache_key):
+        created = time.time()
+        serialized = json.dumps(self.results)
+        with _memory_cache_lock:
+            _memory_cache.clear()
+            _memory_cache[cache_key] = (created, serialized)
+
+        tmp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"key": cache_key, "created": created, "results": self.results}))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Could not cache environment inventory in {self.cache_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _map(self, func, items):
+        # Probes are independent subprocess calls, so they run on the discovery's pool
+        if self._executor is None:
+            return [func(item) for item in items]
+        return list(self._executor.map(func, items))
+
     def _detect_os(self):
         os_type = platform.system()
         os_info = {}
@@ -261,23 +409,24 @@ class EnvDiscovery:
         self.results["os"] = os_info
 
     def _detect_cli_tools(self):
-        tools_found = {}
-        for tool in self._cli_tool_names:
-            path = shutil.which(tool)
-            if path:
+        statuses = self._map(self._probe_cli_tool, self._cli_tool_names)
+        self.results["cli_tools"] = dict(zip(self._cli_tool_names, statuses))
+
+    def _probe_cli_tool(self, tool):
+        path = shutil.which(tool)
+        if not path:
+            return {"found": False}
+        version = None
+        if tool in ("g++", "gcc", "clang", "git"):
+            try:
+                out = subprocess.check_output([tool, "--version"], text=True, stderr=subprocess.STDOUT, timeout=1)
+                version = out.splitlines()[0].strip()
+            except Exception:
                 version = None
-                if tool in ("g++", "gcc", "clang", "git"):
-                    try:
-                        out = subprocess.check_output([tool, "--version"], text=True, stderr=subprocess.STDOUT, timeout=1)
-                        version = out.splitlines()[0].strip()
-                    except Exception:
-                        version = None
-                tools_found[tool] = {"found": True}
-                if version:
-                    tools_found[tool]["version"] = version
-            else:
-                tools_found[tool] = {"found": False}
-        self.results["cli_tools"] = tools_found
+        status = {"found": True}
+        if version:
+            status["version"] = version
+        return status
 
     def _detect_python(self):
         installations = []
@@ -312,13 +461,14 @@ class EnvDiscovery:
             for major in [2, 3]:
                 for minor in range(0, 15):
                     common_names.append(f"python{major}.{minor}")
-            seen_paths = set()
+            paths = []
             for name in common_names:
                 path = shutil.which(name)
-                if path and path not in seen_paths:
-                    seen_paths.add(path)
-                    ver = self._get_python_version(path)
-                    installations.append({"version": ver, "path": path})
+                if path and path not in paths:
+                    paths.append(path)
+            versions = self._map(self._get_python_version, paths)
+            for path, ver in zip(paths, versions):
+                installations.append({"version": ver, "path": path})
 
         installations = sorted(installations, key=lambda x: x.get("version", "") or "")
         self.results["python"]["installations"] = installations
@@ -336,31 +486,35 @@ class EnvDiscovery:
         venv_available = any(inst for inst in self.results["python"]["installations"]
                              if inst.get("version") and inst["version"][0] == '3')
         env_tools_status["venv"] = {"available": venv_available, "built_in": True}
-        for tool, display_name in self._py_env_tools.items():
-            found_path = shutil.which(tool)
-            if found_path:
-                version = None
-                try:
-                    if tool == "pyenv":
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=1)
-                        version = out.strip().split()[-1]
-                    elif tool in ("pipenv", "poetry", "conda", "pipx", "uv"):
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
-                        version = out.strip().split()[-1]
-                    elif tool == "virtualenv":
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
-                        version = out.strip()
-                except Exception:
-                    version = None
-                env_tools_status[display_name] = {"installed": True}
-                if version:
-                    env_tools_status[display_name]["version"] = version
-            else:
-                env_tools_status[display_name] = {"installed": False}
+        statuses = self._map(self._probe_py_env_tool, list(self._py_env_tools))
+        for display_name, status in zip(self._py_env_tools.values(), statuses):
+            env_tools_status[display_name] = status
         self.results["python"]["env_tools"] = env_tools_status
 
+    def _probe_py_env_tool(self, tool):
+        found_path = shutil.which(tool)
+        if not found_path:
+            return {"installed": False}
+        version = None
+        try:
+            if tool == "pyenv":
+                out = subprocess.check_output([tool, "--version"], text=True, timeout=1)
+                version = out.strip().split()[-1]
+            elif tool in ("pipenv", "poetry", "conda", "pipx", "uv"):
+                out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
+                version = out.strip().split()[-1]
+            elif tool == "virtualenv":
+                out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
+                version = out.strip()
+        except Exception:
+            version = None
+        status = {"installed": True}
+        if version:
+            status["version"] = version
+        return status
+
     def _detect_package_managers(self):
-        pkg_status = {}
+        managers = []
         for mgr in self._package_managers:
             if platform.system() == "Windows":
                 if mgr in ("apt", "apt-get", "dnf", "yum", "pacman", "paru", "zypper", "brew"):
@@ -383,103 +537,86 @@ class EnvDiscovery:
                     if distro_id in ("opensuse", "suse"):
                         if mgr in ("apt", "apt-get", "dnf", "yum", "pacman", "paru"):
                             continue
-            path = shutil.which(mgr)
-            pkg_status[mgr] = {"found": bool(path)}
-            if path:
+            managers.append(mgr)
+        statuses = self._map(self._probe_package_manager, managers)
+        self.results["package_managers"] = dict(zip(managers, statuses))
+
+    def _probe_package_manager(self, mgr):
+        path = shutil.which(mgr)
+        status = {"found": bool(path)}
+        if path:
+            version = None
+            try:
+                if mgr in ("brew", "winget", "choco"):
+                    out = subprocess.check_output([mgr, "--version"], text=True, timeout=3)
+                    version_line = out.splitlines()[0].strip()
+                    version = version_line
+                elif mgr in ("apt", "apt-get", "pacman", "paru", "dnf", "yum", "zypper"):
+                    out = subprocess.check_output([mgr, "--version"], text=True, timeout=2)
+                    version_line = out.splitlines()[0].strip()
+                    version = version_line
+            except Exception:
                 version = None
-                try:
-                    if mgr in ("brew", "winget", "choco"):
-                        out = subprocess.check_output([mgr, "--version"], text=True, timeout=3)
-                        version_line = out.splitlines()[0].strip()
-                        version = version_line
-                    elif mgr in ("apt", "apt-get", "pacman", "paru", "dnf", "yum", "zypper"):
-                        out = subprocess.check_output([mgr, "--version"], text=True, timeout=2)
-                        version_line = out.splitlines()[0].strip()
-                        version = version_line
-                except Exception:
-                    version = None
-                if version:
-                    pkg_status[mgr]["version"] = version
-        self.results["package_managers"] = pkg_status
+            if version:
+                status["version"] = version
+        return status
 
     def _detect_libraries(self):
-        libs_found = {}
         have_pkg_config = bool(shutil.which("pkg-config"))
-        for lib, info in self._libraries.items():
-            lib_info = {"found": False}
-            found = False
-            ver = None
-            cflags = None
-            libs_flags = None
-            header_paths = []
-            if have_pkg_config and info.get("pkg"):
-                pkg_name = info["pkg"]
-                try:
-                    subprocess.check_output(["pkg-config", "--exists", pkg_name],
-                                            stderr=subprocess.DEVNULL, timeout=1)
-                    found = True
-                    try:
-                        ver = subprocess.check_output(
-                            ["pkg-config", "--modversion", pkg_name],
-                            text=True, timeout=1
-                        ).strip()
-                    except Exception:
-                        ver = None
-                    try:
-                        cflags = subprocess.check_output(
-                            ["pkg-config", "--cflags", pkg_name],
-                            text=True, timeout=1
-                        ).strip()
-                    except Exception:
-                        cflags = None
-                    try:
-                        libs_flags = subprocess.check_output(
-                            ["pkg-config", "--libs", pkg_name],
-                            text=True, timeout=1
-                        ).strip()
-                    except Exception:
-                        libs_flags = None
-                except subprocess.CalledProcessError:
-                    found = False
-            if not found and info.get("headers"):
-                for header in info["headers"]:
-                    for inc_dir in self._include_paths:
-                        header_file = inc_dir / header
-                        if header_file.exists():
-                            found = True
-                            header_paths.append(str(header_file))
-            lib_info["found"] = found
-            if ver:
-                lib_info["version"] = ver
-            if cflags:
-                lib_info["cflags"] = cflags
-            if libs_flags:
-                lib_info["libs"] = libs_flags
-            if header_paths:
-                lib_info["header_paths"] = header_paths
-            libs_found[lib] = lib_info
-        self.results["libraries"] = libs_found
+        statuses = self._map(
+            lambda info: self._probe_library(info, have_pkg_config), self._libraries.values()
+        )
+        self.results["libraries"] = dict(zip(self._libraries, statuses))
 
-    def _detect_node(self):
-        node_info = {}
-        node_path = shutil.which("node")
-        if node_path:
-            try:
-                out = subprocess.check_output(["node", "--version"], text=True, timeout=1)
-                node_info["node_version"] = out.strip()
-            except Exception:
-                node_info["node_version"] = "found"
-        else:
-            node_info["node_version"] = None
-        npm_path = shutil.which("npm")
-        if npm_path:
+    def _probe_library(self, info, have_pkg_config):
+        lib_info = {"found": False}
+        found = False
+        ver = None
+        cflags = None
+        libs_flags = None
+        header_paths = []
+        if have_pkg_config and info.get("pkg"):
+            found, ver, cflags, libs_flags = self._query_pkg_config(info["pkg"])
+        if not found and info.get("headers"):
+            for header in info["headers"]:
+                for inc_dir in self._include_paths:
+                    header_file = inc_dir / header
+                    if header_file.exists():
+                        found = True
+                        header_paths.append(str(header_file))
+        lib_info["found"] = found
+        if ver:
+            lib_info["version"] = ver
+        if cflags:
+            lib_info["cflags"] = cflags
+        if libs_flags:
+            lib_info["libs"] = libs_flags
+        if header_paths:
+            lib_info["header_paths"] = header_paths
+        return lib_info
+
+    def _query_pkg_config(self, pkg_name):
+        try:
+            subprocess.check_output(["pkg-config", "--exists", pkg_name],
+                                    stderr=subprocess.DEVNULL, timeout=1)
+        except (subprocess.SubprocessError, OSError):
+            return False, None, None, None
+        flags = []
+        for query in ("--modversion", "--cflags", "--libs"):
             try:
-                out = subprocess.check_output(["npm", "--version"], text=True, timeout=1)
-                node_info["npm_version"] = out.strip()
+                flags.append(subprocess.check_output(
+                    ["pkg-config", query, pkg_name],
+                    text=True, timeout=1
+                ).strip())
             except Exception:
-                node_info["npm_version"] = "found"
-        else:
-            node_info["npm_version"] = None
+                flags.append(None)
+        return (True, *flags)
+
+    def _detect_node(self):
+        node_info = {}
+        node_info["node_version"], node_info["npm_version"] = self._map(
+            self._probe_node_tool, ["node", "npm"]
+        )
         nvm_installed = False
         nvm_version = None
         if platform.system() == "Windows":
@@ -498,6 +635,15 @@ class EnvDiscovery:
             node_info["nvm_version"] = nvm_version
         self.results["node"] = node_info
 
+    def _probe_node_tool(self, tool):
+        if not shutil.which(tool):
+            return None
+        try:
+            out = subprocess.check_output([tool, "--version"], text=True, timeout=1)
+            return out.strip()
+        except Exception:
+            return "found"
+
     def format_markdown(self):
         os_info = self.results.get("os", {})
         lines = []
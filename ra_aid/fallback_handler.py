@@ -1,13 +1,18 @@
 import json
 import re
+import threading
+import time
+from concurrent.futures import as_completed
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 from langchain_core.tools import BaseTool
 from langgraph.graph.message import BaseMessage
 
 from ra_aid.agents_alias import RAgents
 from ra_aid.config import (
+    DEFAULT_FALLBACK_HEDGE_COUNT,
     DEFAULT_MAX_TOOL_FAILURES,
     FALLBACK_TOOL_MODEL_LIMIT,
     RETRY_FALLBACK_COUNT,
@@ -30,6 +35,9 @@ class FallbackHandler:
     maintains failure counts, and triggers appropriate fallback methods for both
     prompt-based and function-calling tool invocations. It also resets internal
     counters when a tool call succeeds.
+
+    With a fallback_hedge_count above 1, fallback models are queried concurrently
+    and the first one whose tool call succeeds wins (see attempt_hedged_fallback).
     """
 
     def __init__(self, config, tools):
@@ -45,6 +53,11 @@ class FallbackHandler:
         self.fallback_enabled = config.get("experimental_fallback_handler", False)
         self.fallback_tool_models = self._load_fallback_tool_models(config)
         self.max_failures = config.get("max_tool_failures", DEFAULT_MAX_TOOL_FAILURES)
+        self.hedge_count = max(
+            1, config.get("fallback_hedge_count") or DEFAULT_FALLBACK_HEDGE_COUNT
+        )
+        # Per-model attempts, wins and latency across hedged fallbacks
+        self.fallback_model_stats: dict[str, dict] = {}
         self.tool_failure_consecutive_failures = 0
         self.failed_messages: list[BaseMessage] = []
         self.current_failing_tool_name = ""
@@ -176,10 +189,15 @@ class FallbackHandler:
             f"**Tool fallback activated**: Attempting fallback for tool {self.current_failing_tool_name}.",
             title="Fallback Notification",
         )
-        for fallback_model in self.fallback_tool_models:
-            result_list = self.invoke_fallback(fallback_model)
+        if self.hedge_count > 1 and len(self.fallback_tool_models) > 1:
+            result_list = self.attempt_hedged_fallback()
             if result_list:
                 return result_list
+        else:
+            for fallback_model in self.fallback_tool_models:
+                result_list = self.invoke_fallback(fallback_model)
+                if result_list:
+                    return result_list
 
         # Import repository classes directly to avoid circular imports
         from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
@@ -208,6 +226,135 @@ class FallbackHandler:
             f"All fallback models have failed for tool: {current_failing_tool_name}"
         )
 
+    def attempt_hedged_fallback(self):
+        """
+        Query up to hedge_count fallback models at once and keep the first one whose tool call succeeds.
+
+        Models are dispatched in fallback_tool_models order, starting the next one whenever one
+        fails. Tool calls run one at a time on the calling thread as responses arrive, so the
+        failing tool is never executed concurrently. Once a tool call succeeds, models not yet
+        started are cancelled and responses still in flight are discarded.
+
+        Returns:
+            List of [raw_llm_response, tool_call_result], or None if every model failed.
+        """
+        models = list(self.fallback_tool_models)
+        msg_list = self.construct_prompt_msg_list()
+        tool_to_bind = self.current_tool_to_bind
+        tool_name = self.current_failing_tool_name
+        cancelled = threading.Event()
+        attempts = {}
+        winner = None
+
+        executor = ContextThreadPoolExecutor(max_workers=min(self.hedge_count, len(models)))
+        try:
+            futures = {
+                executor.submit(
+                    self._hedged_request,
+                    fallback_model,
+                    msg_list,
+                    tool_to_bind,
+                    tool_name,
+                    cancelled,
+                ): index
+                for index, fallback_model in enumerate(models)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                fallback_model = models[index]
+                response, tool_call, error, latency_ms = future.result()
+                if error is None:
+                    try:
+                        tool_call_result = self.invoke_prompt_tool_call(tool_call)
+                    except Exception as e:
+                        error = e
+
+                attempts[index] = {
+                    "model": fallback_model["model"],
+                    "latency_ms": latency_ms,
+                    "outcome": "failed" if error else "won",
+                }
+                if error is None:
+                    logger.debug(
+                        f"Hedged fallback won by model: {self._format_model(fallback_model)}"
+                    )
+                    winner = [response, tool_call_result]
+                    cancelled.set()
+                    break
+                logger.error(
+                    f"Fallback with model {self._format_model(fallback_model)} failed: {error}"
+                )
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        attempt_list = [
+            attempts.get(index, {"model": m["model"], "latency_ms": None, "outcome": "cancelled"})
+            for index, m in enumerate(models)
+        ]
+        self._record_hedge_stats(tool_name, attempt_list)
+
+        if winner:
+            self.reset_fallback_handler()
+        return winner
+
+    def _hedged_request(self, fallback_model, msg_list, tool_to_bind, tool_name, cancelled):
+        """Request a tool call from one model, returning (response, tool_call, error, latency_ms)."""
+        if cancelled.is_set():
+            return None, None, FallbackToolExecutionError("Cancelled"), None
+        start = time.monotonic()
+        try:
+            response, tool_call = self._request_tool_call(
+                fallback_model, msg_list, tool_to_bind, tool_name
+            )
+            error = None
+        except Exception as e:
+            response, tool_call, error = None, None, e
+        return response, tool_call, error, round((time.monotonic() - start) * 1000, 1)
+
+    def _record_hedge_stats(self, tool_name, attempts):
+        """Update per-model win rates and record the hedged fallback in the trajectory."""
+        for attempt in attempts:
+            if attempt["outcome"] == "cancelled":
+                continue
+            stats = self.fallback_model_stats.setdefault(
+                attempt["model"], {"attempts": 0, "wins": 0, "total_latency_ms": 0.0}
+            )
+            stats["attempts"] += 1
+            stats["wins"] += attempt["outcome"] == "won"
+            stats["total_latency_ms"] += attempt["latency_ms"]
+
+        model_stats = {
+            model: {
+                "attempts": stats["attempts"],
+                "win_rate": round(stats["wins"] / stats["attempts"], 3),
+                "avg_latency_ms": round(stats["total_latency_ms"] / stats["attempts"], 1),
+            }
+            for model, stats in self.fallback_model_stats.items()
+        }
+        winner = next((a["model"] for a in attempts if a["outcome"] == "won"), None)
+
+        # Import repository classes directly to avoid circular imports
+        from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+        from ra_aid.database.repositories.human_input_repository import HumanInputRepository
+        from ra_aid.database.connection import get_db
+
+        trajectory_repo = TrajectoryRepository(get_db())
+        human_input_repo = HumanInputRepository(get_db())
+        trajectory_repo.create(
+            tool_name=tool_name,
+            step_data={
+                "message": f"Hedged fallback for tool {tool_name}: "
+                + (f"won by {winner}." if winner else "all models failed."),
+                "display_title": "Fallback Hedge",
+                "winner": winner,
+                "attempts": attempts,
+                "model_stats": model_stats,
+            },
+            record_type="fallback_hedge",
+            human_input_id=human_input_repo.get_most_recent_id(),
+        )
+
     def reset_fallback_handler(self):
         """
         Reset the fallback handler's internal failure counters and clear the record of used fallback models.
@@ -271,18 +418,30 @@ class FallbackHandler:
             )
         return tool_to_bind
 
-    def _bind_tool_model(self, simple_model: BaseChatModel, fallback_model):
+    def _bind_tool_model(
+        self, simple_model: BaseChatModel, fallback_model, tool=None, tool_name=None
+    ):
+        tool = tool or self.current_tool_to_bind
+        tool_name = tool_name or self.current_failing_tool_name
         if fallback_model.get("type", "prompt").lower() == "fc":
             # Force tool calling with tool_choice param.
             bound_model = simple_model.bind_tools(
-                [self.current_tool_to_bind],
-                tool_choice=self.current_failing_tool_name,
+                [tool],
+                tool_choice=tool_name,
             )
         else:
             # Do not force tool calling (Prompt method)
-            bound_model = simple_model.bind_tools([self.current_tool_to_bind])
+            bound_model = simple_model.bind_tools([tool])
         return bound_model
 
+    def _request_tool_call(self, fallback_model, msg_list, tool=None, tool_name=None):
+        """Ask a fallback model for the failing tool call, returning (response, tool_call_dict)."""
+        simple_model = initialize_llm(fallback_model["provider"], fallback_model["model"])
+        bound_model = self._bind_tool_model(simple_model, fallback_model, tool, tool_name)
+        retry_model = bound_model.with_retry(stop_after_attempt=RETRY_FALLBACK_COUNT)
+        response = retry_model.invoke(msg_list)
+        return response, self.base_message_to_tool_call_dict(response)
+
     def invoke_fallback(self, fallback_model):
         """
         Attempt a Prompt or function-calling fallback by invoking the current failing tool with the given fallback model.
@@ -295,21 +454,10 @@ class FallbackHandler:
         """
         try:
             logger.debug(f"Trying fallback model: {self._format_model(fallback_model)}")
-            simple_model = initialize_llm(
-                fallback_model["provider"], fallback_model["model"]
+            response, tool_call = self._request_tool_call(
+                fallback_model, self.construct_prompt_msg_list()
             )
 
-            bound_model = self._bind_tool_model(simple_model, fallback_model)
-
-            retry_model = bound_model.with_retry(
-                stop_after_attempt=RETRY_FALLBACK_COUNT
-            )
-
-            msg_list = self.construct_prompt_msg_list()
-            response = retry_model.invoke(msg_list)
-
-            tool_call = self.base_message_to_tool_call_dict(response)
-
             tool_call_result = self.invoke_prompt_tool_call(tool_call)
             # cpm(str(tool_call_result), title="Fallback Tool Call Result")
             logger.debug(
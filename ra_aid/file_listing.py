@@ -1,10 +1,19 @@
 """Module for efficient file listing using git."""
 
+import fnmatch
+import itertools
+import json
 import os
 import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
-import fnmatch
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 class FileListerError(Exception):
@@ -71,20 +80,573 @@ def is_git_repo(directory: str) -> bool:
         raise FileListerError(f"Error checking git repository: {e}")
 
 
+# Directories that are never part of a project file listing.
+EXCLUDED_DIRS = {".ra-aid", ".venv", ".git", ".aider", "__pycache__"}
+
+# The persistent file index lives in the project's .ra-aid directory. It is only
+# written when that directory already exists, so listing files never creates it.
+FILE_INDEX_DIR = ".ra-aid"
+FILE_INDEX_VERSION = 1
+
+# An mtime this close to the time a listing started cannot prove that nothing changed
+# later within the same timestamp tick, so it is stored as racy and rechecked on the
+# next lookup (the same approach git uses for racily clean index entries).
+_RACY_WINDOW_NS = 2_000_000_000
+_RACY = -2
+_MISSING = -1
+
+# Above this many changed directories one full untracked scan beats per-directory pathspecs.
+_MAX_INCREMENTAL_DIRS = 256
+
+_file_indexes: Dict[Tuple[str, bool], "_ProjectFileIndex"] = {}
+_file_index_lock = threading.RLock()
+# Every change to an index's file list gets a new generation, across rebuilds too
+_file_index_generations = itertools.count(1)
+
+
+@dataclass
+class _ProjectFileIndex:
+    """Cached file listing for one project directory.
+
+    Every directory that can contain listed files is stamped with its mtime so that a
+    refresh only rescans directories that changed. Git projects also stamp the git
+    index and the ignore files, since those change the listing without touching any
+    directory.
+    """
+
+    root: str
+    include_hidden: bool
+    is_git: bool
+    files: List[str] = field(default_factory=list)
+    dir_stamps: Dict[str, int] = field(default_factory=dict)
+    # Git projects only
+    git_dir: Optional[str] = None
+    control_stamps: Dict[str, int] = field(default_factory=dict)
+    tracked: List[str] = field(default_factory=list)
+    untracked: List[str] = field(default_factory=list)
+    # Non-git projects only: relative directory -> names of the files directly inside it
+    dir_files: Dict[str, List[str]] = field(default_factory=dict)
+    cacheable: bool = True
+    dirty: bool = True
+    generation: int = field(default_factory=lambda: next(_file_index_generations))
+
+
+def _stat_mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return _MISSING
+
+
+def _stamp(mtime_ns: int, racy_after_ns: int) -> int:
+    return _RACY if mtime_ns >= racy_after_ns else mtime_ns
+
+
+def _keep_git_path(path: str, include_hidden: bool) -> bool:
+    # Skip hidden files unless explicitly included
+    if not include_hidden and (
+        path.startswith(".") or any(part.startswith(".") for part in path.split("/"))
+    ):
+        return False
+    # Skip .aider files and RA.Aid's own state directory
+    if ".aider" in path or path.split("/", 1)[0] == FILE_INDEX_DIR:
+        return False
+    return True
+
+
+def _parent_dirs(paths: Iterable[str]) -> Set[str]:
+    """Return the root ("") plus every directory containing one of the given paths."""
+    dirs = {""}
+    for path in paths:
+        parent = path.rpartition("/")[0]
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = parent.rpartition("/")[0]
+    return dirs
+
+
+def _is_under(path: str, dirs: Set[str]) -> bool:
+    if "" in dirs:
+        return True
+    parent = path.rpartition("/")[0]
+    while parent:
+        if parent in dirs:
+            return True
+        parent = parent.rpartition("/")[0]
+    return False
+
+
+def _run_git_ls_files(root: str, args: List[str]) -> List[str]:
+    try:
+        process = subprocess.run(
+            args,
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise GitCommandError(f"Git command failed: {e}")
+    except PermissionError as e:
+        raise DirectoryAccessError(f"Permission denied: {e}")
+    return [line.strip() for line in process.stdout.splitlines() if line.strip()]
+
+
+def _find_git_dir(root: str) -> Optional[str]:
+    """Return the absolute git directory for root, or None if it cannot be determined."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+        )
+    except Exception:
+        return None
+    git_dir = str(result.stdout).strip() if result.returncode == 0 else ""
+    if not os.path.isabs(git_dir) or _stat_mtime_ns(git_dir) == _MISSING:
+        return None
+    return git_dir
+
+
+def _git_check_ignore(root: str, paths: List[str]) -> Set[str]:
+    """Return the subset of paths that git ignores."""
+    try:
+        result = subprocess.run(
+            ["git", "check-ignore", "--stdin", "-z"],
+            cwd=root,
+            input="\0".join(paths),
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        # Treat everything as ignored: at worst a new file in an otherwise
+        # unlisted directory is picked up on the next full rebuild.
+        return set(paths)
+    if result.returncode not in (0, 1):
+        return set(paths)
+    return {path for path in result.stdout.split("\0") if path}
+
+
+def _find_unlisted_dirs(
+    root: str, known_dirs: Set[str], start_dirs: Iterable[str], include_hidden: bool
+) -> Set[str]:
+    """Find non-ignored directories below start_dirs that contain no listed files.
+
+    These need stamps too: creating a file in an empty directory (or one holding only
+    ignored files) changes the mtime of that directory and nothing else.
+    """
+    found: Set[str] = set()
+    frontier = list(start_dirs)
+    while frontier:
+        candidates = []
+        for rel in frontier:
+            try:
+                with os.scandir(os.path.join(root, rel)) as entries:
+                    for entry in entries:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                        if entry.name in EXCLUDED_DIRS or (
+                            not include_hidden and entry.name.startswith(".")
+                        ):
+                            continue
+                        child = f"{rel}/{entry.name}" if rel else entry.name
+                        if child not in known_dirs and child not in found:
+                            candidates.append(child)
+            except OSError:
+                continue
+        if not candidates:
+            break
+        ignored = _git_check_ignore(root, candidates)
+        frontier = [path for path in candidates if path not in ignored]
+        found.update(frontier)
+    return found
+
+
+def _collect_ignore_files(index: _ProjectFileIndex, paths: Iterable[str], racy_after_ns: int) -> None:
+    for path in paths:
+        if path.rpartition("/")[2] == ".gitignore":
+            abs_path = os.path.join(index.root, path)
+            index.control_stamps[abs_path] = _stamp(_stat_mtime_ns(abs_path), racy_after_ns)
+
+
+def _build_git_index(index: _ProjectFileIndex) -> None:
+    racy_after_ns = time.time_ns() - _RACY_WINDOW_NS
+    root = index.root
+    index.git_dir = _find_git_dir(root)
+
+    # Get both tracked and untracked files
+    tracked = _run_git_ls_files(root, ["git", "ls-files"])
+    untracked = _run_git_ls_files(root, ["git", "ls-files", "--others", "--exclude-standard"])
+    index.tracked = [path for path in tracked if _keep_git_path(path, index.include_hidden)]
+    index.untracked = [path for path in untracked if _keep_git_path(path, index.include_hidden)]
+    index.files = sorted(set(index.tracked + index.untracked))
+
+    index.cacheable = index.git_dir is not None and _stat_mtime_ns(root) != _MISSING
+    if not index.cacheable:
+        return
+
+    for name in ("index", os.path.join("info", "exclude")):
+        path = os.path.join(index.git_dir, name)
+        index.control_stamps[path] = _stamp(_stat_mtime_ns(path), racy_after_ns)
+    _collect_ignore_files(index, tracked + untracked, racy_after_ns)
+
+    listed_dirs = _parent_dirs(index.files)
+    watched = listed_dirs | _find_unlisted_dirs(root, listed_dirs, listed_dirs, index.include_hidden)
+    index.dir_stamps = {
+        rel: _stamp(_stat_mtime_ns(os.path.join(root, rel)), racy_after_ns) for rel in watched
+    }
+
+
+def _refresh_git_index(index: _ProjectFileIndex) -> bool:
+    racy_after_ns = time.time_ns() - _RACY_WINDOW_NS
+    root = index.root
+
+    # Any change to the git index (add, commit, checkout, ...) can move files between
+    # tracked and untracked, so it always means a full rebuild.
+    index_path = os.path.join(index.git_dir, "index")
+    if _stat_mtime_ns(index_path) != index.control_stamps.get(index_path):
+        return False
+
+    changed: Set[str] = set()
+    for path, stamp in list(index.control_stamps.items()):
+        mtime = _stat_mtime_ns(path)
+        if mtime == stamp:
+            continue
+        index.control_stamps[path] = _stamp(mtime, racy_after_ns)
+        if os.path.basename(path) == ".gitignore":
+            rel_dir = os.path.relpath(os.path.dirname(path), root)
+            changed.add("" if rel_dir == "." else rel_dir.replace(os.sep, "/"))
+        else:
+            changed.add("")
+    for rel, stamp in list(index.dir_stamps.items()):
+        mtime = _stat_mtime_ns(os.path.join(root, rel))
+        if mtime != stamp:
+            index.dir_stamps[rel] = _stamp(mtime, racy_after_ns)
+            changed.add(rel)
+    if not changed:
+        return True
+
+    if "" in changed or len(changed) > _MAX_INCREMENTAL_DIRS:
+        untracked = _run_git_ls_files(root, ["git", "ls-files", "--others", "--exclude-standard"])
+        index.untracked = []
+    else:
+        untracked = _run_git_ls_files(
+            root,
+            ["git", "--literal-pathspecs", "ls-files", "--others", "--exclude-standard", "--"]
+            + sorted(changed),
+        )
+        index.untracked = [path for path in index.untracked if not _is_under(path, changed)]
+    index.untracked.extend(path for path in untracked if _keep_git_path(path, index.include_hidden))
+    index.files = sorted(set(index.tracked + index.untracked))
+    index.generation = next(_file_index_generations)
+    _collect_ignore_files(index, untracked, racy_after_ns)
+
+    # Drop directories that disappeared and no longer hold listed files, then start
+    # watching new directories found below the ones that changed.
+    listed_dirs = _parent_dirs(index.files)
+    for rel in [rel for rel, stamp in index.dir_stamps.items() if stamp == _MISSING]:
+        if rel not in listed_dirs:
+            del index.dir_stamps[rel]
+    known_dirs = listed_dirs | set(index.dir_stamps)
+    start_dirs = [rel for rel in changed if rel in index.dir_stamps] + [
+        rel for rel in listed_dirs if rel not in index.dir_stamps
+    ]
+    new_dirs = (listed_dirs - set(index.dir_stamps)) | _find_unlisted_dirs(
+        root, known_dirs, start_dirs, index.include_hidden
+    )
+    for rel in new_dirs:
+        index.dir_stamps[rel] = _stamp(_stat_mtime_ns(os.path.join(root, rel)), racy_after_ns)
+    index.dirty = True
+    return True
+
+
+def _scan_directory(root: str, rel: str, include_hidden: bool) -> Tuple[List[str], List[str]]:
+    """List the files and walkable subdirectories directly inside one directory."""
+    files: List[str] = []
+    subdirs: List[str] = []
+    with os.scandir(os.path.join(root, rel)) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk, symlinked directories are neither listed nor followed
+                if (
+                    not entry.is_symlink()
+                    and entry.name not in EXCLUDED_DIRS
+                    and (include_hidden or not entry.name.startswith("."))
+                ):
+                    subdirs.append(os.path.join(rel, entry.name) if rel else entry.name)
+            elif include_hidden or not entry.name.startswith("."):
+                files.append(entry.name)
+    return files, subdirs
+
+
+def _walk_directory(index: _ProjectFileIndex, start: str, racy_after_ns: int) -> None:
+    pending = [start]
+    while pending:
+        rel = pending.pop()
+        mtime = _stat_mtime_ns(os.path.join(index.root, rel))
+        try:
+            files, subdirs = _scan_directory(index.root, rel, index.include_hidden)
+        except PermissionError as e:
+            if not rel:
+                raise DirectoryAccessError(f"Cannot access directory {index.root}: {e}")
+            continue
+        except OSError:
+            continue
+        index.dir_stamps[rel] = _stamp(mtime, racy_after_ns)
+        index.dir_files[rel] = files
+        pending.extend(subdirs)
+
+
+def _drop_directory(index: _ProjectFileIndex, rel: str) -> None:
+    prefix = rel + os.sep
+    for key in [key for key in index.dir_files if key == rel or key.startswith(prefix)]:
+        index.dir_files.pop(key, None)
+        index.dir_stamps.pop(key, None)
+
+
+def _join_dir_files(index: _ProjectFileIndex) -> List[str]:
+    return sorted(
+        os.path.join(rel, name) if rel else name
+        for rel, names in index.dir_files.items()
+        for name in names
+    )
+
+
+def _build_walk_index(index: _ProjectFileIndex) -> None:
+    racy_after_ns = time.time_ns() - _RACY_WINDOW_NS
+    index.cacheable = _stat_mtime_ns(index.root) != _MISSING
+    _walk_directory(index, "", racy_after_ns)
+    index.files = _join_dir_files(index)
+
+
+def _refresh_walk_index(index: _ProjectFileIndex) -> bool:
+    racy_after_ns = time.time_ns() - _RACY_WINDOW_NS
+    root = index.root
+    changed = {}
+    for rel, stamp in index.dir_stamps.items():
+        mtime = _stat_mtime_ns(os.path.join(root, rel))
+        if mtime != stamp:
+            changed[rel] = mtime
+    if not changed:
+        return True
+
+    # A change at the top level may be a new .git directory
+    if "" in changed:
+        try:
+            if is_git_repo(root):
+                return False
+        except FileListerError:
+            pass
+
+    children: Dict[str, Set[str]] = {}
+    for rel in index.dir_files:
+        if rel:
+            children.setdefault(os.path.dirname(rel), set()).add(rel)
+
+    # Sorted so that parents are handled before their children
+    for rel in sorted(changed):
+        if rel not in index.dir_files:
+            continue
+        if changed[rel] == _MISSING:
+            _drop_directory(index, rel)
+            continue
+        try:
+            files, subdirs = _scan_directory(root, rel, index.include_hidden)
+        except OSError:
+            _drop_directory(index, rel)
+            continue
+        index.dir_stamps[rel] = _stamp(changed[rel], racy_after_ns)
+        index.dir_files[rel] = files
+        for gone in children.get(rel, set()) - set(subdirs):
+            _drop_directory(index, gone)
+        for new in set(subdirs) - children.get(rel, set()):
+            _walk_directory(index, new, racy_after_ns)
+
+    index.files = _join_dir_files(index)
+    index.generation = next(_file_index_generations)
+    index.dirty = True
+    return True
+
+
+def _file_index_path(root: str, include_hidden: bool) -> str:
+    name = "file_index_hidden.json" if include_hidden else "file_index.json"
+    return os.path.join(root, FILE_INDEX_DIR, name)
+
+
+def _save_file_index(index: _ProjectFileIndex) -> None:
+    if not os.path.isdir(os.path.join(index.root, FILE_INDEX_DIR)):
+        return
+    payload = {
+        "version": FILE_INDEX_VERSION,
+        "root": index.root,
+        "include_hidden": index.include_hidden,
+        "is_git": index.is_git,
+        "dir_stamps": index.dir_stamps,
+        "git_dir": index.git_dir,
+        "control_stamps": index.control_stamps,
+        "tracked": index.tracked,
+        "untracked": index.untracked,
+        "dir_files": index.dir_files,
+    }
+    path = _file_index_path(index.root, index.include_hidden)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not persist file index to {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _load_file_index(root: str, include_hidden: bool) -> Optional[_ProjectFileIndex]:
+    try:
+        with open(_file_index_path(root, include_hidden), encoding="utf-8") as f:
+            data = json.load(f)
+        if (
+            data.get("version") != FILE_INDEX_VERSION
+            or data.get("root") != root
+            or data.get("include_hidden") != include_hidden
+        ):
+            return None
+        index = _ProjectFileIndex(
+            root=root,
+            include_hidden=include_hidden,
+            is_git=bool(data["is_git"]),
+            dir_stamps=dict(data["dir_stamps"]),
+            git_dir=data["git_dir"],
+            control_stamps=dict(data["control_stamps"]),
+            tracked=list(data["tracked"]),
+            untracked=list(data["untracked"]),
+            dir_files={rel: list(names) for rel, names in data["dir_files"].items()},
+            dirty=False,
+        )
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    if index.is_git and not index.git_dir:
+        return None
+    if index.is_git:
+        index.files = sorted(set(index.tracked + index.untracked))
+    else:
+        index.files = _join_dir_files(index)
+    return index
+
+
+def _build_file_index(root: str, include_hidden: bool) -> _ProjectFileIndex:
+    # Check if it's a git repository
+    try:
+        is_git = is_git_repo(root)
+    except FileListerError:
+        # If checking fails, default to non-git approach
+        is_git = False
+
+    index = _ProjectFileIndex(root=root, include_hidden=include_hidden, is_git=is_git)
+    if is_git:
+        _build_git_index(index)
+    else:
+        _build_walk_index(index)
+    return index
+
+
+def _get_indexed_files(directory: str, include_hidden: bool) -> Tuple[List[str], Optional[Tuple[str, bool, int]]]:
+    """Return the sorted, de-duplicated file list for directory and its version key."""
+    root = os.path.realpath(directory)
+    key = (root, include_hidden)
+    with _file_index_lock:
+        index = _file_indexes.get(key) or _load_file_index(root, include_hidden)
+        fresh = False
+        if index is not None:
+            try:
+                if index.is_git:
+                    fresh = _refresh_git_index(index)
+                else:
+                    fresh = _refresh_walk_index(index)
+            except FileListerError:
+                # Let a full rebuild surface (or recover from) the error
+                fresh = False
+        if not fresh:
+            index = _build_file_index(root, include_hidden)
+
+        if not index.cacheable:
+            _file_indexes.pop(key, None)
+            return index.files, None
+        _file_indexes[key] = index
+        if index.dirty:
+            _save_file_index(index)
+            index.dirty = False
+        return index.files, (root, include_hidden, index.generation)
+
+
+def clear_file_index_cache() -> None:
+    """Drop all in-process file indexes.
+
+    Persisted indexes under .ra-aid are kept; they are revalidated against the
+    filesystem the next time they are loaded.
+    """
+    with _file_index_lock:
+        _file_indexes.clear()
+
+
 def get_all_project_files(
     directory: str, include_hidden: bool = False, exclude_patterns: Optional[List[str]] = None
 ) -> List[str]:
     """
     Get a list of all files in a project directory, handling both git and non-git repositories.
-    
+
+    Results come from a file index that is shared by all callers in the process and,
+    when the project has a .ra-aid directory, persisted there between runs. Only the
+    directories whose mtime changed since the last call are rescanned; a change to the
+    git index triggers a full rebuild.
+
     Args:
         directory: Path to the directory
         include_hidden: Whether to include hidden files (starting with .) in the results
         exclude_patterns: Optional list of patterns to exclude from the results
-        
+
     Returns:
-        List[str]: List of file paths relative to the directory
-        
+        List[str]: Sorted list of file paths relative to the directory
+
+    Raises:
+        DirectoryNotFoundError: If directory does not exist
+        DirectoryAccessError: If directory cannot be accessed
+        GitCommandError: If git command fails
+        FileListerError: For other unexpected errors
+    """
+    all_files, _ = get_indexed_project_files(directory, include_hidden)
+
+    # Apply additional exclude patterns if specified
+    if exclude_patterns:
+        return [
+            f for f in all_files if not any(fnmatch.fnmatch(f, pattern) for pattern in exclude_patterns)
+        ]
+
+    # Copy so callers cannot mutate the cached listing
+    return list(all_files)
+
+
+def get_indexed_project_files(
+    directory: str, include_hidden: bool = False
+) -> Tuple[List[str], Optional[Tuple[str, bool, int]]]:
+    """
+    Get the cached file list for a project directory together with its version.
+
+    This is the shared list held by the file index, so callers must treat it as
+    read-only. The version key changes whenever the list changes, which lets
+    derived indexes (such as the fuzzy search index) stay in sync cheaply.
+
+    Args:
+        directory: Path to the directory
+        include_hidden: Whether to include hidden files (starting with .) in the results
+
+    Returns:
+        Tuple containing:
+            - Sorted list of file paths relative to the directory
+            - Hashable version key, or None if the listing could not be cached
+
     Raises:
         DirectoryNotFoundError: If directory does not exist
         DirectoryAccessError: If directory cannot be accessed
@@ -96,106 +658,47 @@ def get_all_project_files(
         raise DirectoryNotFoundError(f"Directory not found: {directory}")
     if not os.path.isdir(directory):
         raise DirectoryNotFoundError(f"Not a directory: {directory}")
-    
-    # Default excluded directories
-    excluded_dirs = {'.ra-aid', '.venv', '.git', '.aider', '__pycache__'}
-    
-    # Check if it's a git repository
-    try:
-        is_git = is_git_repo(directory)
-    except FileListerError:
-        # If checking fails, default to non-git approach
-        is_git = False
-    
-    all_files = []
-    
-    if is_git:
-        # Get list of files from git ls-files
-        try:
-            # Get both tracked and untracked files
-            tracked_files_process = subprocess.run(
-                ["git", "ls-files"],
-                cwd=directory,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            untracked_files_process = subprocess.run(
-                ["git", "ls-files", "--others", "--exclude-standard"],
-                cwd=directory,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            raise GitCommandError(f"Git command failed: {e}")
-        except PermissionError as e:
-            raise DirectoryAccessError(f"Permission denied: {e}")
 
-        # Combine and process the files
-        for file in (
-            tracked_files_process.stdout.splitlines()
-            + untracked_files_process.stdout.splitlines()
-        ):
-            file = file.strip()
-            if not file:
-                continue
-            # Skip hidden files unless explicitly included
-            if not include_hidden and (
-                file.startswith(".")
-                or any(part.startswith(".") for part in file.split("/"))
-            ):
-                continue
-            # Skip .aider files
-            if ".aider" in file:
-                continue
-            all_files.append(file)
-    else:
-        # Not a git repository, use manual file listing
-        base_path = Path(directory)
-        
-        # First check if we can access the directory (check exists and isdir already done above)
-        try:
-            # We already verified existence, just check for permission errors
-            # Handle potential FileNotFoundError for mock tests
-            try:
-                os.listdir(directory)
-            except FileNotFoundError:
-                # This should normally not happen as we checked existence above
-                # But it can happen in mock tests
-                pass
-        except PermissionError as e:
-            raise DirectoryAccessError(f"Cannot access directory {directory}: {e}")
-        
-        try:
-            for root, dirs, files in os.walk(directory):
-                # Filter out excluded directories
-                dirs[:] = [d for d in dirs if d not in excluded_dirs and (include_hidden or not d.startswith('.'))]
-                
-                # Calculate relative path
-                rel_root = os.path.relpath(root, directory)
-                if rel_root == '.':
-                    rel_root = ''
-                
-                # Process files
-                for file in files:
-                    # Skip hidden files unless explicitly included
-                    if not include_hidden and file.startswith('.'):
-                        continue
-                    
-                    # Create relative path
-                    rel_path = os.path.join(rel_root, file) if rel_root else file
-                    all_files.append(rel_path)
-        except PermissionError as e:
-            raise DirectoryAccessError(f"Permission denied while walking directory {directory}: {e}")
-    
-    # Apply additional exclude patterns if specified
-    if exclude_patterns:
-        for pattern in exclude_patterns:
-            all_files = [f for f in all_files if not fnmatch.fnmatch(f, pattern)]
-            
-    # Remove duplicates and sort
-    return sorted(set(all_files))
+    return _get_indexed_files(directory, include_hidden)
+
+
+def get_project_tree_stamp(directory: str, include_hidden: bool = False) -> Optional[Tuple[Any, int]]:
+    """
+    Get a stamp of the project's file listing and directory mtimes.
+
+    The stamp changes whenever the file list changes and whenever a file is
+    created, removed or renamed in a listed directory, which includes editors
+    that save by writing a new file and renaming it over the old one. It does
+    not change when a file is rewritten in place. Taking it costs what the
+    file index refresh costs: a stat per directory, not per file.
+
+    Args:
+        directory: Path to the directory
+        include_hidden: Whether the listing includes hidden files
+
+    Returns:
+        Optional[Tuple[Any, int]]: The listing version and a hash of the
+        directory stamps, or None when the listing cannot be cached or a
+        stamp is too recent to rule out a change within the same mtime tick
+
+    Raises:
+        DirectoryNotFoundError: If directory does not exist
+        FileListerError: For other errors listing the directory
+    """
+    _, version = get_indexed_project_files(directory, include_hidden)
+    if version is None:
+        return None
+    with _file_index_lock:
+        index = _file_indexes.get((version[0], include_hidden))
+        if index is None or index.generation != version[2]:
+            return None
+        if _RACY in index.dir_stamps.values() or _RACY in index.control_stamps.values():
+            return None
+        stamps = (
+            tuple(sorted(index.dir_stamps.items())),
+            tuple(sorted(index.control_stamps.items())),
+        )
+    return version, hash(stamps)
 
 
 def get_file_listing(
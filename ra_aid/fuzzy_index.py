@@ -0,0 +1,282 @@
+"""Candidate pruning index for fuzzy file search.
+
+Scoring every project path with a fuzzy matcher is linear in the size of the
+project. This module keeps a trigram index over the distinct path components
+(directory and file names) of the project file listing, so a search only scores
+the paths whose components share trigrams with the search term. Small projects
+skip pruning and score every path.
+"""
+
+import fnmatch
+import os
+import re
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Pattern, Sequence, Set, Tuple
+
+from rapidfuzz.utils import default_process
+
+from ra_aid.file_listing import get_indexed_project_files
+
+# Projects up to this size are scored exhaustively; pruning only pays off above it.
+FULL_SCAN_LIMIT = 10_000
+# Maximum number of paths handed to the scorer after pruning.
+CANDIDATE_LIMIT = 2_000
+# Keep adding weaker components until at least this many candidates are collected.
+MIN_CANDIDATES = 500
+
+# Rebuild instead of updating once this fraction of entries is stale.
+_MAX_DEAD_RATIO = 0.25
+_MAX_CACHED_INDEXES = 8
+_MAX_CACHED_INCLUDES = 16
+
+# (root, include_hidden, exclude_patterns) -> (index, file listing version it reflects)
+_indexes: "OrderedDict[Tuple[str, bool, Tuple[str, ...]], Tuple[FuzzyFileIndex, Tuple]]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def compile_path_patterns(patterns: Sequence[str]) -> Optional[Pattern[str]]:
+    """
+    Compile fnmatch-style patterns into a single regular expression.
+
+    Matching a path against the result is equivalent to calling fnmatch.fnmatch
+    with each pattern, but takes one regex match instead of one per pattern.
+
+    Args:
+        patterns: fnmatch-style patterns
+
+    Returns:
+        Optional[Pattern[str]]: Compiled pattern, or None if no patterns were given
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(f"(?:{fnmatch.translate(os.path.normcase(pattern))})" for pattern in patterns)
+    )
+
+
+def _matches(pattern: Optional[Pattern[str]], path: str) -> bool:
+    return pattern is not None and pattern.match(os.path.normcase(path)) is not None
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class FuzzyFileIndex:
+    """Trigram index over the path components of a file listing."""
+
+    def __init__(self, paths: Sequence[str], exclude_patterns: Optional[Sequence[str]] = None):
+        """
+        Build the index.
+
+        Args:
+            paths: Project file paths
+            exclude_patterns: fnmatch-style patterns of paths to leave out of the index
+        """
+        self._exclude = compile_path_patterns(exclude_patterns or [])
+        self._lock = threading.Lock()
+        self._rebuild(paths)
+
+    def _rebuild(self, paths: Sequence[str]) -> None:
+        self._paths: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._dead: Set[int] = set()
+        self._excluded: Set[str] = set()
+        self._components: List[str] = []
+        self._component_ids: Dict[str, int] = {}
+        self._component_files: List[array] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._alive: Optional[List[str]] = None
+        self._includes: "OrderedDict[Tuple[str, ...], FrozenSet[int]]" = OrderedDict()
+        for path in paths:
+            self._add(path)
+
+    def _add(self, path: str) -> None:
+        if _matches(self._exclude, path):
+            self._excluded.add(path)
+            return
+        file_id = len(self._paths)
+        self._paths.append(path)
+        self._ids[path] = file_id
+        for part in set(path.replace(os.sep, "/").split("/")):
+            component_id = self._component_ids.get(part)
+            if component_id is None:
+                component_id = len(self._components)
+                self._components.append(default_process(part))
+                self._component_ids[part] = component_id
+                self._component_files.append(array("I"))
+                for trigram in _trigrams(self._components[component_id]):
+                    self._postings.setdefault(trigram, []).append(component_id)
+            self._component_files[component_id].append(file_id)
+
+    def update(self, paths: Sequence[str]) -> None:
+        """
+        Bring the index in line with a new version of the file listing.
+
+        Only added and removed paths are processed; removed paths are tombstoned
+        and the index is rebuilt once too many entries are stale.
+
+        Args:
+            paths: The complete, current project file list
+        """
+        with self._lock:
+            current = set(paths)
+            removed = [path for path in self._ids if path not in current]
+            if len(self._dead) + len(removed) > len(self._paths) * _MAX_DEAD_RATIO:
+                self._rebuild(paths)
+                return
+            for path in removed:
+                self._dead.add(self._ids.pop(path))
+            self._excluded &= current
+            for path in paths:
+                if path not in self._ids and path not in self._excluded:
+                    self._add(path)
+            self._alive = None
+            self._includes.clear()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _alive_paths(self) -> List[str]:
+        if self._alive is None:
+            self._alive = sorted(self._ids)
+        return self._alive
+
+    def _included_ids(self, include_paths: Optional[Sequence[str]]) -> Optional[FrozenSet[int]]:
+        if not include_paths:
+            return None
+        key = tuple(include_paths)
+        included = self._includes.get(key)
+        if included is None:
+            pattern = compile_path_patterns(include_paths)
+            included = frozenset(
+                file_id for path, file_id in self._ids.items() if _matches(pattern, path)
+            )
+            self._includes[key] = included
+            if len(self._includes) > _MAX_CACHED_INCLUDES:
+                self._includes.popitem(last=False)
+        return included
+
+    def _score_components(self, query: str) -> Dict[int, float]:
+        """Score components by the share of query trigrams they contain."""
+        query_trigrams = _trigrams(query)
+        if not query_trigrams:
+            # Too short for trigrams: fall back to substring containment
+            return {
+                component_id: len(query) / max(len(component), 1)
+                for component_id, component in enumerate(self._components)
+                if query and query in component
+            }
+
+        postings = sorted(
+            (self._postings.get(trigram, []) for trigram in query_trigrams), key=len
+        )
+        # Trigrams shared by a large part of the vocabulary (".py" and friends) say
+        # little about relevance and dominate the cost, so skip them when the query
+        # has more selective ones.
+        common = max(len(self._components) // 4, 1000)
+        selective = [posting for posting in postings if len(posting) <= common]
+        counts: Counter = Counter()
+        for posting in selective or postings:
+            counts.update(posting)
+        return {
+            component_id: count / len(query_trigrams) for component_id, count in counts.items()
+        }
+
+    def candidates(
+        self, search_term: str, include_paths: Optional[Sequence[str]] = None
+    ) -> Tuple[List[str], int]:
+        """
+        Select the paths worth scoring for a search term.
+
+        Args:
+            search_term: The fuzzy search term
+            include_paths: Optional fnmatch-style patterns a path must match
+
+        Returns:
+            Tuple containing:
+                - Paths to score
+                - Number of paths searched (after include_paths filtering)
+        """
+        with self._lock:
+            included = self._included_ids(include_paths)
+            total = len(self._ids) if included is None else len(included)
+
+            if total <= FULL_SCAN_LIMIT:
+                alive = self._alive_paths()
+                if included is None:
+                    return list(alive), total
+                return [path for path in alive if self._ids[path] in included], total
+
+            scores = self._score_components(default_process(search_term))
+            if not scores:
+                return [], total
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            best = ranked[0][1]
+            seen: Set[int] = set()
+            result: List[str] = []
+            for component_id, score in ranked:
+                if score < best / 2 and len(result) >= MIN_CANDIDATES:
+                    break
+                for file_id in self._component_files[component_id]:
+                    if file_id in seen or file_id in self._dead:
+                        continue
+                    if included is not None and file_id not in included:
+                        continue
+                    seen.add(file_id)
+                    result.append(self._paths[file_id])
+                    if len(result) >= CANDIDATE_LIMIT:
+                        return result, total
+            return result, total
+
+
+def get_fuzzy_file_index(
+    directory: str,
+    include_hidden: bool = False,
+    exclude_patterns: Optional[Sequence[str]] = None,
+) -> FuzzyFileIndex:
+    """
+    Get the fuzzy search index for a project, kept in sync with its file listing.
+
+    Args:
+        directory: Path to the project directory
+        include_hidden: Whether to include hidden files (starting with .)
+        exclude_patterns: fnmatch-style patterns of paths to leave out
+
+    Returns:
+        FuzzyFileIndex: Index over the current project files
+
+    Raises:
+        FileListerError: If the project files cannot be listed
+    """
+    paths, version = get_indexed_project_files(directory, include_hidden)
+    if version is None:
+        return FuzzyFileIndex(paths, exclude_patterns)
+
+    key = (version[0], include_hidden, tuple(exclude_patterns or ()))
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is not None:
+            _indexes.move_to_end(key)
+    if entry is not None:
+        index, indexed_version = entry
+        if indexed_version != version:
+            index.update(paths)
+    else:
+        index = FuzzyFileIndex(paths, exclude_patterns)
+
+    with _indexes_lock:
+        _indexes[key] = (index, version)
+        _indexes.move_to_end(key)
+        while len(_indexes) > _MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def clear_fuzzy_index_cache() -> None:
+    """Drop all cached fuzzy search indexes."""
+    with _indexes_lock:
+        _indexes.clear()
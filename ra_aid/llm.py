@@ -1,3 +1,4 @@
+import hashlib
 import os
 from typing import Any, Dict, List, Optional
 
@@ -12,8 +13,10 @@ from openai import OpenAI
 
 from ra_aid.chat_models.deepseek_chat import ChatDeepseekReasoner
 from ra_aid.console.formatting import cpm
+from ra_aid.llm_client_pool import get_llm_client_pool, llm_client_pool_enabled
 from ra_aid.logging_config import get_logger
 from ra_aid.model_detection import is_claude_37, is_deepseek_v3
+from ra_aid.rate_limiter import attach_rate_limiter
 
 
 from ra_aid.database.repositories.config_repository import get_config_repository
@@ -24,9 +27,21 @@ from .models_params import models_params
 def get_available_openai_models() -> List[str]:
     """Fetch available OpenAI models using OpenAI client.
 
+    The listing is cached in the client pool per API key, so spawning expert
+    agents does not repeat the request.
+
     Returns:
         List of available model names
     """
+    if llm_client_pool_enabled():
+        return get_llm_client_pool().available_models(
+            ("openai", _fingerprint(os.getenv("OPENAI_API_KEY"))),
+            _list_openai_models,
+        )
+    return _list_openai_models()
+
+
+def _list_openai_models() -> List[str]:
     try:
         # Use OpenAI client to fetch models
         client = OpenAI()
@@ -83,6 +98,13 @@ LLM_MAX_RETRIES = 5
 logger = get_logger(__name__)
 
 
+def _fingerprint(secret: Optional[str]) -> Optional[str]:
+    """Identify a credential in cache keys without keeping it in plain text."""
+    if secret is None:
+        return None
+    return hashlib.sha256(secret.encode()).hexdigest()[:16]
+
+
 def get_env_var(
     name: str, expert: bool = False, default: Optional[str] = None
 ) -> Optional[str]:
@@ -379,6 +401,10 @@ def create_llm_client(
 ) -> BaseChatModel:
     """Create a language model client with appropriate configuration.
 
+    Clients are shared through the LLM client pool (see ra_aid.llm_client_pool),
+    so agents asking for the same provider, model and settings reuse one client
+    and its HTTP connections. Set llm_client_pool to False to always build anew.
+
     Args:
         provider: The LLM provider to use
         model_name: Name of the model to use
@@ -392,6 +418,41 @@ def create_llm_client(
     if not config:
         raise ValueError(f"Unsupported provider: {provider}")
 
+    if not llm_client_pool_enabled():
+        return _build_llm_client(provider, model_name, temperature, is_expert, config)
+
+    try:
+        num_ctx = get_config_repository().get(
+            "expert_num_ctx" if is_expert else "num_ctx", 262144
+        )
+    except RuntimeError:
+        num_ctx = None
+    key = (
+        provider,
+        model_name,
+        temperature,
+        is_expert,
+        _fingerprint(config.get("api_key")),
+        config.get("base_url"),
+        num_ctx,
+        get_env_var(name="LLM_REQUEST_TIMEOUT", default=LLM_REQUEST_TIMEOUT),
+        get_env_var(name="LLM_MAX_RETRIES", default=LLM_MAX_RETRIES),
+    )
+    return get_llm_client_pool().get_or_create(
+        key,
+        lambda: _build_llm_client(provider, model_name, temperature, is_expert, config),
+    )
+
+
+def _build_llm_client(
+    provider: str,
+    model_name: str,
+    temperature: Optional[float],
+    is_expert: bool,
+    config: Dict[str, Any],
+) -> BaseChatModel:
+    """Construct a new client; create_llm_client reuses pooled ones."""
+
     if is_expert and provider == "openai":
         # If no specific expert model is provided, try to select the default ('o3').
         # The select_expert_model function handles the logic of checking availability.
@@ -631,12 +692,16 @@ def initialize_llm(
     provider: str, model_name: str, temperature: float | None = None
 ) -> BaseChatModel:
     """Initialize a language model client based on the specified provider and model."""
-    return create_llm_client(provider, model_name, temperature, is_expert=False)
+    return attach_rate_limiter(
+        create_llm_client(provider, model_name, temperature, is_expert=False), provider
+    )
 
 
 def initialize_expert_llm(provider: str, model_name: str) -> BaseChatModel:
     """Initialize an expert language model client based on the specified provider and model."""
-    return create_llm_client(provider, model_name, temperature=None, is_expert=True)
+    return attach_rate_limiter(
+        create_llm_client(provider, model_name, temperature=None, is_expert=True), provider
+    )
 
 
 def validate_provider_env(provider: str) -> bool:
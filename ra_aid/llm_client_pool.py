@@ -0,0 +1,155 @@
+"""
+Process-wide pool of LLM clients.
+
+Agents are created per task, and the server spawns several research and
+implementation agents per session, each asking for the same provider and
+model. Building a client each time repeats provider configuration, any
+model-availability lookup, and, most importantly, creates a new HTTP client
+whose connection pool starts cold. The pool hands out one client per
+(provider, model, temperature, expert) combination instead, so keep-alive
+connections are reused across agents and sessions.
+
+Clients are keyed on everything they are built from, including the provider's
+API key and base URL, so changing the environment yields a new client rather
+than a stale one. Pooled clients must be treated as shared: bind tools or
+options with bind_tools()/bind(), which return new runnables, rather than
+mutating the client.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ra_aid.config import DEFAULT_LLM_CLIENT_POOL_MAX_ENTRIES
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# How long a provider's list of available models is trusted
+MODEL_AVAILABILITY_TTL_SECONDS = 3600
+
+
+class LLMClientPool:
+    """LRU pool of constructed chat model clients, with cached model listings."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_LLM_CLIENT_POOL_MAX_ENTRIES,
+        model_availability_ttl: float = MODEL_AVAILABILITY_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.model_availability_ttl = model_availability_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._available_models: Dict[Hashable, Tuple[float, List[str]]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._construction_seconds = 0.0
+        self._saved_seconds = 0.0
+        self._model_lookups_saved = 0
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the pooled client for key, building it with factory on a miss.
+
+        Args:
+            key: Everything the client's construction depends on
+            factory: Builds the client
+
+        Returns:
+            The pooled client
+        """
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None:
+                self._clients.move_to_end(key)
+                self._hits += 1
+                self._saved_seconds += entry[1]
+                logger.debug(
+                    "Reusing pooled LLM client (%.1f ms construction saved)", entry[1] * 1000
+                )
+                return entry[0]
+
+        start = time.perf_counter()
+        client = factory()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._misses += 1
+            self._construction_seconds += elapsed
+            # Another agent may have built the same client meanwhile; keep the first
+            entry = self._clients.setdefault(key, (client, elapsed))
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_entries:
+                self._clients.popitem(last=False)
+        return entry[0]
+
+    def available_models(self, key: Hashable, loader: Callable[[], List[str]]) -> List[str]:
+        """
+        Return a provider's available models, listing them at most once per TTL.
+
+        Failed listings (an empty result) are not cached.
+        """
+        now = self._clock()
+        with self._lock:
+            cached = self._available_models.get(key)
+            if cached is not None and now - cached[0] < self.model_availability_ttl:
+                self._model_lookups_saved += 1
+                return list(cached[1])
+
+        models = loader()
+        if models:
+            with self._lock:
+                self._available_models[key] = (now, list(models))
+        return models
+
+    def clear(self) -> None:
+        """Drop all pooled clients and cached model listings."""
+        with self._lock:
+            self._clients.clear()
+            self._available_models.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool usage, including the client construction time saved by reuse."""
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                "clients": len(self._clients),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / requests, 3) if requests else 0.0,
+                "construction_ms": round(self._construction_seconds * 1000, 1),
+                "construction_ms_saved": round(self._saved_seconds * 1000, 1),
+                "model_lookups_saved": self._model_lookups_saved,
+            }
+
+
+_pool: Optional[LLMClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    """Return the process-wide client pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = LLMClientPool()
+        return _pool
+
+
+def clear_llm_client_pool() -> None:
+    """Drop pooled clients, e.g. after credentials change or between tests."""
+    get_llm_client_pool().clear()
+
+
+def llm_client_pool_enabled() -> bool:
+    """Whether clients should be pooled, per the llm_client_pool config setting."""
+    try:
+        from ra_aid.database.repositories.config_repository import get_config_repository
+
+        return bool(get_config_repository().get("llm_client_pool", True))
+    except RuntimeError:
+        return True
@@ -0,0 +1,32 @@
+# 016_20250410_120000_add_trajectory_session_indexes.py
+import peewee as pw
+from peewee_migrate import Migrator
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Index name -> indexed columns. Names match the ones peewee derives from
+# Trajectory.Meta.indexes, so databases created from the models already have them.
+INDEXES = {
+    "trajectory_session_id_created_at": ("session_id", "created_at"),
+    "trajectory_session_id_record_type": ("session_id", "record_type"),
+}
+
+
+def migrate(migrator: Migrator, database: pw.Database, fake=False, **kwargs):
+    """Add composite indexes for session-scoped trajectory queries."""
+    logger.info("Adding session indexes to trajectory table")
+    for name, columns in INDEXES.items():
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        migrator.sql(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "trajectory" ({column_list})'
+        )
+    # Refresh planner statistics so existing databases pick up the new indexes
+    migrator.sql('ANALYZE "trajectory"')
+
+
+def rollback(migrator: Migrator, database: pw.Database, fake=False, **kwargs):
+    """Remove the session indexes from the trajectory table."""
+    logger.info("Removing session indexes from trajectory table")
+    for name in INDEXES:
+        migrator.sql(f'DROP INDEX IF EXISTS "{name}"')
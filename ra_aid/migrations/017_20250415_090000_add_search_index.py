@@ -0,0 +1,57 @@
+# 017_20250415_090000_add_search_index.py
+import peewee as pw
+from peewee_migrate import Migrator
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# FTS table -> (source table, indexed columns). The statements below are a
+# snapshot of ra_aid.database.search_index at the time of this migration.
+FTS_TABLES = {
+    "trajectory_fts": ("trajectory", ("tool_name", "tool_parameters", "tool_result", "error_message")),
+    "human_input_fts": ("human_input", ("content",)),
+}
+
+
+def _create_statements(fts, table, columns):
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def migrate(migrator: Migrator, database: pw.Database, fake=False, **kwargs):
+    """Add FTS5 search tables over trajectories and human inputs and index existing rows."""
+    try:
+        database.execute_sql("CREATE VIRTUAL TABLE temp.ra_aid_fts5_probe USING fts5(x)")
+        database.execute_sql("DROP TABLE temp.ra_aid_fts5_probe")
+    except pw.OperationalError:
+        logger.warning("SQLite was built without FTS5; search will use substring matching")
+        return
+
+    logger.info("Adding full-text search index for trajectories and human inputs")
+    for fts, (table, columns) in FTS_TABLES.items():
+        for statement in _create_statements(fts, table, columns):
+            migrator.sql(statement)
+        # Index the rows that existed before the triggers
+        migrator.sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def rollback(migrator: Migrator, database: pw.Database, fake=False, **kwargs):
+    """Remove the full-text search tables and their triggers."""
+    logger.info("Removing full-text search index")
+    for fts in FTS_TABLES:
+        for suffix in ("ai", "ad", "au"):
+            migrator.sql(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        migrator.sql(f"DROP TABLE IF EXISTS {fts}")
@@ -9,6 +9,7 @@ The interface remains compatible with external callers expecting a tuple (output
 where output is a bytes object (UTF-8 encoded).
 """
 
+import codecs
 import errno
 import io
 import os
@@ -17,7 +18,8 @@ import signal
 import subprocess
 import sys
 import time
-from typing import List, Optional, Tuple
+from collections import deque
+from typing import Deque, List, Optional, Tuple
 
 import pyte
 from pyte.screens import HistoryScreen
@@ -27,10 +29,25 @@ if sys.platform == "win32":
     import msvcrt
     import threading
 else:
-    import select
+    import selectors
     import termios
     import tty
 
+# Scrollback lines kept by the terminal emulator; older lines are discarded.
+HISTORY_LINES = 2000
+# Raw bytes kept for the fallback path when terminal emulation fails.
+RAW_BUFFER_LIMIT = 256 * 1024
+# Captured output returned to the caller is limited to this many characters.
+OUTPUT_LIMIT = 8000
+# Bounds for the adaptive pty read size.
+MIN_READ_SIZE = 4096
+MAX_READ_SIZE = 64 * 1024
+# Bytes read per wakeup before timeouts and input are checked again.
+DRAIN_BUDGET = 256 * 1024
+# Echoed output is flushed once this many bytes are pending or this many seconds passed.
+ECHO_FLUSH_BYTES = 64 * 1024
+ECHO_FLUSH_INTERVAL = 0.05
+
 
 def create_process(
     cmd: List[str],
@@ -133,15 +150,311 @@ def render_line(line, columns: int) -> str:
         return str(line)
 
 
+def _wrap_history_event(event: str, handler):
+    def wrapper(self, *args, **kwargs):
+        self.before_event(event)
+        result = handler(self, *args, **kwargs)
+        self.after_event(event)
+        return result
+
+    wrapper.__name__ = handler.__name__
+    wrapper.__doc__ = handler.__doc__
+    return wrapper
+
+
+def _fast_history_screen(base: type) -> type:
+    """
+    Return a HistoryScreen subclass with its event hooks bound once at class level.
+
+    pyte's HistoryScreen wraps event handlers in __getattribute__, which runs for
+    every attribute access, including several per character drawn. Defining the
+    wrapped handlers on the class gives the same behaviour at a fraction of the
+    cost, which dominates throughput for commands with a lot of output.
+
+    This relies on the private HistoryScreen._wrapped list of event names. If a
+    pyte release drops it, base is returned unchanged: slower, but correct.
+    """
+    events = getattr(base, "_wrapped", None)
+    if isinstance(events, str):
+        return base
+    try:
+        events = list(events)
+    except TypeError:
+        return base
+    if not events or not all(isinstance(event, str) and hasattr(base, event) for event in events):
+        return base
+
+    namespace = {
+        "__doc__": base.__doc__,
+        "__getattribute__": object.__getattribute__,
+    }
+    for event in events:
+        namespace[event] = _wrap_history_event(event, getattr(base, event))
+    return type("_HistoryScreen", (base,), namespace)
+
+
+_HistoryScreen = _fast_history_screen(HistoryScreen)
+
+
+class TerminalCapture:
+    """
+    Incrementally render process output through a pyte HistoryScreen.
+
+    Output is fed to the terminal emulator as it is read, so memory stays
+    bounded by the screen size and scrollback cap rather than the total amount
+    of output, and the rendered lines are ready as soon as the process exits.
+    The most recent raw bytes are kept in a ring buffer as a fallback in case
+    terminal emulation fails.
+    """
+
+    def __init__(
+        self,
+        cols: int,
+        rows: int,
+        history: int = HISTORY_LINES,
+        raw_limit: int = RAW_BUFFER_LIMIT,
+    ):
+        self.cols = cols
+        self.rows = rows
+        self.raw_limit = raw_limit
+        self._raw: Deque[bytes] = deque()
+        self._raw_size = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self.error: Optional[Exception] = None
+        self.screen = _HistoryScreen(cols, rows, history=history, ratio=0.5)
+        self.stream = pyte.Stream(self.screen)
+
+    def feed(self, data: bytes) -> None:
+        """Feed a chunk of raw output into the screen and the raw ring buffer."""
+        if not data:
+            return
+        self._append_raw(data)
+        if self.error is not None:
+            return
+        try:
+            self.stream.feed(self._decoder.decode(data))
+        except Exception as e:
+            self.error = e
+
+    def _append_raw(self, data: bytes) -> None:
+        self._raw.append(data)
+        self._raw_size += len(data)
+        while self._raw_size > self.raw_limit and len(self._raw) > 1:
+            self._raw_size -= len(self._raw.popleft())
+        if self._raw_size > self.raw_limit:
+            # A single oversized chunk: keep only its tail
+            self._raw[0] = self._raw[0][-self.raw_limit :]
+            self._raw_size = len(self._raw[0])
+
+    @property
+    def raw_output(self) -> bytes:
+        """The most recent raw bytes, at most raw_limit of them."""
+        return b"".join(self._raw)
+
+    def _lines(self, history) -> List[str]:
+        if hasattr(history, "keys"):
+            # Dictionary-like object
+            return [render_line(history[line_num], self.cols) for line_num in sorted(history.keys())]
+        # Deque or other iterable
+        return [render_line(line, self.cols) for line in history]
+
+    def render(self) -> str:
+        """
+        Render the scrollback history and current display.
+
+        Returns:
+            str: Non-empty lines with trailing whitespace stripped, joined by newlines
+
+        Raises:
+            Exception: If terminal emulation failed while feeding output
+        """
+        if self.error is not None:
+            raise self.error
+        self.stream.feed(self._decoder.decode(b"", final=True))
+
+        # Older history, then the current display, then newer history
+        all_lines = self._lines(self.screen.history.top)
+        all_lines.extend(render_line(line, self.cols) for line in self.screen.display)
+        all_lines.extend(self._lines(self.screen.history.bottom))
+
+        # Trim out empty lines to get only meaningful lines
+        # Also strip trailing whitespace from each line
+        trimmed_lines = [line.rstrip() for line in all_lines if line and line.strip()]
+        return "\n".join(trimmed_lines)
+
+
+def next_read_size(current: int, received: int) -> int:
+    """
+    Adapt the pty read size to the rate at which output arrives.
+
+    Full reads double the size (up to MAX_READ_SIZE) so bulk output takes fewer
+    system calls; reads that use less than a quarter of the buffer halve it
+    again (down to MIN_READ_SIZE).
+
+    Args:
+        current: The read size used for the last read
+        received: Number of bytes that read returned
+
+    Returns:
+        int: The read size to use next
+    """
+    if received >= current:
+        return min(current * 2, MAX_READ_SIZE)
+    if received < current // 4:
+        return max(current // 2, MIN_READ_SIZE)
+    return current
+
+
+class EchoWriter:
+    """
+    Coalesce echoed output into fewer, larger writes to a file descriptor.
+
+    Output is buffered until ECHO_FLUSH_BYTES are pending or ECHO_FLUSH_INTERVAL
+    seconds have passed since the last flush, instead of issuing one write per
+    chunk read from the process.
+    """
+
+    def __init__(
+        self,
+        fd: int = 1,
+        flush_bytes: int = ECHO_FLUSH_BYTES,
+        flush_interval: float = ECHO_FLUSH_INTERVAL,
+    ):
+        self.fd = fd
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._buffer = bytearray()
+        self._last_flush = time.monotonic()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes not yet written."""
+        return len(self._buffer)
+
+    def write(self, data: bytes) -> None:
+        """Buffer data, flushing once enough is pending."""
+        self._buffer += data
+        if len(self._buffer) >= self.flush_bytes:
+            self.flush()
+
+    def maybe_flush(self) -> None:
+        """Flush if buffered output has waited for the flush interval."""
+        if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered output."""
+        view = memoryview(self._buffer)
+        try:
+            while view:
+                view = view[os.write(self.fd, view) :]
+        finally:
+            view.release()
+            self._buffer.clear()
+            self._last_flush = time.monotonic()
+
+
+def _drain_pty(
+    master_fd: int,
+    read_size: int,
+    capture: TerminalCapture,
+    echo: Optional[EchoWriter],
+) -> Tuple[bool, int]:
+    """
+    Read everything currently available from the non-blocking pty master.
+
+    Returns:
+        Tuple containing:
+            - Whether the pty reached EOF
+            - The read size to use for the next read
+    """
+    total = 0
+    while total < DRAIN_BUDGET:
+        try:
+            data = os.read(master_fd, read_size)
+        except BlockingIOError:
+            return False, read_size
+        except OSError as e:
+            if e.errno == errno.EIO:
+                return True, read_size
+            raise
+        if not data:  # EOF detected.
+            return True, read_size
+        capture.feed(data)
+        if echo is not None:
+            echo.write(data)
+        total += len(data)
+        read_size = next_read_size(read_size, len(data))
+    return False, read_size
+
+
+def _pump_pty(
+    master_fd: int,
+    capture: TerminalCapture,
+    check_timeout,
+    stdin_fd: Optional[int] = None,
+    echo: Optional[EchoWriter] = None,
+) -> bool:
+    """
+    Event loop moving output from the pty into the capture (and echo) until EOF.
+
+    Uses the platform's best selector (epoll on Linux, kqueue on BSD/macOS).
+    When stdin_fd is given, input from it is forwarded to the process.
+
+    Returns:
+        bool: True if the process was terminated for exceeding its timeout
+    """
+    read_size = MIN_READ_SIZE
+    with selectors.DefaultSelector() as selector:
+        selector.register(master_fd, selectors.EVENT_READ)
+        if stdin_fd is not None:
+            selector.register(stdin_fd, selectors.EVENT_READ)
+        try:
+            while True:
+                if check_timeout():
+                    return True
+                # Wake up in time to flush pending echo output.
+                timeout = ECHO_FLUSH_INTERVAL if echo is not None and echo.pending else 1.0
+                events = selector.select(timeout)
+                if not events:
+                    if echo is not None:
+                        echo.flush()
+                    continue
+                for key, _ in events:
+                    if key.fd == master_fd:
+                        eof, read_size = _drain_pty(master_fd, read_size, capture, echo)
+                        if eof:
+                            return False
+                    else:
+                        try:
+                            input_data = os.read(stdin_fd, 1024)
+                        except OSError:
+                            input_data = b""
+                        if input_data:
+                            os.write(master_fd, input_data)
+                        else:
+                            selector.unregister(stdin_fd)
+                if echo is not None:
+                    if stdin_fd is not None:
+                        # Someone is typing: keep echo latency low.
+                        echo.flush()
+                    else:
+                        echo.maybe_flush()
+        finally:
+            if echo is not None:
+                echo.flush()
+
+
 def run_interactive_command(
-    cmd: List[str], expected_runtime_seconds: int = 30
+    cmd: List[str], expected_runtime_seconds: int = 30, echo: bool = True
 ) -> Tuple[bytes, int]:
     """
     Runs an interactive command with output capture, capturing final scrollback history.
 
     This function provides a cross-platform way to run interactive commands with:
-    - Full terminal emulation using pyte's HistoryScreen
-    - Real-time display of command output
+    - Full terminal emulation using pyte's HistoryScreen, fed incrementally as
+      output arrives so memory use does not grow with the amount of output
+    - Real-time display of command output (unless echo is disabled)
     - Input forwarding when running in an interactive terminal
     - Timeout handling to prevent runaway processes
     - Comprehensive output capture including ANSI escape sequences
@@ -155,7 +468,8 @@ def run_interactive_command(
 
     On Unix:
     - Uses pseudo-terminals (PTY) for full terminal emulation
-    - Uses select() for non-blocking I/O
+    - Uses an event-driven selector loop with adaptive read sizes and
+      coalesced echo for non-blocking I/O
     - Handles raw terminal mode for proper input forwarding
     - Uses process groups for proper signal handling
 
@@ -165,6 +479,9 @@ def run_interactive_command(
         If process exceeds 2x this value, it will be terminated gracefully.
         If process exceeds 3x this value, it will be killed forcefully.
         Must be between 1 and 1800 seconds (30 minutes).
+      echo: Whether to display command output on the terminal as it arrives.
+        When False, output is only captured and input is not forwarded, which
+        suits sessions without a user at the terminal (e.g. the web server).
 
     Returns:
       A tuple of (captured_output, return_code), where captured_output is a UTF-8 encoded
@@ -209,7 +526,7 @@ def run_interactive_command(
     # Create process based on platform
     proc, master_fd = create_process(cmd, env, cols, rows)
 
-    captured_data = []
+    capture = TerminalCapture(cols, rows)
     start_time = time.time()
     was_terminated = False
 
@@ -233,6 +550,7 @@ def run_interactive_command(
         # Windows implementation using threads for I/O
         running = True
         stdin_thread = None
+        capture_lock = threading.Lock()
 
         def read_stdout():
             nonlocal running
@@ -241,9 +559,11 @@ def run_interactive_command(
                     data = proc.stdout.read(1024)
                     if not data:
                         break
-                    captured_data.append(data)
-                    sys.stdout.buffer.write(data)
-                    sys.stdout.buffer.flush()
+                    with capture_lock:
+                        capture.feed(data)
+                    if echo:
+                        sys.stdout.buffer.write(data)
+                        sys.stdout.buffer.flush()
                 except (OSError, IOError):
                     break
                 except Exception as e:
@@ -257,9 +577,11 @@ def run_interactive_command(
                     data = proc.stderr.read(1024)
                     if not data:
                         break
-                    captured_data.append(data)
-                    sys.stderr.buffer.write(data)
-                    sys.stderr.buffer.flush()
+                    with capture_lock:
+                        capture.feed(data)
+                    if echo:
+                        sys.stderr.buffer.write(data)
+                        sys.stderr.buffer.flush()
                 except (OSError, IOError):
                     break
                 except Exception as e:
@@ -289,7 +611,7 @@ def run_interactive_command(
         stderr_thread.start()
 
         # Only start stdin thread if we're in an interactive terminal
-        if sys.stdin.isatty():
+        if echo and sys.stdin.isatty():
             stdin_thread = threading.Thread(target=handle_input)
             stdin_thread.daemon = True
             stdin_thread.start()
@@ -319,125 +641,44 @@ def run_interactive_command(
             if proc.stdin:
                 proc.stdin.close()
     else:
-        # Unix implementation using select and pty
+        # Unix implementation using a selector loop over the pty
         try:
             stdin_fd = sys.stdin.fileno()
         except (AttributeError, io.UnsupportedOperation):
             stdin_fd = None
 
         # Interactive mode: forward input if running in a TTY.
-        if stdin_fd is not None and sys.stdin.isatty():
+        interactive = echo and stdin_fd is not None and sys.stdin.isatty()
+        old_settings = None
+        if interactive:
             old_settings = termios.tcgetattr(stdin_fd)
             tty.setraw(stdin_fd)
-            try:
-                while True:
-                    if check_timeout():
-                        was_terminated = True
-                        break
-                    # Use a finite timeout to avoid indefinite blocking.
-                    rlist, _, _ = select.select([master_fd, stdin_fd], [], [], 1.0)
-                    if master_fd in rlist:
-                        try:
-                            data = os.read(master_fd, 1024)
-                        except OSError as e:
-                            if e.errno == errno.EIO:
-                                break
-                            else:
-                                raise
-                        if not data:  # EOF detected.
-                            break
-                        captured_data.append(data)
-                        os.write(1, data)
-                    if stdin_fd in rlist:
-                        try:
-                            input_data = os.read(stdin_fd, 1024)
-                        except OSError:
-                            input_data = b""
-                        if input_data:
-                            os.write(master_fd, input_data)
-            except KeyboardInterrupt:
-                proc.terminate()
-            finally:
+        try:
+            was_terminated = _pump_pty(
+                master_fd,
+                capture,
+                check_timeout,
+                stdin_fd=stdin_fd if interactive else None,
+                echo=EchoWriter(1) if echo else None,
+            )
+        except KeyboardInterrupt:
+            proc.terminate()
+        finally:
+            if old_settings is not None:
                 termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_settings)
-        else:
-            # Non-interactive mode.
-            try:
-                while True:
-                    if check_timeout():
-                        was_terminated = True
-                        break
-                    rlist, _, _ = select.select([master_fd], [], [], 1.0)
-                    if not rlist:
-                        continue
-                    try:
-                        data = os.read(master_fd, 1024)
-                    except OSError as e:
-                        if e.errno == errno.EIO:
-                            break
-                        else:
-                            raise
-                    if not data:  # EOF detected.
-                        break
-                    captured_data.append(data)
-                    os.write(1, data)
-            except KeyboardInterrupt:
-                proc.terminate()
 
         os.close(master_fd)
 
     # Wait for the process to finish
     proc.wait()
 
-    # Ensure we have captured data even if the screen processing failed
-    raw_output = b"".join(captured_data)
-
-    # Process the captured output through a fresh screen
+    # The screen has been fed while reading, so only rendering remains
     try:
-        # Create a new screen and stream for final processing
-        screen = HistoryScreen(cols, rows, history=2000, ratio=0.5)
-        stream = pyte.Stream(screen)
-
-        # Feed all captured data at once to get the final state
-        raw_output = b"".join(captured_data)
-        decoded = raw_output.decode("utf-8", errors="ignore")
-        stream.feed(decoded)
-
-        # Get all history lines (top and bottom) and current display
-        all_lines = []
-
-        # Add history.top lines (older history)
-        if hasattr(screen.history.top, "keys"):
-            # Dictionary-like object
-            for line_num in sorted(screen.history.top.keys()):
-                line = screen.history.top[line_num]
-                all_lines.append(render_line(line, cols))
-        else:
-            # Deque or other iterable
-            for i, line in enumerate(screen.history.top):
-                all_lines.append(render_line(line, cols))
-
-        # Add current display lines
-        all_lines.extend([render_line(line, cols) for line in screen.display])
-
-        # Add history.bottom lines (newer history)
-        if hasattr(screen.history.bottom, "keys"):
-            # Dictionary-like object
-            for line_num in sorted(screen.history.bottom.keys()):
-                line = screen.history.bottom[line_num]
-                all_lines.append(render_line(line, cols))
-        else:
-            # Deque or other iterable
-            for i, line in enumerate(screen.history.bottom):
-                all_lines.append(render_line(line, cols))
-
-        # Trim out empty lines to get only meaningful lines
-        # Also strip trailing whitespace from each line
-        trimmed_lines = [line.rstrip() for line in all_lines if line and line.strip()]
-
-        final_output = "\n".join(trimmed_lines)
+        final_output = capture.render()
     except Exception as e:
         # If anything goes wrong with screen processing, fall back to raw output
         print(f"Warning: Error processing terminal output: {e}", file=sys.stderr)
+        raw_output = capture.raw_output
         try:
             # Decode raw output, strip trailing whitespace from each line
             decoded = raw_output.decode("utf-8", errors="replace")
@@ -452,15 +693,15 @@ def run_interactive_command(
         timeout_msg = f"\n[Process exceeded timeout ({expected_runtime_seconds} seconds expected)]"
         final_output += timeout_msg
 
-    # Limit output to the last 8000 bytes
+    # Limit output to the last OUTPUT_LIMIT characters
     if isinstance(final_output, str):
-        final_output = final_output[-8000:]
+        final_output = final_output[-OUTPUT_LIMIT:]
         final_output = final_output.encode("utf-8")
     elif isinstance(final_output, bytes):
-        final_output = final_output[-8000:]
+        final_output = final_output[-OUTPUT_LIMIT:]
     else:
         # Handle any unexpected type
-        final_output = str(final_output)[-8000:].encode("utf-8")
+        final_output = str(final_output)[-OUTPUT_LIMIT:].encode("utf-8")
 
     return final_output, proc.returncode
 
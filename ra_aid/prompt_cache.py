@@ -0,0 +1,153 @@
+"""
+Prompt prefix caching.
+
+Every agent step resends the agent's prompt, including the environment
+inventory and project listing, followed by the growing conversation. Providers
+can serve a repeated prompt prefix from cache, which cuts input latency and
+cost, as long as the prefix is byte-identical between requests:
+
+- OpenAI, DeepSeek, Gemini and most OpenAI-compatible endpoints cache prefixes
+  automatically; they only need the stable parts of the prompt first. The
+  agent prompts therefore lead with the environment inventory, which is the
+  same for every agent of a session, and put the date, memory and task after it.
+- Anthropic only caches up to explicit cache_control breakpoints (at most
+  four per request). add_cache_control() marks the end of the shared prefix,
+  the end of the agent's prompt and the latest human or tool message, so each
+  step reads everything but its newest messages from cache.
+
+The markers are added to copies of the messages sent to the model; the
+agent's stored history is left unchanged.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Anthropic rejects requests with more breakpoints than this
+MAX_CACHE_BREAKPOINTS = 4
+
+# Agent prompts end their session-wide stable prefix with this tag
+STABLE_PREFIX_END = "</environment inventory>"
+
+
+def prompt_caching_enabled() -> bool:
+    """Whether cache breakpoints should be added, per the prompt_caching config setting."""
+    try:
+        from ra_aid.database.repositories.config_repository import get_config_repository
+
+        return bool(get_config_repository().get("prompt_caching", True))
+    except RuntimeError:
+        return True
+
+
+def supports_cache_control(model: Optional[BaseChatModel]) -> bool:
+    """Whether the model needs explicit cache_control breakpoints to cache prompts."""
+    if model is None:
+        return False
+    try:
+        from langchain_anthropic import ChatAnthropic
+    except ImportError:
+        return False
+    return isinstance(model, ChatAnthropic) and prompt_caching_enabled()
+
+
+def split_stable_prefix(text: str) -> List[str]:
+    """Split a prompt after its stable prefix, if it has one."""
+    end = text.find(STABLE_PREFIX_END)
+    if end == -1:
+        return [text]
+    end += len(STABLE_PREFIX_END)
+    prefix, rest = text[:end], text[end:]
+    return [prefix, rest] if rest.strip() else [text]
+
+
+def _text_blocks(content: Any) -> List[Dict[str, Any]]:
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+    return [
+        {"type": "text", "text": block} if isinstance(block, str) else dict(block)
+        for block in content
+    ]
+
+
+def _is_tool_result_list(content: Any) -> bool:
+    return (
+        isinstance(content, list)
+        and bool(content)
+        and all(isinstance(block, dict) and block.get("type") == "tool_result" for block in content)
+    )
+
+
+def _mark_last_block(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if blocks:
+        blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+    return blocks
+
+
+def _with_breakpoint(message: BaseMessage, split_prefix: bool = False) -> BaseMessage:
+    """Return a copy of message whose content ends in a cache breakpoint."""
+    if isinstance(message, ToolMessage) and not _is_tool_result_list(message.content):
+        # Anthropic takes the breakpoint on the tool_result block itself
+        block = {
+            "type": "tool_result",
+            "content": message.content,
+            "tool_use_id": message.tool_call_id,
+            "is_error": message.status == "error",
+            "cache_control": CACHE_CONTROL,
+        }
+        return message.model_copy(update={"content": [block]})
+
+    if split_prefix and isinstance(message.content, str):
+        blocks = [
+            {"type": "text", "text": part, "cache_control": CACHE_CONTROL}
+            for part in split_stable_prefix(message.content)
+        ]
+    else:
+        blocks = _mark_last_block(_text_blocks(message.content))
+    return message.model_copy(update={"content": blocks})
+
+
+def add_cache_control(
+    messages: Sequence[BaseMessage], prefix_messages: int = 1
+) -> List[BaseMessage]:
+    """
+    Add Anthropic cache breakpoints to the messages of one model request.
+
+    Args:
+        messages: Messages about to be sent to the model
+        prefix_messages: How many leading messages make up the agent's prompt
+            (its system message and task), which are the same at every step
+
+    Returns:
+        Copies of the messages, with at most MAX_CACHE_BREAKPOINTS breakpoints
+    """
+    result = list(messages)
+    if not result:
+        return result
+
+    breakpoints = 0
+    prefix_messages = min(prefix_messages, len(result))
+    for index in range(prefix_messages):
+        message = result[index]
+        if not isinstance(message, (HumanMessage, SystemMessage)):
+            continue
+        marked = _with_breakpoint(message, split_prefix=True)
+        added = sum(1 for block in marked.content if "cache_control" in block)
+        if breakpoints + added > MAX_CACHE_BREAKPOINTS:
+            break
+        breakpoints += added
+        result[index] = marked
+
+    # Rolling breakpoint on the newest human or tool message; the next step
+    # reads the conversation up to here from cache
+    for index in range(len(result) - 1, prefix_messages - 1, -1):
+        if breakpoints >= MAX_CACHE_BREAKPOINTS:
+            break
+        if isinstance(result[index], (HumanMessage, ToolMessage)):
+            result[index] = _with_breakpoint(result[index])
+            break
+
+    return result
@@ -10,7 +10,11 @@ from ra_aid.prompts.human_prompts import HUMAN_PROMPT_SECTION_IMPLEMENTATION
 from ra_aid.prompts.web_research_prompts import WEB_RESEARCH_PROMPT_SECTION_IMPLEMENTATION
 
 # Implementation stage prompt - guides specific task implementation
-IMPLEMENTATION_PROMPT = """Current Date: {current_date}
+IMPLEMENTATION_PROMPT = """<environment inventory>
+{env_inv}
+</environment inventory>
+
+Current Date: {current_date}
 Working Directory: {working_directory}
 
 <project info>
@@ -25,10 +29,6 @@ Working Directory: {working_directory}
 {research_notes}
 </research notes>
 
-<environment inventory>
-{env_inv}
-</environment inventory>
-
 MAKE USE OF THE ENVIRONMENT INVENTORY TO GET YOUR WORK DONE AS EFFICIENTLY AND ACCURATELY AS POSSIBLE
 
 E.G. IF WE ARE USING A LIBRARY AND IT IS FOUND IN ENV INVENTORY, ADD THE INCLUDE/LINKER FLAGS TO YOUR MAKEFILE/CMAKELISTS/COMPILATION COMMAND/ETC.
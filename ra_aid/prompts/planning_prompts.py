@@ -8,7 +8,11 @@ from ra_aid.prompts.web_research_prompts import WEB_RESEARCH_PROMPT_SECTION_PLAN
 
 # Planning stage prompt - guides task breakdown and implementation planning
 # Includes a directive to scale complexity with request size and consult the expert (if available) for logic verification and debugging.
-PLANNING_PROMPT = """Current Date: {current_date}
+PLANNING_PROMPT = """<environment inventory>
+{env_inv}
+</environment inventory>
+
+Current Date: {current_date}
 Working Directory: {working_directory}
 
 KEEP IT SIMPLE
@@ -21,10 +25,6 @@ KEEP IT SIMPLE
 {research_notes}
 </research notes>
 
-<environment inventory>
-{env_inv}
-</environment inventory>
-
 MAKE USE OF THE ENVIRONMENT INVENTORY TO GET YOUR WORK DONE AS EFFICIENTLY AND ACCURATELY AS POSSIBLE
 
 E.G. IF WE ARE USING A LIBRARY AND IT IS FOUND IN ENV INVENTORY, ADD THE INCLUDE/LINKER FLAGS TO YOUR MAKEFILE/CMAKELISTS/COMPILATION COMMAND/
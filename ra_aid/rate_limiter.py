@@ -0,0 +1,415 @@
+"""
+Client-side rate limiting for LLM providers.
+
+Every agent thread in the process shares one ProviderRateLimiter per
+provider, so concurrent sessions in the server pace their calls together
+instead of each discovering the provider's limits through 429s:
+
+- A request bucket allows "rpm" calls per minute, with bursts up to rpm.
+- A token bucket allows "tpm" tokens per minute. Each call's actual token
+  usage is debited when it finishes, and the next call waits while the bucket
+  is in debt.
+- A cool-down pauses every call to the provider after a rate limit error,
+  for as long as the provider's Retry-After hint (or the retry backoff) says.
+
+Limits are optional; without them only the cool-down applies. The limiter is
+attached to chat models as their langchain rate_limiter, which every invoke
+and stream acquires before calling the provider.
+"""
+
+import asyncio
+import email.utils
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Longest wait honored from a provider's Retry-After hint
+MAX_RETRY_AFTER_SECONDS = 300
+# Waits are taken in slices of at most this long, checking for a stop request in between
+_WAIT_SLICE_SECONDS = 0.5
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate.
+
+    Takes may overdraw the bucket; the caller then waits until the debt is
+    repaid, so callers are served in the order they reserved.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until the bucket is out of debt."""
+        self._refill()
+        return max(0.0, -self._level / self.rate)
+
+    def take(self, amount: float) -> float:
+        """
+        Remove amount from the bucket.
+
+        Returns:
+            float: Seconds the caller should wait before proceeding
+        """
+        self._refill()
+        self._level -= amount
+        return max(0.0, -self._level / self.rate)
+
+
+class ProviderRateLimiter(BaseRateLimiter):
+    """Paces calls to one provider by request rate, token rate and Retry-After cool-downs."""
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.provider = provider
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cooldown_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self.configure(requests_per_minute, tokens_per_minute)
+
+    def configure(self, requests_per_minute: Optional[float], tokens_per_minute: Optional[float]) -> None:
+        """Set or clear the request and token limits."""
+        with self._lock:
+            self._request_bucket = (
+                TokenBucket(requests_per_minute, self._clock) if requests_per_minute else None
+            )
+            self._token_bucket = TokenBucket(tokens_per_minute, self._clock) if tokens_per_minute else None
+
+    def _delay(self, reserve: bool) -> float:
+        with self._lock:
+            delay = max(0.0, self._cooldown_until - self._clock())
+            if self._token_bucket is not None:
+                delay = max(delay, self._token_bucket.wait_time())
+            if self._request_bucket is not None:
+                if reserve:
+                    delay = max(delay, self._request_bucket.take(1))
+                else:
+                    delay = max(delay, self._request_bucket.wait_time())
+            if reserve:
+                self.requests += 1
+                if delay > 0:
+                    self.throttled += 1
+                    self.waited_seconds += delay
+            return delay
+
+    def reserve(self) -> float:
+        """Claim the next call slot and return how long to wait for it, in seconds."""
+        return self._delay(reserve=True)
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """
+        Wait for the provider's limits to allow another call.
+
+        Args:
+            blocking: Whether to wait; if False, only take a slot that is free now
+
+        Returns:
+            bool: Whether a slot was taken
+        """
+        if not blocking:
+            if self._delay(reserve=False) > 0:
+                return False
+            self.reserve()
+            return True
+        delay = self.reserve()
+        if delay > 0:
+            logger.debug(f"Pacing {self.provider} call by {delay:.2f}s")
+            wait_interruptibly(delay)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        """Async version of acquire."""
+        if not blocking:
+            return self.acquire(blocking=False)
+        delay = self.reserve()
+        if delay > 0:
+            logger.debug(f"Pacing {self.provider} call by {delay:.2f}s")
+            await asyncio.sleep(delay)
+        return True
+
+    def penalize(self, seconds: float) -> None:
+        """Hold every call to the provider for the next seconds, e.g. after a 429."""
+        with self._lock:
+            self._cooldown_until = max(self._cooldown_until, self._clock() + seconds)
+
+    def record_usage(self, tokens: int) -> None:
+        """Debit the tokens a finished call used from the token bucket."""
+        if tokens <= 0:
+            return
+        with self._lock:
+            if self._token_bucket is not None:
+                self._token_bucket.take(tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of calls paced, how many had to wait and for how long in total."""
+        with self._lock:
+            return {
+                "provider": self.provider,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """Return the process-wide rate limiter of a provider, creating it without limits."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = ProviderRateLimiter(provider)
+        return limiter
+
+
+def configure_rate_limit(
+    provider: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> ProviderRateLimiter:
+    """
+    Set the request and token limits of a provider.
+
+    Args:
+        provider: Provider name
+        requests_per_minute: Calls allowed per minute, or None for no limit
+        tokens_per_minute: Tokens allowed per minute, or None for no limit
+
+    Returns:
+        ProviderRateLimiter: The provider's limiter
+    """
+    limiter = get_rate_limiter(provider)
+    limiter.configure(requests_per_minute, tokens_per_minute)
+    return limiter
+
+
+def rate_limiter_stats() -> List[Dict[str, Any]]:
+    """Return the usage stats of every provider's limiter."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.stats() for limiter in limiters]
+
+
+def reset_rate_limiters() -> None:
+    """Forget all providers' limiters."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def wait_interruptibly(seconds: float, check: Optional[Callable[[], None]] = None) -> bool:
+    """
+    Sleep for up to seconds, returning early if the current agent is told to stop.
+
+    Args:
+        seconds: How long to wait
+        check: Optional callback run between waits, which may raise to abort
+
+    Returns:
+        bool: True if the full time passed, False if a stop request cut it short
+    """
+    from ra_aid.agent_context import get_current_context, should_exit
+
+    context = get_current_context()
+    token = context.cancellation_token if context is not None else None
+    deadline = time.monotonic() + seconds
+    while True:
+        if check is not None:
+            check()
+        if should_exit():
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return True
+        if token is not None:
+            if token.wait(min(remaining, _WAIT_SLICE_SECONDS)):
+                return False
+        else:
+            time.sleep(min(remaining, _WAIT_SLICE_SECONDS))
+
+
+_DURATION_RE = re.compile(r"([0-9.]+)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_MESSAGE_HINT_RE = re.compile(
+    r"(?:retry|try again)\s+(?:after|in)\s+([0-9.]+)\s*(ms|milliseconds?|s|secs?|seconds?)?",
+    re.IGNORECASE,
+)
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse durations such as "20ms", "1.5s" or "6m0s"."""
+    parts = _DURATION_RE.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value.strip():
+        return None
+    return sum(float(number) * _UNITS[unit] for number, unit in parts)
+
+
+def _seconds_until(value: str) -> Optional[float]:
+    """Parse an HTTP date or RFC 3339 timestamp into seconds from now."""
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _header_hint(headers: Any) -> Optional[float]:
+    def header(name: str) -> Optional[str]:
+        try:
+            value = headers.get(name)
+        except Exception:
+            return None
+        return value.strip() if isinstance(value, str) and value.strip() else None
+
+    if (value := header("retry-after-ms")) is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    if (value := header("retry-after")) is not None:
+        try:
+            return float(value)
+        except ValueError:
+            if (seconds := _seconds_until(value)) is not None:
+                return seconds
+
+    # Reset times of the exhausted limit, from providers that send no Retry-After
+    resets = []
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        if (value := header(name)) is not None and (seconds := _parse_duration(value)) is not None:
+            resets.append(seconds)
+    for name in ("anthropic-ratelimit-requests-reset", "anthropic-ratelimit-tokens-reset"):
+        if (value := header(name)) is not None and (seconds := _seconds_until(value)) is not None:
+            resets.append(seconds)
+    return max(resets) if resets else None
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Return how long a provider asked the client to wait before retrying.
+
+    Looks at, in order, the Retry-After style headers of the error's HTTP
+    response, the retry delay of Google API errors, and a "retry after N
+    seconds" phrase in the message.
+
+    Args:
+        error: Exception raised by a provider client
+
+    Returns:
+        Optional[float]: Seconds to wait, capped at MAX_RETRY_AFTER_SECONDS, or None without a hint
+    """
+    hint = None
+    for source in (error, getattr(error, "response", None)):
+        headers = getattr(source, "headers", None)
+        if headers is not None and (hint := _header_hint(headers)) is not None:
+            break
+
+    if hint is None:
+        for detail in getattr(error, "details", None) or ():
+            retry_delay = getattr(detail, "retry_delay", None)
+            if retry_delay is not None:
+                hint = getattr(retry_delay, "seconds", 0) + getattr(retry_delay, "nanos", 0) / 1e9
+                break
+
+    if hint is None:
+        match = _MESSAGE_HINT_RE.search(str(error))
+        if match:
+            unit = (match.group(2) or "s").lower()
+            hint = float(match.group(1)) * (0.001 if unit.startswith("m") else 1.0)
+
+    if hint is None:
+        return None
+    return min(max(0.0, hint), MAX_RETRY_AFTER_SECONDS)
+
+
+def _tokens_used(response: LLMResult) -> int:
+    usage = (response.llm_output or {}).get("token_usage") or (response.llm_output or {}).get("usage")
+    if isinstance(usage, dict):
+        total = usage.get("total_tokens")
+        if total is None:
+            total = (usage.get("prompt_tokens") or usage.get("input_tokens") or 0) + (
+                usage.get("completion_tokens") or usage.get("output_tokens") or 0
+            )
+        if total:
+            return int(total)
+    total = 0
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                total += metadata.get("total_tokens", 0)
+    return total
+
+
+class RateLimitUsageHandler(BaseCallbackHandler):
+    """Callback that debits each finished call's token usage from its provider's limiter."""
+
+    def __init__(self, limiter: ProviderRateLimiter):
+        self.limiter = limiter
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        try:
+            self.limiter.record_usage(_tokens_used(response))
+        except Exception as e:
+            logger.debug(f"Could not record token usage for rate limiting: {e}")
+
+
+def attach_rate_limiter(model: Any, provider: str) -> Any:
+    """
+    Pace a chat model's calls with its provider's shared rate limiter.
+
+    Args:
+        model: Chat model created for the provider
+        provider: Provider name
+
+    Returns:
+        The same model
+    """
+    if not hasattr(model, "rate_limiter"):
+        return model
+    limiter = get_rate_limiter(provider)
+    try:
+        model.rate_limiter = limiter
+        callbacks = list(model.callbacks or []) if isinstance(model.callbacks, (list, tuple, type(None))) else None
+        # Pooled models are attached again on reuse; replace handlers of limiters since reset
+        if callbacks is not None and not any(
+            isinstance(cb, RateLimitUsageHandler) and cb.limiter is limiter for cb in callbacks
+        ):
+            callbacks = [cb for cb in callbacks if not isinstance(cb, RateLimitUsageHandler)]
+            model.callbacks = callbacks + [RateLimitUsageHandler(limiter)]
+    except (AttributeError, TypeError, ValueError) as e:
+        logger.debug(f"Could not attach rate limiter to {type(model).__name__}: {e}")
+    return model
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark environment discovery.
+
+Times EnvDiscovery.discover() on this machine:
+
+- sequential: every probe one after another, as discovery used to run
+- concurrent: probes spread over the discovery's worker pool
+- disk cache: a fresh process reading the cached inventory
+- memory cache: a later discovery in the same process, e.g. a server session
+
+Reports the best wall time of --runs in milliseconds. The uncached runs use a
+temporary cache file, so the user's cache is left untouched.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_env_inv [--runs N]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import ra_aid.env_inv as env_inv
+from ra_aid.env_inv import EnvDiscovery
+
+
+def _best_ms(func: Callable[[], Any], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(min(timings), 2)
+
+
+def run_benchmark(runs: int = 3) -> Dict[str, Any]:
+    """Time uncached and cached discovery."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "env_inv.json"
+
+        def discover_from_disk():
+            env_inv._memory_cache.clear()
+            EnvDiscovery(cache_path=cache_path).discover()
+
+        results = {
+            "sequential_ms": _best_ms(
+                lambda: EnvDiscovery(use_cache=False, max_workers=1).discover(), runs
+            ),
+            "concurrent_ms": _best_ms(lambda: EnvDiscovery(use_cache=False).discover(), runs),
+        }
+        EnvDiscovery(cache_path=cache_path).discover(refresh=True)
+        results["disk_cache_ms"] = _best_ms(discover_from_disk, runs)
+        EnvDiscovery(cache_path=cache_path).discover()
+        results["memory_cache_ms"] = _best_ms(
+            lambda: EnvDiscovery(cache_path=cache_path).discover(), runs
+        )
+        env_inv._memory_cache.clear()
+    results["workers"] = EnvDiscovery().max_workers
+    return results
+
+
+def main():
+    """Command-line entry point for the environment discovery benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark environment discovery")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per scenario")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.runs), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
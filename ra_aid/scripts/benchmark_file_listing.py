@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark project file listing with and without the file index.
+
+Reports the time for a cold listing (full git/filesystem scan), a listing
+served from the persisted index in .ra-aid (when present), and a warm
+listing served from the in-process index.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_file_listing [DIRECTORY] [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+from ra_aid import file_listing
+
+
+def _time_call(func: Callable[[], Any], runs: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+    }
+
+
+def run_benchmark(directory: str, runs: int = 5) -> Dict[str, Any]:
+    """
+    Time cold, persisted and warm listings of a directory.
+
+    Args:
+        directory: Project directory to list
+        runs: Number of timed runs per scenario
+
+    Returns:
+        Dict[str, Any]: Timings per scenario plus the number of files listed
+    """
+    root = os.path.realpath(directory)
+
+    def cold():
+        file_listing._build_file_index(root, False)
+
+    def persisted():
+        file_listing.clear_file_index_cache()
+        file_listing.get_all_project_files(directory)
+
+    def warm():
+        file_listing.get_all_project_files(directory)
+
+    file_count = len(file_listing.get_all_project_files(directory))
+    results = {
+        "directory": root,
+        "files": file_count,
+        "cold": _time_call(cold, runs),
+        "warm": _time_call(warm, runs),
+    }
+    if os.path.exists(file_listing._file_index_path(root, False)):
+        results["persisted"] = _time_call(persisted, runs)
+    return results
+
+
+def main():
+    """Command-line entry point for the file listing benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark cold vs warm project file listing")
+    parser.add_argument("directory", nargs="?", default=".", help="Project directory to list")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per scenario")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.directory, args.runs), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
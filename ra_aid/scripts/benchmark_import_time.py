@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark ra-aid CLI startup.
+
+Times, in fresh interpreters:
+
+- import: `import ra_aid.__main__`, what every `ra-aid` invocation pays
+- version: `ra-aid --version`, which should exit right after argument parsing
+- runtime: loading everything main() needs before it starts an agent
+
+For each, reports the best wall time of --runs in milliseconds, the slowest
+top-level imports from `python -X importtime`, and which of the heavy
+dependencies (litellm, langgraph, the web server) ended up loaded.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_import_time [--runs N] [--top N]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+HEAVY_MODULES = ["litellm", "langgraph", "langchain_core", "uvicorn", "ra_aid.server.server"]
+
+SCENARIOS = {
+    "import": "import ra_aid.__main__",
+    "version": (
+        "import sys; sys.argv = ['ra-aid', '--version']\n"
+        "import ra_aid.__main__ as m\n"
+        "try:\n"
+        "    m.main()\n"
+        "except SystemExit:\n"
+        "    pass"
+    ),
+    "runtime": (
+        "import ra_aid.__main__ as m; m._configure_litellm()\n"
+        "import ra_aid.agent_utils, ra_aid.agents.research_agent, ra_aid.server.server"
+    ),
+}
+
+_REPORT_LOADED = (
+    "\nimport json, sys\n"
+    "print(json.dumps(sorted(m for m in {modules!r} if m in sys.modules)), file=sys.stderr)"
+)
+
+
+def _run(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    return subprocess.run(
+        command + ["-c", code], capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr: str, top: int) -> List[Dict[str, Any]]:
+    """Return the slowest top-level imports from `-X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # Nested imports are indented under the module that triggered them
+        if name.startswith("  "):
+            continue
+        imports.append({"module": name.strip(), "ms": round(int(parts[1]) / 1000, 1)})
+    return sorted(imports, key=lambda item: item["ms"], reverse=True)[:top]
+
+
+def time_scenario(code: str, runs: int, top: int) -> Dict[str, Any]:
+    """Time one startup scenario in fresh interpreters."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(code)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    profiled = _run(code + _REPORT_LOADED.format(modules=HEAVY_MODULES), importtime=True)
+    loaded = json.loads(profiled.stderr.strip().splitlines()[-1])
+    return {
+        "best_ms": round(min(timings), 1),
+        "heavy_modules_loaded": loaded,
+        "slowest_imports": parse_importtime(profiled.stderr, top),
+    }
+
+
+def run_benchmark(runs: int = 5, top: int = 5) -> Dict[str, Any]:
+    """Time each startup scenario, including a bare interpreter for reference."""
+    results = {"interpreter": time_scenario("pass", runs, 0)}
+    for name, code in SCENARIOS.items():
+        results[name] = time_scenario(code, runs, top)
+    return results
+
+
+def main():
+    """Command-line entry point for the import time benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark ra-aid CLI startup")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per scenario")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.runs, args.top), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark output throughput of run_interactive_command.
+
+Runs a child process that writes a large synthetic output through the pty
+and reports the throughput in MB/s, both with terminal echo (redirected to
+/dev/null so it does not flood the console) and in quiet mode.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_interactive [--megabytes N] [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from ra_aid.proc.interactive import run_interactive_command
+
+_GENERATOR = (
+    "import sys\n"
+    "line = b'%06d ' + b'x' * 72 + b'\\n'\n"
+    "total = int(sys.argv[1])\n"
+    "out = sys.stdout.buffer\n"
+    "written = 0\n"
+    "i = 0\n"
+    "while written < total:\n"
+    "    chunk = b''.join(line % (i + n) for n in range(128))\n"
+    "    out.write(chunk)\n"
+    "    written += len(chunk)\n"
+    "    i += 128\n"
+    "out.flush()\n"
+)
+
+
+def _generator_cmd(size: int) -> List[str]:
+    return [sys.executable, "-c", _GENERATOR, str(size)]
+
+
+def _time_run(size: int, echo: bool) -> float:
+    saved_stdout = None
+    if echo:
+        # Keep echoed output off the console while still paying for the writes
+        sys.stdout.flush()
+        saved_stdout = os.dup(1)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.close(devnull)
+    try:
+        start = time.perf_counter()
+        _, return_code = run_interactive_command(
+            _generator_cmd(size), expected_runtime_seconds=1800, echo=echo
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        if saved_stdout is not None:
+            os.dup2(saved_stdout, 1)
+            os.close(saved_stdout)
+    if return_code != 0:
+        raise RuntimeError(f"Output generator exited with {return_code}")
+    return elapsed
+
+
+def run_benchmark(megabytes: float = 16, runs: int = 3) -> Dict[str, Any]:
+    """
+    Measure run_interactive_command throughput with and without echo.
+
+    Args:
+        megabytes: Amount of output the child process writes per run
+        runs: Number of timed runs per mode
+
+    Returns:
+        Dict[str, Any]: Elapsed times and MB/s per mode
+    """
+    size = int(megabytes * 1024 * 1024)
+    results: Dict[str, Any] = {"megabytes": megabytes, "runs": runs}
+    for mode, echo in (("echo", True), ("quiet", False)):
+        timings = [_time_run(size, echo) for _ in range(runs)]
+        best = min(timings)
+        results[mode] = {
+            "min_s": round(best, 3),
+            "median_s": round(statistics.median(timings), 3),
+            "mb_per_s": round(megabytes / best, 2),
+        }
+    return results
+
+
+def main():
+    """Command-line entry point for the interactive throughput benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark pty output throughput of run_interactive_command"
+    )
+    parser.add_argument(
+        "--megabytes", type=float, default=16, help="Output size per run in MB"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per mode")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.megabytes, args.runs), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-text search over a large trajectory table.
+
+Builds a SQLite database with --rows synthetic tool-call trajectories, times
+indexing them into trajectory_fts, then times TrajectoryRepository.search for
+a few query shapes with the FTS5 index and with the substring fallback used on
+databases without it:
+
+- rare: a word in about one row in ten thousand
+- common: a word in every tenth row
+- prefix: a prefix query matching a whole family of words
+- session: the common word, restricted to one session
+- common_ranked: the common word with order="rank", which scores every match
+
+Each timing is the best of --runs, in milliseconds, for --limit results.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_search [--rows N] [--sessions N] [--limit N] [--db FILE]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional
+
+import peewee
+
+from ra_aid.database.models import HumanInput, Session, Trajectory
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+from ra_aid.database.search_index import TRAJECTORY_FTS, create_search_index
+
+_TOOLS = ("ripgrep_search", "read_file_tool", "run_shell_command", "emit_key_facts", "list_directory_tree")
+_WORDS = ("parser", "session", "websocket", "migration", "config", "provider", "fallback", "cache")
+_INSERT_BATCH = 10_000
+
+
+def populate(db: peewee.SqliteDatabase, rows: int, sessions: int) -> None:
+    """
+    Create the tables and insert synthetic trajectory records without indexing them.
+
+    Args:
+        db: Database bound to the trajectory models
+        rows: Number of trajectory records to insert
+        sessions: Number of sessions the records are spread over
+    """
+    db.create_tables([Session, HumanInput, Trajectory])
+    with db.atomic():
+        Session.insert_many([{"id": i + 1} for i in range(sessions)]).execute()
+
+    start = datetime.datetime(2025, 1, 1)
+    fields = [
+        Trajectory.session,
+        Trajectory.created_at,
+        Trajectory.updated_at,
+        Trajectory.tool_name,
+        Trajectory.tool_parameters,
+        Trajectory.tool_result,
+        Trajectory.record_type,
+    ]
+    for offset in range(0, rows, _INSERT_BATCH):
+        batch = []
+        for i in range(offset, min(offset + _INSERT_BATCH, rows)):
+            created_at = start + datetime.timedelta(milliseconds=i)
+            word = _WORDS[i % len(_WORDS)]
+            marker = " needle" if i % 10_000 == 0 else ""
+            common = " timeout" if i % 10 == 0 else ""
+            batch.append(
+                (
+                    i % sessions + 1,
+                    created_at,
+                    created_at,
+                    _TOOLS[i % len(_TOOLS)],
+                    json.dumps({"pattern": f"{word}_{i % 97}", "path": f"ra_aid/{word}/module_{i % 53}.py"}),
+                    json.dumps({"output": f"step {i}: {word} handled{common}{marker}"}),
+                    "tool_execution",
+                )
+            )
+        with db.atomic():
+            Trajectory.insert_many(batch, fields=fields).execute()
+
+
+def _best_ms(fn: Callable[[], Any], runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def time_searches(repo: TrajectoryRepository, session_id: int, limit: int, runs: int) -> Dict[str, float]:
+    """
+    Time the search query shapes against the current schema.
+
+    Args:
+        repo: Repository to search through
+        session_id: Session for the session-filtered query
+        limit: Results per search
+        runs: Timed runs per query
+
+    Returns:
+        Dict[str, float]: Best time in milliseconds per query
+    """
+    return {
+        "rare": _best_ms(lambda: repo.search("needle", limit=limit), runs),
+        "common": _best_ms(lambda: repo.search("timeout", limit=limit), runs),
+        "prefix": _best_ms(lambda: repo.search("migr*", limit=limit), runs),
+        "session": _best_ms(lambda: repo.search("timeout", session_id=session_id, limit=limit), runs),
+        "common_ranked": _best_ms(lambda: repo.search("timeout", limit=limit, order="rank"), runs),
+    }
+
+
+def run_benchmark(
+    rows: int = 1_000_000,
+    sessions: int = 100,
+    limit: int = 20,
+    runs: int = 3,
+    path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build the database and time searches with and without the FTS5 index.
+
+    Args:
+        rows: Number of trajectory records to insert
+        sessions: Number of sessions the records are spread over
+        limit: Results per search
+        runs: Timed runs per query
+        path: Database file to create; a temporary file is used when None
+
+    Returns:
+        Dict[str, Any]: Setup times and per-query timings with and without the index
+    """
+    tmpdir = None
+    if path is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, "search.db")
+    db = peewee.SqliteDatabase(path, pragmas={"journal_mode": "wal", "synchronous": "off"})
+    try:
+        with db.bind_ctx([Session, HumanInput, Trajectory]):
+            start = time.perf_counter()
+            populate(db, rows, sessions)
+            populate_s = time.perf_counter() - start
+
+            repo = TrajectoryRepository(db, async_writes=False)
+            session_id = sessions // 2 + 1
+            without_index = time_searches(repo, session_id, limit, runs)
+
+            start = time.perf_counter()
+            if not create_search_index(db, rebuild=True):
+                raise RuntimeError("This SQLite build does not support FTS5")
+            index_s = time.perf_counter() - start
+            with_index = time_searches(repo, session_id, limit, runs)
+            index_pages = db.execute_sql(f"SELECT COUNT(*) FROM {TRAJECTORY_FTS}_data").fetchone()[0]
+    finally:
+        db.close()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    return {
+        "rows": rows,
+        "sessions": sessions,
+        "limit": limit,
+        "populate_s": round(populate_s, 2),
+        "index_s": round(index_s, 2),
+        "index_pages": index_pages,
+        "substring_ms": without_index,
+        "fts5_ms": with_index,
+    }
+
+
+def main():
+    """Command-line entry point for the search benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark trajectory full-text search")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Trajectory records to insert")
+    parser.add_argument("--sessions", type=int, default=100, help="Sessions to spread records over")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per query")
+    parser.add_argument("--db", help="Database file to create (default: a temporary file)")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.rows, args.sessions, args.limit, args.runs, args.db), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
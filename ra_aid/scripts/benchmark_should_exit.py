@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark the stop-signal checks agents run on every step.
+
+Times should_exit in the situations agents call it from (no context, inside
+an agent context holding the session's cancellation token, and with only the
+session registered) and reports nanoseconds per call and the overhead per
+agent step for --checks-per-step calls. For comparison it also times the
+previous implementation's pattern: an RLock-guarded registry lookup plus three
+INFO log records per call, logged to a handler that discards them.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_should_exit [--iterations N] [--checks-per-step N]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from ra_aid.agent_context import agent_context, should_exit
+from ra_aid.utils.agent_thread_manager import (
+    agent_thread_registry,
+    get_cancellation_token,
+    register_agent,
+    unregister_agent,
+)
+
+_SESSION_ID = 987_654
+
+
+def _ns_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def _legacy_should_exit(session_id: int, lock: threading.RLock, log: logging.Logger) -> bool:
+    # Mirrors the former should_exit/has_received_stop_signal pair
+    log.info("SHOULD_EXIT: Checking if agent should exit for session_id: %s", session_id)
+    log.info(f"Checking if agent has received stop signal for session_id {session_id}")
+    with lock:
+        entry = agent_thread_registry.get(session_id)
+    if entry and entry["stop_event"].is_set():
+        return True
+    log.info("SHOULD_EXIT: No stop signal received from client, continuing agent for session_id: %s", session_id)
+    return False
+
+
+def run_benchmark(iterations: int = 200_000, checks_per_step: int = 6) -> Dict[str, Any]:
+    """
+    Time should_exit and the legacy locking, logging check.
+
+    Args:
+        iterations: Calls timed per scenario
+        checks_per_step: should_exit calls per agent step, for the per-step figures
+
+    Returns:
+        Dict[str, Any]: Nanoseconds per call and microseconds per step for each scenario
+    """
+    legacy_log = logging.getLogger("ra_aid.benchmark_should_exit.legacy")
+    legacy_log.setLevel(logging.INFO)
+    legacy_log.addHandler(logging.NullHandler())
+    legacy_log.propagate = False
+    legacy_lock = threading.RLock()
+
+    register_agent(_SESSION_ID, threading.current_thread(), threading.Event())
+    try:
+        token = get_cancellation_token(_SESSION_ID)
+        timings = {
+            "no_context": _ns_per_call(should_exit, iterations),
+            "session_registry": _ns_per_call(lambda: should_exit(_SESSION_ID), iterations),
+        }
+        with agent_context(cancellation_token=token):
+            with agent_context():
+                timings["nested_context_token"] = _ns_per_call(
+                    lambda: should_exit(_SESSION_ID), iterations
+                )
+        timings["legacy_lock_and_log"] = _ns_per_call(
+            lambda: _legacy_should_exit(_SESSION_ID, legacy_lock, legacy_log), iterations
+        )
+    finally:
+        unregister_agent(_SESSION_ID)
+
+    return {
+        "iterations": iterations,
+        "checks_per_step": checks_per_step,
+        "ns_per_call": {name: round(ns, 1) for name, ns in timings.items()},
+        "us_per_step": {
+            name: round(ns * checks_per_step / 1000, 3) for name, ns in timings.items()
+        },
+    }
+
+
+def main():
+    """Command-line entry point for the stop-signal microbenchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark agent stop-signal checks")
+    parser.add_argument("--iterations", type=int, default=200_000, help="Calls per scenario")
+    parser.add_argument(
+        "--checks-per-step", type=int, default=6, help="should_exit calls per agent step"
+    )
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.iterations, args.checks_per_step), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark cached vs uncached token counting for react agent message trimming.
+
+Replays a trajectory of agent messages one step at a time and trims the
+message history at every step the way state_modifier does, once with a token
+counter that tokenizes every message on every call and once with the
+memoizing counter. Uncached trimming grows cubically with the trajectory
+length, so it is only timed on every Nth step (--stride); both are reported
+as mean milliseconds per step, along with the cache hit/miss statistics.
+
+The trajectory is either loaded from a JSON file holding a list of messages
+serialized with langchain's messages_to_dict, or synthesized.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_token_counter [--messages FILE] [--count N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+    messages_from_dict,
+)
+
+from ra_aid.anthropic_message_utils import anthropic_trim_messages
+from ra_aid.anthropic_token_limiter import CachedTokenCounter, create_token_counter_wrapper
+from ra_aid.config import DEFAULT_MODEL
+
+
+def synthesize_trajectory(count: int = 500) -> List[BaseMessage]:
+    """
+    Build a react-agent style trajectory of tool calls and results.
+
+    Args:
+        count: Number of messages to produce
+
+    Returns:
+        List[BaseMessage]: System prompt, task, then alternating tool calls and results
+    """
+    messages: List[BaseMessage] = [
+        SystemMessage(content="You are an autonomous software engineering agent. " * 40),
+        HumanMessage(content="Implement the requested feature and update the tests."),
+    ]
+    step = 0
+    while len(messages) < count:
+        call_id = f"call_{step}"
+        messages.append(
+            AIMessage(
+                content=f"Step {step}: reading the next file to understand the code.",
+                tool_calls=[
+                    {"name": "read_file_tool", "args": {"filepath": f"src/mod_{step}.py"}, "id": call_id}
+                ],
+            )
+        )
+        messages.append(
+            ToolMessage(
+                content="".join(
+                    f"def function_{step}_{i}(value):\n    return value * {i}\n\n" for i in range(20)
+                ),
+                tool_call_id=call_id,
+            )
+        )
+        step += 1
+    return messages[:count]
+
+
+def _replay(
+    messages: List[BaseMessage], token_counter, max_tokens: int, steps: List[int]
+) -> float:
+    """Return the mean seconds per step spent trimming at the given steps."""
+    start = time.perf_counter()
+    for step in steps:
+        anthropic_trim_messages(
+            messages[:step],
+            token_counter=token_counter,
+            max_tokens=max_tokens,
+            strategy="last",
+            allow_partial=False,
+            include_system=True,
+            num_messages_to_keep=2,
+        )
+    return (time.perf_counter() - start) / len(steps)
+
+
+def run_benchmark(
+    messages: List[BaseMessage],
+    model: str = DEFAULT_MODEL,
+    max_tokens: int = 20_000,
+    stride: int = 25,
+) -> Dict[str, Any]:
+    """
+    Replay a trajectory with uncached and cached token counting.
+
+    Args:
+        messages: The trajectory to replay
+        model: Model name passed to litellm's token counter
+        max_tokens: Token limit used for trimming at each step
+        stride: Time the uncached counter on every stride-th step only
+
+    Returns:
+        Dict[str, Any]: Mean time per step for both counters and the cached counter's stats
+    """
+    all_steps = list(range(1, len(messages) + 1))
+    sampled_steps = all_steps[stride - 1 :: stride] or all_steps[-1:]
+    uncached = _replay(
+        messages, create_token_counter_wrapper(model, cached=False), max_tokens, sampled_steps
+    )
+    counter = CachedTokenCounter(model)
+    cached = _replay(messages, counter, max_tokens, all_steps)
+    # Mean over the same steps as the uncached run, with every earlier step already cached
+    cached_sampled = _replay(messages, counter, max_tokens, sampled_steps)
+    return {
+        "messages": len(messages),
+        "model": model,
+        "max_tokens": max_tokens,
+        "uncached_ms_per_step": round(uncached * 1000, 3),
+        "cached_ms_per_step": round(cached * 1000, 3),
+        "speedup": round(uncached / cached_sampled, 1) if cached_sampled else None,
+        "cache": counter.stats(),
+    }
+
+
+def _load_messages(path: Optional[str], count: int) -> List[BaseMessage]:
+    if not path:
+        return synthesize_trajectory(count)
+    with open(path, encoding="utf-8") as f:
+        return messages_from_dict(json.load(f))[:count]
+
+
+def main():
+    """Command-line entry point for the token counter benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark cached vs uncached token counting during trimming"
+    )
+    parser.add_argument("--messages", help="JSON file of messages from messages_to_dict")
+    parser.add_argument("--count", type=int, default=500, help="Number of messages to replay")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model name for token counting")
+    parser.add_argument("--max-tokens", type=int, default=20_000, help="Token limit for trimming")
+    parser.add_argument(
+        "--stride", type=int, default=25, help="Time uncached counting on every Nth step"
+    )
+    args = parser.parse_args()
+
+    messages = _load_messages(args.messages, args.count)
+    print(json.dumps(run_benchmark(messages, args.model, args.max_tokens, args.stride), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark the create_react_agent tool node on a recorded multi-call message.
+
+Replays one AIMessage with several tool calls, as recorded from a research
+agent step, through:
+
+- sequential: each call in turn, as with max_parallel_tool_calls = 1
+- concurrent: ConcurrentToolNode with --workers threads
+
+The tools are stand-ins that take as long as the recorded calls did (sleeping,
+like the subprocesses and file reads they replace, releases the GIL), so the
+timings isolate how the node schedules calls. A trajectory of your own can be
+replayed with --trajectory, a JSON list of {"name", "args", "duration_ms"}.
+
+Each timing is the best of --runs, in milliseconds.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_tool_node [--workers N] [--runs N] [--trajectory FILE]
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+
+from ra_aid.agent_backends.concurrent_tool_node import ConcurrentToolNode
+from ra_aid.tool_configs import SIDE_EFFECT_FREE_TOOLS
+
+# Tool calls of one research step: a search, reads of the matching files, a
+# tree listing, then a note recording what was found
+RECORDED_TRAJECTORY: List[Dict[str, Any]] = [
+    {"name": "ripgrep_search", "args": {"pattern": "def create_agent"}, "duration_ms": 85},
+    {"name": "read_file_tool", "args": {"filepath": "ra_aid/agent_utils.py"}, "duration_ms": 35},
+    {"name": "read_file_tool", "args": {"filepath": "ra_aid/llm.py"}, "duration_ms": 30},
+    {"name": "fuzzy_find_project_files", "args": {"search_term": "tool_node"}, "duration_ms": 120},
+    {"name": "list_directory_tree", "args": {"path": "ra_aid/agent_backends"}, "duration_ms": 60},
+    {"name": "read_file_tool", "args": {"filepath": "ra_aid/tool_configs.py"}, "duration_ms": 25},
+    {"name": "emit_key_facts", "args": {"facts": ["create_agent builds the react agent"]}, "duration_ms": 15},
+]
+
+
+def _replay_tool(name: str, duration_ms: float) -> StructuredTool:
+    def replay(**kwargs: Any) -> str:
+        time.sleep(duration_ms / 1000)
+        return f"{name} done"
+
+    return StructuredTool.from_function(replay, name=name, description=f"Replays {name}")
+
+
+def build_replay(trajectory: List[Dict[str, Any]]):
+    """
+    Build the replay tools and the message calling them.
+
+    Args:
+        trajectory: Recorded calls with name, args and duration_ms
+
+    Returns:
+        Tuple of the tools and the AIMessage with one tool call per record
+    """
+    tools = {}
+    calls = []
+    for i, record in enumerate(trajectory):
+        # One stand-in per tool name; calls to the same tool share its recorded latency
+        tools.setdefault(record["name"], _replay_tool(record["name"], record["duration_ms"]))
+        calls.append({"name": record["name"], "args": record.get("args", {}), "id": f"call_{i}"})
+    return list(tools.values()), AIMessage(content="", tool_calls=calls)
+
+
+def _best_ms(node: ConcurrentToolNode, message: AIMessage, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        node.invoke([message])
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 1)
+
+
+def run_benchmark(
+    workers: int = 4, runs: int = 5, trajectory: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Time the recorded message through the sequential and concurrent tool nodes.
+
+    Args:
+        workers: Threads for concurrent read-only calls
+        runs: Timed runs per node
+        trajectory: Recorded calls to replay; RECORDED_TRAJECTORY when None
+
+    Returns:
+        Dict[str, Any]: Call counts, per-node timings and the speedup
+    """
+    trajectory = trajectory or RECORDED_TRAJECTORY
+    tools, message = build_replay(trajectory)
+    sequential_ms = _best_ms(ConcurrentToolNode(tools, max_workers=1), message, runs)
+    concurrent_ms = _best_ms(ConcurrentToolNode(tools, max_workers=workers), message, runs)
+    return {
+        "tool_calls": len(trajectory),
+        "read_only_calls": sum(record["name"] in SIDE_EFFECT_FREE_TOOLS for record in trajectory),
+        "recorded_ms": sum(record["duration_ms"] for record in trajectory),
+        "workers": workers,
+        "sequential_ms": sequential_ms,
+        "concurrent_ms": concurrent_ms,
+        "speedup": round(sequential_ms / concurrent_ms, 2),
+    }
+
+
+def main():
+    """Command-line entry point for the tool node benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent tool call execution")
+    parser.add_argument("--workers", type=int, default=4, help="Threads for read-only calls")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per node")
+    parser.add_argument("--trajectory", help="JSON file of recorded calls to replay")
+    args = parser.parse_args()
+
+    trajectory = None
+    if args.trajectory:
+        with open(args.trajectory) as f:
+            trajectory = json.load(f)
+
+    print(json.dumps(run_benchmark(args.workers, args.runs, trajectory), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Benchmark session trajectory queries on a large database.
+
+Builds a SQLite database with --rows trajectory records spread over --sessions
+sessions, then times the session-scoped repository queries before and after
+adding the composite (session_id, created_at) and (session_id, record_type)
+indexes (the foreign key index on session_id alone exists in both runs):
+
+- full: get_trajectories_by_session for one session
+- offset_page: a late page fetched with LIMIT/OFFSET
+- keyset_page: the same page fetched with get_trajectories_by_session_page
+- stream: iter_trajectories_by_session over the whole session
+- usage_totals: get_session_usage_totals
+
+Each timing is the best of --runs, in milliseconds.
+
+Usage:
+    python -m ra_aid.scripts.benchmark_trajectory_queries [--rows N] [--sessions N] [--db FILE]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional
+
+import peewee
+
+from ra_aid.database.models import HumanInput, Session, Trajectory
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+
+_INDEXES = {
+    "trajectory_session_id_created_at": ("session_id", "created_at"),
+    "trajectory_session_id_record_type": ("session_id", "record_type"),
+}
+_RECORD_TYPES = ("tool_execution", "model_usage", "stage_transition")
+_INSERT_BATCH = 10_000
+
+
+def populate(db: peewee.SqliteDatabase, rows: int, sessions: int) -> None:
+    """
+    Create the tables and insert synthetic trajectory records.
+
+    Records are interleaved across sessions the way concurrent agent runs
+    would write them, so one session's rows are scattered through the table.
+
+    Args:
+        db: Database bound to the trajectory models
+        rows: Number of trajectory records to insert
+        sessions: Number of sessions the records are spread over
+    """
+    db.create_tables([Session, HumanInput, Trajectory])
+    for name in _INDEXES:
+        db.execute_sql(f'DROP INDEX IF EXISTS "{name}"')
+    with db.atomic():
+        Session.insert_many([{"id": i + 1} for i in range(sessions)]).execute()
+
+    start = datetime.datetime(2025, 1, 1)
+    fields = [
+        Trajectory.session,
+        Trajectory.created_at,
+        Trajectory.updated_at,
+        Trajectory.tool_name,
+        Trajectory.tool_parameters,
+        Trajectory.record_type,
+        Trajectory.input_tokens,
+        Trajectory.output_tokens,
+        Trajectory.current_cost,
+        Trajectory.is_error,
+    ]
+    for offset in range(0, rows, _INSERT_BATCH):
+        batch = []
+        for i in range(offset, min(offset + _INSERT_BATCH, rows)):
+            created_at = start + datetime.timedelta(milliseconds=i)
+            batch.append(
+                (
+                    i % sessions + 1,
+                    created_at,
+                    created_at,
+                    f"tool_{i % 17}",
+                    json.dumps({"step": i}),
+                    _RECORD_TYPES[i % len(_RECORD_TYPES)],
+                    100,
+                    20,
+                    0.001,
+                    False,
+                )
+            )
+        with db.atomic():
+            Trajectory.insert_many(batch, fields=fields).execute()
+
+
+def add_indexes(db: peewee.SqliteDatabase) -> None:
+    """Create the composite session indexes and refresh planner statistics."""
+    for name, columns in _INDEXES.items():
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        db.execute_sql(f'CREATE INDEX IF NOT EXISTS "{name}" ON "trajectory" ({column_list})')
+    db.execute_sql('ANALYZE "trajectory"')
+
+
+def _best_ms(fn: Callable[[], Any], runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def time_queries(
+    repo: TrajectoryRepository, session_id: int, page_size: int, runs: int
+) -> Dict[str, float]:
+    """
+    Time the session queries against the current schema.
+
+    Args:
+        repo: Repository to query through
+        session_id: Session whose history is read
+        page_size: Records per page for the paginated queries
+        runs: Timed runs per query
+
+    Returns:
+        Dict[str, float]: Best time in milliseconds per query
+    """
+    session_rows = Trajectory.select().where(Trajectory.session == session_id).count()
+    late_offset = max(session_rows - page_size, 0)
+    # Cursor of the row just before the late page, as the previous page would return it
+    cursor = None
+    if late_offset:
+        previous = (
+            Trajectory.select(Trajectory.created_at, Trajectory.id)
+            .where(Trajectory.session == session_id)
+            .order_by(Trajectory.created_at, Trajectory.id)
+            .offset(late_offset - 1)
+            .limit(1)
+            .get()
+        )
+        cursor = (previous.created_at, previous.id)
+
+    def offset_page():
+        return [
+            repo._to_model(t)
+            for t in Trajectory.select()
+            .where(Trajectory.session == session_id)
+            .order_by(Trajectory.created_at, Trajectory.id)
+            .offset(late_offset)
+            .limit(page_size)
+        ]
+
+    return {
+        "full": _best_ms(lambda: repo.get_trajectories_by_session(session_id), runs),
+        "offset_page": _best_ms(offset_page, runs),
+        "keyset_page": _best_ms(
+            lambda: repo.get_trajectories_by_session_page(session_id, page_size, cursor), runs
+        ),
+        "stream": _best_ms(
+            lambda: sum(1 for _ in repo.iter_trajectories_by_session(session_id)), runs
+        ),
+        "usage_totals": _best_ms(lambda: repo.get_session_usage_totals(session_id), runs),
+    }
+
+
+def run_benchmark(
+    rows: int = 1_000_000,
+    sessions: int = 100,
+    page_size: int = 100,
+    runs: int = 3,
+    path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build the database and time the session queries with and without indexes.
+
+    Args:
+        rows: Number of trajectory records to insert
+        sessions: Number of sessions the records are spread over
+        page_size: Records per page for the paginated queries
+        runs: Timed runs per query
+        path: Database file to create; a temporary file is used when None
+
+    Returns:
+        Dict[str, Any]: Setup times and per-query timings before and after indexing
+    """
+    tmpdir = None
+    if path is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, "trajectories.db")
+    db = peewee.SqliteDatabase(path, pragmas={"journal_mode": "wal", "synchronous": "off"})
+    try:
+        with db.bind_ctx([Session, HumanInput, Trajectory]):
+            start = time.perf_counter()
+            populate(db, rows, sessions)
+            populate_s = time.perf_counter() - start
+
+            repo = TrajectoryRepository(db, async_writes=False)
+            session_id = sessions // 2 + 1
+            before = time_queries(repo, session_id, page_size, runs)
+
+            start = time.perf_counter()
+            add_indexes(db)
+            index_s = time.perf_counter() - start
+            after = time_queries(repo, session_id, page_size, runs)
+    finally:
+        db.close()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    return {
+        "rows": rows,
+        "sessions": sessions,
+        "rows_per_session": rows // sessions,
+        "page_size": page_size,
+        "populate_s": round(populate_s, 2),
+        "create_indexes_s": round(index_s, 2),
+        "without_indexes_ms": before,
+        "with_indexes_ms": after,
+        "speedup": {
+            name: round(before[name] / after[name], 1) if after[name] else None
+            for name in before
+        },
+    }
+
+
+def main():
+    """Command-line entry point for the trajectory query benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark session trajectory queries with and without indexes"
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Trajectory records to insert")
+    parser.add_argument("--sessions", type=int, default=100, help="Sessions to spread records over")
+    parser.add_argument("--page-size", type=int, default=100, help="Records per page")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per query")
+    parser.add_argument("--db", help="Database file to create (default: a temporary file)")
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            run_benchmark(args.rows, args.sessions, args.page_size, args.runs, args.db),
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+API v1 Metrics Endpoint.
+
+This module reports the server process's LLM performance for capacity
+planning: p50/p95 latency, time to first token and throughput of recent calls
+by model and agent type, along with provider rate limiter and client pool usage.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Query, status
+from pydantic import BaseModel
+
+from ra_aid.callbacks.latency_metrics import get_latency_metrics
+from ra_aid.llm_client_pool import get_llm_client_pool
+from ra_aid.rate_limiter import rate_limiter_stats
+
+# Create API router
+router = APIRouter(
+    prefix="/v1/metrics",
+    tags=["metrics"],
+    responses={
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error"},
+    },
+)
+
+
+class LatencySummaryModel(BaseModel):
+    """
+    Pydantic model for the latency of recent LLM calls of one model and agent type.
+
+    Durations are in seconds. Time to first token is only known for streamed
+    calls, and throughput only for calls reporting output token usage, so
+    their percentiles may be None.
+
+    Attributes:
+        model: Model name
+        agent_type: Agent type the calls were made for
+        calls: Number of calls recorded since the server started
+    """
+
+    model: str
+    agent_type: str
+    calls: int
+    duration_p50: Optional[float] = None
+    duration_p95: Optional[float] = None
+    time_to_first_token_p50: Optional[float] = None
+    time_to_first_token_p95: Optional[float] = None
+    tokens_per_second_p50: Optional[float] = None
+    tokens_per_second_p95: Optional[float] = None
+
+
+class MetricsResponse(BaseModel):
+    """
+    Pydantic model for metrics responses.
+
+    Attributes:
+        llm_latency: Latency summaries by model and agent type
+        rate_limiters: Request, throttling and wait counts per provider
+        llm_client_pool: Client reuse counts and construction time saved
+    """
+
+    llm_latency: List[LatencySummaryModel]
+    rate_limiters: List[Dict[str, Any]]
+    llm_client_pool: Dict[str, Any]
+
+
+@router.get(
+    "",
+    response_model=MetricsResponse,
+    summary="LLM performance metrics",
+    description="Latency percentiles, rate limiting and client reuse of this server's LLM calls",
+)
+async def get_metrics(
+    model: Optional[str] = Query(None, description="Only report this model"),
+    agent_type: Optional[str] = Query(None, description="Only report this agent type"),
+) -> MetricsResponse:
+    """
+    Get LLM performance metrics.
+
+    Args:
+        model: Optional model to restrict latency summaries to
+        agent_type: Optional agent type to restrict latency summaries to
+
+    Returns:
+        MetricsResponse: Current metrics of the server process
+    """
+    return MetricsResponse(
+        llm_latency=get_latency_metrics().snapshot(model=model, agent_type=agent_type),
+        rate_limiters=rate_limiter_stats(),
+        llm_client_pool=get_llm_client_pool().stats(),
+    )
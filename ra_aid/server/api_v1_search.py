@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+API v1 Search Endpoint.
+
+This module provides full-text search across past sessions: the tool names,
+parameters, results and errors of trajectories, and the content of human
+inputs, backed by the SQLite FTS5 search index.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+import peewee
+from pydantic import BaseModel
+
+from ra_aid.database.pydantic_models import SearchResultModel
+from ra_aid.database.search_index import ORDER_RANK, ORDER_RECENT
+from ra_aid.database.repositories.human_input_repository import (
+    HumanInputRepository,
+    get_human_input_repository,
+)
+from ra_aid.database.repositories.trajectory_repository import (
+    TrajectoryRepository,
+    get_trajectory_repository,
+)
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Create API router
+router = APIRouter(
+    prefix="/v1/search",
+    tags=["search"],
+    responses={
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Database error"},
+    },
+)
+
+
+class SearchKind(str, Enum):
+    """Which records a search covers."""
+
+    ALL = "all"
+    TRAJECTORY = "trajectory"
+    HUMAN_INPUT = "human_input"
+
+
+class SearchOrder(str, Enum):
+    """How search results are ordered."""
+
+    RECENT = ORDER_RECENT
+    RANK = ORDER_RANK
+
+
+class SearchResponse(BaseModel):
+    """
+    Pydantic model for search responses.
+
+    Attributes:
+        query: The search text that was used
+        results: Matches from the requested record kinds, in the requested order
+    """
+
+    query: str
+    results: List[SearchResultModel]
+
+
+@router.get(
+    "",
+    response_model=SearchResponse,
+    summary="Search sessions",
+    description="Full-text search over trajectories and human inputs",
+)
+async def search(
+    q: str = Query(..., min_length=1, description="Search words; all must match, a trailing * matches a prefix"),
+    kind: SearchKind = Query(SearchKind.ALL, description="Which records to search"),
+    session_id: Optional[int] = Query(None, description="Only search this session"),
+    record_type: Optional[str] = Query(None, description="Only search trajectories of this record type"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of results"),
+    order: SearchOrder = Query(
+        SearchOrder.RECENT,
+        description="'recent' for newest first, or 'rank' for best match first (slower for common words)",
+    ),
+    trajectory_repo: TrajectoryRepository = Depends(get_trajectory_repository),
+    human_input_repo: HumanInputRepository = Depends(get_human_input_repository),
+) -> SearchResponse:
+    """
+    Search trajectories and human inputs.
+
+    Trajectory and human input matches are merged newest first, or, ordered by
+    rank, alternately from each kind in its own rank order: BM25 scores from the
+    two search indexes are not comparable, and matches found without the index
+    have no rank at all. A record_type filter only applies to trajectories, so
+    it excludes human inputs.
+
+    Args:
+        q: Search words
+        kind: Which records to search
+        session_id: Optional session to restrict the search to
+        record_type: Optional trajectory record type to restrict the search to
+        limit: Maximum number of results
+        order: Whether to list the newest or the best matches first
+        trajectory_repo: TrajectoryRepository dependency injection
+        human_input_repo: HumanInputRepository dependency injection
+
+    Returns:
+        SearchResponse: The first `limit` matches in the requested order
+
+    Raises:
+        HTTPException: With a 422 status code if the query has no searchable words
+        HTTPException: With a 500 status code if there's a database error
+    """
+    try:
+        trajectory_results: List[SearchResultModel] = []
+        human_input_results: List[SearchResultModel] = []
+        if kind in (SearchKind.ALL, SearchKind.TRAJECTORY):
+            trajectory_results = trajectory_repo.search(
+                q, session_id=session_id, record_type=record_type, limit=limit, order=order.value
+            )
+        if kind in (SearchKind.ALL, SearchKind.HUMAN_INPUT) and record_type is None:
+            human_input_results = human_input_repo.search(
+                q, session_id=session_id, limit=limit, order=order.value
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except peewee.DatabaseError as e:
+        logger.error(f"Database error searching for {q!r}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+
+    if order == SearchOrder.RANK:
+        results = _interleave(trajectory_results, human_input_results)
+    else:
+        results = trajectory_results + human_input_results
+        results.sort(key=lambda result: result.created_at or datetime.min, reverse=True)
+    return SearchResponse(query=q, results=results[:limit])
+
+
+def _interleave(*result_lists: List[SearchResultModel]) -> List[SearchResultModel]:
+    """Alternate between result lists, keeping each list's own order."""
+    merged = []
+    for position in range(max((len(results) for results in result_lists), default=0)):
+        merged.extend(results[position] for results in result_lists if position < len(results))
+    return merged
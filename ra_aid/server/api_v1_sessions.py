@@ -7,13 +7,22 @@ It implements routes for creating, listing, and retrieving sessions
 with proper validation and error handling.
 """
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import base64
+import binascii
+import datetime
+from typing import AsyncIterator, List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 import peewee
 from pydantic import BaseModel, Field
 
 from ra_aid.database.repositories.session_repository import SessionRepository, get_session_repository
-from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository, get_trajectory_repository
+from ra_aid.database.repositories.trajectory_repository import (
+    TrajectoryCursor,
+    TrajectoryRepository,
+    get_trajectory_repository,
+)
 from ra_aid.database.pydantic_models import SessionModel, TrajectoryModel
 from ra_aid.utils.agent_thread_manager import stop_agent, is_agent_running
 
@@ -75,6 +84,61 @@ class PaginatedSessionResponse(PaginatedResponse):
     items: List[SessionModel]
 
 
+class TrajectoryPageResponse(BaseModel):
+    """
+    Pydantic model for keyset-paginated trajectory responses.
+
+    Attributes:
+        items: Trajectory records of the current page, in created_at order
+        next_cursor: Opaque cursor for the next page, or None on the last page
+        limit: The limit parameter that was used
+    """
+    items: List[TrajectoryModel]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+def encode_cursor(cursor: Optional[TrajectoryCursor]) -> Optional[str]:
+    """
+    Encode a trajectory repository cursor as an opaque, URL-safe string.
+
+    Args:
+        cursor: The (created_at, id) cursor, or None
+
+    Returns:
+        Optional[str]: The encoded cursor, or None if cursor is None
+    """
+    if cursor is None:
+        return None
+    created_at, trajectory_id = cursor
+    raw = f"{created_at.isoformat()}|{trajectory_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> TrajectoryCursor:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: The encoded cursor
+
+    Returns:
+        TrajectoryCursor: The (created_at, id) cursor
+
+    Raises:
+        HTTPException: With a 422 status code if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, trajectory_id = raw.rsplit("|", 1)
+        return datetime.datetime.fromisoformat(created_at), int(trajectory_id)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor",
+        )
+
+
 # Dependency to get the session repository
 def get_repository() -> SessionRepository:
     """
@@ -289,6 +353,124 @@ async def get_session_trajectories(
         )
 
 
+@router.get(
+    "/{session_id}/trajectory/page",
+    response_model=TrajectoryPageResponse,
+    summary="Get a page of session trajectories",
+    description="Get trajectory records of a session one keyset-paginated page at a time",
+)
+async def get_session_trajectory_page(
+    session_id: int,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    session_repo: SessionRepository = Depends(get_repository),
+    trajectory_repo: TrajectoryRepository = Depends(get_trajectory_repository),
+) -> TrajectoryPageResponse:
+    """
+    Get one page of trajectory records for a specific session.
+
+    Pages follow each other by cursor rather than offset, so late pages of a
+    long session are as cheap to fetch as the first one.
+
+    Args:
+        session_id: The ID of the session to get trajectories for
+        limit: Maximum number of records to return (default: 100)
+        cursor: Cursor from the previous page, or None for the first page
+        session_repo: SessionRepository dependency injection
+        trajectory_repo: TrajectoryRepository dependency injection
+
+    Returns:
+        TrajectoryPageResponse: The records and the cursor for the next page
+
+    Raises:
+        HTTPException: With a 404 status code if the session is not found
+        HTTPException: With a 422 status code if the cursor is malformed
+        HTTPException: With a 500 status code if there's a database error
+    """
+    after = decode_cursor(cursor) if cursor else None
+    try:
+        if not session_repo.get(session_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Session with ID {session_id} not found",
+            )
+        items, next_cursor = trajectory_repo.get_trajectories_by_session_page(
+            session_id, limit=limit, after=after
+        )
+        return TrajectoryPageResponse(
+            items=items,
+            next_cursor=encode_cursor(next_cursor),
+            limit=limit,
+        )
+    except peewee.DatabaseError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+
+
+@router.get(
+    "/{session_id}/trajectory/stream",
+    summary="Stream session trajectories",
+    description="Stream all trajectory records of a session as newline-delimited JSON",
+    response_class=StreamingResponse,
+)
+async def stream_session_trajectories(
+    session_id: int,
+    batch_size: int = Query(500, ge=1, le=5000, description="Records read per database query"),
+    session_repo: SessionRepository = Depends(get_repository),
+    trajectory_repo: TrajectoryRepository = Depends(get_trajectory_repository),
+) -> StreamingResponse:
+    """
+    Stream all trajectory records for a specific session.
+
+    Records are read in batches and written one JSON object per line as they
+    are read, so neither the server nor the client holds the full history.
+
+    Args:
+        session_id: The ID of the session to get trajectories for
+        batch_size: Number of records read from the database per query
+        session_repo: SessionRepository dependency injection
+        trajectory_repo: TrajectoryRepository dependency injection
+
+    Returns:
+        StreamingResponse: application/x-ndjson response with one record per line
+
+    Raises:
+        HTTPException: With a 404 status code if the session is not found
+        HTTPException: With a 500 status code if there's a database error
+    """
+    try:
+        if not session_repo.get(session_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Session with ID {session_id} not found",
+            )
+        # Read the first batch up front so database errors still produce a 500
+        first_page, cursor = trajectory_repo.get_trajectories_by_session_page(
+            session_id, limit=batch_size
+        )
+    except peewee.DatabaseError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+
+    async def generate() -> AsyncIterator[bytes]:
+        page, next_cursor = first_page, cursor
+        while True:
+            yield "".join(item.model_dump_json() + "\n" for item in page).encode("utf-8")
+            if next_cursor is None:
+                return
+            # Let other requests run between batches
+            await asyncio.sleep(0)
+            page, next_cursor = trajectory_repo.get_trajectories_by_session_page(
+                session_id, limit=batch_size, after=next_cursor
+            )
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.delete(
     "/{session_id}",
     status_code=status.HTTP_204_NO_CONTENT,
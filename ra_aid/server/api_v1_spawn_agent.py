@@ -25,6 +25,7 @@ from ra_aid.llm import initialize_llm, get_model_default_temperature
 from ra_aid.server.broadcast_sender import send_broadcast
 from ra_aid.utils.agent_thread_manager import agent_thread_registry, has_received_stop_signal, register_agent, \
     unregister_agent
+from ra_aid.utils.gc_scheduler import gc_scheduler, run_pending_gc
 
 # Create logger
 logger = logging.getLogger(__name__)
@@ -96,6 +97,7 @@ def run_agent_thread(
 
     final_status = 'completed'  # Default final status
     session_repo_instance = None # To hold the repo instance for finally block
+    config_repo_instance = None # Owner of the session's queued memory GC
 
     try:
         # Initialize database connection
@@ -124,6 +126,7 @@ def run_agent_thread(
             logger.debug(f"Context managers initialized for session_id={session_id}")
 
             session_repo_instance = session_repo # Keep reference for finally block
+            config_repo_instance = config_repo
 
             # Register broadcast hook for new trajectories
             trajectory_repo.register_create_hook(send_broadcast)
@@ -147,7 +150,7 @@ def run_agent_thread(
             # ---> Update status to running and broadcast <--- END
 
             # Import here to avoid circular imports
-            from ra_aid.__main__ import run_research_agent
+            from ra_aid.agents.research_agent import run_research_agent
 
             # Get configuration values from config repository
             provider = config_repo.get("provider", "anthropic")
@@ -260,6 +263,8 @@ def run_agent_thread(
                 thread_id=thread_id_str, # run_research_agent might expect string thread_id
                 session_id=session_id,  # Pass integer session_id
             )
+            # Finish queued memory GC while the repositories are open
+            run_pending_gc()
             logger.info(f"Agent execution completed successfully for session {session_id}.")
             # --- > Agent Execution Logic <--- END
 
@@ -289,6 +294,10 @@ def run_agent_thread(
             except Exception as final_update_e:
                  logger.error(f"Failed to update/broadcast final status for session {session_id}: {final_update_e}")
 
+            # Drop memory GC left queued by a failed or halted run
+            if config_repo_instance:
+                gc_scheduler.discard_pending(config_repo_instance)
+
             # Unregister the agent thread from the global registry
             unregister_agent(session_id)
         else:
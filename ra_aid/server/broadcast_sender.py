@@ -1,11 +1,14 @@
+import asyncio
 import queue
 import logging
-from typing import Any
+from typing import Any, Callable, Dict, Optional
 from ra_aid.database.pydantic_models import TrajectoryModel  # Import TrajectoryModel
 
 logger = logging.getLogger(__name__)
 
 _broadcast_queue: queue.Queue | None = None
+_broadcast_loop: Optional[asyncio.AbstractEventLoop] = None
+_broadcast_dispatch: Optional[Callable[[Dict[str, Any]], None]] = None
 
 def set_broadcast_queue(queue_instance: queue.Queue):
     """Sets the global broadcast queue instance for this module."""
@@ -13,23 +16,54 @@ def set_broadcast_queue(queue_instance: queue.Queue):
     _broadcast_queue = queue_instance
     logger.info("Broadcast queue set in broadcast_sender.")
 
+def set_broadcast_loop(
+    loop: Optional[asyncio.AbstractEventLoop],
+    dispatch: Optional[Callable[[Dict[str, Any]], None]] = None,
+):
+    """Hands broadcasts straight to an event loop instead of a queue.
+
+    send_broadcast schedules dispatch(wrapper) on the loop with
+    call_soon_threadsafe, so agent threads never block on delivery and the
+    loop does not have to poll for messages. Pass None to unset.
+    """
+    global _broadcast_loop, _broadcast_dispatch
+    _broadcast_loop = loop
+    _broadcast_dispatch = dispatch if loop is not None else None
+    logger.info("Broadcast loop %s in broadcast_sender.", "set" if loop else "cleared")
+
+def _deliver(wrapper: Dict[str, Any]):
+    loop, dispatch = _broadcast_loop, _broadcast_dispatch
+    if loop is not None and dispatch is not None:
+        try:
+            loop.call_soon_threadsafe(dispatch, wrapper)
+            return
+        except RuntimeError:
+            # The loop has been closed; fall back to the queue if there is one
+            if _broadcast_queue is None:
+                logger.debug("Broadcast loop closed; dropping message.")
+                return
+    if _broadcast_queue is None:
+        raise RuntimeError("Broadcast queue not initialized")
+    _broadcast_queue.put(wrapper)
+
 def send_broadcast(message: Any):
-    """Puts a message onto the WebSocket broadcast queue.
+    """Hands a message to the WebSocket broadcaster.
 
     If the message is a dictionary containing 'type' and 'payload' keys,
-    it is put directly onto the queue. Otherwise, it determines the type,
-    wraps the message in a standard structure {'type': ..., 'payload': ...},
-    and then puts it onto the queue.
+    it is delivered as is. Otherwise, it determines the type, wraps the
+    message in a standard structure {'type': ..., 'payload': ...}, and
+    delivers the wrapper. Messages go to the event loop set with
+    set_broadcast_loop, or else onto the broadcast queue.
     """
-    if _broadcast_queue is None:
+    if _broadcast_queue is None and _broadcast_loop is None:
         raise RuntimeError("Broadcast queue not initialized")
 
     # Check if the message is already structured
     if isinstance(message, dict) and 'type' in message and 'payload' in message:
-        _broadcast_queue.put(message)
+        _deliver(message)
         # Use f-string for cleaner logging and access the type safely
         msg_type = message.get('type', 'unknown')
-        logger.debug(f"Pre-structured message with type '{msg_type}' put directly onto broadcast queue.")
+        logger.debug(f"Pre-structured message with type '{msg_type}' handed to broadcaster.")
         return  # Exit early as the message is already processed
 
     # Original logic for non-pre-structured messages
@@ -45,5 +79,5 @@ def send_broadcast(message: Any):
             pass
 
     wrapper = {'type': message_type, 'payload': message}
-    _broadcast_queue.put(wrapper)
-    logger.debug(f"Wrapped message with type '{message_type}' put onto broadcast queue.")
+    _deliver(wrapper)
+    logger.debug(f"Wrapped message with type '{message_type}' handed to broadcaster.")
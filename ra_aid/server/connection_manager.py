@@ -1,30 +1,191 @@
+import asyncio
 import logging
-from typing import List
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional
 
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+# Messages a client may have waiting before the overflow policy applies.
+DEFAULT_CLIENT_QUEUE_SIZE = 256
+
+# Overflow policies for a full client queue.
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class ClientConnection:
+    """
+    A websocket client with its own bounded send queue and sender task.
+
+    Each client is fed by its own task, so a slow client only delays its own
+    messages. Messages sharing a coalesce key replace each other while still
+    queued, so a backed-up client receives only the latest state for that key.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue_size: int = DEFAULT_CLIENT_QUEUE_SIZE,
+        overflow: str = DROP_OLDEST,
+    ):
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        # Entries are [coalesce_key, message] lists so coalescing can update them in place
+        self._pending: Deque[List[Any]] = deque()
+        self._keyed: Dict[Hashable, List[Any]] = {}
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be sent."""
+        return len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def enqueue(self, message: str, coalesce_key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a message for this client without waiting.
+
+        Args:
+            message: Serialized message text
+            coalesce_key: Messages with the same key replace each other while queued
+
+        Returns:
+            bool: False if the message was dropped
+        """
+        if self._closed:
+            return False
+        if coalesce_key is not None:
+            entry = self._keyed.get(coalesce_key)
+            if entry is not None:
+                entry[1] = message
+                self.coalesced += 1
+                return True
+        if len(self._pending) >= self.max_queue_size:
+            self.dropped += 1
+            if self.overflow == DROP_NEWEST:
+                return False
+            oldest = self._pending.popleft()
+            if oldest[0] is not None and self._keyed.get(oldest[0]) is oldest:
+                del self._keyed[oldest[0]]
+        entry = [coalesce_key, message]
+        self._pending.append(entry)
+        if coalesce_key is not None:
+            self._keyed[coalesce_key] = entry
+        self._ready.set()
+        return True
+
+    async def run(self) -> None:
+        """Send queued messages until the client fails or is closed."""
+        try:
+            while not self._closed:
+                if not self._pending:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                entry = self._pending.popleft()
+                if entry[0] is not None and self._keyed.get(entry[0]) is entry:
+                    del self._keyed[entry[0]]
+                await self.websocket.send_text(entry[1])
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to send message to client {self.websocket.client}: {e}")
+        finally:
+            self._closed = True
+
+    def close(self) -> None:
+        """Stop the sender task and discard queued messages."""
+        self._closed = True
+        self._pending.clear()
+        self._keyed.clear()
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_CLIENT_QUEUE_SIZE,
+        overflow: str = DROP_OLDEST,
+    ):
+        if overflow not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, self.max_queue_size, self.overflow)
+        client.task = asyncio.create_task(client.run())
+        self.clients[websocket] = client
 
     def disconnect(self, websocket: WebSocket):
-        try:
-            self.active_connections.remove(websocket)
-        except ValueError:
-            # WebSocket might already be removed, ignore
-            pass
-
-    async def broadcast(self, message: str):
-        # Iterate over a copy in case disconnect happens during broadcast
-        for connection in self.active_connections[:]:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Failed to send message to client {connection.client}: {e}")
-                # Disconnect logic should handle cleanup, don't remove here
+        client = self.clients.pop(websocket, None)
+        if client is not None:
+            # WebSocket might already be removed, ignore otherwise
+            client.close()
+
+    def publish(self, message: str, coalesce_key: Optional[Hashable] = None) -> int:
+        """
+        Queue an already serialized message for every client without waiting.
+
+        Must be called from the event loop thread.
+
+        Args:
+            message: Serialized message text, shared by all clients
+            coalesce_key: Optional key letting a newer message replace a queued one
+
+        Returns:
+            int: Number of clients the message was queued for
+        """
+        queued = 0
+        # Iterate over a copy in case disconnect happens during publish
+        for websocket, client in list(self.clients.items()):
+            if client.closed:
+                # The sender failed; the endpoint's disconnect may not have run yet
+                self.clients.pop(websocket, None)
+                continue
+            if client.enqueue(message, coalesce_key):
+                queued += 1
+        return queued
+
+    async def broadcast(self, message: str, coalesce_key: Optional[Hashable] = None):
+        self.publish(message, coalesce_key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-manager delivery counters for monitoring slow clients."""
+        clients = list(self.clients.values())
+        return {
+            "clients": len(clients),
+            "pending": sum(client.pending for client in clients),
+            "sent": sum(client.sent for client in clients),
+            "dropped": sum(client.dropped for client in clients),
+            "coalesced": sum(client.coalesced for client in clients),
+        }
+
+    async def close(self):
+        """Stop every client's sender task."""
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            client.close()
+        tasks = [client.task for client in clients if client.task is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
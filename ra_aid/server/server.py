@@ -5,8 +5,8 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import AsyncGenerator, Callable, Any
-import queue
+import functools
+from typing import AsyncGenerator, Callable, Any, Hashable, Optional, Tuple
 import json
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Response
@@ -29,47 +29,57 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from ra_aid.server.api_v1_metrics import router as metrics_router
+from ra_aid.server.api_v1_search import router as search_router
 from ra_aid.server.api_v1_sessions import router as sessions_router
 from ra_aid.server.api_v1_spawn_agent import router as spawn_agent_router
 from ra_aid.server.connection_manager import ConnectionManager
-from ra_aid.server.broadcast_sender import set_broadcast_queue
+from ra_aid.server.broadcast_sender import set_broadcast_loop
 
 _app_instance: FastAPI = None
 
-async def broadcast_consumer(q: queue.Queue[Any], manager: ConnectionManager):
-    while True:
-        try:
-            wrapper = await asyncio.to_thread(q.get, timeout=1.0)
-            if not isinstance(wrapper, dict) or 'type' not in wrapper or 'payload' not in wrapper:
-                logger.warning(f"Received unexpected item format from broadcast queue: {type(wrapper)}. Expected {{'type': ..., 'payload': ...}}. Item: {str(wrapper)[:200]}...")
-                continue
-
-            payload = wrapper['payload']
-            message_type = wrapper['type']
-            serializable_payload = None
-
-            try:
-                if hasattr(payload, 'model_dump') and callable(payload.model_dump):
-                    serializable_payload = payload.model_dump(mode='json')
-                else:
-                    serializable_payload = payload
-                wrapper['payload'] = serializable_payload
-                message_str = json.dumps(wrapper)
-            except TypeError:
-                logger.warning(f"Could not JSON serialize wrapped message with type '{message_type}'. Payload type: {type(payload)}, Original Payload Preview: {str(payload)[:100]}... Wrapper Preview: {str(wrapper)[:200]}...")
-                continue
-            except Exception as e:
-                logger.error(f"Error during serialization of wrapper in broadcast_consumer: {e}. Wrapper Preview: {str(wrapper)[:200]}...")
-                continue
-
-            await manager.broadcast(message_str)
-        except queue.Empty:
-            continue
-        except asyncio.CancelledError:
-            logger.info("Broadcast consumer task cancelled.")
-            break
-        except Exception:
-            logger.exception("Error in broadcast consumer task.")
+# Message types that describe current state; a newer one replaces any still queued for a client
+COALESCED_MESSAGE_TYPES = ("session_update", "session_details_update")
+
+def serialize_broadcast(wrapper: Any) -> Optional[Tuple[str, Optional[Hashable]]]:
+    """Serializes a broadcast wrapper once for all clients.
+
+    Returns the message text and its coalesce key, or None if the wrapper
+    is malformed or cannot be serialized.
+    """
+    if not isinstance(wrapper, dict) or 'type' not in wrapper or 'payload' not in wrapper:
+        logger.warning(f"Received unexpected broadcast item format: {type(wrapper)}. Expected {{'type': ..., 'payload': ...}}. Item: {str(wrapper)[:200]}...")
+        return None
+
+    payload = wrapper['payload']
+    message_type = wrapper['type']
+    try:
+        if hasattr(payload, 'model_dump') and callable(payload.model_dump):
+            serializable_payload = payload.model_dump(mode='json')
+        else:
+            serializable_payload = payload
+        message_str = json.dumps({**wrapper, 'payload': serializable_payload})
+    except TypeError:
+        logger.warning(f"Could not JSON serialize wrapped message with type '{message_type}'. Payload type: {type(payload)}, Original Payload Preview: {str(payload)[:100]}... Wrapper Preview: {str(wrapper)[:200]}...")
+        return None
+    except Exception as e:
+        logger.error(f"Error during serialization of broadcast wrapper: {e}. Wrapper Preview: {str(wrapper)[:200]}...")
+        return None
+
+    coalesce_key = None
+    if message_type in COALESCED_MESSAGE_TYPES and isinstance(serializable_payload, dict):
+        payload_id = serializable_payload.get('id')
+        if payload_id is not None:
+            coalesce_key = (message_type, payload_id)
+    return message_str, coalesce_key
+
+def dispatch_broadcast(manager: ConnectionManager, wrapper: Any) -> None:
+    """Serializes a wrapper and queues it for every client; runs on the event loop."""
+    serialized = serialize_broadcast(wrapper)
+    if serialized is None:
+        return
+    message_str, coalesce_key = serialized
+    manager.publish(message_str, coalesce_key)
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -79,28 +89,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Application startup: Initializing resources.")
     app.state.loop = asyncio.get_running_loop()
 
-    app.state.broadcast_queue = queue.Queue()
-    set_broadcast_queue(app.state.broadcast_queue)
-
     app.state.connection_manager = ConnectionManager()
-    app.state.broadcast_task = asyncio.create_task(
-        broadcast_consumer(app.state.broadcast_queue, app.state.connection_manager)
+    # Agent threads hand broadcasts straight to the loop; no queue polling
+    set_broadcast_loop(
+        app.state.loop, functools.partial(dispatch_broadcast, app.state.connection_manager)
     )
 
     yield
 
     logger.info("Application shutdown: Cleaning up resources.")
-    if hasattr(app.state, 'broadcast_task') and app.state.broadcast_task:
-        app.state.broadcast_task.cancel()
-        try:
-            await asyncio.wait_for(app.state.broadcast_task, timeout=5.0)
-            logger.info("Broadcast consumer task successfully cancelled.")
-        except asyncio.TimeoutError:
-            logger.warning("Broadcast consumer task did not cancel within timeout.")
-        except asyncio.CancelledError:
-            logger.info("Broadcast consumer task already cancelled.")
-        except Exception:
-            logger.exception("Error during broadcast consumer task cancellation.")
+    set_broadcast_loop(None)
+    try:
+        await asyncio.wait_for(app.state.connection_manager.close(), timeout=5.0)
+    except asyncio.TimeoutError:
+        logger.warning("WebSocket senders did not stop within timeout.")
+    except Exception:
+        logger.exception("Error while closing WebSocket connections.")
 
     _app_instance = None
     logger.info("Application shutdown complete.")
@@ -122,6 +126,8 @@ app.add_middleware(
 
 app.include_router(sessions_router)
 app.include_router(spawn_agent_router)
+app.include_router(search_router)
+app.include_router(metrics_router)
 
 CURRENT_DIR = Path(__file__).parent
 PREBUILT_DIR = CURRENT_DIR / "prebuilt"
@@ -38,6 +38,18 @@ from ra_aid.database.repositories.config_repository import get_config_repository
 # Define constant tool groups
 CUSTOM_TOOLS = []
 
+# Names of tools that only read state: they may record trajectories and print
+# output, but do not change files, memory or the session. Bundled calls to
+# only these tools can safely run concurrently.
+SIDE_EFFECT_FREE_TOOLS = frozenset(
+    {
+        "ripgrep_search",
+        "read_file_tool",
+        "fuzzy_find_project_files",
+        "list_directory_tree",
+    }
+)
+
 def set_modification_tools(use_aider=False):
     """Set the MODIFICATION_TOOLS list based on configuration.
 
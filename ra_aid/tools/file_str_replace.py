@@ -9,6 +9,7 @@ from ra_aid.console.formatting import console_panel
 from ra_aid.tools.memory import emit_related_files
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
+from ra_aid.utils.tool_result_cache import invalidates_tool_results
 import logging
 
 logger = logging.getLogger(__name__)
@@ -45,6 +46,7 @@ def format_string_for_display(s: str, threshold: int = 30) -> str:
 
 
 @tool
+@invalidates_tool_results("filepath")
 def file_str_replace(filepath: str, old_str: str, new_str: str, *, replace_all: bool = False) -> Dict[str, any]:
     """Replace an exact string match in a file with a new string.
     Only performs replacement if the old string appears exactly once, or replace_all is True.
@@ -1,8 +1,7 @@
-import fnmatch
 import logging
 from typing import List, Tuple, Dict, Optional, Any
 
-from fuzzywuzzy import process
+from rapidfuzz import fuzz, process, utils
 from git import Repo, exc
 from langchain_core.tools import tool
 from rich.console import Console
@@ -10,7 +9,9 @@ from rich.markdown import Markdown
 from rich.panel import Panel
 
 from ra_aid.console.formatting import console_panel, cpm
-from ra_aid.file_listing import get_all_project_files, FileListerError
+from ra_aid.file_listing import FileListerError
+from ra_aid.fuzzy_index import get_fuzzy_file_index
+from ra_aid.utils.tool_result_cache import cached_tool_result, project_dependencies
 
 console = Console()
 
@@ -68,6 +69,13 @@ DEFAULT_EXCLUDE_PATTERNS = [
 
 
 @tool
+@cached_tool_result(
+    "fuzzy_find_project_files",
+    lambda params: project_dependencies(
+        params["repo_path"], params["include_hidden"], stat_files=False
+    ),
+    path_params=("repo_path",),
+)
 def fuzzy_find_project_files(
     search_term: str,
     *,
@@ -150,30 +158,32 @@ def fuzzy_find_project_files(
         return []
 
     try:
-        # Get all project files using the common utility function
-        all_files = get_all_project_files(
+        # Get the search index for the project files; it follows the file listing
+        # and narrows large projects down to plausible candidates before scoring
+        file_index = get_fuzzy_file_index(
             repo_path,
             include_hidden=include_hidden,
             exclude_patterns=all_exclude_patterns # Use combined list
         )
 
-        # Apply include patterns if specified
-        if include_paths:
-            included_files = []
-            for pattern in include_paths:
-                included_files.extend(f for f in all_files if fnmatch.fnmatch(f, pattern))
-            # Note: 'all_files' below this point refers to the files *after* include_paths filtering
-            all_files = included_files 
-            total_files_scanned = len(all_files) # Total scanned is after include filter
-        else:
-             total_files_scanned = len(all_files) # Total scanned is all project files
-
-
-        # Perform fuzzy matching
-        matches = process.extract(search_term, all_files, limit=max_results)
+        # Candidates are already restricted to include_paths when specified, so the
+        # total scanned is counted after the include filter
+        candidates, total_files_scanned = file_index.candidates(search_term, include_paths)
+
+        # Score all candidates in one batched call
+        matches = process.extract(
+            search_term,
+            candidates,
+            scorer=fuzz.WRatio,
+            processor=utils.default_process,
+            limit=max_results,
+            score_cutoff=threshold,
+        )
 
         # Filter by threshold
-        filtered_matches = [(path, score) for path, score in matches if score >= threshold]
+        filtered_matches = [
+            (path, int(round(score))) for path, score, *_ in matches if score >= threshold
+        ]
 
         # Build info panel content (for CLI output, unchanged)
         info_sections = []
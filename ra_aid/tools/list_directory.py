@@ -12,6 +12,7 @@ from rich.panel import Panel
 from rich.tree import Tree
 
 from ra_aid.console.formatting import cpm
+from ra_aid.utils.tool_result_cache import cached_tool_result, tree_dependencies
 
 console = Console()
 
@@ -177,6 +178,16 @@ def build_tree(
 
 
 @tool
+@cached_tool_result(
+    "list_directory_tree",
+    lambda params: tree_dependencies(
+        params["path"],
+        params["max_depth"],
+        params["follow_links"],
+        params["show_size"] or params["show_modified"],
+    ),
+    path_params=("path",),
+)
 def list_directory_tree(
     path: str = ".",
     *,
@@ -21,6 +21,7 @@ from ra_aid.database.repositories.research_note_repository import get_research_n
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.database.repositories.work_log_repository import get_work_log_repository
 from ra_aid.model_formatters import key_snippets_formatter
+from ra_aid.utils.gc_scheduler import maybe_schedule_gc
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -92,16 +93,10 @@ def emit_research_notes(notes: str) -> str:
         
         log_work_event(f"Stored research note #{note_id}.")
         
-        # Check if we need to clean up notes (more than 30)
+        # Schedule the research notes cleaner if there are too many notes
         try:
-            all_notes = get_research_note_repository().get_all()
-            if len(all_notes) > 30:
-                # Trigger the research notes cleaner agent
-                try:
-                    from ra_aid.agents.research_notes_gc_agent import run_research_notes_gc_agent
-                    run_research_notes_gc_agent()
-                except Exception as e:
-                    logger.error(f"Failed to run research notes cleaner: {str(e)}")
+            note_repo = get_research_note_repository()
+            maybe_schedule_gc("research_notes", note_repo.count())
         except RuntimeError as e:
             logger.error(f"Failed to access research note repository: {str(e)}")
             
@@ -170,16 +165,10 @@ def emit_key_facts(facts: List[str]) -> str:
 
     log_work_event(f"Stored {len(facts)} key facts.")
     
-    # Check if we need to clean up facts (more than 30)
+    # Schedule the key facts cleaner if there are too many facts
     try:
-        all_facts = get_key_fact_repository().get_all()
-        if len(all_facts) > 50:
-            # Trigger the key facts cleaner agent
-            try:
-                from ra_aid.agents.key_facts_gc_agent import run_key_facts_gc_agent
-                run_key_facts_gc_agent()
-            except Exception as e:
-                logger.error(f"Failed to run key facts cleaner: {str(e)}")
+        fact_repo = get_key_fact_repository()
+        maybe_schedule_gc("key_facts", fact_repo.count())
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
     
@@ -282,15 +271,9 @@ def emit_key_snippet(snippet_info: SnippetInfo) -> str:
 
     log_work_event(f"Stored code snippet #{snippet_id}.")
     
-    # Check if we need to clean up snippets (more than 20)
-    all_snippets = get_key_snippet_repository().get_all()
-    if len(all_snippets) > 35:
-        # Trigger the key snippets cleaner agent
-        try:
-            from ra_aid.agents.key_snippets_gc_agent import run_key_snippets_gc_agent
-            run_key_snippets_gc_agent()
-        except Exception as e:
-            logger.error(f"Failed to run key snippets cleaner: {str(e)}")
+    # Schedule the key snippets cleaner if there are too many snippets
+    snippet_repo = get_key_snippet_repository()
+    maybe_schedule_gc("key_snippets", snippet_repo.count())
     
     return f"Snippet #{snippet_id} stored."
 
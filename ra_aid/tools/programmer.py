@@ -16,6 +16,7 @@ from ra_aid.text.processing import truncate_output
 from ra_aid.tools.memory import log_work_event
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.related_files_repository import get_related_files_repository
+from ra_aid.utils.tool_result_cache import invalidates_tool_results
 
 console = Console()
 logger = get_logger(__name__)
@@ -28,6 +29,7 @@ def _truncate_for_log(text: str, max_length: int = 300) -> str:
 
 
 @tool
+@invalidates_tool_results()
 def run_programming_task(
     instructions: str, files: List[str] = []
 ) -> Dict[str, Union[str, int, bool]]:
@@ -130,7 +132,11 @@ def run_programming_task(
             .get("latency_coefficient", DEFAULT_BASE_LATENCY)
         )
 
-        result = run_interactive_command(command, expected_runtime_seconds=latency)
+        result = run_interactive_command(
+            command,
+            expected_runtime_seconds=latency,
+            echo=get_config_repository().get("shell_echo", True),
+        )
         print()
 
         # Log the programming task
@@ -8,6 +8,7 @@ from langchain_core.tools import tool
 from ra_aid.text.processing import truncate_output
 from ra_aid.tools.memory import is_binary_file
 from ra_aid.console.formatting import console_panel, cpm
+from ra_aid.utils.tool_result_cache import cached_tool_result, file_dependencies
 
 # Standard buffer size for file reading
 CHUNK_SIZE = 8192
@@ -57,6 +58,11 @@ def record_trajectory(
 
 
 @tool
+@cached_tool_result(
+    "read_file_tool",
+    lambda params: file_dependencies(params["filepath"]),
+    path_params=("filepath",),
+)
 def read_file_tool(filepath: str, encoding: str = "utf-8") -> Dict[str, str]:
     """Read and return the contents of a text file.
 
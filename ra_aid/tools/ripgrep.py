@@ -1,16 +1,25 @@
 
-from typing import Dict, List, Union, Optional
+import base64
+import json
+import os
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Union, Optional, Tuple
 
 from langchain_core.tools import tool
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 
+from ra_aid.config import DEFAULT_RIPGREP_MAX_MATCHES, DEFAULT_RIPGREP_MAX_OUTPUT_BYTES
 from ra_aid.console.formatting import console_panel, cpm
+from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.proc.interactive import run_interactive_command
 from ra_aid.text.processing import truncate_output
+from ra_aid.utils.tool_result_cache import cached_tool_result, project_dependencies
 
 console = Console()
 
@@ -71,8 +80,164 @@ FILE_TYPE_MAP = {
     "psql": "postgres",
 }
 
+# Longer lines (minified bundles, data files) are cut to keep results readable
+MAX_LINE_CHARS = 1000
+
+
+@dataclass
+class RipgrepFileResult:
+    """Matches and context lines found in one file, in file order."""
+
+    path: str
+    # (line number, line text, whether the line is a match rather than context)
+    lines: List[Tuple[Optional[int], str, bool]] = field(default_factory=list)
+    match_count: int = 0
+
+
+@dataclass
+class RipgrepStreamResult:
+    """Structured result of a streamed ripgrep search."""
+
+    files: List[RipgrepFileResult] = field(default_factory=list)
+    match_count: int = 0
+    output_bytes: int = 0
+    # Which budget ended the search early: "max_matches" or "max_output_bytes"
+    stop_reason: Optional[str] = None
+    return_code: int = 0
+    error: str = ""
+
+    @property
+    def truncated(self) -> bool:
+        return self.stop_reason is not None
+
+    @property
+    def success(self) -> bool:
+        # rg exits with 1 when nothing matched, which is not an error
+        return self.return_code in (0, 1)
+
+    def render(self) -> str:
+        """Render results like rg's grouped output: path, then line:text (matches) or line-text (context)."""
+        blocks = []
+        for file_result in self.files:
+            lines = [file_result.path]
+            previous = None
+            for line_number, text, is_match in file_result.lines:
+                if previous is not None and line_number is not None and line_number > previous + 1:
+                    lines.append("--")
+                lines.append(f"{line_number}{':' if is_match else '-'}{text}")
+                previous = line_number
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+
+def _decode_rg_data(data: Optional[Dict]) -> str:
+    """Decode an rg --json text object, which holds either text or base64 bytes."""
+    if not data:
+        return ""
+    if "text" in data:
+        return data["text"]
+    return base64.b64decode(data.get("bytes", "")).decode("utf-8", errors="replace")
+
+
+def stream_ripgrep(
+    cmd: List[str],
+    max_matches: int = DEFAULT_RIPGREP_MAX_MATCHES,
+    max_output_bytes: int = DEFAULT_RIPGREP_MAX_OUTPUT_BYTES,
+    cwd: Optional[str] = None,
+) -> RipgrepStreamResult:
+    """
+    Run an `rg --json` command without a terminal and parse its events as they arrive.
+
+    The process is killed as soon as the match or output budget is reached, so a
+    search that would print millions of lines costs no more than the budget.
+
+    Args:
+        cmd: Full rg command line, including --json
+        max_matches: Stop after this many matching lines
+        max_output_bytes: Stop once this many bytes of line text were collected
+        cwd: Working directory for the search
+
+    Returns:
+        RipgrepStreamResult: Per-file results plus totals
+
+    Raises:
+        FileNotFoundError: If rg is not installed
+    """
+    result = RipgrepStreamResult()
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    # Drain stderr concurrently so a chatty rg can't block on a full pipe
+    stderr_chunks: List[bytes] = []
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+    )
+    stderr_reader.start()
+
+    current: Optional[RipgrepFileResult] = None
+    try:
+        for raw_line in process.stdout:
+            try:
+                event = json.loads(raw_line)
+            except ValueError:
+                continue
+            event_type = event.get("type")
+            if event_type not in ("match", "context"):
+                continue
+            data = event.get("data", {})
+            path = _decode_rg_data(data.get("path"))
+            if current is None or current.path != path:
+                current = RipgrepFileResult(path=path)
+                result.files.append(current)
+
+            text = _decode_rg_data(data.get("lines")).rstrip("\r\n")
+            if len(text) > MAX_LINE_CHARS:
+                text = text[:MAX_LINE_CHARS] + " [line truncated]"
+            is_match = event_type == "match"
+            current.lines.append((data.get("line_number"), text, is_match))
+            result.output_bytes += len(text.encode("utf-8")) + 1
+            if is_match:
+                current.match_count += 1
+                result.match_count += 1
+                if result.match_count >= max_matches:
+                    result.stop_reason = "max_matches"
+                    break
+            if result.output_bytes >= max_output_bytes:
+                result.stop_reason = "max_output_bytes"
+                break
+    finally:
+        if result.truncated and process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        return_code = process.wait()
+        stderr_reader.join(timeout=5)
+
+    result.return_code = 0 if result.truncated else return_code
+    if not result.success:
+        result.error = b"".join(stderr_chunks).decode("utf-8", errors="replace").strip()
+    return result
+
+
+def _get_config_value(key: str, default):
+    try:
+        return get_config_repository().get(key, default)
+    except RuntimeError:
+        return default
+
+
 
 @tool
+@cached_tool_result(
+    "ripgrep_search",
+    lambda params: project_dependencies(
+        os.getcwd(), params["include_hidden"], params["include_paths"]
+    ),
+    path_params=("include_paths",),
+)
 def ripgrep_search(
     pattern: str,
     *,
@@ -103,8 +268,13 @@ def ripgrep_search(
                        If provided, rg will only search these paths.
         fixed_string: Whether to treat pattern as a literal string instead of regex (default: False)
     """
+    streaming = _get_config_value("ripgrep_streaming", True)
+
     # Build rg command with options
-    cmd = ["rg", "--color", "always"] # Use '--color always' to capture colors
+    if streaming:
+        cmd = ["rg", "--json"] # Structured events, parsed while rg is still running
+    else:
+        cmd = ["rg", "--color", "always"] # Use '--color always' to capture colors
 
     if before_context_lines is not None:
         cmd.extend(["-B", str(before_context_lines)])
@@ -184,10 +354,40 @@ def ripgrep_search(
         border_style="bright_blue"
     )
     try:
-        print()
-        output, return_code = run_interactive_command(cmd)
-        print()
-        decoded_output = output.decode('utf-8', errors='replace') if output else "" # Ensure decoding
+        if streaming:
+            max_output_bytes = _get_config_value(
+                "ripgrep_max_output_bytes", DEFAULT_RIPGREP_MAX_OUTPUT_BYTES
+            )
+            search = stream_ripgrep(
+                cmd,
+                max_matches=_get_config_value("ripgrep_max_matches", DEFAULT_RIPGREP_MAX_MATCHES),
+                max_output_bytes=max_output_bytes,
+            )
+            decoded_output = search.render() if search.success else search.error
+            if search.truncated:
+                if search.stop_reason == "max_output_bytes":
+                    reason = (
+                        f"output limit of {max_output_bytes} bytes reached "
+                        f"after {search.match_count} matches"
+                    )
+                else:
+                    reason = f"stopped after {search.match_count} matches"
+                decoded_output += (
+                    f"\n\n[Search {reason}; "
+                    "narrow the pattern or use include_paths to see more]"
+                )
+            return_code = search.return_code
+            match_count = search.match_count
+            truncated = search.truncated
+        else:
+            print()
+            output, return_code = run_interactive_command(
+                cmd, echo=_get_config_value("shell_echo", True)
+            )
+            print()
+            decoded_output = output.decode('utf-8', errors='replace') if output else "" # Ensure decoding
+            match_count = None
+            truncated = False
 
         final_output = decoded_output # Store full output for trajectory
         final_return_code = return_code
@@ -205,7 +405,12 @@ def ripgrep_search(
             # Even if successful, output might be empty (no matches)
             if not (decoded_output and decoded_output.strip()):
                  console_panel("[grey50](No matches found)[/]", title="✅ Search Complete", border_style="green", style="italic")
+            elif streaming:
+                 console_panel(truncated_output_for_agent, title=f"✅ {match_count} Matches", border_style="green")
             agent_return_value = {"output": truncated_output_for_agent, "return_code": return_code, "success": True}
+        if streaming:
+            agent_return_value["match_count"] = match_count
+            agent_return_value["truncated"] = truncated
 
     except Exception as e:
         # Handle exceptions during command execution (e.g., command not found)
@@ -226,6 +431,9 @@ def ripgrep_search(
         "return_code": final_return_code,
         "success": final_success
     }
+    if "match_count" in agent_return_value:
+        tool_result_for_trajectory["match_count"] = agent_return_value["match_count"]
+        tool_result_for_trajectory["truncated"] = agent_return_value["truncated"]
     try:
         trajectory_repo.create(
             tool_name="ripgrep_search",
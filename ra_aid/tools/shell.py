@@ -15,6 +15,7 @@ from ra_aid.tools.memory import log_work_event
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
+from ra_aid.utils.tool_result_cache import invalidates_tool_results
 
 console = Console()
 
@@ -37,6 +38,7 @@ def _truncate_for_log(text: str, max_length: int = 300) -> str:
 
 
 @tool
+@invalidates_tool_results()
 def run_shell_command(
     command: str, timeout: int = 30
 ) -> Dict[str, Union[str, int, bool]]:
@@ -115,6 +117,7 @@ def run_shell_command(
         output, return_code = run_interactive_command(
             shell_cmd + [command],
             expected_runtime_seconds=timeout,
+            echo=get_config_repository().get("shell_echo", True),
         )
         print()
         result = {
@@ -9,11 +9,13 @@ from rich.panel import Panel
 from ra_aid.console.formatting import console_panel
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository  # Added import
 from ra_aid.tools.memory import emit_related_files
+from ra_aid.utils.tool_result_cache import invalidates_tool_results
 
 console = Console()
 
 
 @tool
+@invalidates_tool_results("filepath")
 def put_complete_file_contents(
     filepath: str,
     complete_file_contents: str = "",
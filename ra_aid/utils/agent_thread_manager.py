@@ -1,12 +1,40 @@
 import threading
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-# Global registry mapping session_id -> { thread, stop_event }
+
+class CancellationToken:
+    """
+    Stop signal for an agent session that can be polled without locks or logging.
+
+    The token wraps the threading.Event a session is stopped with. Checking it
+    is a single flag read, so agents can poll it on every step and tool call.
+    """
+
+    __slots__ = ("_event",)
+
+    def __init__(self, event: Optional[threading.Event] = None):
+        self._event = event if event is not None else threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the token is cancelled or the timeout expires."""
+        return self._event.wait(timeout)
+
+
+# Global registry mapping session_id -> { thread, stop_event, token }
 agent_thread_registry: Dict[int, Dict[str, Any]] = {}
-# Lock to protect access to the registry
+# Lock to protect access to the registry. Writers hold it; the stop-signal
+# checks on the agent hot path read without it, since single dict lookups
+# are atomic.
 _registry_lock = threading.RLock()
 
 def register_agent(session_id: int, thread: threading.Thread, stop_event: threading.Event) -> None:
@@ -17,7 +45,8 @@ def register_agent(session_id: int, thread: threading.Thread, stop_event: thread
     with _registry_lock:
         agent_thread_registry[session_id] = {
             "thread": thread,
-            "stop_event": stop_event
+            "stop_event": stop_event,
+            "token": CancellationToken(stop_event),
         }
 
 def get_session_id_by_thread_name(thread_name: str) -> int | None:
@@ -65,8 +94,20 @@ def is_agent_running(session_id: int) -> bool:
     return bool(entry and entry["thread"].is_alive())
 
 
+def get_cancellation_token(session_id: Optional[int]) -> Optional[CancellationToken]:
+    """
+    Return the cancellation token of a registered session, without locking.
+    """
+    if session_id is None:
+        return None
+    entry = agent_thread_registry.get(session_id)
+    if not entry:
+        return None
+    token = entry.get("token")
+    return token if token is not None else CancellationToken(entry["stop_event"])
+
+
 def has_received_stop_signal(session_id: int) -> bool:
-    logger.info(f"Checking if agent has received stop signal for session_id {session_id}")
-    with _registry_lock:
-        entry = agent_thread_registry.get(session_id)
+    # Polled on every agent step; stays lock-free and silent
+    entry = agent_thread_registry.get(session_id)
     return bool(entry and entry["stop_event"].is_set())
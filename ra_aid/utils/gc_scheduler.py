@@ -0,0 +1,194 @@
+"""
+Threshold-triggered scheduling of the memory garbage collection agents.
+
+The memory tools used to read every row of a store after each write just to
+compare its length with a limit, and then ran the GC agent inline, so the
+agent that emitted the fact waited for a whole LLM cleanup pass. Instead the
+tools now pass the store's row count (a COUNT query, or the size of the
+memory cache) to maybe_schedule_gc, which:
+
+- Does nothing while the count is at or below the store's threshold.
+- Skips the store if a GC run for it is already pending or in progress.
+- Otherwise queues the store's GC agent, so the tool returns at once.
+
+Queued GC agents run at the next agent step boundary, when the agent loop
+calls run_pending_gc, on the agent's own thread and in the context of the
+tool call that queued them. They therefore nest under the calling agent like
+any other sub-agent, sharing its repositories, interrupt handling and console
+without racing it, and always finish before the session's database and
+repository contexts are closed. Each session (its ConfigRepository) only runs
+the GC runs it queued itself.
+
+GC runs inline in the tool when "memory_gc_async" is disabled.
+"""
+
+import contextvars
+import importlib
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ra_aid.config import (
+    DEFAULT_KEY_FACTS_GC_THRESHOLD,
+    DEFAULT_KEY_SNIPPETS_GC_THRESHOLD,
+    DEFAULT_RESEARCH_NOTES_GC_THRESHOLD,
+)
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Store name -> (GC agent module, GC agent function, threshold config key, default threshold)
+GC_STORES: Dict[str, Tuple[str, str, str, int]] = {
+    "key_facts": (
+        "ra_aid.agents.key_facts_gc_agent",
+        "run_key_facts_gc_agent",
+        "key_facts_gc_threshold",
+        DEFAULT_KEY_FACTS_GC_THRESHOLD,
+    ),
+    "key_snippets": (
+        "ra_aid.agents.key_snippets_gc_agent",
+        "run_key_snippets_gc_agent",
+        "key_snippets_gc_threshold",
+        DEFAULT_KEY_SNIPPETS_GC_THRESHOLD,
+    ),
+    "research_notes": (
+        "ra_aid.agents.research_notes_gc_agent",
+        "run_research_notes_gc_agent",
+        "research_notes_gc_threshold",
+        DEFAULT_RESEARCH_NOTES_GC_THRESHOLD,
+    ),
+}
+
+
+def _get_config(key: str, default: Any) -> Any:
+    try:
+        from ra_aid.database.repositories.config_repository import get_config_repository
+
+        return get_config_repository().get(key, default)
+    except RuntimeError:
+        return default
+
+
+def _owner() -> Any:
+    """Return the session that GC runs scheduled from this context belong to."""
+    from ra_aid.database.repositories.config_repository import config_repo_var
+
+    return config_repo_var.get()
+
+
+class GCScheduler:
+    """Queues at most one GC agent per memory store and session, run at agent step boundaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[Any, str], contextvars.Context] = {}
+        self._running: Set[Tuple[Any, str]] = set()
+
+    def threshold(self, store: str) -> int:
+        """Return the row count above which a store is garbage collected."""
+        _, _, config_key, default = GC_STORES[store]
+        return _get_config(config_key, default)
+
+    def is_pending(self, store: str) -> bool:
+        """Return whether a GC run for the store is queued in the current session."""
+        with self._lock:
+            return (_owner(), store) in self._pending
+
+    def is_running(self, store: str) -> bool:
+        """Return whether a GC run for the store is in progress in the current session."""
+        with self._lock:
+            return (_owner(), store) in self._running
+
+    def maybe_schedule(self, store: str, count: int) -> bool:
+        """
+        Queue the store's GC agent if its row count is over the threshold.
+
+        Args:
+            store: Name of the memory store, a key of GC_STORES
+            count: Current number of rows in the store
+
+        Returns:
+            bool: True if a GC run was queued (or completed, when run inline)
+        """
+        if count <= self.threshold(store):
+            return False
+
+        key = (_owner(), store)
+        with self._lock:
+            if key in self._pending or key in self._running:
+                logger.debug(f"GC for {store} already scheduled; skipping ({count} rows)")
+                return False
+            if _get_config("memory_gc_async", True):
+                logger.debug(f"Queueing GC for {store} ({count} rows)")
+                self._pending[key] = contextvars.copy_context()
+                return True
+
+        logger.debug(f"Running GC for {store} ({count} rows)")
+        self._run(key)
+        return True
+
+    def run_pending(self) -> int:
+        """
+        Run the GC agents queued by the current session, one after another.
+
+        Called at agent step boundaries. Does nothing while one of the
+        session's GC agents is running, so GC agents do not start each other.
+
+        Returns:
+            int: Number of GC runs completed
+        """
+        owner = _owner()
+        completed = 0
+        while True:
+            with self._lock:
+                if any(key[0] is owner for key in self._running):
+                    return completed
+                key = next((key for key in self._pending if key[0] is owner), None)
+                if key is None:
+                    return completed
+                context = self._pending.pop(key)
+            context.run(self._run, key)
+            completed += 1
+
+    def discard_pending(self, owner: Optional[Any] = None) -> int:
+        """
+        Drop the GC runs queued by a session without running them.
+
+        Args:
+            owner: The session's ConfigRepository; the current session when None
+
+        Returns:
+            int: Number of GC runs dropped
+        """
+        owner = _owner() if owner is None else owner
+        with self._lock:
+            keys = [key for key in self._pending if key[0] is owner]
+            for key in keys:
+                del self._pending[key]
+        return len(keys)
+
+    def _run(self, key: Tuple[Any, str]) -> None:
+        store = key[1]
+        module_name, function_name, _, _ = GC_STORES[store]
+        with self._lock:
+            self._running.add(key)
+        try:
+            run_gc_agent = getattr(importlib.import_module(module_name), function_name)
+            run_gc_agent()
+        except Exception as e:
+            logger.error(f"Failed to run {store} cleaner: {str(e)}")
+        finally:
+            with self._lock:
+                self._running.discard(key)
+
+
+gc_scheduler = GCScheduler()
+
+
+def maybe_schedule_gc(store: str, count: int) -> bool:
+    """Queue the store's GC agent on the shared scheduler if it is over its threshold."""
+    return gc_scheduler.maybe_schedule(store, count)
+
+
+def run_pending_gc() -> int:
+    """Run the GC agents queued by the current session on the shared scheduler."""
+    return gc_scheduler.run_pending()
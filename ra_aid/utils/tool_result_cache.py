@@ -0,0 +1,452 @@
+"""
+Session-scoped cache of read-only tool results.
+
+Agents often repeat the same ripgrep_search, read_file_tool,
+list_directory_tree or fuzzy_find_project_files call within a session, and
+each repeat re-runs a subprocess or re-reads the disk. Decorating those tools
+with cached_tool_result lets a repeat return the earlier result instead.
+
+An entry is keyed on the tool name, the working directory and the call's
+arguments, with defaults filled in and path arguments made absolute. Each
+entry also stores a stamp of the filesystem state the result was computed
+from (see the *_dependencies functions below), and is only reused while that
+stamp is unchanged:
+
+- read_file_tool: the file's mtime, size and inode.
+- list_directory_tree: the mtimes of the directories it lists, plus the
+  files themselves when sizes or modified times are shown.
+- fuzzy_find_project_files: the version of the project file listing, which
+  changes when files are added or removed.
+- ripgrep_search: the project file listing version plus, for searches limited
+  to include_paths, the mtimes of the files under them, or, for whole-project
+  searches, the mtimes of the project's directories.
+
+Writes through put_complete_file_contents and file_str_replace drop the
+entries that may cover the written file, and run_shell_command and
+run_programming_task, which can change anything, drop every entry. The stamp
+check still catches changes made behind the agent's back.
+
+The cache is held per session, so it is only active while a session
+repository is available. Each hit is recorded in the trajectory with the
+session's running hit and miss counts. The "tool_result_cache" setting turns
+caching off.
+"""
+
+import bisect
+import copy
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from ra_aid.config import DEFAULT_TOOL_RESULT_CACHE_MAX_ENTRIES
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# (paths the result depends on, or None for the whole project; filesystem stamp)
+Dependencies = Tuple[Optional[Tuple[str, ...]], Any]
+
+_MAX_SESSION_CACHES = 8
+
+
+def _stat_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _abspath(path: str) -> str:
+    return os.path.normpath(os.path.abspath(path.strip()))
+
+
+def _is_within(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+class ToolResultCache:
+    """Bounded LRU cache of tool results, each valid while its dependency stamp holds."""
+
+    def __init__(self, max_entries: int = DEFAULT_TOOL_RESULT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Optional[Tuple[str, ...]], Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, str], stamp: Any) -> Tuple[bool, Any]:
+        """
+        Look up a result, counting the hit or miss.
+
+        Args:
+            key: Tool name and normalized arguments
+            stamp: Current stamp of the result's dependencies
+
+        Returns:
+            Tuple[bool, Any]: Whether a valid entry was found, and a copy of its result
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, copy.deepcopy(entry[2])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Tuple[str, str], dependencies: Dependencies, result: Any) -> None:
+        """Store a result with the dependencies it was computed from."""
+        paths, stamp = dependencies
+        with self._lock:
+            self._entries[key] = (paths, stamp, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, paths: Optional[Iterable[str]] = None) -> int:
+        """
+        Drop entries that may be affected by changes to the given paths.
+
+        Args:
+            paths: Changed files or directories, or None to drop every entry
+
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            if paths is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            changed = [_abspath(path) for path in paths]
+            stale = [
+                key
+                for key, (scope, _, _) in self._entries.items()
+                if scope is None
+                or any(_is_within(path, root) or _is_within(root, path) for path in changed for root in scope)
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit and miss counts, hit rate and entry count."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_caches: "OrderedDict[int, ToolResultCache]" = OrderedDict()
+_caches_lock = threading.Lock()
+
+
+def _current_session_id() -> Optional[int]:
+    try:
+        from ra_aid.database.repositories.session_repository import get_session_repository
+
+        return get_session_repository().get_current_session_id()
+    except RuntimeError:
+        return None
+
+
+def _config_value(key: str, default: Any) -> Any:
+    try:
+        from ra_aid.database.repositories.config_repository import get_config_repository
+
+        return get_config_repository().get(key, default)
+    except RuntimeError:
+        return default
+
+
+def get_tool_result_cache() -> Optional[ToolResultCache]:
+    """
+    Return the tool result cache of the current session.
+
+    Returns:
+        Optional[ToolResultCache]: The cache, or None if caching is disabled or there is no session
+    """
+    if not _config_value("tool_result_cache", True):
+        return None
+    session_id = _current_session_id()
+    if session_id is None:
+        return None
+    with _caches_lock:
+        cache = _caches.get(session_id)
+        if cache is None:
+            cache = ToolResultCache(
+                _config_value("tool_result_cache_max_entries", DEFAULT_TOOL_RESULT_CACHE_MAX_ENTRIES)
+            )
+            _caches[session_id] = cache
+            while len(_caches) > _MAX_SESSION_CACHES:
+                _caches.popitem(last=False)
+        _caches.move_to_end(session_id)
+        return cache
+
+
+def invalidate_tool_results(paths: Optional[Iterable[str]] = None) -> None:
+    """
+    Drop cached results affected by a change to the filesystem.
+
+    The filesystem is shared, so every session's cache is invalidated.
+
+    Args:
+        paths: Changed files or directories, or None if anything may have changed
+    """
+    paths = None if paths is None else [path for path in paths if path]
+    with _caches_lock:
+        caches = list(_caches.values())
+    dropped = sum(cache.invalidate(paths) for cache in caches)
+    if dropped:
+        logger.debug(f"Dropped {dropped} cached tool results")
+
+
+def clear_tool_result_caches() -> None:
+    """Forget all sessions' caches and their statistics."""
+    with _caches_lock:
+        _caches.clear()
+
+
+def _record_hit(tool_name: str, tool_parameters: Dict[str, Any], stats: Dict[str, Any]) -> None:
+    try:
+        from ra_aid.database.repositories.human_input_repository import get_human_input_repository
+        from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
+
+        get_trajectory_repository().create(
+            tool_name=tool_name,
+            tool_parameters=tool_parameters,
+            tool_result={"cache": "hit"},
+            step_data={
+                "display_title": "Cached Result",
+                "cache_hits": stats["hits"],
+                "cache_misses": stats["misses"],
+                "cache_hit_rate": stats["hit_rate"],
+            },
+            record_type="tool_execution",
+            human_input_id=get_human_input_repository().get_most_recent_id(),
+        )
+    except RuntimeError:
+        logger.debug("Skipping cache hit trajectory: repositories not available")
+
+
+def cached_tool_result(
+    tool_name: str,
+    dependencies: Callable[[Dict[str, Any]], Optional[Dependencies]],
+    path_params: Sequence[str] = (),
+):
+    """
+    Decorate a read-only tool function so repeated calls reuse its result.
+
+    Apply below @tool, so the tool's schema still comes from the function's signature.
+
+    Args:
+        tool_name: Name recorded in the trajectory for cache hits
+        dependencies: Given the normalized arguments, returns the paths the result
+            depends on and a stamp of their state, or None if the call is not cacheable
+        path_params: Arguments holding a path or list of paths, made absolute for the key
+
+    Returns:
+        Decorator for the tool function
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_tool_result_cache()
+            if cache is None:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            for name in path_params:
+                value = params.get(name)
+                if isinstance(value, str):
+                    params[name] = _abspath(value)
+                elif isinstance(value, (list, tuple)):
+                    params[name] = [_abspath(path) for path in value]
+
+            try:
+                deps = dependencies(params)
+            except Exception as e:
+                logger.debug(f"Not caching {tool_name}: {e}")
+                deps = None
+            if deps is None:
+                return func(*args, **kwargs)
+
+            key = (tool_name, json.dumps([os.getcwd(), params], sort_keys=True, default=str))
+            hit, result = cache.get(key, deps[1])
+            if hit:
+                from ra_aid.console.formatting import cpm
+
+                stats = cache.stats()
+                cpm(
+                    f"Reused the result of an identical `{tool_name}` call (session hit rate {stats['hit_rate']:.0%})",
+                    title="♻️ Cached Result",
+                    border_style="bright_blue",
+                )
+                _record_hit(tool_name, params, stats)
+                return result
+
+            result = func(*args, **kwargs)
+            cache.put(key, deps, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates_tool_results(path_param: Optional[str] = None):
+    """
+    Decorate a tool function that changes the filesystem.
+
+    After each call, cached results covering the path in the path_param
+    argument are dropped, or every cached result if path_param is None.
+
+    Args:
+        path_param: Argument holding the path the tool writes
+
+    Returns:
+        Decorator for the tool function
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if path_param is None:
+                    invalidate_tool_results()
+                else:
+                    path = signature.bind(*args, **kwargs).arguments.get(path_param)
+                    invalidate_tool_results([path] if isinstance(path, str) else None)
+
+        return wrapper
+
+    return decorator
+
+
+def file_dependencies(path: str) -> Optional[Dependencies]:
+    """Depend on one file; a missing file is not cached."""
+    stamp = _stat_stamp(path)
+    if stamp is None:
+        return None
+    return (path,), stamp
+
+
+def tree_dependencies(root: str, max_depth: int, follow_links: bool, include_files: bool) -> Optional[Dependencies]:
+    """
+    Depend on the directories of a tree listing down to max_depth.
+
+    A directory's mtime changes when entries are added, removed or renamed in
+    it. File stamps are added when the listing shows file metadata.
+    """
+    if not os.path.isdir(root):
+        return file_dependencies(root)
+    stamps = [_stat_stamp(root), _stat_stamp(os.path.join(root, ".gitignore"))]
+    pending = [(root, 1)]
+    while pending:
+        directory, depth = pending.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=follow_links)
+            except OSError:
+                continue
+            if is_dir and depth < max_depth:
+                stamps.append((entry.path, _stat_stamp(entry.path)))
+                pending.append((entry.path, depth + 1))
+            elif include_files:
+                stamps.append((entry.path, _stat_stamp(entry.path)))
+    return (root,), tuple(stamps)
+
+
+def _listed_under(files: Sequence[str], relative: str) -> Iterable[str]:
+    """Yield the entries of a sorted project listing at or under a relative path."""
+    if relative == os.curdir:
+        yield from files
+        return
+    # Git lists paths with "/", directory walks with os.sep
+    for separator in dict.fromkeys(["/", os.sep]):
+        prefix = relative.replace(os.sep, separator)
+        index = bisect.bisect_left(files, prefix)
+        if index < len(files) and files[index] == prefix:
+            yield prefix
+        directory = prefix + separator
+        for listed in itertools.islice(files, bisect.bisect_left(files, directory), None):
+            if not listed.startswith(directory):
+                break
+            yield listed
+
+
+def project_dependencies(
+    root: str, include_hidden: bool, include_paths: Optional[Sequence[str]] = None, stat_files: bool = True
+) -> Optional[Dependencies]:
+    """
+    Depend on the project file listing, and optionally on the files in it.
+
+    When file contents matter, a call limited to include_paths takes the stamp
+    of each listed file under those paths. A whole-project call takes the
+    directory stamps of the file index instead (see get_project_tree_stamp),
+    so its key costs a stat per directory rather than per file; in-place
+    rewrites made behind the agent's back are not seen until a directory in
+    the project changes.
+
+    Args:
+        root: Project directory
+        include_hidden: Whether the listing includes hidden files
+        include_paths: Absolute paths the call is limited to, or None for the whole project
+        stat_files: Whether file contents matter
+
+    Returns:
+        Optional[Dependencies]: None when the listing cannot be versioned or a path is outside the project
+    """
+    from ra_aid.file_listing import get_indexed_project_files, get_project_tree_stamp
+
+    if stat_files and not include_paths:
+        stamp = get_project_tree_stamp(root, include_hidden)
+        return None if stamp is None else (None, stamp)
+
+    files, version = get_indexed_project_files(root, include_hidden)
+    if version is None:
+        return None
+    root = _abspath(root)
+    scope = None
+    if include_paths:
+        if not all(_is_within(path, root) for path in include_paths):
+            return None
+        scope = tuple(include_paths)
+    if not stat_files:
+        return scope, version
+
+    stamps = []
+    for path in scope:
+        for listed in _listed_under(files, os.path.relpath(path, root)):
+            stamps.append(_stat_stamp(os.path.join(root, listed)))
+        # Paths outside the listing, such as ignored files named explicitly
+        stamps.append(_stat_stamp(path))
+    return scope, (version, hash(tuple(stamps)))
@@ -34,6 +34,16 @@ def mock_config_repository():
     config_repo_var.reset(token)
 
 
+@pytest.fixture(autouse=True)
+def fresh_llm_client_pool():
+    """Keep pooled LLM clients, built from each test's mocks, from leaking between tests."""
+    from ra_aid.llm_client_pool import clear_llm_client_pool
+
+    clear_llm_client_pool()
+    yield
+    clear_llm_client_pool()
+
+
 @pytest.fixture()
 def mock_trajectory_repository():
     """Mock the TrajectoryRepository to avoid database operations during tests."""
@@ -0,0 +1,154 @@
+"""
+Tests for the create_react_agent tool node that parallelizes read-only tools.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from ra_aid.agent_backends.concurrent_tool_node import ConcurrentToolNode
+from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class Recorder:
+    """Tools that log when they start and finish."""
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+        self.barrier = None
+
+    def record(self, event):
+        with self.lock:
+            self.events.append(event)
+
+    def tools(self):
+        @tool
+        def read_file_tool(filepath: str) -> str:
+            """Read a file."""
+            self.record(f"start {filepath}")
+            if self.barrier is not None:
+                self.barrier.wait(5)
+            else:
+                time.sleep(0.05)
+            self.record(f"end {filepath}")
+            return f"contents of {filepath} in {request_id.get()}"
+
+        @tool
+        def write_file_tool(filepath: str) -> str:
+            """Write a file."""
+            self.record(f"write {filepath}")
+            return f"wrote {filepath}"
+
+        return [read_file_tool, write_file_tool]
+
+
+def message(*calls):
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {"name": name, "args": {"filepath": path}, "id": f"call_{i}"}
+            for i, (name, path) in enumerate(calls)
+        ],
+    )
+
+
+def test_read_only_calls_run_concurrently():
+    recorder = Recorder()
+    recorder.barrier = threading.Barrier(3)
+    node = ConcurrentToolNode(recorder.tools(), max_workers=3)
+
+    # Each call waits for the other two, so this only finishes if all three overlap
+    result = node.invoke([message(*[("read_file_tool", f"f{i}") for i in range(3)])])
+
+    assert [m.tool_call_id for m in result] == ["call_0", "call_1", "call_2"]
+    assert [m.content.split(" in ")[0] for m in result] == [f"contents of f{i}" for i in range(3)]
+
+
+def test_other_calls_run_alone_and_in_order():
+    recorder = Recorder()
+    node = ConcurrentToolNode(recorder.tools(), max_workers=4)
+
+    result = node.invoke(
+        [message(("read_file_tool", "a"), ("read_file_tool", "b"), ("write_file_tool", "c"), ("read_file_tool", "d"))]
+    )
+
+    events = recorder.events
+    write = events.index("write c")
+    assert {"end a", "end b"} <= set(events[:write])
+    assert events[write + 1 :] == ["start d", "end d"]
+    assert [m.tool_call_id for m in result] == ["call_0", "call_1", "call_2", "call_3"]
+
+
+def test_single_worker_runs_sequentially():
+    recorder = Recorder()
+    node = ConcurrentToolNode(recorder.tools(), max_workers=1)
+
+    node.invoke([message(("read_file_tool", "a"), ("read_file_tool", "b"))])
+
+    assert recorder.events == ["start a", "end a", "start b", "end b"]
+
+
+def test_worker_count_from_config():
+    with ConfigRepositoryManager() as config:
+        config.set("max_parallel_tool_calls", 2)
+        assert ConcurrentToolNode(Recorder().tools()).max_workers == 2
+        config.set("max_parallel_tool_calls", 0)
+        assert ConcurrentToolNode(Recorder().tools()).max_workers == 1
+
+
+def test_context_reaches_worker_threads():
+    recorder = Recorder()
+    node = ConcurrentToolNode(recorder.tools(), max_workers=2)
+    token = request_id.set("session-7")
+    try:
+        result = node.invoke([message(("read_file_tool", "a"), ("read_file_tool", "b"))])
+    finally:
+        request_id.reset(token)
+
+    assert all(m.content.endswith("in session-7") for m in result)
+
+
+def test_async_path_keeps_order():
+    recorder = Recorder()
+    node = ConcurrentToolNode(recorder.tools(), max_workers=2)
+
+    result = asyncio.run(
+        node.ainvoke([message(("read_file_tool", "a"), ("write_file_tool", "b"), ("read_file_tool", "c"))])
+    )
+
+    assert [m.tool_call_id for m in result] == ["call_0", "call_1", "call_2"]
+    write = recorder.events.index("write b")
+    assert "end a" in recorder.events[:write]
+    assert "start c" in recorder.events[write:]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_tool_errors_become_messages(max_workers):
+    @tool
+    def read_file_tool(filepath: str) -> str:
+        """Read a file."""
+        raise FileNotFoundError(filepath)
+
+    node = ConcurrentToolNode([read_file_tool], max_workers=max_workers)
+    result = node.invoke([message(("read_file_tool", "a"), ("read_file_tool", "b"))])
+
+    assert [m.status for m in result] == ["error", "error"]
+
+
+def test_graph_state_input():
+    recorder = Recorder()
+    node = ConcurrentToolNode(recorder.tools(), max_workers=2)
+    calls = message(("read_file_tool", "a"), ("read_file_tool", "b"), ("write_file_tool", "c"))
+
+    result = node.invoke({"messages": [calls], "remaining_steps": 5})
+
+    assert [m.tool_call_id for m in result["messages"]] == ["call_0", "call_1", "call_2"]
+    assert len(calls.tool_calls) == 3
@@ -70,6 +70,8 @@ def test_initial_state(callback_handler):
         "tokens": 0,
         "input_tokens": 0,
         "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
         "session_id": 123,  # From mock_repositories fixture
         "duration": 0.0,
     }
@@ -198,6 +200,8 @@ def test_reset_session_totals(callback_handler):
         "tokens": 0,
         "input_tokens": 0,
         "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
         "session_id": 123,  # session_id is PRESERVED by reset_session_totals
         "duration": 0.0,
     }
@@ -259,3 +263,146 @@ def test_get_stats(callback_handler):
     assert stats["session_totals"]["cost"] == pytest.approx(expected_cost)
     assert stats["session_totals"]["duration"] == pytest.approx(0.1)
     assert stats["session_totals"]["session_id"] == 123  # From mock
+
+
+def test_overlapping_runs_are_timed_separately(callback_handler):
+    """Test that concurrent calls are timed by run id, with TTFT and throughput."""
+    from uuid import uuid4
+
+    from ra_aid.callbacks.latency_metrics import get_latency_metrics
+
+    get_latency_metrics().reset()
+    callback_handler.trajectory_repo = MagicMock()
+    mock_response = MagicMock(spec=LLMResult)
+    mock_response.llm_output = {
+        "token_usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+    }
+    slow_run, fast_run = uuid4(), uuid4()
+
+    with patch("time.time") as clock:
+        clock.return_value = 100.0
+        callback_handler.on_llm_start({}, ["prompt"], run_id=slow_run, metadata={"agent_type": "research"})
+        clock.return_value = 101.0
+        callback_handler.on_llm_start({}, ["prompt"], run_id=fast_run, metadata={"agent_type": "research"})
+        callback_handler.on_llm_new_token("a", run_id=fast_run)
+        clock.return_value = 101.5
+        callback_handler.on_llm_new_token("b", run_id=fast_run)
+        callback_handler.on_llm_end(mock_response, run_id=fast_run)
+        clock.return_value = 104.0
+        callback_handler.on_llm_end(mock_response, run_id=slow_run)
+
+    fast_step, slow_step = (
+        call.kwargs["step_data"] for call in callback_handler.trajectory_repo.create.call_args_list
+    )
+    assert fast_step["duration"] == pytest.approx(0.5)
+    assert fast_step["time_to_first_token"] == pytest.approx(0.0)
+    assert fast_step["tokens_per_second"] == pytest.approx(100.0)
+    assert slow_step["duration"] == pytest.approx(4.0)
+    assert slow_step["time_to_first_token"] is None
+    assert slow_step["tokens_per_second"] == pytest.approx(12.5)
+
+    latency = slow_step["latency"]
+    assert slow_step["agent_type"] == "research"
+    assert (latency["model"], latency["agent_type"], latency["calls"]) == (DEFAULT_MODEL, "research", 2)
+    assert latency["duration_p50"] == pytest.approx(2.25)
+    assert latency["duration_p95"] == pytest.approx(3.825)
+    assert callback_handler.session_totals["duration"] == pytest.approx(4.5)
+    get_latency_metrics().reset()
+
+
+def test_concurrent_runs_keep_their_own_model(callback_handler):
+    """Test that latency and usage rows go to the model each call was made with."""
+    from uuid import uuid4
+
+    from ra_aid.callbacks.latency_metrics import get_latency_metrics
+
+    get_latency_metrics().reset()
+    callback_handler.trajectory_repo = MagicMock()
+    mock_response = MagicMock(spec=LLMResult)
+    mock_response.llm_output = {
+        "token_usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    }
+    sonnet_run, gpt_run = uuid4(), uuid4()
+
+    with patch("time.time") as clock:
+        clock.return_value = 100.0
+        callback_handler.on_llm_start(
+            {}, ["prompt"], run_id=sonnet_run, metadata={"ls_model_name": "claude-3-7-sonnet"}
+        )
+        callback_handler.on_llm_start(
+            {}, ["prompt"], run_id=gpt_run, invocation_params={"model": "gpt-4o"}
+        )
+        clock.return_value = 101.0
+        callback_handler.on_llm_end(mock_response, run_id=sonnet_run)
+        clock.return_value = 103.0
+        callback_handler.on_llm_end(mock_response, run_id=gpt_run)
+
+    sonnet_step, gpt_step = (
+        call.kwargs["step_data"] for call in callback_handler.trajectory_repo.create.call_args_list
+    )
+    assert (sonnet_step["model"], sonnet_step["latency"]["model"]) == ("claude-3-7-sonnet", "claude-3-7-sonnet")
+    assert (gpt_step["model"], gpt_step["latency"]["model"]) == ("gpt-4o", "gpt-4o")
+    assert get_latency_metrics().summary("gpt-4o", "default")["duration_p50"] == pytest.approx(3.0)
+    get_latency_metrics().reset()
+
+
+def test_failed_run_is_forgotten(callback_handler):
+    """Test that errored calls do not leave timing state behind."""
+    from uuid import uuid4
+
+    run_id = uuid4()
+    callback_handler.on_llm_start({}, ["prompt"], run_id=run_id)
+    callback_handler.on_llm_error(RuntimeError("boom"), run_id=run_id)
+    assert callback_handler._runs == {}
+
+
+def test_anthropic_prompt_cache_tokens(callback_handler):
+    """Test that Anthropic cache reads and writes are counted and priced."""
+    callback_handler.trajectory_repo = MagicMock()
+    callback_handler.input_cost_per_token = Decimal("0.001")
+    callback_handler.output_cost_per_token = Decimal("0.002")
+    callback_handler.cache_read_cost_per_token = Decimal("0.0001")
+    callback_handler.cache_creation_cost_per_token = Decimal("0.00125")
+    mock_response = MagicMock(spec=LLMResult)
+    mock_response.llm_output = {
+        "usage": {
+            "input_tokens": 10,
+            "output_tokens": 20,
+            "cache_read_input_tokens": 1000,
+            "cache_creation_input_tokens": 100,
+        }
+    }
+
+    callback_handler._last_request_time = None
+    callback_handler.on_llm_end(mock_response)
+
+    # Anthropic's input_tokens excludes the cached part of the prompt
+    assert callback_handler.prompt_tokens == 1110
+    assert callback_handler.total_cost == Decimal("0.01") + Decimal("0.1") + Decimal("0.125") + Decimal("0.04")
+    assert callback_handler.session_totals["cache_read_tokens"] == 1000
+    assert callback_handler.session_totals["cache_creation_tokens"] == 100
+    step_data = callback_handler.trajectory_repo.create.call_args.kwargs["step_data"]
+    assert step_data["cache_read_tokens"] == 1000
+    assert step_data["cache_creation_tokens"] == 100
+
+
+def test_openai_cached_prompt_tokens(callback_handler):
+    """Test that OpenAI's cached prompt tokens are counted without changing the prompt total."""
+    callback_handler.trajectory_repo = MagicMock()
+    mock_response = MagicMock(spec=LLMResult)
+    mock_response.llm_output = {
+        "token_usage": {
+            "prompt_tokens": 2000,
+            "completion_tokens": 50,
+            "total_tokens": 2050,
+            "prompt_tokens_details": {"cached_tokens": 1536},
+        }
+    }
+
+    callback_handler.on_llm_end(mock_response)
+
+    assert callback_handler.prompt_tokens == 2000
+    assert callback_handler.get_stats()["cumulative_tokens"]["cache_read"] == 1536
+    step_data = callback_handler.trajectory_repo.create.call_args.kwargs["step_data"]
+    assert step_data["cache_read_tokens"] == 1536
+    assert step_data["cache_creation_tokens"] == 0
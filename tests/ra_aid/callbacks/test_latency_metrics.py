@@ -0,0 +1,39 @@
+"""Tests for LLM latency percentiles."""
+
+import pytest
+
+from ra_aid.callbacks.latency_metrics import LatencyMetrics, percentile
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) is None
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == pytest.approx(2.5)
+    assert percentile(list(range(1, 101)), 95) == pytest.approx(95.05)
+
+
+def test_groups_by_model_and_agent_type():
+    metrics = LatencyMetrics()
+    for duration in (1.0, 2.0, 3.0):
+        metrics.record("gpt-4", "research", duration, tokens_per_second=10 * duration)
+    metrics.record("gpt-4", "planner", 9.0, time_to_first_token=0.5)
+
+    research = metrics.summary("gpt-4", "research")
+    assert research["calls"] == 3
+    assert research["duration_p50"] == 2.0
+    assert research["tokens_per_second_p95"] == pytest.approx(29.0)
+    assert research["time_to_first_token_p50"] is None
+
+    assert [s["agent_type"] for s in metrics.snapshot()] == ["planner", "research"]
+    assert [s["agent_type"] for s in metrics.snapshot(agent_type="planner")] == ["planner"]
+    assert metrics.snapshot(model="claude") == []
+    assert metrics.summary("gpt-4", "default") is None
+
+
+def test_window_keeps_recent_calls():
+    metrics = LatencyMetrics(window=2)
+    for duration in (100.0, 1.0, 1.0):
+        metrics.record("gpt-4", "default", duration)
+    summary = metrics.summary("gpt-4", "default")
+    assert summary["calls"] == 3
+    assert summary["duration_p95"] == 1.0
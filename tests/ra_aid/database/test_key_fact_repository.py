@@ -8,7 +8,7 @@ from unittest.mock import patch
 import peewee
 
 from ra_aid.database.connection import DatabaseManager, db_var
-from ra_aid.database.models import KeyFact, BaseModel
+from ra_aid.database.models import HumanInput, KeyFact, BaseModel, Session
 from ra_aid.database.repositories.key_fact_repository import (
     KeyFactRepository, 
     KeyFactRepositoryManager,
@@ -287,4 +287,23 @@ def test_to_model_method(setup_db):
     assert pydantic_fact.updated_at == peewee_fact.updated_at
     
     # Test with None input
-    assert repo._to_model(None) is None
\ No newline at end of file
+    assert repo._to_model(None) is None
+
+
+def test_count_by_session(setup_db):
+    """Test counting facts recorded directly in a session or under its human inputs."""
+    setup_db.create_tables([Session, HumanInput], safe=True)
+    repo = KeyFactRepository(db=setup_db)
+    session = Session.create(command_line="ra-aid one")
+    other = Session.create(command_line="ra-aid two")
+    human_input = HumanInput.create(content="question", source="cli", session=session)
+
+    KeyFact.create(content="direct", session=session)
+    repo.create("via human input", human_input_id=human_input.id)
+    KeyFact.create(content="other session", session=other)
+    repo.create("no session")
+
+    assert repo.count() == 4
+    assert repo.count_by_session(session.id) == 2
+    assert repo.count_by_session(other.id) == 1
+    assert repo.count_by_session(999) == 0
@@ -0,0 +1,181 @@
+"""
+Tests for the versioned memory store cache and its use by the memory repositories.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import peewee
+import pytest
+
+from ra_aid.database.memory_cache import MemoryStoreCache, clear_memory_caches, get_memory_cache
+from ra_aid.database.models import HumanInput, KeyFact, KeySnippet, ResearchNote, Session
+from ra_aid.database.repositories.key_fact_repository import KeyFactRepository
+from ra_aid.database.repositories.key_snippet_repository import KeySnippetRepository
+from ra_aid.database.repositories.research_note_repository import ResearchNoteRepository
+from ra_aid.model_formatters import format_key_facts_dict
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    db = peewee.SqliteDatabase(str(tmp_path / "pk.db"))
+    models = [Session, HumanInput, KeyFact, KeySnippet, ResearchNote]
+    with db.bind_ctx(models):
+        db.create_tables(models)
+        yield db
+    db.close()
+    clear_memory_caches()
+
+
+def test_load_once_then_apply_writes():
+    cache = MemoryStoreCache("facts")
+    load = MagicMock(return_value={2: "b", 1: "a"})
+
+    assert list(cache.entries(load)) == [1, 2]
+    assert cache.entries(load) == {1: "a", 2: "b"}
+    load.assert_called_once()
+
+    snapshot = cache.entries(load)
+    cache.upsert(3, "c")
+    cache.upsert(1, "A")
+    cache.remove(2)
+
+    assert cache.entries(load) == {1: "A", 3: "c"}
+    # Writes replace the dictionary instead of changing one already handed out
+    assert snapshot == {1: "a", 2: "b"}
+    assert cache.version == 3
+    assert cache.count(MagicMock(side_effect=AssertionError)) == 2
+
+
+def test_out_of_order_upsert_keeps_id_order():
+    cache = MemoryStoreCache("facts")
+    cache.entries(lambda: {1: "a", 5: "e"})
+    cache.upsert(3, "c")
+    assert list(cache.entries(MagicMock())) == [1, 3, 5]
+
+
+def test_write_during_load_is_not_cached():
+    cache = MemoryStoreCache("facts")
+
+    def racing_load():
+        cache.upsert(2, "b")
+        return {1: "a"}
+
+    assert cache.entries(racing_load) == {1: "a"}
+    assert not cache.loaded
+    assert cache.entries(lambda: {1: "a", 2: "b"}) == {1: "a", 2: "b"}
+
+
+def test_count_queries_until_loaded():
+    cache = MemoryStoreCache("facts")
+    assert cache.count(lambda: 7) == 7
+
+
+def test_in_memory_databases_get_private_caches():
+    db = peewee.SqliteDatabase(":memory:")
+    assert get_memory_cache(db, "facts") is not get_memory_cache(db, "facts")
+
+
+def test_repositories_on_one_file_share_cache(file_db):
+    writer = KeyFactRepository(file_db)
+    reader = KeyFactRepository(file_db)
+    writer.create("first")
+    assert reader.get_facts_dict() == {1: "first"}
+
+    writer.create("second")
+    writer.update(1, "first, revised")
+    with patch.object(KeyFact, "select", side_effect=AssertionError("database was queried")):
+        assert reader.get_facts_dict() == {1: "first, revised", 2: "second"}
+        assert reader.count() == 2
+    assert reader.version == writer.version == 3
+
+
+def test_writes_from_another_connection_reload_the_snapshot(file_db, tmp_path):
+    repo = KeyFactRepository(file_db)
+    repo.create("fact from A")
+    assert repo.get_facts_dict() == {1: "fact from A"}
+
+    # Another process on the same project database
+    other_db = peewee.SqliteDatabase(str(tmp_path / "pk.db"))
+    with other_db.bind_ctx([KeyFact]):
+        KeyFactRepository(other_db).create("fact from B")
+        KeyFact.delete().where(KeyFact.id == 1).execute()
+    other_db.close()
+
+    assert repo.count() == 1
+    assert repo.get_facts_dict() == {2: "fact from B"}
+    # Unchanged since the reload, so served from the snapshot again
+    with patch.object(KeyFact, "select", side_effect=AssertionError("database was queried")):
+        assert repo.get_facts_dict() == {2: "fact from B"}
+
+
+def test_repository_count_without_loading(file_db):
+    repo = ResearchNoteRepository(file_db)
+    repo.create("note one")
+    repo.create("note two")
+    assert repo.count() == 2
+    repo.delete(1)
+    assert repo.get_notes_dict() == {2: "note two"}
+    assert repo.count() == 1
+
+
+def test_snippets_dict_is_a_copy(file_db):
+    repo = KeySnippetRepository(file_db)
+    repo.create("a.py", 1, "x = 1", "assignment")
+    repo.get_snippets_dict()[1]["snippet"] = "changed"
+    assert repo.get_snippets_dict()[1]["snippet"] == "x = 1"
+
+
+def test_cached_facts_render_like_database_facts(file_db):
+    repo = KeyFactRepository(file_db)
+    for content in ["alpha", "beta", "gamma"]:
+        repo.create(content)
+    repo.get_facts_dict()
+    repo.delete(2)
+    repo.create("delta")
+
+    from_db = {fact.id: fact.content for fact in repo.get_all()}
+    assert format_key_facts_dict(repo.get_facts_dict()) == format_key_facts_dict(from_db)
+
+
+def test_relevant_selects_top_k_in_id_order():
+    cache = MemoryStoreCache("facts")
+    load = lambda: {1: "uses sqlite", 2: "websocket server", 3: "sqlite migrations", 4: "cli flags"}
+
+    assert cache.relevant(load, str, "sqlite", 2) == {1: "uses sqlite", 3: "sqlite migrations"}
+    # Within the budget everything is included
+    assert cache.relevant(load, str, "sqlite", 4) == load()
+    assert cache.relevant(load, str, "sqlite", 0) == load()
+
+
+def test_relevant_index_follows_writes():
+    cache = MemoryStoreCache("facts")
+    cache.relevant(lambda: {1: "alpha", 2: "beta", 3: "gamma"}, str, "alpha", 1)
+    cache.upsert(4, "delta token")
+    cache.upsert(1, "renamed")
+    cache.remove(2)
+
+    assert cache.relevant(MagicMock(), str, "delta", 1) == {4: "delta token"}
+    assert cache.relevant(MagicMock(), str, "alpha", 1) == {4: "delta token"}
+
+
+def test_repository_relevant_dicts(file_db):
+    facts = KeyFactRepository(file_db)
+    for content in ["The API uses FastAPI", "Tests run with pytest", "Config lives in config.py"]:
+        facts.create(content)
+    assert facts.get_relevant_facts_dict("add a pytest test", top_k=1) == {2: "Tests run with pytest"}
+
+    snippets = KeySnippetRepository(file_db)
+    snippets.create("ra_aid/server/server.py", 10, "app = FastAPI()", "server app")
+    snippets.create("ra_aid/llm.py", 20, "def create_llm_client():", None)
+    relevant = snippets.get_relevant_snippets_dict("llm client", top_k=1)
+    assert list(relevant) == [2]
+    relevant[2]["snippet"] = "changed"
+    assert snippets.get_snippets_dict()[2]["snippet"] == "def create_llm_client():"
+
+    notes = ResearchNoteRepository(file_db)
+    notes.create("websocket broadcasts are queued per client")
+    notes.create("trajectory rows are written in batches")
+    assert notes.get_relevant_notes_dict("trajectory writer", top_k=1) == {
+        2: "trajectory rows are written in batches"
+    }
+
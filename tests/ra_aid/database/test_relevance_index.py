@@ -0,0 +1,64 @@
+"""
+Tests for BM25 relevance ranking of memory entries.
+"""
+
+import pytest
+
+from ra_aid.database.relevance_index import BM25Index, resolve_top_k, snippet_text, tokenize
+from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
+
+
+def test_tokenize_splits_identifiers_and_drops_stopwords():
+    assert tokenize("The getUserId helper") == ["getuserid", "get", "user", "id", "helper"]
+    assert tokenize("parse_http_response()") == ["parse", "http", "response"]
+    assert tokenize("HTTPServer") == ["httpserver", "http", "server"]
+    assert tokenize("") == []
+
+
+def test_scores_prefer_rare_terms():
+    index = BM25Index()
+    index.add(1, "the database connection uses sqlite")
+    index.add(2, "the websocket server broadcasts updates")
+    index.add(3, "database migrations run at startup with peewee_migrate")
+
+    scores = index.scores("sqlite database")
+    assert set(scores) == {1, 3}
+    assert scores[1] > scores[3]
+    assert index.top_k("websocket", 1) == [2]
+
+
+def test_unmatched_entries_fill_by_recency():
+    index = BM25Index()
+    for doc_id in range(1, 6):
+        index.add(doc_id, f"note number {doc_id}")
+    index.add(6, "the cache invalidation rule")
+
+    assert index.top_k("cache", 3) == [6, 5, 4]
+
+
+def test_add_replaces_and_remove_forgets():
+    index = BM25Index()
+    index.add(1, "alpha beta")
+    index.add(1, "gamma")
+    assert index.scores("alpha") == {}
+    assert 1 in index.scores("gamma")
+
+    index.remove(1)
+    index.remove(1)
+    assert len(index) == 0
+    assert index.scores("gamma") == {}
+
+
+def test_snippet_text_covers_path_description_and_code():
+    text = snippet_text(
+        {"filepath": "ra_aid/llm.py", "line_number": 3, "snippet": "def create_llm():", "description": None}
+    )
+    assert "llm" in tokenize(text)
+    assert "create" in tokenize(text)
+
+
+@pytest.mark.parametrize("configured, explicit, expected", [(7, None, 7), (7, 3, 3), (0, None, 0), (7, -1, 0)])
+def test_resolve_top_k(configured, explicit, expected):
+    with ConfigRepositoryManager() as config:
+        config.set("memory_relevance_top_k", configured)
+        assert resolve_top_k(explicit) == expected
@@ -0,0 +1,137 @@
+"""
+Tests for the full-text search index over trajectories and human inputs.
+"""
+
+import importlib
+import json
+from unittest.mock import MagicMock
+
+import peewee
+import pytest
+
+from ra_aid.database.models import HumanInput, Session, Trajectory
+from ra_aid.database.repositories.human_input_repository import HumanInputRepository
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+from ra_aid.database.search_index import (
+    build_match_query,
+    create_search_index,
+    excerpt,
+    search_index_available,
+)
+
+MODELS = [Session, HumanInput, Trajectory]
+
+
+@pytest.fixture
+def db():
+    database = peewee.SqliteDatabase(":memory:")
+    with database.bind_ctx(MODELS):
+        database.create_tables(MODELS)
+        yield database
+    database.close()
+
+
+def _trajectory(session, tool_name, parameters, result, record_type="tool_execution"):
+    return Trajectory.create(
+        session=session,
+        tool_name=tool_name,
+        tool_parameters=json.dumps(parameters),
+        tool_result=json.dumps(result),
+        record_type=record_type,
+    )
+
+
+def test_build_match_query_quotes_words():
+    assert build_match_query("ripgrep timeout") == '"ripgrep" "timeout"'
+    assert build_match_query('fail* "OR" NEAR(') == '"fail"* "OR" "NEAR("'
+    with pytest.raises(ValueError):
+        build_match_query('  "" * ')
+
+
+def test_excerpt_centres_on_match():
+    text = "x" * 300 + " needle " + "y" * 300
+    snippet = excerpt(text, ["needle"], width=80)
+    assert "needle" in snippet
+    assert snippet.startswith("...") and snippet.endswith("...")
+
+
+def test_trajectory_search_ranks_and_filters(db):
+    assert create_search_index(db)
+    one, two = Session.create(), Session.create()
+    _trajectory(one, "ripgrep_search", {"pattern": "def main"}, {"output": "ra_aid/__main__.py"})
+    _trajectory(one, "run_shell_command", {"command": "pytest -q"}, "3 failed")
+    _trajectory(two, "run_shell_command", {"command": "pytest tests/ra_aid"}, "ok", record_type="other")
+
+    repo = TrajectoryRepository(db, async_writes=False)
+    # Newest first by default
+    assert [hit.id for hit in repo.search("pytest")] == [3, 2]
+    assert [hit.id for hit in repo.search("ripgrep")] == [1]
+    assert repo.search("ripgrep")[0].snippet == "[ripgrep]_search"
+    ranked = repo.search("pytest", order="rank")
+    assert {hit.id for hit in ranked} == {2, 3}
+    assert ranked[0].rank <= ranked[1].rank
+    with pytest.raises(ValueError):
+        repo.search("pytest", order="oldest")
+    assert [hit.id for hit in repo.search("pytest", session_id=two.id)] == [3]
+    assert [hit.id for hit in repo.search("pytest", record_type="tool_execution")] == [2]
+    assert [hit.id for hit in repo.search("fail*")] == [2]
+    assert repo.search("pytest", limit=1)[0].kind == "trajectory"
+
+
+def test_triggers_follow_updates_and_deletes(db):
+    create_search_index(db)
+    session = Session.create()
+    trajectory = _trajectory(session, "run_shell_command", {"command": "make"}, "failed")
+    repo = TrajectoryRepository(db, async_writes=False)
+
+    trajectory.tool_result = json.dumps("passed")
+    trajectory.save()
+    assert repo.search("failed") == []
+    assert [hit.id for hit in repo.search("passed")] == [trajectory.id]
+
+    trajectory.delete_instance()
+    assert repo.search("passed") == []
+
+
+def test_human_input_search(db):
+    create_search_index(db)
+    one, two = Session.create(), Session.create()
+    HumanInput.create(content="Add a search endpoint", source="cli", session=one)
+    HumanInput.create(content="Speed up the search index", source="chat", session=two)
+
+    repo = HumanInputRepository(db)
+    assert {hit.id for hit in repo.search("search")} == {1, 2}
+    hits = repo.search("search", session_id=two.id)
+    assert [(hit.kind, hit.id, hit.session_id) for hit in hits] == [("human_input", 2, two.id)]
+    assert "[search]" in hits[0].snippet
+
+
+def test_search_without_index_uses_substrings(db):
+    session = Session.create()
+    _trajectory(session, "ripgrep_search", {"pattern": "TODO"}, {"output": "2 matches"})
+    _trajectory(session, "ripgrep_search", {"pattern": "FIXME"}, {"output": "none"})
+    HumanInput.create(content="Find the TODO comments", source="cli", session=session)
+    assert not search_index_available(db, "trajectory_fts")
+
+    hits = TrajectoryRepository(db, async_writes=False).search("ripgrep TODO")
+    assert [hit.id for hit in hits] == [1]
+    assert "TODO" in hits[0].snippet
+    assert [hit.id for hit in HumanInputRepository(db).search("todo")] == [1]
+
+
+def test_migration_indexes_existing_rows(db):
+    session = Session.create()
+    _trajectory(session, "read_file_tool", {"filepath": "setup.py"}, "contents")
+    HumanInput.create(content="existing question", source="cli", session=session)
+
+    migration = importlib.import_module("ra_aid.migrations.017_20250415_090000_add_search_index")
+    migrator = MagicMock()
+    migrator.sql.side_effect = db.execute_sql
+    migration.migrate(migrator, db)
+
+    assert [hit.id for hit in TrajectoryRepository(db, async_writes=False).search("setup")] == [1]
+    assert [hit.id for hit in HumanInputRepository(db).search("question")] == [1]
+
+    migration.rollback(migrator, db)
+    assert not search_index_available(db, "trajectory_fts")
+    assert not search_index_available(db, "human_input_fts")
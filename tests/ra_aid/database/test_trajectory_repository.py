@@ -2,8 +2,10 @@
 Tests for the TrajectoryRepository class.
 """
 
+import datetime
 import pytest
 import json
+import peewee
 import logging
 from unittest.mock import patch, MagicMock, call
 
@@ -636,6 +638,69 @@ def test_get_trajectories_by_session(setup_db, mock_session_repository, cleanup_
         assert trajectory.tool_name.startswith("tool_s2")
 
 
+def test_get_trajectories_by_session_page(setup_db, mock_session_repository, cleanup_repo):
+    """Keyset pages cover the session history in order without overlap."""
+    repo = TrajectoryRepository(db=setup_db)
+    Session.create(id=2)
+    same_time = datetime.datetime(2025, 1, 1, 12, 0, 0)
+    for i in range(7):
+        repo.create(tool_name=f"tool_{i}", session_id=1)
+        repo.create(tool_name=f"other_{i}", session_id=2)
+    # Rows sharing a timestamp are ordered by id
+    Trajectory.update(created_at=same_time).where(Trajectory.session == 1).execute()
+
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        page, cursor = repo.get_trajectories_by_session_page(1, limit=3, after=cursor)
+        names.extend(t.tool_name for t in page)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert names == [f"tool_{i}" for i in range(7)]
+    assert names == [t.tool_name for t in repo.get_trajectories_by_session(1)]
+
+
+def test_get_trajectories_by_session_page_exact_fit(setup_db, mock_session_repository, cleanup_repo):
+    repo = TrajectoryRepository(db=setup_db)
+    for i in range(4):
+        repo.create(tool_name=f"tool_{i}", session_id=1)
+
+    page, cursor = repo.get_trajectories_by_session_page(1, limit=4)
+    assert len(page) == 4
+    assert cursor is None
+
+
+def test_iter_trajectories_by_session(setup_db, mock_session_repository, cleanup_repo):
+    repo = TrajectoryRepository(db=setup_db)
+    for i in range(11):
+        repo.create(tool_name=f"tool_{i}", session_id=1)
+
+    streamed = [t.tool_name for t in repo.iter_trajectories_by_session(1, batch_size=4)]
+    assert streamed == [f"tool_{i}" for i in range(11)]
+
+
+def test_session_queries_use_indexes(setup_db, mock_session_repository, cleanup_repo):
+    """Session history and usage totals are served by the composite indexes."""
+    db = Trajectory._meta.database
+    history_plan = db.execute_sql(
+        "EXPLAIN QUERY PLAN SELECT * FROM trajectory WHERE session_id = ? ORDER BY created_at, id",
+        (1,),
+    ).fetchall()
+    assert "trajectory_session_id_created_at" in str(history_plan)
+    assert "TEMP B-TREE" not in str(history_plan)
+
+    totals_plan = db.execute_sql(
+        "EXPLAIN QUERY PLAN SELECT SUM(input_tokens) FROM trajectory "
+        "WHERE session_id = ? AND record_type = 'model_usage'",
+        (1,),
+    ).fetchall()
+    assert "trajectory_session_id_record_type" in str(totals_plan)
+
+
 def test_trajectory_repository_manager(setup_db, cleanup_repo, mock_session_repository):
     """Test the TrajectoryRepositoryManager context manager."""
     # Use the context manager to create a repository
@@ -782,3 +847,89 @@ def test_create_hook_error_handling_instance(setup_db, cleanup_repo, mock_sessio
         assert trajectory_model.tool_name == "hook_error_test"
 
 # --- End Tests for Hook Mechanism ---
+
+
+# --- Tests for asynchronous, batched writes ---
+
+@pytest.fixture
+def file_db(tmp_path, cleanup_repo):
+    """A file-backed database, which enables the background trajectory writer."""
+    db = peewee.SqliteDatabase(
+        str(tmp_path / "pk.db"), pragmas={"journal_mode": "wal", "foreign_keys": 1}
+    )
+    with db.bind_ctx([Trajectory, HumanInput, Session]):
+        db.create_tables([Trajectory, HumanInput, Session])
+        Session.create(id=1, name="Test Session")
+        yield db
+    db.close()
+
+
+def test_async_create_is_written_in_background(file_db, mock_session_repository):
+    repo = TrajectoryRepository(db=file_db)
+    stored = []
+    hook = MagicMock(side_effect=stored.append)
+    hook.__name__ = "record_hook"
+    repo.register_create_hook(hook)
+    try:
+        model = repo.create(tool_name="ripgrep_search", tool_parameters={"pattern": "x"})
+
+        # The caller gets the record back without waiting for its insert
+        assert model.id is None
+        assert model.tool_parameters == {"pattern": "x"}
+        assert model.session_id == 1
+
+        assert repo.flush(timeout=10)
+        assert Trajectory.select().count() == 1
+        assert len(stored) == 1
+        assert stored[0].id is not None
+        assert stored[0].tool_name == "ripgrep_search"
+    finally:
+        repo.close()
+
+
+def test_async_reads_see_queued_records(file_db, mock_session_repository):
+    repo = TrajectoryRepository(db=file_db)
+    try:
+        for i in range(50):
+            repo.create(tool_name=f"tool_{i}", session_id=1, record_type="model_usage", input_tokens=1)
+
+        trajectories = repo.get_trajectories_by_session(1)
+        assert [t.tool_name for t in trajectories] == [f"tool_{i}" for i in range(50)]
+        assert repo.get_session_usage_totals(1)["total_input_tokens"] == 50
+    finally:
+        repo.close()
+
+
+def test_async_manager_flushes_on_exit(file_db, mock_session_repository):
+    with TrajectoryRepositoryManager(file_db) as repo:
+        repo._writer.flush_interval = 60  # Only the exit flush can write the record
+        repo.create(tool_name="pending")
+
+    assert Trajectory.select().where(Trajectory.tool_name == "pending").count() == 1
+
+
+def test_async_bad_record_does_not_lose_batch(file_db, mock_session_repository):
+    repo = TrajectoryRepository(db=file_db)
+    try:
+        repo.create(tool_name="before", session_id=1, human_input_id=999)
+        repo.create(tool_name="orphan", session_id=12345)  # Violates the session foreign key
+        repo.create(tool_name="after", session_id=1)
+        repo.flush(timeout=10)
+    finally:
+        repo.close()
+
+    names = {t.tool_name for t in Trajectory.select()}
+    assert names == {"before", "after"}
+    assert Trajectory.get(Trajectory.tool_name == "before").human_input is None
+
+
+def test_async_writes_disabled_for_in_memory_db(setup_db, cleanup_repo):
+    repo = TrajectoryRepository(db=setup_db)
+    assert repo._writer is None
+
+
+def test_create_after_close_writes_synchronously(file_db, mock_session_repository):
+    repo = TrajectoryRepository(db=file_db)
+    repo.close()
+    model = repo.create(tool_name="sync")
+    assert model.id is not None
@@ -181,7 +181,9 @@ def test_truncate_table(setup_test_model, mock_logger):
     assert TestModel.select().count() == 2
 
     # Call truncate_table
-    truncate_table(TestModel)
+    with patch("ra_aid.database.utils.clear_memory_caches") as clear_caches:
+        truncate_table(TestModel)
+    clear_caches.assert_called_once()
 
     # Verify success message was logged
     mock_logger.info.assert_called_with(
@@ -1,11 +1,23 @@
 """Tests for the interactive subprocess module."""
 
 import os
+import sys
 import tempfile
 
+import pyte
 import pytest
+from pyte.screens import HistoryScreen
 
-from ra_aid.proc.interactive import run_interactive_command
+from ra_aid.proc.interactive import (
+    MAX_READ_SIZE,
+    MIN_READ_SIZE,
+    EchoWriter,
+    TerminalCapture,
+    _HistoryScreen,
+    _fast_history_screen,
+    next_read_size,
+    run_interactive_command,
+)
 
 
 def test_basic_command():
@@ -198,3 +210,138 @@ def test_tty_available():
         b"/dev/pts/" in output_cleaned or b"/dev/ttys" in output_cleaned
     ), f"Unexpected TTY output: {output_cleaned}"
     assert retcode == 0
+
+
+def test_terminal_capture_handles_split_chunks():
+    """Multi-byte characters and escape sequences may span read chunks."""
+    capture = TerminalCapture(80, 24)
+    data = "caf\u00e9 \x1b[31mred\x1b[0m done\n".encode("utf-8")
+    for i in range(len(data)):
+        capture.feed(data[i : i + 1])
+    assert capture.render() == "caf\u00e9 red done"
+
+
+def test_terminal_capture_bounds_memory():
+    """Raw bytes and scrollback stay bounded however much output is fed."""
+    capture = TerminalCapture(80, 24, history=100, raw_limit=4096)
+    for i in range(5000):
+        capture.feed(f"line {i}\r\n".encode())
+
+    assert len(capture.raw_output) <= 4096
+    assert capture.raw_output.endswith(b"line 4999\r\n")
+    lines = capture.render().splitlines()
+    assert len(lines) <= 100 + 24
+    assert lines[-1] == "line 4999"
+
+
+def test_terminal_capture_keeps_tail_of_oversized_chunk():
+    capture = TerminalCapture(80, 24, raw_limit=10)
+    capture.feed(b"0123456789abcdef")
+    assert capture.raw_output == b"6789abcdef"
+
+
+def test_very_large_output():
+    """Output far beyond the history cap still yields the final lines."""
+    output, retcode = run_interactive_command(["/bin/bash", "-c", "seq 1 20000"])
+    assert len(output) <= 8000
+    assert output.splitlines()[-1] == b"20000"
+    assert retcode == 0
+
+
+def test_quiet_mode_does_not_echo(capfd):
+    """With echo disabled output is captured but not written to the terminal."""
+    output, retcode = run_interactive_command(
+        ["/bin/bash", "-c", "echo quiet-output"], echo=False
+    )
+    assert b"quiet-output" in output
+    assert "quiet-output" not in capfd.readouterr().out
+    assert retcode == 0
+
+
+def test_echo_mode_writes_output(capfd):
+    run_interactive_command(["/bin/bash", "-c", "echo loud-output"])
+    assert "loud-output" in capfd.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "current,received,expected",
+    [
+        (MIN_READ_SIZE, MIN_READ_SIZE, MIN_READ_SIZE * 2),
+        (MAX_READ_SIZE, MAX_READ_SIZE, MAX_READ_SIZE),
+        (MIN_READ_SIZE * 4, 10, MIN_READ_SIZE * 2),
+        (MIN_READ_SIZE, 10, MIN_READ_SIZE),
+        (MIN_READ_SIZE * 2, MIN_READ_SIZE, MIN_READ_SIZE * 2),
+    ],
+)
+def test_next_read_size(current, received, expected):
+    assert next_read_size(current, received) == expected
+
+
+def test_echo_writer_coalesces_writes():
+    read_fd, write_fd = os.pipe()
+    try:
+        echo = EchoWriter(write_fd, flush_bytes=100, flush_interval=60)
+        echo.write(b"a" * 40)
+        echo.write(b"b" * 40)
+        assert echo.pending == 80
+        echo.maybe_flush()
+        assert echo.pending == 80
+        echo.write(b"c" * 40)
+        assert echo.pending == 0
+        assert os.read(read_fd, 1000) == b"a" * 40 + b"b" * 40 + b"c" * 40
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_bulk_output_is_fully_captured():
+    """Output arriving faster than it is read keeps its order and tail."""
+    cmd = [
+        sys.executable,
+        "-c",
+        "import sys; sys.stdout.write(''.join('row %d\\n' % i for i in range(50000)))",
+    ]
+    output, retcode = run_interactive_command(cmd, echo=False)
+    assert output.splitlines()[-1] == b"row 49999"
+    assert retcode == 0
+
+
+def test_history_screen_matches_pyte():
+    """The fast history screen renders exactly like pyte's HistoryScreen."""
+    parts = []
+    for i in range(600):
+        parts.append(f"line {i} \x1b[3{i % 8}mcolor\x1b[0m")
+        if i % 97 == 0:
+            parts.append("\x1b[2J\x1b[H")
+        if i % 41 == 0:
+            parts.append("\x1b[5A\x1b[10Cover\x1b[K")
+        if i % 13 == 0:
+            parts.append("\rprogress " + "#" * (i % 50))
+        parts.append("\tend\r\n" if i % 5 else "x" * 150 + "\n")
+    data = "".join(parts)
+
+    screens = []
+    for screen_class in (HistoryScreen, _HistoryScreen):
+        screen = screen_class(80, 24, history=100, ratio=0.5)
+        stream = pyte.Stream(screen)
+        for start in range(0, len(data), 777):
+            stream.feed(data[start : start + 777])
+        screens.append(screen)
+
+    expected, actual = screens
+    assert actual.display == expected.display
+    assert [dict(line) for line in actual.history.top] == [
+        dict(line) for line in expected.history.top
+    ]
+    assert [dict(line) for line in actual.history.bottom] == [
+        dict(line) for line in expected.history.bottom
+    ]
+    assert (actual.cursor.x, actual.cursor.y) == (expected.cursor.x, expected.cursor.y)
+
+
+@pytest.mark.parametrize("wrapped", [None, 42, "draw", ["no_such_event"]])
+def test_history_screen_falls_back_without_event_list(wrapped):
+    """A pyte without a usable HistoryScreen._wrapped gets the stock screen."""
+    screen_class = type("Screen", (HistoryScreen,), {"_wrapped": wrapped})
+    assert _fast_history_screen(screen_class) is screen_class
+    assert _HistoryScreen is not HistoryScreen
@@ -0,0 +1,50 @@
+"""
+Tests for the API v1 metrics endpoint.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ra_aid.callbacks.latency_metrics import get_latency_metrics
+from ra_aid.rate_limiter import get_rate_limiter, reset_rate_limiters
+from ra_aid.server.api_v1_metrics import router
+
+
+@pytest.fixture
+def client():
+    get_latency_metrics().reset()
+    reset_rate_limiters()
+    app = FastAPI()
+    app.include_router(router)
+    yield TestClient(app)
+    get_latency_metrics().reset()
+    reset_rate_limiters()
+
+
+def test_metrics_report_latency_and_usage(client):
+    metrics = get_latency_metrics()
+    metrics.record("gpt-4", "research", 2.0, tokens_per_second=40.0)
+    metrics.record("claude-3-7-sonnet-20250219", "planner", 1.0, time_to_first_token=0.25)
+    get_rate_limiter("openai")
+
+    response = client.get("/v1/metrics")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [(s["model"], s["agent_type"]) for s in body["llm_latency"]] == [
+        ("claude-3-7-sonnet-20250219", "planner"),
+        ("gpt-4", "research"),
+    ]
+    assert body["llm_latency"][0]["time_to_first_token_p95"] == 0.25
+    assert body["llm_latency"][1]["tokens_per_second_p50"] == 40.0
+    assert [limiter["provider"] for limiter in body["rate_limiters"]] == ["openai"]
+    assert "construction_ms_saved" in body["llm_client_pool"]
+
+
+def test_metrics_filter_by_agent_type(client):
+    get_latency_metrics().record("gpt-4", "research", 2.0)
+    get_latency_metrics().record("gpt-4", "planner", 1.0)
+
+    body = client.get("/v1/metrics", params={"agent_type": "planner"}).json()
+    assert [s["agent_type"] for s in body["llm_latency"]] == ["planner"]
@@ -0,0 +1,101 @@
+"""
+Tests for the API v1 search endpoint.
+"""
+
+from unittest.mock import MagicMock
+
+import peewee
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ra_aid.database.pydantic_models import SearchResultModel
+from ra_aid.database.repositories.human_input_repository import get_human_input_repository
+from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
+from ra_aid.server.api_v1_search import router
+
+
+@pytest.fixture
+def trajectory_repo():
+    repo = MagicMock()
+    repo.search.return_value = [
+        SearchResultModel(kind="trajectory", id=5, session_id=1, tool_name="ripgrep_search", snippet="[rg]", rank=-2.0),
+        SearchResultModel(kind="trajectory", id=9, session_id=1, tool_name="read_file_tool", snippet="[rg]", rank=-0.5),
+    ]
+    return repo
+
+
+@pytest.fixture
+def human_input_repo():
+    repo = MagicMock()
+    repo.search.return_value = [
+        SearchResultModel(kind="human_input", id=3, session_id=1, snippet="use [rg]", rank=-1.0)
+    ]
+    return repo
+
+
+@pytest.fixture
+def client(trajectory_repo, human_input_repo):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_trajectory_repository] = lambda: trajectory_repo
+    app.dependency_overrides[get_human_input_repository] = lambda: human_input_repo
+    return TestClient(app)
+
+
+def test_search_merges_kinds_by_rank(client, trajectory_repo, human_input_repo):
+    response = client.get("/v1/search", params={"q": "rg", "session_id": 1, "limit": 2, "order": "rank"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "rg"
+    assert [(r["kind"], r["id"]) for r in body["results"]] == [("trajectory", 5), ("human_input", 3)]
+    trajectory_repo.search.assert_called_once_with(
+        "rg", session_id=1, record_type=None, limit=2, order="rank"
+    )
+    human_input_repo.search.assert_called_once_with("rg", session_id=1, limit=2, order="rank")
+
+
+def test_rank_order_without_search_index(client, trajectory_repo, human_input_repo):
+    # The substring fallback has no BM25 ranks
+    for hit in trajectory_repo.search.return_value + human_input_repo.search.return_value:
+        hit.rank = None
+
+    response = client.get("/v1/search", params={"q": "rg", "order": "rank"})
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()["results"]] == [5, 3, 9]
+    assert response.json()["results"][0]["rank"] is None
+
+
+def test_search_defaults_to_newest_first(client, trajectory_repo, human_input_repo):
+    times = iter(["2025-04-01T10:00:00", "2025-04-01T12:00:00", "2025-04-01T11:00:00"])
+    for hit in trajectory_repo.search.return_value + human_input_repo.search.return_value:
+        hit.created_at = next(times)
+
+    response = client.get("/v1/search", params={"q": "rg"})
+    assert [r["id"] for r in response.json()["results"]] == [9, 3, 5]
+    assert trajectory_repo.search.call_args.kwargs["order"] == "recent"
+
+
+def test_search_single_kind_and_record_type(client, trajectory_repo, human_input_repo):
+    response = client.get("/v1/search", params={"q": "rg", "kind": "human_input"})
+    assert [r["id"] for r in response.json()["results"]] == [3]
+    trajectory_repo.search.assert_not_called()
+
+    human_input_repo.search.reset_mock()
+    response = client.get("/v1/search", params={"q": "rg", "record_type": "tool_execution"})
+    assert [r["id"] for r in response.json()["results"]] == [5, 9]
+    human_input_repo.search.assert_not_called()
+
+
+def test_search_errors(client, trajectory_repo):
+    assert client.get("/v1/search", params={"q": ""}).status_code == 422
+    assert client.get("/v1/search", params={"q": "x", "limit": 0}).status_code == 422
+    assert client.get("/v1/search", params={"q": "x", "order": "oldest"}).status_code == 422
+
+    trajectory_repo.search.side_effect = ValueError("Search query must contain at least one word")
+    response = client.get("/v1/search", params={"q": '""'})
+    assert response.status_code == 422
+
+    trajectory_repo.search.side_effect = peewee.DatabaseError("disk I/O error")
+    assert client.get("/v1/search", params={"q": "rg"}).status_code == 500
@@ -11,8 +11,9 @@ from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 from unittest.mock import patch
 import datetime
+import json
 
-from ra_aid.server.api_v1_sessions import router, get_repository
+from ra_aid.server.api_v1_sessions import router, get_repository, encode_cursor
 from ra_aid.database.pydantic_models import SessionModel, TrajectoryModel
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 
@@ -140,6 +141,7 @@ def mock_trajectory_repo(mock_trajectories):
     """Mock the TrajectoryRepository for testing."""
     repo = MagicMock()
     repo.get_trajectories_by_session.return_value = mock_trajectories
+    repo.get_trajectories_by_session_page.return_value = (mock_trajectories, None)
     return repo
 
 
@@ -256,6 +258,62 @@ def test_get_session_trajectories_not_found(client, mock_repo, mock_trajectory_r
 
 
 
+def test_get_session_trajectory_page(client, mock_trajectory_repo, mock_trajectories):
+    """Test that the page endpoint round-trips its cursor."""
+    cursor = (mock_trajectories[1].created_at, mock_trajectories[1].id)
+    mock_trajectory_repo.get_trajectories_by_session_page.return_value = (mock_trajectories, cursor)
+
+    response = client.get("/v1/session/1/trajectory/page?limit=2")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [t["id"] for t in body["items"]] == [1, 2]
+    assert body["limit"] == 2
+    assert body["next_cursor"] == encode_cursor(cursor)
+    mock_trajectory_repo.get_trajectories_by_session_page.assert_called_with(1, limit=2, after=None)
+
+    response = client.get(f"/v1/session/1/trajectory/page?limit=2&cursor={body['next_cursor']}")
+
+    assert response.status_code == 200
+    mock_trajectory_repo.get_trajectories_by_session_page.assert_called_with(1, limit=2, after=cursor)
+
+
+def test_get_session_trajectory_page_invalid_cursor(client, mock_trajectory_repo):
+    response = client.get("/v1/session/1/trajectory/page?cursor=not-a-cursor")
+
+    assert response.status_code == 422
+    mock_trajectory_repo.get_trajectories_by_session_page.assert_not_called()
+
+
+def test_get_session_trajectory_page_not_found(client, mock_repo, mock_trajectory_repo):
+    mock_repo.get.return_value = None
+
+    response = client.get("/v1/session/999/trajectory/page")
+
+    assert response.status_code == 404
+    mock_trajectory_repo.get_trajectories_by_session_page.assert_not_called()
+
+
+def test_stream_session_trajectories(client, mock_trajectory_repo, mock_trajectories):
+    """Test that the stream endpoint writes every page as NDJSON."""
+    cursor = (mock_trajectories[0].created_at, mock_trajectories[0].id)
+    mock_trajectory_repo.get_trajectories_by_session_page.side_effect = [
+        ([mock_trajectories[0]], cursor),
+        ([mock_trajectories[1]], None),
+    ]
+
+    response = client.get("/v1/session/1/trajectory/stream?batch_size=1")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["tool_name"] for line in lines] == ["test_tool_1", "test_tool_2"]
+    assert mock_trajectory_repo.get_trajectories_by_session_page.call_args_list[1].kwargs == {
+        "limit": 1,
+        "after": cursor,
+    }
+
+
 def test_delete_session_success(client, mock_repo, mock_session):
     mock_repo.get.return_value = mock_session
 
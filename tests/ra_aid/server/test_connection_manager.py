@@ -0,0 +1,177 @@
+"""
+Tests for websocket fan-out in ConnectionManager and the broadcast handoff.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from ra_aid.server import broadcast_sender
+from ra_aid.server.broadcast_sender import send_broadcast, set_broadcast_loop
+from ra_aid.server.connection_manager import (
+    DROP_NEWEST,
+    ClientConnection,
+    ConnectionManager,
+)
+from ra_aid.server.server import dispatch_broadcast, serialize_broadcast
+
+
+class FakeWebSocket:
+    """Records sent messages; a gate lets tests hold a client back."""
+
+    def __init__(self, name="client", fail=False):
+        self.client = name
+        self.sent = []
+        self.fail = fail
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("connection reset")
+        self.sent.append(message)
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_slow_client_does_not_block_others():
+    async def scenario():
+        manager = ConnectionManager()
+        slow, fast = FakeWebSocket("slow"), FakeWebSocket("fast")
+        slow.gate.clear()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        for i in range(5):
+            await manager.broadcast(f"m{i}")
+        await _settle()
+
+        assert fast.sent == [f"m{i}" for i in range(5)]
+        assert slow.sent == []
+
+        slow.gate.set()
+        await _settle()
+        assert slow.sent == fast.sent
+        await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_drops_oldest():
+    async def scenario():
+        manager = ConnectionManager(max_queue_size=3)
+        ws = FakeWebSocket()
+        ws.gate.clear()
+        await manager.connect(ws)
+        manager.publish("m0")
+        await _settle()  # The sender now waits on the first send
+
+        for i in range(1, 6):
+            manager.publish(f"m{i}")
+        assert manager.stats()["dropped"] == 2
+
+        ws.gate.set()
+        await _settle()
+        assert ws.sent == ["m0", "m3", "m4", "m5"]
+        await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_drop_newest():
+    client = ClientConnection(FakeWebSocket(), max_queue_size=2, overflow=DROP_NEWEST)
+    assert client.enqueue("a")
+    assert client.enqueue("b")
+    assert not client.enqueue("c")
+    assert client.dropped == 1
+    assert [entry[1] for entry in client._pending] == ["a", "b"]
+
+
+def test_coalesced_messages_replace_queued_ones():
+    client = ClientConnection(FakeWebSocket())
+    client.enqueue("first", coalesce_key=("session_update", 1))
+    client.enqueue("trajectory")
+    client.enqueue("second", coalesce_key=("session_update", 1))
+    client.enqueue("other", coalesce_key=("session_update", 2))
+
+    assert client.coalesced == 1
+    assert [entry[1] for entry in client._pending] == ["second", "trajectory", "other"]
+
+
+def test_failed_client_is_removed():
+    async def scenario():
+        manager = ConnectionManager()
+        broken, healthy = FakeWebSocket("broken", fail=True), FakeWebSocket("healthy")
+        await manager.connect(broken)
+        await manager.connect(healthy)
+
+        manager.publish("m0")
+        await _settle()
+        manager.publish("m1")
+        await _settle()
+
+        assert manager.active_connections == [healthy]
+        assert healthy.sent == ["m0", "m1"]
+        await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_serialize_broadcast_once_with_coalesce_key():
+    wrapper = {"type": "session_update", "payload": {"id": 7, "status": "running"}}
+    message, key = serialize_broadcast(wrapper)
+
+    assert json.loads(message) == wrapper
+    assert key == ("session_update", 7)
+    assert serialize_broadcast({"type": "trajectory", "payload": {"id": 1}})[1] is None
+    assert serialize_broadcast({"no": "type"}) is None
+    assert serialize_broadcast({"type": "x", "payload": object()}) is None
+
+
+@pytest.fixture
+def reset_broadcast_sender():
+    saved = (broadcast_sender._broadcast_queue, broadcast_sender._broadcast_loop, broadcast_sender._broadcast_dispatch)
+    yield
+    (
+        broadcast_sender._broadcast_queue,
+        broadcast_sender._broadcast_loop,
+        broadcast_sender._broadcast_dispatch,
+    ) = saved
+
+
+def test_send_broadcast_from_thread_reaches_clients(reset_broadcast_sender):
+    async def scenario():
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        set_broadcast_loop(
+            asyncio.get_running_loop(), lambda wrapper: dispatch_broadcast(manager, wrapper)
+        )
+
+        thread = threading.Thread(
+            target=lambda: [send_broadcast({"type": "n", "payload": i}) for i in range(3)]
+        )
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        await _settle()
+
+        assert [json.loads(m)["payload"] for m in ws.sent] == [0, 1, 2]
+        await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_send_broadcast_requires_target(reset_broadcast_sender):
+    broadcast_sender._broadcast_queue = None
+    set_broadcast_loop(None)
+    with pytest.raises(RuntimeError):
+        send_broadcast({"type": "n", "payload": 1})
@@ -17,6 +17,7 @@ from ra_aid.agent_context import (
     reset_completion_flags,
     should_exit,
 )
+from ra_aid.utils.agent_thread_manager import CancellationToken, agent_thread_registry
 
 
 class TestAgentContext:
@@ -403,3 +404,40 @@ class TestUtilityFunctions:
                 assert should_exit() is True
                 assert inner.agent_should_exit is True
                 assert outer.agent_should_exit is False
+
+
+class TestCancellationToken:
+    """Test cases for session cancellation tokens in agent contexts."""
+
+    def test_token_inherited_by_nested_contexts(self):
+        token = CancellationToken()
+        with agent_context(cancellation_token=token) as outer:
+            with agent_context() as inner:
+                assert inner.cancellation_token is token
+                assert should_exit() is False
+
+                token.cancel()
+
+                assert should_exit() is True
+                # The stop signal does not set the exit flags themselves
+                assert inner.agent_should_exit is False
+                assert outer.agent_should_exit is False
+
+    def test_should_exit_checks_session_registry(self):
+        stop_event = threading.Event()
+        agent_thread_registry[4242] = {"thread": None, "stop_event": stop_event}
+        try:
+            assert should_exit(4242) is False
+            stop_event.set()
+            assert should_exit(4242) is True
+            # Without a context the session signal still applies
+            assert should_exit() is False
+        finally:
+            agent_thread_registry.pop(4242, None)
+
+    def test_should_exit_does_not_log(self, caplog):
+        with caplog.at_level("DEBUG"):
+            with agent_context(cancellation_token=CancellationToken()):
+                for _ in range(10):
+                    should_exit(1)
+        assert caplog.records == []
@@ -9,6 +9,7 @@ import pytest
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
+from ra_aid.agent_backends.concurrent_tool_node import ConcurrentToolNode
 from ra_aid.agent_context import (
     agent_context,
 )
@@ -152,7 +153,9 @@ def test_create_agent_anthropic(mock_model, mock_config_repository):
         assert agent == "react_agent"
         # Check that create_react_agent was called with the right model and messages
         assert mock_react.call_args[0][0] == mock_model
-        assert mock_react.call_args[0][1] == []
+        tool_node = mock_react.call_args[0][1]
+        assert isinstance(tool_node, ConcurrentToolNode)
+        assert tool_node.tools_by_name == {}
         # Check that interrupt_after and version are set correctly
         assert mock_react.call_args[1]["interrupt_after"] == ["tools"]
         assert mock_react.call_args[1]["version"] == "v2"
@@ -176,7 +179,8 @@ def test_create_agent_openai(mock_model, mock_config_repository):
                 [],
                 max_tokens=models_params["openai"]["gpt-4"]["token_limit"],
                 config={"provider": "openai", "model": "gpt-4"},
-                session_id=None
+                session_id=None,
+                agent_type="default"
             )
 
 
@@ -196,7 +200,8 @@ def test_create_agent_no_token_limit(mock_model, mock_config_repository):
                 [],
                 max_tokens=DEFAULT_TOKEN_LIMIT,
                 config={"provider": "unknown", "model": "unknown-model"},
-                session_id=None
+                session_id=None,
+                agent_type="default"
             )
 
 
@@ -216,7 +221,8 @@ def test_create_agent_missing_config(mock_model, mock_config_repository):
                 [],
                 max_tokens=DEFAULT_TOKEN_LIMIT,
                 config={"provider": "openai"},
-                session_id=None
+                session_id=None,
+                agent_type="default"
             )
 
 
@@ -253,7 +259,8 @@ def test_create_agent_with_checkpointer(mock_model, mock_config_repository):
                 [],
                 max_tokens=models_params["openai"]["gpt-4"]["token_limit"],
                 config={"provider": "openai", "model": "gpt-4"},
-                session_id=None
+                session_id=None,
+                agent_type="default"
             )
 
 
@@ -322,7 +329,9 @@ def test_create_agent_anthropic_token_limiting_disabled(
         assert agent == "react_agent"
         # Check that create_react_agent was called with the right model and messages
         assert mock_react.call_args[0][0] == mock_model
-        assert mock_react.call_args[0][1] == []
+        tool_node = mock_react.call_args[0][1]
+        assert isinstance(tool_node, ConcurrentToolNode)
+        assert tool_node.tools_by_name == {}
         # Check that interrupt_after and version are set correctly
         assert mock_react.call_args[1]["interrupt_after"] == ["tools"]
         assert mock_react.call_args[1]["version"] == "v2"
@@ -416,6 +425,31 @@ def test_run_agent_stream(monkeypatch, mock_config_repository):
     assert ctx.completion_message == ""
 
 
+def test_run_agent_stream_runs_queued_gc_between_steps(monkeypatch, mock_config_repository):
+    from ra_aid.agent_utils import _run_agent_stream
+
+    events = []
+
+    class State:
+        next = None
+
+    class DummyAgent:
+        def stream(self, input_data, cfg: dict):
+            events.append("agent step")
+            yield {"agent": "chunk"}
+            events.append("tools step")
+            yield {"tools": "chunk"}
+
+        def get_state(self, state_config=None):
+            return State()
+
+    monkeypatch.setattr("ra_aid.agent_utils.print_agent_output", lambda *args, **kwargs: None)
+    monkeypatch.setattr("ra_aid.agent_utils.run_pending_gc", lambda: events.append("gc"))
+    _run_agent_stream(DummyAgent(), [HumanMessage("dummy prompt")])
+
+    assert events == ["agent step", "gc", "tools step", "gc"]
+
+
 def test_execute_test_command_wrapper(monkeypatch):
     from ra_aid.agent_utils import _execute_test_command_wrapper
 
@@ -508,6 +542,37 @@ def test_handle_api_error_retry(monkeypatch):
     _handle_api_error(Exception("error code 429"), 0, 5, 1)
 
 
+def test_handle_api_error_honors_retry_after(mock_config_repository):
+    from types import SimpleNamespace
+
+    from ra_aid.agent_utils import _handle_api_error
+    from ra_aid.rate_limiter import get_rate_limiter, reset_rate_limiters
+
+    reset_rate_limiters()
+    mock_config_repository.update({"provider": "anthropic"})
+    error = Exception("error code 429")
+    error.status_code = 429
+    error.response = SimpleNamespace(headers={"retry-after": "12"})
+
+    with patch("ra_aid.agent_utils.wait_interruptibly") as wait:
+        _handle_api_error(error, 0, 5, 1)
+
+    assert wait.call_args[0][0] == 12.0
+    # Other threads calling the provider are held for the same time
+    assert 11 < get_rate_limiter("anthropic").reserve() <= 12
+    reset_rate_limiters()
+
+
+def test_handle_api_error_backoff_is_capped():
+    from ra_aid.agent_utils import MAX_RETRY_BACKOFF_SECONDS, _handle_api_error
+
+    with patch("ra_aid.agent_utils.wait_interruptibly") as wait:
+        _handle_api_error(Exception("error code 429"), 15, 20, 1)
+
+    delay = wait.call_args[0][0]
+    assert MAX_RETRY_BACKOFF_SECONDS / 2 <= delay <= MAX_RETRY_BACKOFF_SECONDS
+
+
 def test_run_agent_with_retry_checks_crash_status(monkeypatch, mock_config_repository):
     """Test that run_agent_with_retry checks for crash status at the beginning of each iteration."""
     from ra_aid.agent_context import agent_context, mark_agent_crashed
@@ -772,7 +837,8 @@ def test_create_agent_openai_token_limiting_disabled(mock_model, mock_config_rep
                     "provider": "openai",
                     "model": "gpt-4"
                 },
-                session_id=None
+                session_id=None,
+                agent_type="default"
             )
 
 
@@ -797,5 +863,6 @@ def test_create_agent_default_token_limit(mock_model, mock_config_repository):
                     "provider": "unknown",
                     "model": "unknown-model"
                 },
-                session_id=None
+                session_id=None,
+                agent_type="default"
             )
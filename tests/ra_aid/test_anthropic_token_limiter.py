@@ -7,7 +7,9 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, Tool
 from langgraph.prebuilt.chat_agent_executor import AgentState
 
 from ra_aid.anthropic_token_limiter import (
+    CachedTokenCounter,
     create_token_counter_wrapper,
+    get_cached_token_counter,
     estimate_messages_tokens,
     get_model_token_limit,
     state_modifier,
@@ -703,5 +705,74 @@ class TestAnthropicTokenLimiter(unittest.TestCase):
                 )
 
 
+
+class TestCachedTokenCounter(unittest.TestCase):
+    def setUp(self):
+        self.messages = [
+            SystemMessage(content="You are a helpful assistant."),
+            HumanMessage(content="Please refactor the parser module."),
+            AIMessage(
+                content=[{"type": "text", "text": "Looking at the parser now."}],
+                tool_calls=[{"name": "read_file", "args": {"path": "p.py"}, "id": "c1"}],
+            ),
+            ToolMessage(content="def parse():\n    pass\n" * 20, tool_call_id="c1"),
+            AIMessage(content="Done."),
+        ]
+
+    def test_matches_litellm_count(self):
+        """Summing cached per-message counts gives litellm's count for the list."""
+        model = "claude-3-7-sonnet-20250219"
+        counter = CachedTokenCounter(model)
+        expected = litellm.token_counter(
+            model=model,
+            messages=[convert_message_to_litellm_format(m) for m in self.messages],
+        )
+        self.assertEqual(counter(self.messages), expected)
+        self.assertEqual(counter(self.messages[:2]), create_token_counter_wrapper(
+            model, cached=False
+        )(self.messages[:2]))
+
+    @patch("ra_aid.anthropic_token_limiter.token_counter")
+    def test_counts_only_new_messages(self, mock_token_counter):
+        mock_token_counter.side_effect = lambda messages, model: 3 + 10 * len(messages)
+        counter = CachedTokenCounter("test-model")
+
+        self.assertEqual(counter(self.messages[:3]), 33)
+        calls_after_first = mock_token_counter.call_count
+        self.assertEqual(counter(self.messages), 53)
+
+        # Only the two new messages were tokenized
+        self.assertEqual(mock_token_counter.call_count - calls_after_first, 2)
+        stats = counter.stats()
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["misses"], 5)
+        self.assertEqual(stats["entries"], 5)
+
+    @patch("ra_aid.anthropic_token_limiter.token_counter")
+    def test_recounts_changed_content(self, mock_token_counter):
+        mock_token_counter.side_effect = lambda messages, model: sum(
+            len(m["content"]) for m in messages
+        )
+        counter = CachedTokenCounter("test-model")
+        message = HumanMessage(content="abc", id="msg-1")
+        self.assertEqual(counter([message]), 3)
+
+        edited = HumanMessage(content="abcdef", id="msg-1")
+        self.assertEqual(counter([edited]), 6)
+
+    def test_evicts_oldest_entries(self):
+        counter = CachedTokenCounter("claude-3-7-sonnet-20250219", max_entries=2)
+        counter(self.messages)
+        self.assertEqual(counter.stats()["entries"], 2)
+
+    def test_wrapper_is_shared_per_model(self):
+        self.assertIs(
+            create_token_counter_wrapper("model-a"), get_cached_token_counter("model-a")
+        )
+        self.assertIsNot(
+            create_token_counter_wrapper("model-a"), create_token_counter_wrapper("model-b")
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
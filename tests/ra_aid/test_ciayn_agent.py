@@ -1,5 +1,7 @@
+import contextvars
+import threading
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
@@ -174,6 +176,36 @@ def test_trim_chat_history_both_limits():
     assert result[1] == chat_history[-1]
 
 
+def test_trim_chat_history_counts_each_message_once():
+    """Token estimates are cached across turns instead of recomputed per pop."""
+    agent = CiaynAgent(Mock(), [], max_history_messages=100, max_tokens=200)
+    initial_messages = [HumanMessage(content="Initial")]
+    chat_history = []
+    with patch.object(
+        CiaynAgent, "_estimate_tokens", side_effect=CiaynAgent._estimate_tokens
+    ) as mock_estimate:
+        for i in range(20):
+            chat_history.append(HumanMessage(content=f"{i:02d}" + "x" * 38))
+            agent._trim_chat_history(initial_messages, chat_history)
+
+    # One estimate per message plus the initial message, not one per comparison
+    assert mock_estimate.call_count == 21
+    # 20 tokens per message and 3 for the initial message leaves room for 9
+    assert len(chat_history) == 9
+    assert chat_history[-1].content.startswith("19")
+
+
+def test_trim_chat_history_recounts_changed_content():
+    agent = CiaynAgent(Mock(), [], max_history_messages=10, max_tokens=20)
+    message = HumanMessage(content="A" * 10)
+    chat_history = [HumanMessage(content="B" * 10), message]
+    assert len(agent._trim_chat_history([], chat_history)) == 2
+
+    message.content = "A" * 40
+    result = agent._trim_chat_history([], chat_history)
+    assert result == [message]
+
+
 # Fallback tests
 class TestCiaynAgentFallback(unittest.TestCase):
     def setUp(self):
@@ -393,5 +425,84 @@ class TestStripCodeMarkup(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestParallelBundledCalls:
+    """Bundles of side-effect-free tool calls run concurrently, in call order."""
+
+    @staticmethod
+    def _agent(funcs, config=None):
+        return CiaynAgent(DummyModel(), [DummyTool(func) for func in funcs], config=config)
+
+    @staticmethod
+    def _results(output):
+        return [block.split("\n")[1] for block in output.split("\n\n")]
+
+    def test_read_only_bundle_runs_concurrently_in_order(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def ripgrep_search(pattern):
+            barrier.wait()  # Only passes if both calls are running at once
+            return f"matches for {pattern}"
+
+        def read_file_tool(filepath):
+            barrier.wait()
+            return f"contents of {filepath}"
+
+        agent = self._agent([ripgrep_search, read_file_tool])
+        output = agent._execute_tool(
+            HumanMessage("ripgrep_search(pattern='foo')\nread_file_tool(filepath='a.py')")
+        )
+        assert self._results(output) == ["matches for foo", "contents of a.py"]
+
+    def test_bundle_with_side_effects_runs_in_sequence(self):
+        threads = []
+
+        def read_file_tool(filepath):
+            threads.append(threading.current_thread())
+            return filepath
+
+        def emit_key_facts(facts):
+            threads.append(threading.current_thread())
+            return "Facts stored."
+
+        agent = self._agent([read_file_tool, emit_key_facts])
+        output = agent._execute_tool(
+            HumanMessage("read_file_tool(filepath='a.py')\nemit_key_facts(facts=['x'])")
+        )
+        assert self._results(output) == ["a.py", "Facts stored."]
+        assert threads == [threading.main_thread()] * 2
+
+    def test_worker_setting_of_one_disables_parallelism(self):
+        threads = set()
+
+        def ripgrep_search(pattern):
+            threads.add(threading.current_thread())
+            return pattern
+
+        agent = self._agent([ripgrep_search], config={"max_parallel_tool_calls": 1})
+        agent._execute_tool(HumanMessage("ripgrep_search(pattern='a')\nripgrep_search(pattern='b')"))
+        assert threads == {threading.main_thread()}
+
+    def test_workers_see_caller_context(self):
+        marker = contextvars.ContextVar("marker", default=None)
+
+        def ripgrep_search(pattern):
+            return f"{pattern}:{marker.get()}"
+
+        agent = self._agent([ripgrep_search])
+        marker.set("session-7")
+        output = agent._execute_tool(HumanMessage("ripgrep_search(pattern='a')\nripgrep_search(pattern='b')"))
+        assert self._results(output) == ["a:session-7", "b:session-7"]
+
+    def test_parallel_failure_is_reported(self):
+        def ripgrep_search(pattern):
+            if pattern == "bad":
+                raise ValueError("bad pattern")
+            return pattern
+
+        agent = self._agent([ripgrep_search])
+        with pytest.raises(ToolExecutionError):
+            agent._execute_tool(HumanMessage("ripgrep_search(pattern='ok')\nripgrep_search(pattern='bad')"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+"""Tests for concurrent, cached environment discovery."""
+
+import os
+import threading
+import time
+
+import pytest
+
+import ra_aid.env_inv as env_inv
+from ra_aid.env_inv import EnvDiscovery
+
+
+@pytest.fixture(autouse=True)
+def no_tools(monkeypatch, tmp_path):
+    """Discover an empty environment quickly, without running any probes."""
+    path_dir = tmp_path / "bin"
+    path_dir.mkdir()
+    monkeypatch.setenv("PATH", str(path_dir))
+    monkeypatch.setattr(env_inv.shutil, "which", lambda name: None)
+    env_inv._memory_cache.clear()
+    yield path_dir
+    env_inv._memory_cache.clear()
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    """Count discoveries that actually probe the environment."""
+    calls = []
+    original = EnvDiscovery._detect_cli_tools
+
+    def detect(self):
+        calls.append(1)
+        original(self)
+
+    monkeypatch.setattr(EnvDiscovery, "_detect_cli_tools", detect)
+    return calls
+
+
+def test_results_are_cached_on_disk(tmp_path, counted):
+    cache_path = tmp_path / "cache" / "env_inv.json"
+    first = EnvDiscovery(cache_path=cache_path).discover()
+    assert cache_path.exists()
+
+    # A new process only has the disk cache
+    env_inv._memory_cache.clear()
+    discovery = EnvDiscovery(cache_path=cache_path)
+    assert discovery.discover() == first
+    assert discovery.format_markdown().startswith("**Operating System:**")
+    assert len(counted) == 1
+
+    EnvDiscovery(cache_path=cache_path).discover(refresh=True)
+    assert len(counted) == 2
+
+
+def test_cache_is_invalidated_by_path_changes(tmp_path, no_tools, counted, monkeypatch):
+    cache_path = tmp_path / "env_inv.json"
+    EnvDiscovery(cache_path=cache_path).discover()
+
+    # Installing a tool changes its directory's mtime
+    stat = os.stat(no_tools)
+    os.utime(no_tools, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    EnvDiscovery(cache_path=cache_path).discover()
+    assert len(counted) == 2
+
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{no_tools}{os.pathsep}{other_dir}")
+    EnvDiscovery(cache_path=cache_path).discover()
+    EnvDiscovery(cache_path=cache_path).discover()
+    assert len(counted) == 3
+
+
+def test_cache_expires(tmp_path, counted):
+    cache_path = tmp_path / "env_inv.json"
+    EnvDiscovery(cache_path=cache_path, cache_ttl=0).discover()
+    EnvDiscovery(cache_path=cache_path, cache_ttl=0).discover()
+    assert len(counted) == 2
+
+    EnvDiscovery(cache_path=cache_path, use_cache=False).discover()
+    assert len(counted) == 3
+
+
+def test_unreadable_cache_is_ignored(tmp_path, counted):
+    cache_path = tmp_path / "env_inv.json"
+    cache_path.write_text("{not json")
+    results = EnvDiscovery(cache_path=cache_path).discover()
+    assert results["cli_tools"]["git"] == {"found": False}
+    assert len(counted) == 1
+
+
+def test_probes_run_concurrently_in_order(tmp_path, monkeypatch):
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def probe(self, tool):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return {"found": True, "version": tool}
+
+    monkeypatch.setattr(EnvDiscovery, "_probe_cli_tool", probe)
+    discovery = EnvDiscovery(use_cache=False, max_workers=8)
+    results = discovery.discover()
+
+    assert peak[0] > 1
+    assert list(results["cli_tools"]) == discovery._cli_tool_names
+    assert all(status["version"] == tool for tool, status in results["cli_tools"].items())
@@ -367,6 +367,132 @@ class TestFallbackHandler(unittest.TestCase):
         # Expected merged list: first two ("msg1", "msg2") plus "msg3" from the last two, since "msg1" was already present.
         self.assertEqual(self.fallback_handler.msg_list, ["msg1", "msg2", "msg3"])
 
+    def _hedged_handler(self, models):
+        """Build a hedging handler whose fallback models behave as described by models."""
+        import threading
+        import time
+
+        handler = FallbackHandler(
+            {**self.config, "fallback_hedge_count": 3}, []
+        )
+        handler.fallback_tool_models = [
+            {"provider": "dummy", "model": name, "type": "prompt"} for name in models
+        ]
+        handler.current_failing_tool_name = "dummy_tool"
+        handler.current_tool_to_bind = object()
+        invocations = []
+        release = threading.Event()
+
+        class DummyModel:
+            def __init__(self, name):
+                self.name = name
+
+            def bind_tools(self, tools, tool_choice=None):
+                return self
+
+            def with_retry(self, stop_after_attempt):
+                return self
+
+            def invoke(self, msg_list):
+                behaviour = models[self.name]
+                if behaviour == "slow":
+                    release.wait(5)
+                elif isinstance(behaviour, float):
+                    time.sleep(behaviour)
+                if behaviour == "no_tool_call":
+                    return type("Response", (), {"additional_kwargs": {}, "tool_calls": []})()
+                arguments = '{"model": "%s"}' % self.name
+                return type(
+                    "Response",
+                    (),
+                    {
+                        "additional_kwargs": {
+                            "tool_calls": [
+                                {
+                                    "id": "1",
+                                    "type": "function",
+                                    "function": {"name": "dummy_tool", "arguments": arguments},
+                                }
+                            ]
+                        }
+                    },
+                )()
+
+        class DummyTool:
+            func = type("DummyToolFunc", (), {"__name__": "dummy_tool"})()
+
+            def invoke(self, args):
+                invocations.append(args["model"])
+                return f"result from {args['model']}"
+
+        handler.tools.append(DummyTool())
+        return handler, invocations, release, lambda provider, model: DummyModel(model)
+
+    def test_hedged_fallback_takes_first_successful_tool_call(self):
+        from unittest.mock import patch
+
+        handler, invocations, release, init_llm = self._hedged_handler(
+            {"slow-model": "slow", "broken-model": "no_tool_call", "fast-model": 0.05}
+        )
+        with (
+            patch("ra_aid.fallback_handler.initialize_llm", side_effect=init_llm),
+            patch.object(handler, "_record_hedge_stats") as record_stats,
+        ):
+            result = handler.attempt_hedged_fallback()
+        release.set()
+
+        self.assertEqual(result[1], "result from fast-model")
+        self.assertEqual(invocations, ["fast-model"])
+        tool_name, attempts = record_stats.call_args[0]
+        self.assertEqual(tool_name, "dummy_tool")
+        self.assertEqual(
+            [(a["model"], a["outcome"]) for a in attempts],
+            [("slow-model", "cancelled"), ("broken-model", "failed"), ("fast-model", "won")],
+        )
+        # A win resets the handler for the next failure
+        self.assertEqual(handler.current_failing_tool_name, "")
+
+    def test_hedged_fallback_runs_one_tool_call(self):
+        from unittest.mock import patch
+
+        handler, invocations, _, init_llm = self._hedged_handler(
+            {"first-model": 0.01, "second-model": 0.01, "third-model": 0.01}
+        )
+        with (
+            patch("ra_aid.fallback_handler.initialize_llm", side_effect=init_llm),
+            patch("ra_aid.database.repositories.trajectory_repository.TrajectoryRepository") as repo,
+            patch("ra_aid.database.repositories.human_input_repository.HumanInputRepository"),
+            patch("ra_aid.database.connection.get_db"),
+        ):
+            result = handler.attempt_hedged_fallback()
+
+        self.assertEqual(len(invocations), 1)
+        self.assertEqual(result[1], f"result from {invocations[0]}")
+        step_data = repo.return_value.create.call_args.kwargs["step_data"]
+        self.assertEqual(step_data["winner"], invocations[0])
+        self.assertEqual(step_data["model_stats"][invocations[0]]["win_rate"], 1.0)
+        self.assertEqual(
+            repo.return_value.create.call_args.kwargs["record_type"], "fallback_hedge"
+        )
+
+    def test_hedged_fallback_returns_none_when_all_fail(self):
+        from unittest.mock import patch
+
+        handler, invocations, _, init_llm = self._hedged_handler(
+            {"broken-model": "no_tool_call", "other-broken-model": "no_tool_call"}
+        )
+        with (
+            patch("ra_aid.fallback_handler.initialize_llm", side_effect=init_llm),
+            patch.object(handler, "_record_hedge_stats") as record_stats,
+        ):
+            self.assertIsNone(handler.attempt_hedged_fallback())
+
+        self.assertEqual(invocations, [])
+        self.assertEqual(
+            {a["outcome"] for a in record_stats.call_args[0][1]}, {"failed"}
+        )
+        self.assertEqual(handler.current_failing_tool_name, "dummy_tool")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+"""Tests for the fuzzy search candidate index."""
+
+import fnmatch
+
+import pytest
+
+from ra_aid import fuzzy_index
+from ra_aid.file_listing import clear_file_index_cache
+from ra_aid.fuzzy_index import (
+    FuzzyFileIndex,
+    clear_fuzzy_index_cache,
+    compile_path_patterns,
+    get_fuzzy_file_index,
+)
+
+
+def _synthetic_paths(count):
+    dirs = ["src", "lib", "tests", "docs", "tools", "server"]
+    names = ["alpha", "beta", "gamma", "delta", "omega"]
+    return [
+        f"{dirs[i % len(dirs)]}/pkg{i % 50}/{names[i % len(names)]}_{i}.py"
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def small_scan_limit(monkeypatch):
+    """Force the pruning path on small listings."""
+    monkeypatch.setattr(fuzzy_index, "FULL_SCAN_LIMIT", 10)
+    monkeypatch.setattr(fuzzy_index, "CANDIDATE_LIMIT", 50)
+    monkeypatch.setattr(fuzzy_index, "MIN_CANDIDATES", 5)
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["main.py", "lib/__pycache__/x.pyc", "tests/test_main.py", "docs/readme.md", ".git/HEAD"],
+)
+def test_compile_path_patterns_matches_fnmatch(path):
+    """The combined pattern agrees with fnmatch for each pattern."""
+    patterns = ["*.pyc", "__pycache__/*", ".git/*", "*test*"]
+    compiled = compile_path_patterns(patterns)
+    expected = any(fnmatch.fnmatch(path, pattern) for pattern in patterns)
+    assert (compiled.match(path) is not None) == expected
+
+
+def test_compile_path_patterns_empty():
+    assert compile_path_patterns([]) is None
+
+
+def test_small_index_returns_all_paths():
+    """Listings below the scan limit are scored exhaustively."""
+    index = FuzzyFileIndex(["b.py", "a.py", "c.pyc"], exclude_patterns=["*.pyc"])
+    candidates, total = index.candidates("zzz")
+    assert candidates == ["a.py", "b.py"]
+    assert total == 2
+
+
+def test_pruned_candidates_contain_best_match(small_scan_limit):
+    """Pruning keeps paths whose components share trigrams with the query."""
+    paths = _synthetic_paths(2000) + ["server/pkg3/connection_manager.py"]
+    index = FuzzyFileIndex(paths)
+
+    candidates, total = index.candidates("connection_manager")
+
+    assert total == len(paths)
+    assert len(candidates) <= 50
+    assert "server/pkg3/connection_manager.py" in candidates
+
+
+def test_pruned_candidates_respect_include_paths(small_scan_limit):
+    paths = _synthetic_paths(2000)
+    index = FuzzyFileIndex(paths)
+
+    candidates, total = index.candidates("gamma", include_paths=["docs/*"])
+
+    assert candidates
+    assert all(path.startswith("docs/") for path in candidates)
+    assert total == sum(1 for path in paths if path.startswith("docs/"))
+
+
+def test_update_adds_and_removes_paths(small_scan_limit):
+    paths = _synthetic_paths(200)
+    index = FuzzyFileIndex(paths)
+
+    index.update(paths[1:] + ["lib/new_feature.py"])
+
+    assert len(index) == len(paths)
+    candidates, _ = index.candidates("new_feature")
+    assert "lib/new_feature.py" in candidates
+    candidates, _ = index.candidates(paths[0].rsplit("/", 1)[1])
+    assert paths[0] not in candidates
+
+
+def test_index_follows_file_listing(tmp_path):
+    """The cached index picks up files added after it was built."""
+    clear_file_index_cache()
+    clear_fuzzy_index_cache()
+    (tmp_path / "main.py").write_text("")
+
+    first = get_fuzzy_file_index(str(tmp_path), exclude_patterns=["*.pyc"])
+    (tmp_path / "helpers.py").write_text("")
+    second = get_fuzzy_file_index(str(tmp_path), exclude_patterns=["*.pyc"])
+
+    assert second is first
+    candidates, total = second.candidates("helpers")
+    assert "helpers.py" in candidates
+    assert total == 2
@@ -0,0 +1,124 @@
+"""Tests for the process-wide LLM client pool."""
+
+import threading
+from unittest import mock
+from unittest.mock import Mock, patch
+
+import pytest
+from langchain_openai.chat_models import ChatOpenAI
+
+from ra_aid.llm import get_available_openai_models, initialize_expert_llm, initialize_llm
+from ra_aid.llm_client_pool import LLMClientPool, get_llm_client_pool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def mock_openai(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("EXPERT_OPENAI_API_KEY", raising=False)
+    with patch("ra_aid.llm.ChatOpenAI") as mock_class:
+        mock_class.side_effect = lambda **kwargs: Mock(spec=ChatOpenAI)
+        yield mock_class
+
+
+def test_pool_reuses_and_evicts():
+    pool = LLMClientPool(max_entries=2)
+    built = []
+
+    def factory(name):
+        return lambda: built.append(name) or object()
+
+    first = pool.get_or_create("a", factory("a"))
+    assert pool.get_or_create("a", factory("a")) is first
+    pool.get_or_create("b", factory("b"))
+    pool.get_or_create("c", factory("c"))
+    # "a" was least recently used
+    assert pool.get_or_create("a", factory("a")) is not first
+    assert built == ["a", "b", "c", "a"]
+
+    stats = pool.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["clients"] == 2
+    assert stats["construction_ms_saved"] >= 0
+
+
+def test_concurrent_misses_share_one_client():
+    pool = LLMClientPool()
+    barrier = threading.Barrier(4)
+    results = []
+
+    def factory():
+        return object()
+
+    def get():
+        barrier.wait()
+        results.append(pool.get_or_create("key", factory))
+
+    threads = [threading.Thread(target=get) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(client is results[0] for client in results)
+
+
+def test_model_listing_is_cached_until_ttl():
+    clock = FakeClock()
+    pool = LLMClientPool(model_availability_ttl=60, clock=clock)
+    loader = Mock(return_value=["gpt-4", "o3"])
+
+    assert pool.available_models("openai", loader) == ["gpt-4", "o3"]
+    assert pool.available_models("openai", loader) == ["gpt-4", "o3"]
+    assert loader.call_count == 1
+    assert pool.stats()["model_lookups_saved"] == 1
+
+    clock.now += 61
+    pool.available_models("openai", loader)
+    assert loader.call_count == 2
+
+    # Failed listings are retried rather than cached
+    failing = Mock(return_value=[])
+    pool.available_models("other", failing)
+    pool.available_models("other", failing)
+    assert failing.call_count == 2
+
+
+def test_initialize_llm_reuses_clients(mock_openai, monkeypatch):
+    first = initialize_llm("openai", "gpt-4", temperature=0.7)
+    assert initialize_llm("openai", "gpt-4", temperature=0.7) is first
+    assert mock_openai.call_count == 1
+
+    assert initialize_llm("openai", "gpt-4", temperature=0.2) is not first
+    assert initialize_expert_llm("openai", "gpt-4") is not first
+
+    # New credentials get a new client
+    monkeypatch.setenv("OPENAI_API_KEY", "rotated-key")
+    assert initialize_llm("openai", "gpt-4", temperature=0.7) is not first
+    assert mock_openai.call_count == 4
+    assert get_llm_client_pool().stats()["hits"] == 1
+
+
+def test_pool_can_be_disabled(mock_openai, mock_config_repository):
+    mock_config_repository.set("llm_client_pool", False)
+    first = initialize_llm("openai", "gpt-4", temperature=0.7)
+    assert initialize_llm("openai", "gpt-4", temperature=0.7) is not first
+    assert mock_openai.call_count == 2
+
+
+def test_openai_model_listing_is_shared(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    model = Mock()
+    model.id = "o3"
+    with mock.patch("ra_aid.llm.OpenAI") as mock_client:
+        mock_client.return_value.models.list.return_value = Mock(data=[model])
+        assert get_available_openai_models() == ["o3"]
+        assert get_available_openai_models() == ["o3"]
+        mock_client.return_value.models.list.assert_called_once()
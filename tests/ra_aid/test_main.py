@@ -78,11 +78,11 @@ def mock_config_repository():
 def mock_dependencies(monkeypatch):
     """Mock all dependencies needed for main()."""
     # Mock dependencies that interact with external systems
-    monkeypatch.setattr("ra_aid.__main__.check_dependencies", lambda: None)
-    monkeypatch.setattr("ra_aid.__main__.validate_environment", lambda args: (True, [], True, []))
-    monkeypatch.setattr("ra_aid.__main__.create_agent", lambda *args, **kwargs: None)
-    monkeypatch.setattr("ra_aid.__main__.run_agent_with_retry", lambda *args, **kwargs: None)
-    monkeypatch.setattr("ra_aid.__main__.run_research_agent", lambda *args, **kwargs: None)
+    monkeypatch.setattr("ra_aid.dependencies.check_dependencies", lambda: None)
+    monkeypatch.setattr("ra_aid.env.validate_environment", lambda args: (True, [], True, []))
+    monkeypatch.setattr("ra_aid.agent_utils.create_agent", lambda *args, **kwargs: None)
+    monkeypatch.setattr("ra_aid.agent_utils.run_agent_with_retry", lambda *args, **kwargs: None)
+    monkeypatch.setattr("ra_aid.agents.research_agent.run_research_agent", lambda *args, **kwargs: None)
     monkeypatch.setattr("ra_aid.agents.planning_agent.run_planning_agent", lambda *args, **kwargs: None)
     
     # Mock LLM initialization
@@ -92,7 +92,7 @@ def mock_dependencies(monkeypatch):
             config_repo.set("temperature", kwargs["temperature"])
         return None
 
-    monkeypatch.setattr("ra_aid.__main__.initialize_llm", mock_config_update)
+    monkeypatch.setattr("ra_aid.llm.initialize_llm", mock_config_update)
 
 
 @pytest.fixture(autouse=True)
@@ -227,6 +227,27 @@ def test_zero_recursion_limit():
         parse_arguments(["-m", "test message", "--recursion-limit", "0"])
 
 
+def test_rate_limit_arguments():
+    """Test that rate limits are parsed and must be positive."""
+    args = parse_arguments(["-m", "test message", "--rate-limit-rpm", "50", "--rate-limit-tpm", "40000"])
+    assert args.rate_limit_rpm == 50
+    assert args.rate_limit_tpm == 40000
+    assert parse_arguments(["-m", "test message"]).rate_limit_rpm is None
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["-m", "test message", "--rate-limit-rpm", "0"])
+
+
+def test_fallback_hedge_count_argument():
+    """Test that the fallback hedge count defaults to one model at a time."""
+    assert parse_arguments(["-m", "test message"]).fallback_hedge_count == 1
+    args = parse_arguments(["-m", "test message", "--fallback-hedge-count", "3"])
+    assert args.fallback_hedge_count == 3
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["-m", "test message", "--fallback-hedge-count", "0"])
+
+
 def test_config_settings(mock_dependencies, mock_config_repository):
     """Test that various settings are correctly applied in global config."""
     import sys
@@ -294,9 +315,9 @@ def test_temperature_validation(mock_dependencies, mock_config_repository):
     # For testing, we need to patch ConfigRepositoryManager.__enter__ to return our mock
     with patch('ra_aid.database.repositories.config_repository.ConfigRepositoryManager.__enter__', return_value=mock_config_repository):
         # Test valid temperature (0.7)
-        with patch("ra_aid.__main__.initialize_llm", return_value=None) as mock_init_llm:
+        with patch("ra_aid.llm.initialize_llm", return_value=None) as mock_init_llm:
             # Also patch any calls that would actually use the mocked initialize_llm function
-            with patch("ra_aid.__main__.run_research_agent", return_value=None):
+            with patch("ra_aid.agents.research_agent.run_research_agent", return_value=None):
                 with patch("ra_aid.agents.planning_agent.run_planning_agent", return_value=None):
                     with patch.object(
                         sys, "argv", ["ra-aid", "-m", "test", "--temperature", "0.7"]
@@ -0,0 +1,53 @@
+"""Tests that ra-aid startup does not pay for the agent runtime it does not use."""
+
+import subprocess
+import sys
+
+import ra_aid.__main__ as main_module
+
+HEAVY_MODULES = ["litellm", "langgraph", "langchain_core", "uvicorn", "ra_aid.server.server"]
+
+
+def loaded_heavy_modules(code):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{code}\nimport sys\nprint('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = result.stdout.rpartition("loaded:")[2].strip()
+    return [name for name in loaded.split(",") if name]
+
+
+def test_import_skips_runtime_dependencies():
+    assert loaded_heavy_modules("import ra_aid.__main__") == []
+
+
+def test_version_exits_before_loading_runtime():
+    code = (
+        "import sys; sys.argv = ['ra-aid', '--version']\n"
+        "import ra_aid.__main__ as m\n"
+        "try:\n"
+        "    m.main()\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    assert loaded_heavy_modules(code) == []
+
+
+def test_package_exports_resolve_lazily():
+    code = "import ra_aid\nassert callable(ra_aid.print_error)"
+    assert loaded_heavy_modules("import ra_aid") == []
+    assert "langchain_core" in loaded_heavy_modules(code)
+
+
+def test_functions_used_before_main_need_no_runtime_setup():
+    from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
+
+    with ConfigRepositoryManager() as config:
+        config.set("research_only", True)
+        assert main_module.is_informational_query()
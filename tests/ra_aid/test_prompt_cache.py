@@ -0,0 +1,97 @@
+"""Tests for prompt prefix caching."""
+
+from unittest.mock import Mock
+
+from langchain_anthropic import ChatAnthropic
+from langchain_anthropic.chat_models import _format_messages
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from ra_aid.agent_utils import build_agent_kwargs
+from ra_aid.prompt_cache import (
+    CACHE_CONTROL,
+    MAX_CACHE_BREAKPOINTS,
+    add_cache_control,
+    split_stable_prefix,
+    supports_cache_control,
+)
+from ra_aid.prompts.research_prompts import RESEARCH_COMMON_PROMPT_HEADER
+
+PROMPT = "<environment inventory>\npython 3.12\n</environment inventory>\n\nCurrent Date: today\n\nDo the task"
+
+
+def _breakpoints(messages):
+    count = 0
+    for message in messages:
+        if isinstance(message.content, list):
+            count += sum(1 for block in message.content if "cache_control" in block)
+    return count
+
+
+def _conversation():
+    return [
+        HumanMessage(content=PROMPT),
+        AIMessage(content="", tool_calls=[{"id": "call-1", "name": "list_directory", "args": {}}]),
+        ToolMessage(content="a.py", tool_call_id="call-1"),
+        AIMessage(content="", tool_calls=[{"id": "call-2", "name": "read_file", "args": {}}]),
+        ToolMessage(content="print('a')", tool_call_id="call-2"),
+    ]
+
+
+def test_agent_prompts_lead_with_environment_inventory():
+    assert RESEARCH_COMMON_PROMPT_HEADER.startswith("<environment inventory>")
+    prefix, rest = split_stable_prefix(PROMPT)
+    assert prefix.endswith("</environment inventory>")
+    assert rest.startswith("\n\nCurrent Date")
+    assert split_stable_prefix("no inventory") == ["no inventory"]
+
+
+def test_add_cache_control_marks_prefix_and_latest_message():
+    messages = _conversation()
+    result = add_cache_control(messages)
+
+    prompt_blocks = result[0].content
+    assert [block["cache_control"] for block in prompt_blocks] == [CACHE_CONTROL, CACHE_CONTROL]
+    assert "".join(block["text"] for block in prompt_blocks) == PROMPT
+    assert result[-1].content[0]["cache_control"] == CACHE_CONTROL
+    assert result[2] is messages[2]
+    assert _breakpoints(result) == 3
+
+    # The agent's own history is left unchanged
+    assert messages[0].content == PROMPT
+    assert messages[-1].content == "print('a')"
+
+
+def test_add_cache_control_never_exceeds_limit():
+    messages = [HumanMessage(content=PROMPT), HumanMessage(content=PROMPT), HumanMessage(content="last")]
+    result = add_cache_control(messages, prefix_messages=2)
+    assert _breakpoints(result) == MAX_CACHE_BREAKPOINTS
+
+    result = add_cache_control(messages, prefix_messages=3)
+    assert _breakpoints(result) <= MAX_CACHE_BREAKPOINTS
+
+
+def test_marked_messages_format_for_anthropic():
+    _, formatted = _format_messages(add_cache_control(_conversation()))
+    assert formatted[0]["content"][0]["cache_control"] == CACHE_CONTROL
+    tool_result = formatted[-1]["content"][0]
+    assert tool_result["type"] == "tool_result"
+    assert tool_result["cache_control"] == CACHE_CONTROL
+
+
+def test_only_anthropic_models_get_breakpoints(mock_config_repository):
+    model = ChatAnthropic(model="claude-3-7-sonnet-20250219", api_key="test-key")
+    assert supports_cache_control(model)
+    assert not supports_cache_control(Mock())
+
+    mock_config_repository.set("prompt_caching", False)
+    assert not supports_cache_control(model)
+
+
+def test_agent_state_modifier_adds_breakpoints(mock_config_repository):
+    mock_config_repository.set("limit_tokens", False)
+    model = ChatAnthropic(model="claude-3-5-sonnet-20241022", api_key="test-key")
+
+    kwargs = build_agent_kwargs(model=model)
+
+    result = kwargs["state_modifier"]({"messages": _conversation()})
+    assert _breakpoints(result) == 3
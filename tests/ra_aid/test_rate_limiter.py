@@ -0,0 +1,160 @@
+"""Tests for the per-provider client-side rate limiter."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from ra_aid.rate_limiter import (
+    MAX_RETRY_AFTER_SECONDS,
+    ProviderRateLimiter,
+    RateLimitUsageHandler,
+    TokenBucket,
+    attach_rate_limiter,
+    configure_rate_limit,
+    get_rate_limiter,
+    reset_rate_limiters,
+    retry_after_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters():
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock)
+
+    assert [bucket.take(1) for _ in range(60)] == [0.0] * 60
+    assert bucket.take(1) == pytest.approx(1.0)
+    assert bucket.take(1) == pytest.approx(2.0)
+
+    clock.now += 2
+    assert bucket.wait_time() == 0.0
+
+
+def test_request_limit_spaces_calls():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("anthropic", requests_per_minute=2, clock=clock)
+
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(30.0)
+    assert not limiter.acquire(blocking=False)
+    assert limiter.stats() == {"provider": "anthropic", "requests": 3, "throttled": 1, "waited_seconds": 30.0}
+
+
+def test_token_usage_holds_next_call():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("openai", tokens_per_minute=6000, clock=clock)
+
+    assert limiter.reserve() == 0.0
+    limiter.record_usage(9000)
+    # 3000 tokens in debt at 100 tokens per second
+    assert limiter.reserve() == pytest.approx(30.0)
+
+
+def test_cooldown_applies_without_limits():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("gemini", clock=clock)
+    assert limiter.reserve() == 0.0
+
+    limiter.penalize(12)
+    limiter.penalize(5)
+    assert limiter.reserve() == pytest.approx(12.0)
+    clock.now += 12
+    assert limiter.acquire(blocking=False)
+
+
+def test_limiter_is_shared_across_threads():
+    limiters = []
+    threads = [threading.Thread(target=lambda: limiters.append(get_rate_limiter("openai"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(limiter is limiters[0] for limiter in limiters)
+    assert configure_rate_limit("openai", 10) is limiters[0]
+    assert get_rate_limiter("anthropic") is not limiters[0]
+
+
+def error_with_headers(headers, message="rate limited"):
+    error = Exception(message)
+    error.response = SimpleNamespace(headers=headers)
+    return error
+
+
+@pytest.mark.parametrize(
+    "headers,expected",
+    [
+        ({"retry-after": "7"}, 7.0),
+        ({"retry-after-ms": "1500", "retry-after": "7"}, 1.5),
+        ({"x-ratelimit-reset-requests": "1m30s", "x-ratelimit-reset-tokens": "250ms"}, 90.0),
+        ({"retry-after": "100000"}, MAX_RETRY_AFTER_SECONDS),
+        ({}, None),
+    ],
+)
+def test_retry_after_headers(headers, expected):
+    assert retry_after_seconds(error_with_headers(headers)) == expected
+
+
+def test_retry_after_dates():
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    http_date = retry_after_seconds(error_with_headers({"retry-after": format_datetime(later, usegmt=True)}))
+    assert 25 < http_date <= 30
+
+    rfc3339 = retry_after_seconds(
+        error_with_headers({"anthropic-ratelimit-requests-reset": later.isoformat().replace("+00:00", "Z")})
+    )
+    assert 25 < rfc3339 <= 30
+
+
+def test_retry_after_from_details_and_message():
+    google_error = Exception("Resource exhausted")
+    google_error.details = [SimpleNamespace(retry_delay=SimpleNamespace(seconds=4, nanos=500_000_000))]
+    assert retry_after_seconds(google_error) == 4.5
+
+    assert retry_after_seconds(Exception("Rate limit reached. Please try again in 20s.")) == 20.0
+    assert retry_after_seconds(Exception("Please retry after 300 ms")) == pytest.approx(0.3)
+    assert retry_after_seconds(Exception("error code 429")) is None
+
+
+def test_usage_handler_debits_tokens():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("openai", tokens_per_minute=60, clock=clock)
+    handler = RateLimitUsageHandler(limiter)
+
+    handler.on_llm_end(LLMResult(generations=[], llm_output={"token_usage": {"total_tokens": 90}}))
+    assert limiter.reserve() == pytest.approx(30.0)
+
+    clock.now += 30
+    message = AIMessage(content="hi", usage_metadata={"input_tokens": 50, "output_tokens": 10, "total_tokens": 60})
+    handler.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+    assert limiter.reserve() == pytest.approx(60.0)
+
+
+def test_attached_model_is_paced():
+    model = attach_rate_limiter(FakeListChatModel(responses=["one", "two"]), "fake")
+    # Attaching twice keeps a single usage handler
+    attach_rate_limiter(model, "fake")
+
+    assert model.invoke("hello").content == "one"
+    assert get_rate_limiter("fake").stats()["requests"] == 1
+    assert sum(isinstance(cb, RateLimitUsageHandler) for cb in model.callbacks) == 1
@@ -87,6 +87,9 @@ def mock_repository():
         def mock_get_all():
             return list(facts.values())
         mock_repo.return_value.get_all.side_effect = mock_get_all
+
+        # Mock count method
+        mock_repo.return_value.count.side_effect = lambda: len(facts)
         
         yield mock_repo
 
@@ -153,6 +156,7 @@ def mock_key_snippet_repository():
             mock_repo.return_value.delete.side_effect = mock_delete
             mock_repo.return_value.get_snippets_dict.side_effect = mock_get_snippets_dict
             mock_repo.return_value.get_all.side_effect = mock_get_all
+            mock_repo.return_value.count.side_effect = lambda: len(snippets)
         
         yield memory_mock_repo
 
@@ -367,31 +371,16 @@ def test_emit_key_facts(reset_memory, mock_repository):
 
 
 def test_emit_key_facts_triggers_cleaner(reset_memory, mock_repository):
-    """Test that emit_key_facts triggers the cleaner agent when there are more than 30 facts"""
-    # Setup mock repository to return more than 30 facts
-    facts = []
-    for i in range(51):
-        facts.append(MagicMock(id=i, content=f"Test fact {i}", human_input_id=None))
-    
-    # Mock the get_all method to return more than 30 facts
-    mock_repository.return_value.get_all.return_value = facts
-    
-    # Note on testing approach:
-    # Rather than trying to mock the dynamic import which is challenging due to
-    # circular import issues, we verify that the condition that would trigger
-    # the GC agent is satisfied. Specifically, we check that:
-    # 1. get_all() is called to check the number of facts
-    # 2. The mock returns more than 30 facts to trigger the condition
-    #
-    # This is a more maintainable approach than trying to mock the dynamic import
-    # and handles the circular import problem elegantly.
-    
-    # Call emit_key_facts to add the fact
-    emit_key_facts.invoke({"facts": ["New fact"]})
-    
-    # Verify that mock_repository.get_all was called,
-    # which is the condition that would trigger the GC agent
-    mock_repository.return_value.get_all.assert_called_once()
+    """Test that emit_key_facts schedules the cleaner from the fact count alone"""
+    mock_repository.return_value.count.side_effect = None
+    mock_repository.return_value.count.return_value = 51
+
+    with patch("ra_aid.tools.memory.maybe_schedule_gc") as mock_schedule:
+        emit_key_facts.invoke({"facts": ["New fact"]})
+
+    mock_schedule.assert_called_once_with("key_facts", 51)
+    mock_repository.return_value.count.assert_called_once()
+    mock_repository.return_value.get_all.assert_not_called()
 
 
 def test_emit_key_snippet(reset_memory, mock_key_snippet_repository):
@@ -0,0 +1,183 @@
+import json
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.tools.ripgrep import (
+    RipgrepFileResult,
+    RipgrepStreamResult,
+    ripgrep_search,
+    stream_ripgrep,
+)
+
+
+def _event(event_type, path, line_number=None, text=None):
+    data = {"path": {"text": path}}
+    if text is not None:
+        data["lines"] = {"text": text}
+        data["line_number"] = line_number
+    return json.dumps({"type": event_type, "data": data})
+
+
+def _fake_rg(lines, exit_code=0, stderr=""):
+    """Build a command that prints the given rg --json lines and exits."""
+    script = (
+        "import sys\n"
+        f"sys.stdout.write({json.dumps(chr(10).join(lines) + chr(10))})\n"
+        f"sys.stderr.write({stderr!r})\n"
+        f"sys.exit({exit_code})\n"
+    )
+    return [sys.executable, "-c", script]
+
+
+@pytest.fixture
+def mock_repos():
+    with patch("ra_aid.tools.ripgrep.get_trajectory_repository") as mock_traj, patch(
+        "ra_aid.tools.ripgrep.get_human_input_repository"
+    ) as mock_human:
+        mock_human.return_value.get_most_recent_id.return_value = 1
+        yield mock_traj.return_value
+
+
+def test_stream_ripgrep_groups_results_by_file():
+    cmd = _fake_rg(
+        [
+            _event("begin", "src/a.py"),
+            _event("match", "src/a.py", 3, "def foo():\n"),
+            _event("context", "src/a.py", 4, "    return 1\n"),
+            _event("match", "src/a.py", 10, "foo()\n"),
+            _event("end", "src/a.py"),
+            _event("match", "src/b.py", 1, "import foo\n"),
+            json.dumps({"type": "summary", "data": {}}),
+        ]
+    )
+
+    result = stream_ripgrep(cmd)
+
+    assert result.success
+    assert not result.truncated
+    assert result.match_count == 3
+    assert [f.path for f in result.files] == ["src/a.py", "src/b.py"]
+    assert result.files[0].match_count == 2
+    assert result.render() == (
+        "src/a.py\n3:def foo():\n4-    return 1\n--\n10:foo()\n\nsrc/b.py\n1:import foo"
+    )
+
+
+def test_stream_ripgrep_stops_at_match_budget():
+    # Emits matches forever; only the budget can end the search
+    script = (
+        "import json, sys\n"
+        "i = 0\n"
+        "while True:\n"
+        "    i += 1\n"
+        "    print(json.dumps({'type': 'match', 'data': {'path': {'text': 'big.txt'},"
+        " 'lines': {'text': 'hit\\n'}, 'line_number': i}}), flush=True)\n"
+    )
+    start = time.monotonic()
+    result = stream_ripgrep([sys.executable, "-c", script], max_matches=25)
+
+    assert time.monotonic() - start < 10
+    assert result.truncated
+    assert result.stop_reason == "max_matches"
+    assert result.match_count == 25
+    assert result.return_code == 0
+
+
+def test_stream_ripgrep_stops_at_byte_budget():
+    lines = [_event("match", "a.txt", i, "x" * 100 + "\n") for i in range(1, 100)]
+    result = stream_ripgrep(_fake_rg(lines), max_output_bytes=500)
+
+    assert result.truncated
+    assert result.stop_reason == "max_output_bytes"
+    assert result.match_count < 10
+
+
+def test_stream_ripgrep_decodes_bytes_lines():
+    line = json.dumps(
+        {
+            "type": "match",
+            "data": {
+                "path": {"text": "bin.dat"},
+                "lines": {"bytes": "aGVsbG8K"},
+                "line_number": 1,
+            },
+        }
+    )
+    result = stream_ripgrep(_fake_rg([line]))
+    assert result.files[0].lines == [(1, "hello", True)]
+
+
+def test_stream_ripgrep_reports_errors():
+    result = stream_ripgrep(_fake_rg([], exit_code=2, stderr="regex parse error"))
+
+    assert not result.success
+    assert result.return_code == 2
+    assert result.error == "regex parse error"
+
+
+def test_ripgrep_search_uses_json_stream(mock_repos):
+    search = RipgrepStreamResult(
+        files=[RipgrepFileResult(path="a.py", lines=[(1, "needle", True)], match_count=1)],
+        match_count=1,
+    )
+    with patch("ra_aid.tools.ripgrep.stream_ripgrep", return_value=search) as mock_stream:
+        result = ripgrep_search.invoke({"pattern": "needle", "include_paths": ["src"]})
+
+    cmd = mock_stream.call_args[0][0]
+    assert cmd[:2] == ["rg", "--json"]
+    assert cmd[-2:] == ["needle", "src"]
+    assert result == {
+        "output": "a.py\n1:needle",
+        "return_code": 0,
+        "success": True,
+        "match_count": 1,
+        "truncated": False,
+    }
+    tool_result = mock_repos.create.call_args.kwargs["tool_result"]
+    assert tool_result["match_count"] == 1
+
+
+def test_ripgrep_search_reports_truncation(mock_repos, mock_config_repository):
+    mock_config_repository.set("ripgrep_max_matches", 1)
+    search = RipgrepStreamResult(
+        files=[RipgrepFileResult(path="a.py", lines=[(1, "needle", True)], match_count=1)],
+        match_count=1,
+        stop_reason="max_matches",
+    )
+    with patch("ra_aid.tools.ripgrep.stream_ripgrep", return_value=search) as mock_stream:
+        result = ripgrep_search.invoke({"pattern": "needle"})
+
+    assert mock_stream.call_args.kwargs["max_matches"] == 1
+    assert result["truncated"] is True
+    assert "Search stopped after 1 matches" in result["output"]
+
+
+def test_ripgrep_search_reports_output_limit(mock_repos, mock_config_repository):
+    mock_config_repository.set("ripgrep_max_output_bytes", 500)
+    search = RipgrepStreamResult(
+        files=[RipgrepFileResult(path="a.py", lines=[(1, "x" * 500, True)], match_count=1)],
+        match_count=1,
+        output_bytes=501,
+        stop_reason="max_output_bytes",
+    )
+    with patch("ra_aid.tools.ripgrep.stream_ripgrep", return_value=search) as mock_stream:
+        result = ripgrep_search.invoke({"pattern": "x"})
+
+    assert mock_stream.call_args.kwargs["max_output_bytes"] == 500
+    assert result["truncated"] is True
+    assert "output limit of 500 bytes reached" in result["output"]
+    assert "Search stopped" not in result["output"]
+
+
+def test_ripgrep_search_pty_mode(mock_repos, mock_config_repository):
+    mock_config_repository.set("ripgrep_streaming", False)
+    with patch(
+        "ra_aid.tools.ripgrep.run_interactive_command", return_value=(b"a.py\n1:needle", 0)
+    ) as mock_run:
+        result = ripgrep_search.invoke({"pattern": "needle"})
+
+    assert mock_run.call_args[0][0][:3] == ["rg", "--color", "always"]
+    assert result == {"output": "a.py\n1:needle", "return_code": 0, "success": True}
@@ -1,7 +1,12 @@
+import threading
+
 import pytest
 from unittest.mock import MagicMock
 from ra_aid.utils.agent_thread_manager import (
+    CancellationToken,
     agent_thread_registry,
+    get_cancellation_token,
+    register_agent,
     stop_agent,
     is_agent_running,
     has_received_stop_signal,
@@ -48,4 +53,19 @@ def test_has_received_stop_signal_true(mock_registry):
     assert has_received_stop_signal(333) is True
 
 def test_has_received_stop_signal_false(mock_registry):
-    assert has_received_stop_signal(444) is False
\ No newline at end of file
+    assert has_received_stop_signal(444) is False
+def test_register_agent_creates_cancellation_token(mock_registry):
+    stop_event = threading.Event()
+    register_agent(555, MagicMock(name="555"), stop_event)
+
+    token = get_cancellation_token(555)
+    assert isinstance(token, CancellationToken)
+    assert token.cancelled is False
+
+    assert stop_agent(555) is True
+    assert token.cancelled is True
+    assert has_received_stop_signal(555) is True
+
+def test_get_cancellation_token_unknown_session(mock_registry):
+    assert get_cancellation_token(None) is None
+    assert get_cancellation_token(666) is None
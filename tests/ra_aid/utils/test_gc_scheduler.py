@@ -0,0 +1,101 @@
+"""
+Tests for the threshold-triggered memory GC scheduler.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
+from ra_aid.utils.gc_scheduler import GCScheduler
+
+
+@pytest.fixture
+def gc_agent():
+    """Patch the key facts GC agent with one that records the thread it ran on."""
+    threads = []
+    agent = MagicMock(side_effect=lambda: threads.append(threading.current_thread()))
+    with patch("ra_aid.agents.key_facts_gc_agent.run_key_facts_gc_agent", agent):
+        yield agent, threads
+
+
+def test_below_threshold_does_nothing(gc_agent):
+    agent, _ = gc_agent
+    scheduler = GCScheduler()
+    with ConfigRepositoryManager():
+        assert not scheduler.maybe_schedule("key_facts", 50)
+        assert scheduler.run_pending() == 0
+    agent.assert_not_called()
+
+
+def test_queued_until_step_boundary_once_per_store(gc_agent):
+    agent, threads = gc_agent
+    scheduler = GCScheduler()
+    with ConfigRepositoryManager():
+        # The tool is not held up, and a second trigger while queued is skipped
+        assert scheduler.maybe_schedule("key_facts", 51)
+        assert scheduler.is_pending("key_facts")
+        assert not scheduler.maybe_schedule("key_facts", 52)
+        agent.assert_not_called()
+
+        assert scheduler.run_pending() == 1
+        assert not scheduler.is_pending("key_facts")
+        assert scheduler.run_pending() == 0
+    agent.assert_called_once()
+    assert threads == [threading.current_thread()]
+
+
+def test_runs_in_the_context_of_the_tool_call(gc_agent):
+    scheduler = GCScheduler()
+    seen = []
+    agent, _ = gc_agent
+    agent.side_effect = lambda: seen.append(scheduler.is_running("key_facts"))
+    with ConfigRepositoryManager():
+        scheduler.maybe_schedule("key_facts", 51)
+        # A GC agent's own step boundaries do not start further GC runs
+        scheduler.maybe_schedule("key_snippets", 1000)
+        with patch("ra_aid.agents.key_snippets_gc_agent.run_key_snippets_gc_agent") as snippets_agent:
+            snippets_agent.side_effect = lambda: seen.append(scheduler.run_pending())
+            assert scheduler.run_pending() == 2
+    assert seen == [True, 0]
+
+
+def test_sessions_only_run_their_own_gc(gc_agent):
+    agent, _ = gc_agent
+    scheduler = GCScheduler()
+    with ConfigRepositoryManager() as first:
+        scheduler.maybe_schedule("key_facts", 51)
+    with ConfigRepositoryManager():
+        assert not scheduler.is_pending("key_facts")
+        assert scheduler.run_pending() == 0
+    agent.assert_not_called()
+
+    assert scheduler.discard_pending(first) == 1
+    with ConfigRepositoryManager():
+        assert scheduler.run_pending() == 0
+
+
+def test_configured_threshold_and_sync_mode(gc_agent):
+    agent, _ = gc_agent
+    scheduler = GCScheduler()
+    with ConfigRepositoryManager() as config:
+        config.set("key_facts_gc_threshold", 5)
+        config.set("memory_gc_async", False)
+        assert scheduler.maybe_schedule("key_facts", 6)
+        # Ran inline, so it is already done
+        agent.assert_called_once()
+        assert not scheduler.is_pending("key_facts")
+        assert not scheduler.is_running("key_facts")
+
+
+def test_agent_errors_are_contained():
+    scheduler = GCScheduler()
+    with patch(
+        "ra_aid.agents.key_facts_gc_agent.run_key_facts_gc_agent",
+        side_effect=RuntimeError("model unavailable"),
+    ):
+        with ConfigRepositoryManager():
+            assert scheduler.maybe_schedule("key_facts", 100)
+            assert scheduler.run_pending() == 1
+            assert not scheduler.is_running("key_facts")
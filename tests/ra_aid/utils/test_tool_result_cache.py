@@ -0,0 +1,253 @@
+"""
+Tests for the session-scoped read-only tool result cache.
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
+from ra_aid.file_listing import clear_file_index_cache
+from ra_aid.utils.tool_result_cache import (
+    ToolResultCache,
+    cached_tool_result,
+    clear_tool_result_caches,
+    file_dependencies,
+    get_tool_result_cache,
+    invalidate_tool_results,
+    invalidates_tool_results,
+    project_dependencies,
+    tree_dependencies,
+)
+
+
+@pytest.fixture
+def session():
+    """Run with a current session and a fresh cache, recording cache hits."""
+    clear_tool_result_caches()
+    with (
+        patch("ra_aid.utils.tool_result_cache._current_session_id", return_value=1) as session_id,
+        patch("ra_aid.utils.tool_result_cache._record_hit") as record_hit,
+        patch("ra_aid.console.formatting.cpm"),
+    ):
+        yield session_id, record_hit
+    clear_tool_result_caches()
+
+
+def make_reader(calls):
+    @cached_tool_result(
+        "read_file_tool",
+        lambda params: file_dependencies(params["filepath"]),
+        path_params=("filepath",),
+    )
+    def read(filepath: str, encoding: str = "utf-8"):
+        calls.append(filepath)
+        with open(filepath, encoding=encoding) as f:
+            return {"content": f.read()}
+
+    return read
+
+
+def test_repeated_call_is_served_from_cache(session, tmp_path):
+    _, record_hit = session
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    calls = []
+    read = make_reader(calls)
+
+    assert read(str(path)) == {"content": "hello"}
+    # Equivalent arguments share the entry
+    assert read(os.path.join(str(tmp_path), ".", "a.txt"), encoding="utf-8") == {"content": "hello"}
+
+    assert len(calls) == 1
+    assert get_tool_result_cache().stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+    record_hit.assert_called_once()
+    tool_name, params, stats = record_hit.call_args[0]
+    assert tool_name == "read_file_tool"
+    assert params["filepath"] == str(path)
+    assert stats["hits"] == 1
+
+
+def test_cached_result_is_a_copy(session, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    read = make_reader([])
+
+    read(str(path))["content"] = "changed"
+    assert read(str(path)) == {"content": "hello"}
+
+
+def test_changed_mtime_invalidates(session, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    calls = []
+    read = make_reader(calls)
+
+    read(str(path))
+    path.write_text("hello, world")
+    assert read(str(path)) == {"content": "hello, world"}
+    assert len(calls) == 2
+
+
+def test_write_through_tool_invalidates(session, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    calls = []
+    read = make_reader(calls)
+
+    @invalidates_tool_results("filepath")
+    def write(filepath: str, contents: str):
+        pass
+
+    read(str(path))
+    write(str(path), "same size")
+    read(str(path))
+    assert len(calls) == 2
+
+
+def test_invalidation_is_scoped_to_paths(session, tmp_path):
+    cache = get_tool_result_cache()
+    cache.put(("read_file_tool", "a"), ((str(tmp_path / "a.txt"),), 1), "a")
+    cache.put(("read_file_tool", "b"), ((str(tmp_path / "b.txt"),), 1), "b")
+    cache.put(("list_directory_tree", "dir"), ((str(tmp_path),), 1), "tree")
+    cache.put(("ripgrep_search", "all"), (None, 1), "matches")
+
+    invalidate_tool_results([str(tmp_path / "a.txt")])
+
+    assert cache.get(("read_file_tool", "b"), 1) == (True, "b")
+    assert cache.get(("read_file_tool", "a"), 1) == (False, None)
+    assert cache.get(("list_directory_tree", "dir"), 1) == (False, None)
+    assert cache.get(("ripgrep_search", "all"), 1) == (False, None)
+
+    invalidate_tool_results()
+    assert len(cache) == 0
+
+
+def test_tree_dependencies_follow_directory_entries(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("a")
+    before = tree_dependencies(str(tmp_path), 2, False, False)
+    before_with_files = tree_dependencies(str(tmp_path), 2, False, True)
+
+    # File contents only matter when file metadata is listed
+    (tmp_path / "a.txt").write_text("longer")
+    assert tree_dependencies(str(tmp_path), 2, False, False) == before
+    assert tree_dependencies(str(tmp_path), 2, False, True) != before_with_files
+
+    shallow = tree_dependencies(str(tmp_path), 1, False, False)
+    (tmp_path / "sub" / "new.txt").write_text("new")
+    assert tree_dependencies(str(tmp_path), 2, False, False) != before
+    # Below max_depth, nested changes are not listed and not tracked
+    assert tree_dependencies(str(tmp_path), 1, False, False) == shallow
+
+
+def _age(*paths, seconds=60):
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def test_project_dependencies_stat_files_only_in_scope(tmp_path):
+    clear_file_index_cache()
+    (tmp_path / "src").mkdir()
+    (tmp_path / "docs").mkdir()
+    for name in ["src/a.py", "src/b.py", "src.py", "docs/c.md"]:
+        (tmp_path / name).write_text("x")
+    _age(tmp_path / "src", tmp_path / "docs", tmp_path)
+    root = str(tmp_path)
+
+    with patch("ra_aid.utils.tool_result_cache._stat_stamp", wraps=os.stat) as stat:
+        project_dependencies(root, False)
+        # A whole-project search stamps directories through the file index, not files
+        stat.assert_not_called()
+        scope, _ = project_dependencies(root, False, [str(tmp_path / "src")])
+    assert scope == (str(tmp_path / "src"),)
+    assert sorted(call.args[0] for call in stat.call_args_list) == [
+        os.path.join(root, "src"),
+        os.path.join(root, "src", "a.py"),
+        os.path.join(root, "src", "b.py"),
+    ]
+    clear_file_index_cache()
+
+
+def test_whole_project_stamp_follows_directory_changes(tmp_path):
+    clear_file_index_cache()
+    (tmp_path / "a.py").write_text("x = 1")
+    root = str(tmp_path)
+
+    # Changes within the racy window cannot be ruled out, so nothing is cached
+    assert project_dependencies(root, False) is None
+
+    _age(tmp_path)
+    before = project_dependencies(root, False)
+    assert before is not None and before[0] is None
+    assert project_dependencies(root, False) == before
+
+    # An editor saving by replacing the file changes the directory
+    (tmp_path / "a.py.tmp").write_text("x = 2")
+    os.replace(tmp_path / "a.py.tmp", tmp_path / "a.py")
+    _age(tmp_path, seconds=30)
+    assert project_dependencies(root, False) not in (None, before)
+    clear_file_index_cache()
+
+
+def test_no_session_disables_cache(tmp_path):
+    clear_tool_result_caches()
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    calls = []
+    read = make_reader(calls)
+
+    with patch("ra_aid.utils.tool_result_cache._current_session_id", return_value=None):
+        read(str(path))
+        read(str(path))
+    assert len(calls) == 2
+
+
+def test_config_disables_cache(session, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    calls = []
+    read = make_reader(calls)
+
+    with ConfigRepositoryManager() as config:
+        config.set("tool_result_cache", False)
+        read(str(path))
+        read(str(path))
+    assert len(calls) == 2
+
+
+def test_sessions_have_separate_caches(session, tmp_path):
+    session_id, _ = session
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    calls = []
+    read = make_reader(calls)
+
+    read(str(path))
+    session_id.return_value = 2
+    read(str(path))
+    assert len(calls) == 2
+
+
+def test_entries_are_bounded():
+    cache = ToolResultCache(max_entries=2)
+    for name in "abc":
+        cache.put(("tool", name), (None, 0), name)
+    assert len(cache) == 2
+    assert cache.get(("tool", "a"), 0) == (False, None)
+    assert cache.get(("tool", "c"), 0) == (True, "c")
+
+
+def test_read_file_tool_uses_cache(session, tmp_path):
+    from ra_aid.tools import read_file_tool
+
+    path = tmp_path / "a.py"
+    path.write_text("print('hi')\n")
+    with patch("ra_aid.tools.read_file.record_trajectory"):
+        first = read_file_tool.invoke({"filepath": str(path)})
+        with patch("builtins.open", side_effect=AssertionError("read from disk")):
+            second = read_file_tool.invoke({"filepath": str(path)})
+    assert first == second == {"content": "print('hi')\n"}
@@ -2,6 +2,7 @@
 
 import os
 import subprocess
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,6 +12,7 @@ from ra_aid.file_listing import (
     DirectoryNotFoundError,
     FileListerError,
     GitCommandError,
+    clear_file_index_cache,
     get_file_listing,
     is_git_repo,
 )
@@ -541,3 +543,108 @@ def test_hidden_files_excluded_by_default(git_repo_with_aider_files):
 
     # All files should be counted
     assert count == 11  # 5 original + 2 regular + 4 hidden
+
+
+def _age_tree(path, seconds=60):
+    """Push all mtimes in a tree into the past so index stamps are not racy."""
+    past = time.time() - seconds
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            os.utime(os.path.join(root, name), (past, past), follow_symlinks=False)
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def fresh_file_index():
+    """Make sure each test starts without in-process file indexes."""
+    clear_file_index_cache()
+    yield
+    clear_file_index_cache()
+
+
+def test_warm_listing_skips_git(git_repo_with_untracked, fresh_file_index):
+    """A second listing of an unchanged repo is served from the index."""
+    _age_tree(git_repo_with_untracked)
+    files, _ = get_file_listing(str(git_repo_with_untracked))
+
+    with patch("ra_aid.file_listing.subprocess.run") as mock_run:
+        warm_files, _ = get_file_listing(str(git_repo_with_untracked))
+
+    mock_run.assert_not_called()
+    assert warm_files == files
+
+
+def test_index_picks_up_new_untracked_files(git_repo_with_untracked, fresh_file_index):
+    """New files, including ones in freshly created directories, invalidate the index."""
+    _age_tree(git_repo_with_untracked)
+    get_file_listing(str(git_repo_with_untracked))
+
+    (git_repo_with_untracked / "src" / "new_module.py").write_text("x = 1")
+    (git_repo_with_untracked / "empty").mkdir()
+    files, _ = get_file_listing(str(git_repo_with_untracked))
+    assert "src/new_module.py" in files
+
+    _age_tree(git_repo_with_untracked)
+    get_file_listing(str(git_repo_with_untracked))
+    (git_repo_with_untracked / "empty" / "late.py").write_text("y = 2")
+    files, _ = get_file_listing(str(git_repo_with_untracked))
+    assert "empty/late.py" in files
+
+
+def test_index_respects_gitignore_changes(git_repo_with_ignores, fresh_file_index):
+    """Editing .gitignore refreshes the untracked part of the listing."""
+    _age_tree(git_repo_with_ignores)
+    files, _ = get_file_listing(str(git_repo_with_ignores))
+    assert "ignored.txt" not in files
+
+    gitignore = git_repo_with_ignores / ".gitignore"
+    gitignore.write_text(gitignore.read_text().replace("ignored.txt\n", ""))
+    files, _ = get_file_listing(str(git_repo_with_ignores))
+    assert "ignored.txt" in files
+
+
+def test_index_refreshes_after_commit(sample_git_repo, fresh_file_index):
+    """Removing a tracked file through git rebuilds the listing."""
+    _age_tree(sample_git_repo)
+    get_file_listing(str(sample_git_repo))
+
+    subprocess.run(["git", "rm", "-q", "docs/index.html"], cwd=sample_git_repo, check=True)
+    files, total = get_file_listing(str(sample_git_repo))
+    assert "docs/index.html" not in files
+    assert total == 4
+
+
+def test_index_persisted_in_ra_aid_dir(sample_git_repo, fresh_file_index):
+    """The index is saved under .ra-aid when it exists and reused by a new process."""
+    (sample_git_repo / ".ra-aid").mkdir(exist_ok=True)
+    _age_tree(sample_git_repo)
+    files, _ = get_file_listing(str(sample_git_repo), include_hidden=True)
+
+    assert (sample_git_repo / ".ra-aid" / "file_index_hidden.json").is_file()
+    assert not any(f.startswith(".ra-aid/") for f in files)
+
+    clear_file_index_cache()
+    with patch("ra_aid.file_listing.subprocess.run") as mock_run:
+        loaded_files, _ = get_file_listing(str(sample_git_repo), include_hidden=True)
+    mock_run.assert_not_called()
+    assert loaded_files == files
+
+
+def test_non_git_index_incremental(tmp_path, fresh_file_index):
+    """Non-git listings rescan only changed directories and drop removed ones."""
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "a.py").write_text("a")
+    (tmp_path / "pkg" / "sub" / "b.py").write_text("b")
+    _age_tree(tmp_path)
+    get_file_listing(str(tmp_path))
+
+    (tmp_path / "pkg" / "sub" / "c.py").write_text("c")
+    files, _ = get_file_listing(str(tmp_path))
+    assert os.path.join("pkg", "sub", "c.py") in files
+
+    for name in ("b.py", "c.py"):
+        (tmp_path / "pkg" / "sub" / name).unlink()
+    (tmp_path / "pkg" / "sub").rmdir()
+    files, total = get_file_listing(str(tmp_path))
+    assert files == [os.path.join("pkg", "a.py")]
+    assert total == 1